@@ -57,9 +57,9 @@ class TestIntegration(unittest.TestCase):
             self.skipTest("测试项目路径不存在，跳过测试")
         
         branch_dir = self.test_project_path
-        run_info_file = branch_dir / ".run_info"
+        run_history_file = branch_dir / ".run_history.jsonl"
         
-        if not run_info_file.exists():
+        if not run_history_file.exists():
             self.skipTest("运行历史文件不存在，跳过测试")
         
         try:
@@ -81,9 +81,9 @@ class TestIntegration(unittest.TestCase):
             self.skipTest("测试项目路径不存在，跳过测试")
         
         branch_dir = self.test_project_path
-        run_info_file = branch_dir / ".run_info"
+        run_history_file = branch_dir / ".run_history.jsonl"
         
-        if not run_info_file.exists():
+        if not run_history_file.exists():
             self.skipTest("运行历史文件不存在，跳过测试")
         
         try:
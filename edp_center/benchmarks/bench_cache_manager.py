@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+CacheManager 性能测试
+
+与原来的实现（每个条目一个 md5 命名的 pickle 文件，统计时 glob 整个缓存目录）对比：
+- 写入 N 个条目
+- 新实例冷读取（只从磁盘读取）
+- get_stats
+- 按模式失效（原来的实现无法按原始键匹配，只测量新实现）
+
+用法:
+    python edp_center/benchmarks/bench_cache_manager.py
+    python edp_center/benchmarks/bench_cache_manager.py --entries 20000 --reads 5000
+"""
+
+import argparse
+import hashlib
+import pickle
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.cache_manager import CacheManager
+
+
+class FilePerEntryCache:
+    """原来的磁盘布局：每个条目一个 {md5(key)}.cache 文件"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.md5(key.encode()).hexdigest()}.cache"
+
+    def set(self, key, data):
+        with open(self._path(key), 'wb') as f:
+            pickle.dump(data, f)
+
+    def get(self, key):
+        path = self._path(key)
+        if path.exists():
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        return None
+
+    def get_stats(self):
+        return {'disk_files': len(list(self.cache_dir.glob("*.cache")))}
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量 CacheManager 读写速度")
+    parser.add_argument('--entries', type=int, default=100000, help='缓存条目数量')
+    parser.add_argument('--reads', type=int, default=10000, help='冷读取的条目数量')
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix='bench_cache_manager_'))
+    try:
+        keys = [f"lib:{'std' if i % 4 else 'mem'}:{i:06d}" for i in range(args.entries)]
+        value = {'cells': [f'CELL_{i}' for i in range(20)], 'area': 1.5}
+        sample = random.Random(0).sample(keys, min(args.reads, len(keys)))
+
+        legacy = FilePerEntryCache(tmp_dir / 'legacy')
+        _, legacy_set = _timed(lambda: [legacy.set(k, value) for k in keys])
+        cache = CacheManager(tmp_dir / 'sqlite')
+        _, new_set = _timed(lambda: [cache.set(k, value) for k in keys])
+        print(f"set           : {new_set:8.3f}s  (file per entry {legacy_set:.3f}s, {args.entries} entries)")
+
+        legacy_values, legacy_get = _timed(lambda: [legacy.get(k) for k in sample])
+        cold = CacheManager(tmp_dir / 'sqlite')
+        new_values, new_get = _timed(lambda: [cold.get(k) for k in sample])
+        print(f"cold get      : {new_get:8.3f}s  (file per entry {legacy_get:.3f}s, {len(sample)} reads)")
+
+        legacy_stats, legacy_stats_time = _timed(legacy.get_stats)
+        stats, stats_time = _timed(cold.get_stats)
+        print(f"get_stats     : {stats_time * 1000:8.3f}ms  (file per entry {legacy_stats_time * 1000:.3f}ms)")
+
+        removed, pattern_time = _timed(lambda: cold.invalidate_pattern('lib:mem:*'))
+        print(f"invalidate    : {pattern_time:8.3f}s  ({removed} entries matching lib:mem:*)")
+
+        ok = (new_values == legacy_values and stats['disk_entries'] == legacy_stats['disk_files'] == args.entries
+              and removed == sum(1 for k in keys if k.startswith('lib:mem:')))
+        print(f"check         : {'ok' if ok else 'FAILED'}")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+edp CLI 启动耗时测试
+
+用 python -X importtime 运行轻量命令（默认 edp -h），统计导入耗时：
+- 导入总耗时（所有顶层导入的累计耗时之和，取多次运行的最小值）超过预算时失败
+- 导入了不应为轻量命令加载的模块（WorkflowManager、PyYAML、flowkit、cmdkit、configkit、tkinter）时失败
+并列出耗时最多的顶层导入。
+
+用法:
+    python edp_center/benchmarks/bench_cli_startup.py
+    python edp_center/benchmarks/bench_cli_startup.py --budget-ms 80 --repeat 10
+    python edp_center/benchmarks/bench_cli_startup.py -- -stats --help
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+EDP_SCRIPT = project_root / 'edp_center' / 'bin' / 'edp.py'
+
+# 轻量命令不应导入的模块（前缀匹配）
+FORBIDDEN_MODULES = (
+    'edp_center.main.workflow_manager',
+    'edp_center.packages.edp_flowkit',
+    'edp_center.packages.edp_cmdkit',
+    'edp_center.packages.edp_configkit',
+    'edp_center.packages.edp_dirkit',
+    'yaml',
+    'tkinter',
+    '_tkinter',
+)
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, int], List[str]]:
+    """
+    解析 -X importtime 的输出
+
+    Returns:
+        (顶层导入累计耗时之和 ms, {顶层模块: 累计耗时 us}, 所有导入的模块)
+    """
+    top_level: Dict[str, int] = {}
+    modules: List[str] = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.append(name.strip())
+        # 顶层导入的模块名前只有一个空格（嵌套导入每层多两个空格）
+        if not name.startswith('   '):
+            top_level[name.strip()] = int(cumulative)
+    return sum(top_level.values()) / 1000, top_level, modules
+
+
+def measure(args: List[str]) -> Tuple[float, Dict[str, int], List[str]]:
+    """在新进程中运行一次 edp 命令并解析导入耗时"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run([sys.executable, '-X', 'importtime', str(EDP_SCRIPT)] + args,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                            cwd=str(project_root), env=env)
+    return parse_importtime(result.stderr)
+
+
+def forbidden_imports(modules: List[str]) -> List[str]:
+    """导入了的禁止模块（按 FORBIDDEN_MODULES 中的名称列出）"""
+    return [f for f in FORBIDDEN_MODULES if any(m == f or m.startswith(f + '.') for m in modules)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量 edp CLI 轻量命令的导入耗时")
+    parser.add_argument('--budget-ms', type=float, default=150.0, help='导入总耗时预算（毫秒）')
+    parser.add_argument('--repeat', type=int, default=5, help='运行次数（取最小值）')
+    parser.add_argument('--top', type=int, default=8, help='列出耗时最多的顶层导入个数')
+    parser.add_argument('cmd', nargs='*', default=['-h'], help='要测量的 edp 参数（默认: -h）')
+    args = parser.parse_args()
+
+    runs = [measure(args.cmd) for _ in range(args.repeat)]
+    total, top_level, modules = min(runs, key=lambda r: r[0])
+    print(f"command         : edp {' '.join(args.cmd)}")
+    print(f"import time     : {total:9.3f}ms (min of {args.repeat}, budget {args.budget_ms:g}ms)")
+    print(f"modules         : {len(modules)}")
+    for name, cumulative in sorted(top_level.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:9.3f}ms  {name}")
+
+    forbidden = forbidden_imports(modules)
+    if forbidden:
+        print(f"forbidden       : {', '.join(forbidden)}")
+
+    ok = total <= args.budget_ms and not forbidden
+    print(f"check           : {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
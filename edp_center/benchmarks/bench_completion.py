@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+TAB 补全耗时测试
+
+在临时目录中生成一个较大的 WORK_PATH（blocks x users x branches 个 branch 目录），
+在其中一个 branch 目录下：
+- 生成完整的补全缓存（冷）
+- 重复执行 step / branch / user 补全（从缓存回答，包括检查用到的分区是否过期）
+- 新建一个 branch 后只刷新过期的分区，与重新生成完整缓存对比
+补全的平均耗时超过预算或结果不正确时失败。
+
+用法:
+    python edp_center/benchmarks/bench_completion.py
+    python edp_center/benchmarks/bench_completion.py --blocks 50 --users 20 --branches 20 --budget-ms 2
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.main.cli.completion import cache, helpers
+
+EDP_CENTER = project_root / 'edp_center'
+
+
+def create_work_path(root: Path, blocks: int, users: int, branches: int) -> Path:
+    """生成 WORK_PATH/dongting/P85，返回 version 目录"""
+    version_dir = root / 'WORK_PATH' / 'dongting' / 'P85'
+    lines = ['project: dongting', 'version: P85', 'foundry: SAMSUNG', 'node: S8', 'blocks:']
+    for b in range(blocks):
+        lines += [f'  block{b}:', '    users:']
+        for u in range(users):
+            lines.append(f'      user{u}: {{}}')
+            for r in range(branches):
+                (version_dir / f'block{b}' / f'user{u}' / f'branch{r}' / 'runs').mkdir(parents=True)
+    (version_dir / '.edp_version').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return version_dir
+
+
+def timed(func, repeat: int = 1) -> float:
+    """平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量 TAB 补全的耗时")
+    parser.add_argument('--blocks', type=int, default=20, help='block 数量')
+    parser.add_argument('--users', type=int, default=10, help='每个 block 的 user 数量')
+    parser.add_argument('--branches', type=int, default=20, help='每个 user 的 branch 数量')
+    parser.add_argument('--repeat', type=int, default=200, help='补全次数')
+    parser.add_argument('--budget-ms', type=float, default=5.0, help='补全平均耗时预算（毫秒）')
+    args = parser.parse_args()
+
+    temp_dir = Path(tempfile.mkdtemp(prefix='edp_bench_completion_')).resolve()
+    cwd = os.getcwd()
+    saved_env = {k: os.environ.get(k) for k in ('EDP_COMPLETION_CACHE', 'EDP_COMPLETION_REFRESH')}
+    try:
+        version_dir = create_work_path(temp_dir, args.blocks, args.users, args.branches)
+        cache_file = temp_dir / 'completion_cache.json'
+        os.environ['EDP_COMPLETION_CACHE'] = str(cache_file)
+        os.environ['EDP_COMPLETION_REFRESH'] = '0'
+        os.chdir(version_dir / 'block0' / 'user0' / 'branch0')
+
+        full_ms = timed(lambda: cache.update_completion_cache(EDP_CENTER))
+        sections = cache.load_completion_cache(cache_file)['sections']
+
+        steps = helpers.complete_flow_steps('pnr_innovus')
+        branches = helpers.complete_branches()
+        users = helpers.complete_users()
+        # 每次 TAB 都是一个新进程，需要重新读取缓存文件
+        steps_ms = timed(lambda: (cache._loaded.clear(), helpers.complete_flow_steps('pnr_innovus')), args.repeat)
+        branches_ms = timed(lambda: (cache._loaded.clear(), helpers.complete_branches()), args.repeat)
+        users_ms = timed(lambda: (cache._loaded.clear(), helpers.complete_users()), args.repeat)
+
+        # 新建 branch：只有 branches 分区过期
+        (version_dir / 'block0' / 'user0' / 'new_branch').mkdir()
+        st = os.stat(version_dir / 'block0' / 'user0')
+        os.utime(version_dir / 'block0' / 'user0', ns=(st.st_atime_ns, st.st_mtime_ns + 1000000))
+        stale = cache.ensure_fresh(cache.load_completion_cache(cache_file), list(sections))
+        refreshed = []
+        partial_ms = timed(lambda: refreshed.extend(
+            cache.refresh_completion_cache(stale, EDP_CENTER, cache_file)))
+        refreshed_branches = helpers.complete_branches()
+
+        size = cache_file.stat().st_size
+    finally:
+        os.chdir(cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    expected_branches = [f'branch{r}' for r in range(args.branches)]
+    same = (steps == ['pnr_innovus.place', 'pnr_innovus.postroute']
+            and branches == sorted(expected_branches)
+            and users == sorted(f'user{u}' for u in range(args.users))
+            and refreshed_branches == sorted(expected_branches + ['new_branch']))
+    worst_ms = max(steps_ms, branches_ms, users_ms)
+
+    print(f"work path       : {args.blocks} blocks x {args.users} users x {args.branches} branches")
+    print(f"cache           : {len(sections)} sections, {size} bytes")
+    print(f"full generate   : {full_ms:9.2f}ms")
+    print(f"complete steps  : {steps_ms:9.3f}ms (mean of {args.repeat})")
+    print(f"complete branch : {branches_ms:9.3f}ms (mean of {args.repeat})")
+    print(f"complete users  : {users_ms:9.3f}ms (mean of {args.repeat}, budget {args.budget_ms:g}ms)")
+    print(f"stale refresh   : {partial_ms:9.2f}ms ({', '.join(refreshed) or 'nothing'})")
+    print(f"correct result  : {same}")
+
+    ok = same and worst_ms <= args.budget_ms and stale == refreshed and len(refreshed) == 1
+    print(f"check           : {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
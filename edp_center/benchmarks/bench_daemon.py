@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+edp daemon 延迟测试
+
+在临时 socket 上启动 edp daemon，对每个命令测量：
+- daemon 请求延迟：socket 往返（不含客户端 Python 启动），取多次的中位数
+- 端到端耗时：python edp.py <cmd> 经过 daemon 与 EDP_DAEMON=0（冷启动、本进程执行）的对比
+并检查两种方式的输出和退出代码一致。daemon 请求延迟的中位数超过预算时失败。
+
+用法:
+    python edp_center/benchmarks/bench_daemon.py
+    python edp_center/benchmarks/bench_daemon.py --budget-ms 30 --repeat 20
+    python edp_center/benchmarks/bench_daemon.py --cwd /path/to/branch -- -info pnr_innovus
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.main.cli.daemon.protocol import CODE_ROOT, connect, recv_message, send_message
+from edp_center.main.cli.daemon.server import start_daemon, stop_daemon
+
+EDP_SCRIPT = project_root / 'edp_center' / 'bin' / 'edp.py'
+DEFAULT_CWD = project_root / 'Example' / 'WORK_PATH' / 'dongting' / 'P85' / 'block1' / 'user1' / 'main'
+DEFAULT_COMMANDS = [['-info'], ['-info', 'pnr_innovus']]
+
+
+def request_latency(argv: List[str], cwd: Path, env: dict) -> Tuple[float, int]:
+    """一次 daemon 请求的往返耗时（ms）和退出代码"""
+    start = time.perf_counter()
+    sock = connect()
+    if sock is None:
+        raise RuntimeError("无法连接 daemon")
+    with sock:
+        send_message(sock, {'argv': argv, 'cwd': str(cwd), 'env': env, 'python': sys.executable,
+                            'code_root': CODE_ROOT, 'isatty': [False, False]})
+        response = recv_message(sock)
+    elapsed = (time.perf_counter() - start) * 1000
+    if response is None or 'fallback' in response:
+        raise RuntimeError(f"daemon 没有执行请求: {response}")
+    return elapsed, response['exit']
+
+
+def run_edp(argv: List[str], cwd: Path, env: dict) -> Tuple[float, subprocess.CompletedProcess]:
+    """在新进程中运行 edp，返回墙钟耗时（ms）和结果"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, str(EDP_SCRIPT)] + argv, cwd=str(cwd), env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量 edp daemon 的请求延迟和端到端耗时")
+    parser.add_argument('--budget-ms', type=float, default=50.0, help='daemon 请求延迟中位数预算（毫秒）')
+    parser.add_argument('--repeat', type=int, default=10, help='每个命令的测量次数')
+    parser.add_argument('--cwd', type=Path, default=DEFAULT_CWD, help='执行命令的 branch 目录')
+    parser.add_argument('cmd', nargs='*', help='要测量的 edp 参数（默认: -info 和 -info pnr_innovus）')
+    args = parser.parse_args()
+    commands = [args.cmd] if args.cmd else DEFAULT_COMMANDS
+
+    socket_dir = Path(tempfile.mkdtemp(prefix='edp_bench_daemon_'))
+    os.chmod(socket_dir, 0o700)
+    os.environ['EDP_DAEMON_SOCKET'] = str(socket_dir / 'daemon.sock')
+    daemon_env = dict(os.environ)
+    cold_env = dict(os.environ, EDP_DAEMON='0')
+
+    ok = True
+    try:
+        start = time.perf_counter()
+        status = start_daemon(idle_timeout=300)
+        if status is None:
+            print("check           : FAILED (daemon 启动失败)")
+            return 1
+        print(f"daemon start    : {(time.perf_counter() - start) * 1000:9.1f}ms (pid {status['pid']})")
+
+        for argv in commands:
+            command = ' '.join(argv)
+            first, _ = request_latency(argv, args.cwd, daemon_env)
+            latencies = [request_latency(argv, args.cwd, daemon_env)[0] for _ in range(args.repeat)]
+            warm = statistics.median(latencies)
+
+            daemon_ms, daemon_result = min((run_edp(argv, args.cwd, daemon_env) for _ in range(3)),
+                                           key=lambda r: r[0])
+            cold_ms, cold_result = min((run_edp(argv, args.cwd, cold_env) for _ in range(3)),
+                                       key=lambda r: r[0])
+            same = ((daemon_result.returncode, daemon_result.stdout, daemon_result.stderr)
+                    == (cold_result.returncode, cold_result.stdout, cold_result.stderr))
+
+            print(f"command         : edp {command}")
+            print(f"  first request : {first:9.1f}ms")
+            print(f"  warm request  : {warm:9.1f}ms (median of {args.repeat}, min {min(latencies):.1f}ms, "
+                  f"budget {args.budget_ms:g}ms)")
+            print(f"  edp + daemon  : {daemon_ms:9.1f}ms (min of 3)")
+            print(f"  edp cold      : {cold_ms:9.1f}ms (min of 3, EDP_DAEMON=0)")
+            print(f"  speedup       : {cold_ms / daemon_ms:9.2f}x")
+            print(f"  same output   : {same}")
+            ok = ok and same and warm <= args.budget_ms
+    finally:
+        stop_daemon()
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+    print(f"check           : {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
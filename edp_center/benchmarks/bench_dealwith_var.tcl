@@ -0,0 +1,58 @@
+#!/usr/bin/env tclsh
+# Benchmark for edp_dealwith_var.tcl array write traces
+#
+# Measures the cost of writing one array element while N other elements of
+# the same array are constrained/protected. With one dispatcher trace per
+# array the cost should stay flat as N grows.
+#
+# Usage: tclsh edp_center/benchmarks/bench_dealwith_var.tcl ?iterations? ?counts?
+#   tclsh edp_center/benchmarks/bench_dealwith_var.tcl 20000 {0 10 100 1000 5000}
+
+set script_dir [file dirname [file normalize [info script]]]
+source [file join $script_dir .. flow common packages tcl default edp_dealwith_var.tcl]
+
+set iterations [expr {$argc > 0 ? [lindex $argv 0] : 20000}]
+set counts [expr {$argc > 1 ? [lindex $argv 1] : {0 10 100 1000 5000}}]
+
+# Build a fresh array with <count> constrained and <count>/10 protected elements
+proc setup_array {arrayName count} {
+    global $arrayName
+    catch {unset $arrayName}
+    array unset ::edp_var::allowed_values "${arrayName}(*"
+    array unset ::edp_var::protected "${arrayName}(*"
+    set ${arrayName}(place,free) 0
+    for {set i 0} {$i < $count} {incr i} {
+        set ${arrayName}(step$i,cpu_num) 8
+        edp_constraint_var ${arrayName}(step$i,cpu_num) "4 8 16"
+        if {$i % 10 == 0} {
+            edp_protect_var ${arrayName}(step$i,memory) 1000
+        }
+    }
+    if {$count > 0} {
+        set ${arrayName}(place,cpu_num) 8
+        edp_constraint_var ${arrayName}(place,cpu_num) "4 8 16"
+    }
+}
+
+proc time_writes {arrayName element values iterations} {
+    global $arrayName
+    set n [llength $values]
+    set start [clock microseconds]
+    for {set i 0} {$i < $iterations} {incr i} {
+        set ${arrayName}($element) [lindex $values [expr {$i % $n}]]
+    }
+    return [expr {double([clock microseconds] - $start) / $iterations}]
+}
+
+puts [format "%-12s %-8s %-22s %-22s" "rules" "traces" "free elem (us/write)" "constrained (us/write)"]
+foreach count $counts {
+    setup_array pnr_innovus $count
+    set traces [llength [trace info variable pnr_innovus]]
+    set free_cost [time_writes pnr_innovus place,free {1 2 3} $iterations]
+    if {$count > 0} {
+        set constrained_cost [format "%.3f" [time_writes pnr_innovus place,cpu_num {4 8 16} $iterations]]
+    } else {
+        set constrained_cost "-"
+    }
+    puts [format "%-12d %-8d %-22.3f %-22s" $count $traces $free_cost $constrained_cost]
+}
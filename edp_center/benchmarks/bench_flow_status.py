@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+edp -info flow 状态收集性能测试
+
+在临时目录中生成一个合成的 edp_center（--flows 个 flow，每个 --steps 个串联的 step，
+一半的 step 有源脚本）和一个有运行历史的 branch 目录，分别用依次执行（max_workers=1）
+和线程池并发执行收集 flow 状态（info_handler.collect_flow_status，包括 list_available_flows）。
+
+本地磁盘上 stat 只需要几微秒，测试通过 --latency-ms 给每次 stat / listdir / open
+加上固定的等待时间，模拟网络文件系统（NFS）的往返延迟（--latency-ms 0 时测量本地磁盘）。
+两种方式的结果不同或加速比低于 --min-speedup 时失败。
+
+用法:
+    python edp_center/benchmarks/bench_flow_status.py
+    python edp_center/benchmarks/bench_flow_status.py --flows 4 --steps 100 --latency-ms 2
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.main.workflow_manager import WorkflowManager
+from edp_center.main.cli.commands import info_handler
+from edp_center.main.cli.utils import dependency_parser
+from edp_center.main.cli.utils.run_history import RunHistory, RUN_HISTORY_FILE_NAME
+from edp_center.main.cli.utils.yaml_cache import clear_yaml_cache
+from edp_center.packages.edp_cmdkit.sub_steps import reader as sub_steps_reader
+
+FOUNDRY, NODE, PROJECT = 'FDRY', 'N1', 'prj'
+
+
+def create_tree(root: Path, flows: int, steps: int, runs: int) -> Path:
+    """生成 edp_center 和 branch 目录，返回 branch 目录"""
+    edp_center = root / 'edp_center'
+    (edp_center / 'config' / FOUNDRY / NODE / PROJECT).mkdir(parents=True)
+    history = []
+    for f in range(flows):
+        flow = f'flow{f}'
+        lines = [f'{flow}:', '  dependency:', '    FP_MODE:']
+        for s in range(steps):
+            step = f'{flow}_s{s}'
+            lines += [f'      - {step}:', f'          out: {step}.pass', f'          cmd: {step}.tcl']
+            if s:
+                lines.append(f'          in: {flow}_s{s - 1}.pass')
+            lines += ['          sub_steps:', f'            {step}_a.tcl: {flow}::{step}_a']
+            if s % 2 == 0:
+                script = (edp_center / 'flow' / 'initialize' / FOUNDRY / NODE / PROJECT / 'cmds' / flow /
+                          'steps' / f'{flow}.{step}' / f'{step}.tcl')
+                script.parent.mkdir(parents=True)
+                script.write_text('# step\n')
+            history += [{'timestamp': f'2025-01-01 00:{i:02d}:00', 'flow': flow, 'step': step,
+                         'status': 'success' if i % 3 else 'failed'} for i in range(runs)]
+        flow_dir = edp_center / 'config' / FOUNDRY / NODE / 'common' / flow
+        flow_dir.mkdir(parents=True)
+        (flow_dir / 'dependency.yaml').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    branch_dir = root / 'WORK_PATH' / PROJECT / 'P1' / 'blk' / 'usr' / 'main'
+    branch_dir.mkdir(parents=True)
+    with open(branch_dir / RUN_HISTORY_FILE_NAME, 'w', encoding='utf-8') as f:
+        f.writelines(json.dumps(run) + '\n' for run in history)
+    return branch_dir
+
+
+@contextlib.contextmanager
+def simulated_latency(latency: float):
+    """给 stat / listdir / scandir / open 加上固定的等待时间（等待期间释放 GIL，与网络 I/O 相同）"""
+    if latency <= 0:
+        yield
+        return
+
+    def slow(func):
+        def wrapper(*args, **kwargs):
+            time.sleep(latency)
+            return func(*args, **kwargs)
+        return wrapper
+
+    with patch.object(os, 'stat', slow(os.stat)), patch.object(os, 'listdir', slow(os.listdir)), \
+            patch.object(os, 'scandir', slow(os.scandir)), patch.object(builtins, 'open', slow(builtins.open)):
+        yield
+
+
+def collect(manager, edp_center: Path, branch_dir: Path, workers: int, latency: float):
+    """清空进程内缓存后收集一次（与一次 edp -info 相同），返回 (耗时秒, 快照, 显示内容)"""
+    clear_yaml_cache()
+    sub_steps_reader._dependency_cache.clear()
+    RunHistory._parsed.clear()
+    output = io.StringIO()
+    with patch.object(dependency_parser, 'READY_CHECK_MAX_WORKERS', workers), simulated_latency(latency):
+        start = time.perf_counter()
+        snapshot = info_handler.collect_flow_status(manager, edp_center, FOUNDRY, NODE, PROJECT, 'flow0',
+                                                    branch_dir=branch_dir, max_workers=workers)
+        elapsed = time.perf_counter() - start
+    with contextlib.redirect_stderr(output):
+        info_handler.render_flow_status(snapshot)
+    return elapsed, snapshot, output.getvalue()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量 edp -info 收集 flow 状态的耗时")
+    parser.add_argument('--flows', type=int, default=4, help='flow 数量')
+    parser.add_argument('--steps', type=int, default=50, help='每个 flow 的 step 数量')
+    parser.add_argument('--runs', type=int, default=5, help='每个 step 的运行记录数')
+    parser.add_argument('--latency-ms', type=float, default=1.0, help='每次文件系统操作的模拟延迟（毫秒）')
+    parser.add_argument('--workers', type=int, default=info_handler.STATUS_MAX_WORKERS, help='并行数')
+    parser.add_argument('--min-speedup', type=float, default=5.0, help='最低加速比')
+    args = parser.parse_args()
+
+    temp_dir = Path(tempfile.mkdtemp(prefix='edp_bench_flow_status_'))
+    try:
+        branch_dir = create_tree(temp_dir, args.flows, args.steps, args.runs)
+        edp_center = temp_dir / 'edp_center'
+        manager = WorkflowManager(edp_center)
+        latency = args.latency_ms / 1000.0
+
+        serial_s, serial_snapshot, serial_text = collect(manager, edp_center, branch_dir, 1, latency)
+        parallel_s, parallel_snapshot, parallel_text = collect(manager, edp_center, branch_dir,
+                                                               args.workers, latency)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    steps = parallel_snapshot['steps']
+    same = serial_snapshot == parallel_snapshot and serial_text == parallel_text
+    speedup = serial_s / parallel_s
+
+    print(f"branch          : {args.flows} flows x {args.steps} steps, {args.runs} runs per step")
+    print(f"latency         : {args.latency_ms:g}ms per stat/listdir/open")
+    print(f"serial          : {serial_s * 1000:9.1f}ms (max_workers=1)")
+    print(f"parallel        : {parallel_s * 1000:9.1f}ms (max_workers={args.workers})")
+    print(f"speedup         : {speedup:9.1f}x (minimum {args.min_speedup:g}x)")
+    print(f"steps shown     : {len(steps)} ({sum(1 for s in steps.values() if s['ready'])} ready, "
+          f"{sum(1 for s in steps.values() if s['run'] and s['run'][0])} with runs)")
+    print(f"same result     : {same}")
+
+    ok = same and len(steps) == args.steps and speedup >= args.min_speedup
+    print(f"check           : {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+gen-lib 批量处理性能测试
+
+在本地磁盘上生成一个合成的 Samsung STD 库安装目录（默认 200 个库，每个库若干版本、
+gds/lef/cdl/ccs_lvf 视图），分别以串行和多进程并行方式运行 edp_libkit 的批量生成，
+输出耗时、吞吐量和加速比，并检查各种并行数下生成的 lib_config.tcl 内容一致。
+最后在第一个输出目录上再运行一次，检查内容未变化的文件都没有重写。
+
+用法:
+    python edp_center/benchmarks/bench_gen_lib.py
+    python edp_center/benchmarks/bench_gen_lib.py --libs 800 --corners 24 --jobs 1 4 8
+    python edp_center/benchmarks/bench_gen_lib.py --root /tmp/lib_tree --keep   # 只生成合成库目录
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.batch_gen import GenLibOptions, run_gen_lib
+
+PROCESS_CORNERS = ['sspg', 'ffpg', 'tt', 'ssgnp', 'ffgnp', 'sfg']
+VOLTAGES = ['0p675v', '0p75v', '0p825v', '0p72v']
+TEMPERATURES = ['m40c', '125c', '25c']
+
+
+def create_synthetic_lib_tree(root: Path, lib_count: int, versions: int = 2, corners: int = 12) -> List[Path]:
+    """
+    生成合成的 Samsung STD 库安装目录（文件为空文件）
+
+    目录结构与真实的 STD 安装目录一致：
+        {root}/v-logic_{lib}/DesignWare_logic_libs/samsung08nvllg/20hs/hdf/hvt/{version}/{view}/...
+
+    Args:
+        root: 安装目录
+        lib_count: 库数量
+        versions: 每个库的版本数（1.00A、1.00B ...）
+        corners: 每个版本 ccs_lvf 下的 PVT corner 数量
+
+    Returns:
+        库目录列表（按名称排序）
+    """
+    pvt_corners = [f'{p}{v}{t}' for p in PROCESS_CORNERS for v in VOLTAGES for t in TEMPERATURES][:corners]
+    lib_dirs = []
+    for i in range(lib_count):
+        lib_name = f'sa08nvbench{i:05d}'
+        lib_dir = root / f'v-logic_{lib_name}'
+        hvt_dir = lib_dir / 'DesignWare_logic_libs' / 'samsung08nvllg' / '20hs' / 'hdf' / 'hvt'
+        for v in range(versions):
+            version_dir = hvt_dir / f'1.00{chr(ord("A") + v)}'
+            files = [
+                version_dir / 'gds' / f'{lib_name}.gds',
+                version_dir / 'lef' / f'{lib_name}.lef',
+                version_dir / 'cdl' / f'{lib_name}.cdl',
+            ]
+            for corner in pvt_corners:
+                files.append(version_dir / 'ccs_lvf' / f'{lib_name}_{corner}.db')
+                files.append(version_dir / 'ccs_lvf' / f'{lib_name}_{corner}.lib_ccs_tn_lvf_dths.gz')
+            for file_path in files:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.touch()
+        lib_dirs.append(lib_dir)
+    return sorted(lib_dirs)
+
+
+def _read_outputs(output_dir: Path) -> dict:
+    """读取输出目录下所有 lib_config*.tcl（去掉时间戳行）"""
+    outputs = {}
+    for config_file in sorted(output_dir.rglob('lib_config*.tcl')):
+        lines = config_file.read_text(encoding='utf-8').splitlines()
+        outputs[str(config_file.relative_to(output_dir))] = [l for l in lines if not l.startswith('# Generated at')]
+    return outputs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="对比 gen-lib 串行与多进程并行的耗时")
+    parser.add_argument('--libs', type=int, default=200, help='合成库数量')
+    parser.add_argument('--versions', type=int, default=2, help='每个库的版本数')
+    parser.add_argument('--corners', type=int, default=12, help='每个版本的 PVT corner 数量')
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 4, 8], help='要测试的并行数（第一个作为基准）')
+    parser.add_argument('--all-versions', action='store_true', help='处理所有版本（默认只处理最新版本）')
+    parser.add_argument('--root', type=Path, help='合成库目录的位置（默认使用临时目录）')
+    parser.add_argument('--keep', action='store_true', help='保留合成库目录和输出')
+    args = parser.parse_args()
+
+    work_dir = args.root or Path(tempfile.mkdtemp(prefix='bench_gen_lib_'))
+    try:
+        start = time.perf_counter()
+        lib_dirs = create_synthetic_lib_tree(work_dir / 'install', args.libs, args.versions, args.corners)
+        print(f"libraries     : {len(lib_dirs)} ({args.versions} versions, {args.corners} corners)")
+        print(f"tree          : {work_dir / 'install'} ({time.perf_counter() - start:.2f}s to create)")
+
+        baseline_time = None
+        baseline_outputs = None
+        same = True
+        for jobs in args.jobs:
+            output_dir = work_dir / f'output_j{jobs}'
+            options = GenLibOptions(foundry='Samsung', node='ln08lpu_gp', lib_type='STD',
+                                    output_dir=output_dir, all_versions=args.all_versions)
+            start = time.perf_counter()
+            results = run_gen_lib(lib_dirs, options, jobs=jobs)
+            elapsed = time.perf_counter() - start
+
+            failed = sum(1 for r in results if not r.ok)
+            outputs = _read_outputs(output_dir)
+            if baseline_outputs is None:
+                baseline_time, baseline_outputs = elapsed, outputs
+            else:
+                same = same and outputs == baseline_outputs
+            print(f"jobs {jobs:<9d}: {elapsed:8.2f}s  {len(lib_dirs) / elapsed:8.1f} libs/s  "
+                  f"speedup {baseline_time / elapsed:5.2f}x  ({len(outputs)} files, {failed} failed)")
+        print(f"same results  : {'yes' if same else 'NO'}")
+
+        jobs = args.jobs[0]
+        options = GenLibOptions(foundry='Samsung', node='ln08lpu_gp', lib_type='STD',
+                                output_dir=work_dir / f'output_j{jobs}', all_versions=args.all_versions)
+        start = time.perf_counter()
+        results = run_gen_lib(lib_dirs, options, jobs=jobs)
+        elapsed = time.perf_counter() - start
+        written = sum(len(r.written_files) for r in results)
+        unchanged = sum(len(r.unchanged_files) for r in results)
+        print(f"rerun         : {elapsed:8.2f}s  (written {written}, unchanged {unchanged})")
+        ok = same and written == 0 and unchanged == len(baseline_outputs)
+        return 0 if ok else 1
+    finally:
+        if args.keep:
+            print(f"kept          : {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
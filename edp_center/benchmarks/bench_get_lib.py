@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+lib_info 查询性能测试
+
+用 LibGenerator 生成一组合成库（默认 2000 个）的 lib_config.tcl，在 tclsh 中
+source 全部文件后，分别在有反向索引和删除反向索引（回退到扫描 array names）
+两种情况下计时 lib_info::get_lib_info / lib_info::get_physical_info，并检查
+两种方式返回的结果一致。
+
+用法:
+    python edp_center/benchmarks/bench_get_lib.py
+    python edp_center/benchmarks/bench_get_lib.py --libs 2000 --mem-libs 200 --queries 50
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit import LibInfo, LibGenerator, AdapterFactory
+from edp_center.packages.edp_common.path_utils import to_tcl_path
+
+GET_LIB_TCL = project_root / 'edp_center' / 'flow' / 'common' / 'packages' / 'tcl' / 'default' / 'edp_get_lib.tcl'
+
+PROCESS_CORNERS = ['sspg', 'ffpg', 'tt']
+VOLTAGES = ['0p675v', '0p75v', '0p825v', '0p72v']
+TEMPERATURES = ['m40c', '125c', '25c']
+RC_CORNERS = ['Cmax', 'Cmin']
+
+# 与 corner 对应的 MMMC view：{sdc_mode}_{process}_{voltage}_{temperature}_{rc_corner}
+VIEWS = [
+    'func_sspg_0p6750v_m40c_Cmax',
+    'func_ffpg_0p8250v_125c_Cmin',
+    'func_tt_0p7500v_25c_Cmax',
+    'scan_sspg_0p7200v_125c_Cmax',
+]
+
+TIMING_SCRIPT = r'''
+source {%(get_lib)s}
+foreach config_file [glob -directory {%(config_dir)s} */lib_config.tcl] {
+    source $config_file
+}
+rename puts __bench_puts
+proc puts {args} {}
+
+proc bench_queries {rounds views} {
+    set t0 [clock microseconds]
+    for {set i 0} {$i < $rounds} {incr i} {
+        set db [lib_info::get_lib_info db $views]
+        set lef [lib_info::get_physical_info lef]
+    }
+    return [list [expr {([clock microseconds] - $t0) / 1000.0 / $rounds}] [lsort $db] [lsort $lef]]
+}
+
+lassign [bench_queries %(queries)d {%(views)s}] indexed_ms indexed_db indexed_lef
+foreach lib_ele {LIBRARY MEM_LIBRARY IP_LIBRARY} {
+    array unset ${lib_ele}_BY_LIB
+}
+lassign [bench_queries %(scan_queries)d {%(views)s}] scan_ms scan_db scan_lef
+
+__bench_puts "keys [expr {[array size LIBRARY] + [array size MEM_LIBRARY]}]"
+__bench_puts "indexed $indexed_ms [llength $indexed_db] [llength $indexed_lef]"
+__bench_puts "scan $scan_ms [llength $scan_db] [llength $scan_lef]"
+__bench_puts "same [expr {$indexed_db eq $scan_db && $indexed_lef eq $scan_lef}]"
+'''
+
+
+def create_synthetic_configs(output_dir: Path, lib_count: int, mem_lib_count: int) -> None:
+    """
+    用 LibGenerator 生成合成库的 lib_config.tcl（文件本身不需要存在）
+
+    Args:
+        output_dir: 输出目录，每个库一个 {lib_name}/lib_config.tcl
+        lib_count: STD 库数量（LIBRARY）
+        mem_lib_count: MEM 库数量（MEM_LIBRARY）
+    """
+    adapter = AdapterFactory.create_adapter('samsung', 'ln08lpu_gp')
+    fake_root = output_dir / 'fake_lib_root'
+    generators = [(LibGenerator('LIBRARY'), 'STD', lib_count),
+                  (LibGenerator('MEM_LIBRARY'), 'MEM', mem_lib_count)]
+    for generator, lib_type, count in generators:
+        for i in range(count):
+            lib_name = f"bench{lib_type.lower()}{i:05d}"
+            lib_dir = fake_root / lib_name
+            view_files = {
+                'gds': [lib_dir / 'gds' / f'{lib_name}.gds'],
+                'lef': [lib_dir / 'lef' / f'{lib_name}.lef'],
+                'ccs_lvf': [],
+            }
+            for process in PROCESS_CORNERS:
+                for voltage in VOLTAGES:
+                    for temperature in TEMPERATURES:
+                        corner = f'{process}{voltage}{temperature}'
+                        if lib_type == 'MEM':
+                            # MEM 库的 corner 中需要带 RC 信息
+                            for rc in RC_CORNERS:
+                                view_files['ccs_lvf'].append(
+                                    lib_dir / 'ccs_lvf' / f'{lib_name}_{corner}_sig{rc.lower()}.db')
+                        else:
+                            view_files['ccs_lvf'].append(lib_dir / 'ccs_lvf' / f'{lib_name}_{corner}.db')
+                            view_files['ccs_lvf'].append(lib_dir / 'ccs_lvf' / f'{lib_name}_{corner}.lib.gz')
+            lib_info = LibInfo(lib_name=lib_name, lib_path=lib_dir, lib_type=lib_type,
+                               foundry='samsung', node='ln08lpu_gp', version='1.00A')
+            generator.generate(lib_info, view_files, output_dir / lib_name / 'lib_config.tcl', adapter)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="对比 lib_info 使用反向索引与扫描 array names 的查询耗时")
+    parser.add_argument('--libs', type=int, default=2000, help='合成 STD 库数量')
+    parser.add_argument('--mem-libs', type=int, default=0, help='合成 MEM 库数量')
+    parser.add_argument('--queries', type=int, default=50, help='有索引时的查询轮数')
+    parser.add_argument('--scan-queries', type=int, default=3, help='无索引（扫描）时的查询轮数')
+    parser.add_argument('--tclsh', default=shutil.which('tclsh') or 'tclsh')
+    args = parser.parse_args()
+
+    if not shutil.which(args.tclsh):
+        print(f"[ERROR] 找不到 tclsh: {args.tclsh}", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = Path(tmp) / 'lib_configs'
+        create_synthetic_configs(config_dir, args.libs, args.mem_libs)
+        script = TIMING_SCRIPT % {
+            'get_lib': to_tcl_path(GET_LIB_TCL),
+            'config_dir': to_tcl_path(config_dir),
+            'queries': args.queries,
+            'scan_queries': args.scan_queries,
+            'views': ' '.join(VIEWS),
+        }
+        script_path = Path(tmp) / 'bench_get_lib.tcl'
+        script_path.write_text(script, encoding='utf-8')
+        result = subprocess.run([args.tclsh, str(script_path)], capture_output=True, text=True, check=True)
+
+    stats = {line.split()[0]: line.split()[1:] for line in result.stdout.splitlines() if line.strip()}
+    indexed_ms, scan_ms = float(stats['indexed'][0]), float(stats['scan'][0])
+    print(f"libraries     : {args.libs} STD + {args.mem_libs} MEM ({stats['keys'][0]} keys)")
+    print(f"views         : {len(VIEWS)}")
+    print(f"indexed       : {indexed_ms:10.3f} ms / query round  "
+          f"(db {stats['indexed'][1]}, lef {stats['indexed'][2]}, {args.queries} rounds)")
+    print(f"scan          : {scan_ms:10.3f} ms / query round  "
+          f"(db {stats['scan'][1]}, lef {stats['scan'][2]}, {args.scan_queries} rounds)")
+    print(f"speedup       : {scan_ms / max(indexed_ms, 1e-6):.1f}x")
+    print(f"same results  : {'yes' if stats['same'][0] == '1' else 'NO'}")
+    return 0 if stats['same'][0] == '1' else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+增量库索引性能测试
+
+生成合成的 Samsung STD 库安装目录（与 bench_gen_lib.py 相同），依次测量：
+- 第一次增量刷新（全部库都是新增，等同于完整 gen-lib）
+- 没有任何变化时的刷新（只扫描视图目录签名，不生成）
+- 少量库的视图目录有变化时的刷新（只重新生成这些库）
+
+用法:
+    python edp_center/benchmarks/bench_incremental_index.py
+    python edp_center/benchmarks/bench_incremental_index.py --libs 1000 --changed 10 --jobs 4
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from bench_gen_lib import create_synthetic_lib_tree
+from edp_center.packages.edp_libkit.batch_gen import GenLibOptions
+from edp_center.packages.edp_libkit.incremental_index import IncrementalIndexer
+from edp_center.packages.edp_libkit.library_index import LibraryIndex
+
+
+def _refresh(root: Path, lib_dirs, output_dir: Path, index_path: Path, jobs: int):
+    options = GenLibOptions(foundry='Samsung', node='ln08lpu_gp', lib_type='STD', output_dir=output_dir)
+    indexer = IncrementalIndexer(LibraryIndex(index_path), options)
+    return indexer.refresh(lib_dirs, roots=[root], jobs=jobs)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量增量 gen-lib 刷新的耗时")
+    parser.add_argument('--libs', type=int, default=200, help='合成库数量')
+    parser.add_argument('--versions', type=int, default=2, help='每个库的版本数')
+    parser.add_argument('--corners', type=int, default=12, help='每个版本的 PVT corner 数')
+    parser.add_argument('--changed', type=int, default=5, help='第三次刷新前修改的库数量')
+    parser.add_argument('--jobs', type=int, default=1, help='并行数')
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix='bench_incremental_'))
+    try:
+        root = tmp_dir / 'install'
+        lib_dirs = create_synthetic_lib_tree(root, args.libs, args.versions, args.corners)
+        output_dir, index_path = tmp_dir / 'out', tmp_dir / 'out' / '.libkit_index.db'
+
+        full = _refresh(root, lib_dirs, output_dir, index_path, args.jobs)
+        print(f"first refresh : {full.elapsed:8.3f}s  (added {len(full.added)}, generated {len(full.results)})")
+
+        nochange = _refresh(root, lib_dirs, output_dir, index_path, args.jobs)
+        print(f"no change     : {nochange.elapsed:8.3f}s  (unchanged {len(nochange.unchanged)}, "
+              f"generated {len(nochange.results)}, {full.elapsed / nochange.elapsed:.1f}x faster)")
+
+        changed = lib_dirs[:args.changed]
+        for lib_dir in changed:
+            ccs_dir = sorted(lib_dir.rglob('ccs_lvf'))[-1]
+            (ccs_dir / f'{lib_dir.name}_new_corner.db').touch()
+        partial = _refresh(root, lib_dirs, output_dir, index_path, args.jobs)
+        print(f"{args.changed} changed{'':<{6 - len(str(args.changed))}}: {partial.elapsed:8.3f}s  "
+              f"(changed {len(partial.changed)}, generated {len(partial.results)})")
+
+        ok = (len(full.added) == args.libs and not nochange.results and nochange.unchanged == lib_dirs
+              and sorted(partial.changed) == changed)
+        print(f"check         : {'ok' if ok else 'FAILED'}")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+项目 / 工作路径推断缓存测试
+
+在 branch 目录下重复执行 infer_project_info + infer_work_path_info（与 infer_all_info 相同），
+对比每次清空缓存（冷）和使用缓存（热）的平均耗时，并检查两者的结果一致。
+热推断的平均耗时超过预算时失败。
+
+用法:
+    python edp_center/benchmarks/bench_inference.py
+    python edp_center/benchmarks/bench_inference.py --repeat 500 --budget-us 200
+    python edp_center/benchmarks/bench_inference.py --cwd /path/to/branch
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.main.cli.utils.unified_inference import UnifiedInference
+from edp_center.main.cli.utils.inference import clear_inference_cache, list_projects_direct
+
+EDP_CENTER = project_root / 'edp_center'
+DEFAULT_CWD = project_root / 'Example' / 'WORK_PATH' / 'dongting' / 'P85' / 'block1' / 'user1' / 'main'
+
+
+class _Args:
+    """不指定任何参数（全部从目录推断）"""
+    edp_center = None
+    foundry = node = project = work_path = version = block = user = branch = None
+
+
+def infer(current_dir: Path):
+    inference = UnifiedInference(EDP_CENTER)
+    project_info = inference.infer_project_info(current_dir, _Args)
+    work_path_info = inference.infer_work_path_info(current_dir, _Args, project_info)
+    return project_info, work_path_info
+
+
+def measure(current_dir: Path, repeat: int, cold: bool) -> float:
+    """平均每次推断的耗时（微秒）"""
+    clear_inference_cache()
+    infer(current_dir)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if cold:
+            clear_inference_cache()
+        infer(current_dir)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量项目 / 工作路径推断的缓存效果")
+    parser.add_argument('--repeat', type=int, default=200, help='推断次数')
+    parser.add_argument('--budget-us', type=float, default=500.0, help='热推断平均耗时预算（微秒）')
+    parser.add_argument('--cwd', type=Path, default=DEFAULT_CWD, help='branch 目录')
+    args = parser.parse_args()
+
+    current_dir = args.cwd.resolve()
+    os.chdir(current_dir)
+
+    clear_inference_cache()
+    cold_result = infer(current_dir)
+    warm_result = infer(current_dir)
+    same = cold_result == warm_result and cold_result[0] is not None
+
+    cold_us = measure(current_dir, args.repeat, cold=True)
+    warm_us = measure(current_dir, args.repeat, cold=False)
+
+    config_path = EDP_CENTER / 'config'
+    clear_inference_cache()
+    start = time.perf_counter()
+    projects = list_projects_direct(config_path)
+    tree_cold_us = (time.perf_counter() - start) * 1e6
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        list_projects_direct(config_path)
+    tree_warm_us = (time.perf_counter() - start) / args.repeat * 1e6
+
+    project_info, work_path_info = cold_result
+    print(f"directory       : {current_dir}")
+    print(f"inferred        : {project_info and project_info['foundry']}/{project_info and project_info['node']}/"
+          f"{work_path_info and work_path_info['project']}/{work_path_info and work_path_info['branch']}")
+    print(f"cold inference  : {cold_us:9.1f}us (mean of {args.repeat})")
+    print(f"warm inference  : {warm_us:9.1f}us (mean of {args.repeat}, budget {args.budget_us:g}us)")
+    print(f"speedup         : {cold_us / warm_us:9.1f}x")
+    print(f"config tree     : {tree_cold_us:9.1f}us cold, {tree_warm_us:.1f}us warm ({len(projects)} projects)")
+    print(f"same result     : {same}")
+
+    ok = same and warm_us <= args.budget_us
+    print(f"check           : {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LibraryTypeDetector 性能测试
+
+生成一棵合成的库目录树（默认 20000 个候选目录，STD/IP/MEM/未知各占一部分），分别测量：
+- 逐个特征 exists() 探测并遍历祖先目录的旧检测方式
+- 预编译正则 + 每个目录一次 scandir 的检测（首次）
+- 再次检测（使用缓存）
+
+用法:
+    python edp_center/benchmarks/bench_lib_type_detector.py
+    python edp_center/benchmarks/bench_lib_type_detector.py --dirs 50000
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.lib_type_detector import LibraryTypeDetector
+
+MEM_MARKERS = ['mem_compiler', 'memory', 'SRAM', 'MEM', 'sram']
+
+
+def legacy_detect(lib_path: Path) -> Optional[str]:
+    """旧的检测方式（逐个特征 stat，遍历祖先目录做子串判断）"""
+    if not lib_path.exists() or not lib_path.is_dir():
+        return None
+    if any((lib_path / marker).exists() for marker in ['FE-Common', 'BE-Common']):
+        return 'IP'
+    parent = lib_path.parent
+    if 'IP' in parent.name and (lib_path.name.startswith('v') or lib_path.name.replace('.', '').isdigit()):
+        return 'IP'
+    names = [lib_path.name.lower(), parent.name.lower()] + [a.name.lower() for a in lib_path.parents]
+    if any(marker.lower() in name for name in names for marker in MEM_MARKERS):
+        return 'MEM'
+    if (lib_path.name.startswith('v-logic_') or (lib_path / 'DesignWare_logic_libs').exists()
+            or 'STD_Cell' in str(parent) or any('STD_Cell' in a.name for a in lib_path.parents)):
+        return 'STD'
+    path_str = str(lib_path)
+    if '/IP/' in path_str:
+        return 'IP'
+    if '/STD_Cell/' in path_str:
+        return 'STD'
+    if any(marker in path_str for marker in MEM_MARKERS):
+        return 'MEM'
+    return None
+
+
+def build_tree(root: Path, count: int) -> list:
+    """生成候选目录"""
+    dirs = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            path = root / 'STD_Cell' / f'{i // 400:04d}_install' / f'v-logic_lib{i:06d}'
+        elif kind == 1:
+            path = root / 'IP' / f'ip{i:06d}' / 'v1.00'
+            (path / 'FE-Common').mkdir(parents=True)
+        elif kind == 2:
+            path = root / 'Mem_Compiler' / f'group{i // 400:04d}' / f'sram{i:06d}'
+        else:
+            path = root / 'vendor' / f'group{i // 400:04d}' / f'misc{i:06d}'
+        path.mkdir(parents=True, exist_ok=True)
+        dirs.append(path)
+    return dirs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量库类型检测的耗时")
+    parser.add_argument('--dirs', type=int, default=20000, help='候选目录数量')
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix='bench_lib_type_'))
+    try:
+        dirs = build_tree(tmp_dir, args.dirs)
+
+        start = time.perf_counter()
+        legacy = [legacy_detect(d) for d in dirs]
+        legacy_time = time.perf_counter() - start
+        print(f"legacy exists()  : {legacy_time:8.3f}s  ({args.dirs / legacy_time:.0f} dirs/s)")
+
+        LibraryTypeDetector.clear_cache()
+        start = time.perf_counter()
+        detected = [LibraryTypeDetector.detect_library_type(d) for d in dirs]
+        cold = time.perf_counter() - start
+        print(f"regex + scandir  : {cold:8.3f}s  ({args.dirs / cold:.0f} dirs/s, {legacy_time / cold:.1f}x)")
+
+        start = time.perf_counter()
+        cached = [LibraryTypeDetector.detect_library_type(d) for d in dirs]
+        warm = time.perf_counter() - start
+        print(f"cached (stat)    : {warm * 1000:8.3f}ms")
+
+        ok = detected == legacy and cached == detected
+        print(f"check            : {'ok' if ok else 'FAILED'}")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
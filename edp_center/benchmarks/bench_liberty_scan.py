@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Liberty 流式扫描性能测试
+
+生成合成的 Liberty 文件（库级单位、nom PVT、operating_conditions，每个 cell 带若干 pin，
+每个 pin 带 timing 查找表），分别测量：
+- 只读取（和解压）文件的速度（磁盘/解压基准）
+- liberty_scanner.scan_liberty 提取库级信息和全部 cell 名称的速度
+- 只扫描头部（with_cells=False）的耗时
+
+用法:
+    python edp_center/benchmarks/bench_liberty_scan.py
+    python edp_center/benchmarks/bench_liberty_scan.py --cells 4000 --table-size 15 --gz
+    python edp_center/benchmarks/bench_liberty_scan.py --output /tmp/big.lib --keep   # 只生成合成 Liberty 文件
+"""
+
+import argparse
+import gzip
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.liberty_scanner import scan_liberty, DEFAULT_CHUNK_SIZE
+
+LIBRARY_HEADER = '''/* synthetic liberty generated by bench_liberty_scan.py { not a group } */
+library (%(name)s) {
+  delay_model : table_lookup ;
+  time_unit : "1ns" ;
+  voltage_unit : "1V" ;
+  current_unit : "1uA" ;
+  pulling_resistance_unit : "1kohm" ;
+  leakage_power_unit : "1pW" ;
+  capacitive_load_unit (1, pf) ;
+  nom_process : 1.0 ;
+  nom_voltage : %(voltage)s ;
+  nom_temperature : %(temperature)s ;
+  operating_conditions (%(corner)s) {
+    process : 1.0 ;
+    voltage : %(voltage)s ;
+    temperature : %(temperature)s ;
+    tree_type : balanced_tree ;
+  }
+  default_operating_conditions : %(corner)s ;
+  lu_table_template (delay_template_%(n)dx%(n)d) {
+    variable_1 : input_net_transition ;
+    variable_2 : total_output_net_capacitance ;
+    index_1 ("%(index)s") ;
+    index_2 ("%(index)s") ;
+  }
+'''
+
+
+def write_synthetic_liberty(path: Path, cells: int = 1000, pins: int = 4, table_size: int = 8,
+                            voltage: float = 0.675, temperature: float = -40.0) -> int:
+    """
+    生成合成的 Liberty 文件（以 .gz 结尾时 gzip 压缩）
+
+    Args:
+        path: 输出文件路径
+        cells: cell 数量
+        pins: 每个 cell 的输出 pin 数量（每个 pin 带 4 张 timing 表）
+        table_size: 查找表的维度（table_size × table_size）
+        voltage: nom_voltage
+        temperature: nom_temperature
+
+    Returns:
+        未压缩的字节数
+    """
+    corner = f"ss{str(voltage).replace('.', 'p')}v{int(temperature)}c".replace('-', 'n')
+    index = ', '.join(f'{0.001 * (i + 1):.4f}' for i in range(table_size))
+    row = ', '.join(f'{0.0123 * (i + 1):.6f}' for i in range(table_size))
+    table = ' \\\n'.join([f'          "{row}"'] * table_size)
+    tables = ''.join(
+        f'        {kind} (delay_template_{table_size}x{table_size}) {{\n'
+        f'          index_1 ("{index}") ;\n'
+        f'          index_2 ("{index}") ;\n'
+        f'          values ( \\\n{table} \\\n          ) ;\n'
+        f'        }}\n'
+        for kind in ('cell_rise', 'cell_fall', 'rise_transition', 'fall_transition')
+    )
+
+    opener = gzip.open if path.suffix == '.gz' else open
+    written = 0
+    with opener(path, 'wt', encoding='latin-1') as f:
+        text = LIBRARY_HEADER % {'name': path.name.split('.')[0], 'voltage': voltage, 'temperature': temperature,
+                                 'corner': corner, 'n': table_size, 'index': index}
+        f.write(text)
+        written += len(text)
+        for c in range(cells):
+            parts = [f'  cell (BENCH_CELL_{c:06d}) {{\n    area : 1.234 ;\n'
+                     f'    pin (A) {{\n      direction : input ;\n      capacitance : 0.001 ;\n    }}\n']
+            for p in range(pins):
+                parts.append(f'    pin (Z{p}) {{\n      direction : output ;\n      function : "(!A)" ;\n'
+                             f'      timing () {{\n        related_pin : "A" ;\n{tables}      }}\n    }}\n')
+            parts.append('  }\n')
+            text = ''.join(parts)
+            f.write(text)
+            written += len(text)
+        f.write('}\n')
+        written += 2
+    return written
+
+
+def _read_only(path: Path) -> float:
+    """只读取（和解压）文件，返回耗时"""
+    opener = gzip.open if path.suffix == '.gz' else open
+    start = time.perf_counter()
+    with opener(path, 'rb') as f:
+        while f.read(DEFAULT_CHUNK_SIZE):
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量 Liberty 流式扫描速度")
+    parser.add_argument('--cells', type=int, default=2000, help='cell 数量')
+    parser.add_argument('--pins', type=int, default=4, help='每个 cell 的输出 pin 数量')
+    parser.add_argument('--table-size', type=int, default=8, help='查找表维度')
+    parser.add_argument('--gz', action='store_true', help='生成 .lib.gz')
+    parser.add_argument('--output', type=Path, help='合成文件路径（默认使用临时目录）')
+    parser.add_argument('--keep', action='store_true', help='保留合成文件')
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.output:
+        path = args.output
+    else:
+        tmp_dir = Path(tempfile.mkdtemp(prefix='bench_liberty_'))
+        path = tmp_dir / ('bench.lib.gz' if args.gz else 'bench.lib')
+    try:
+        start = time.perf_counter()
+        size = write_synthetic_liberty(path, args.cells, args.pins, args.table_size)
+        mb = size / 1e6
+        print(f"file          : {path} ({mb:.1f} MB uncompressed, {path.stat().st_size / 1e6:.1f} MB on disk, "
+              f"{time.perf_counter() - start:.1f}s to create)")
+
+        read_time = _read_only(path)
+        start = time.perf_counter()
+        header = scan_liberty(path)
+        scan_time = time.perf_counter() - start
+        start = time.perf_counter()
+        head_only = scan_liberty(path, with_cells=False)
+        head_time = time.perf_counter() - start
+
+        ok = (header.complete and len(header.cells) == args.cells and header.units.get('time_unit') == '1ns'
+              and head_only.nom_voltage == header.nom_voltage)
+        print(f"read only     : {read_time:8.3f}s  {mb / read_time:8.1f} MB/s")
+        print(f"scan          : {scan_time:8.3f}s  {mb / scan_time:8.1f} MB/s  "
+              f"({scan_time / read_time:.2f}x read time)")
+        print(f"header only   : {head_time * 1000:8.3f}ms")
+        print(f"library       : {header.library_name}  nom V={header.nom_voltage} T={header.nom_temperature}  "
+              f"{len(header.cells)} cells  {len(header.operating_conditions)} operating_conditions")
+        print(f"check         : {'ok' if ok else 'FAILED'}")
+        return 0 if ok else 1
+    finally:
+        if args.keep:
+            print(f"kept          : {path}")
+        elif tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LibraryIndex 查询性能测试
+
+生成合成的库索引（默认 100000 个库），分别测量：
+- 批量写入（add_libraries，一个事务）
+- 打开索引（与库数量无关，不加载任何库）
+- 按 foundry/node/lib_type 过滤、带库名通配符过滤、统计数量
+- 库名子串全文搜索（FTS5 trigram）与 LIKE 全表扫描的对比
+
+用法:
+    python edp_center/benchmarks/bench_library_index.py
+    python edp_center/benchmarks/bench_library_index.py --libs 20000 --repeat 20
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.lib_info import LibInfo
+from edp_center.packages.edp_libkit.library_index import LibraryIndex
+
+FOUNDRIES = [('Samsung', 'ln08lpu_gp'), ('Samsung', 'ln04lpp'), ('Samsung', 'ln03gap'),
+             ('TSMC', 'n5'), ('TSMC', 'n3e')]
+LIB_TYPES = ['STD', 'IP', 'MEM']
+VTS = ['hvt', 'lvt', 'svt', 'ulvt']
+
+
+def make_libraries(count: int):
+    """生成合成的 LibInfo 列表"""
+    libs = []
+    for i in range(count):
+        foundry, node = FOUNDRIES[i % len(FOUNDRIES)]
+        lib_type = LIB_TYPES[(i // len(FOUNDRIES)) % len(LIB_TYPES)]
+        prefix = {'STD': 'stdcell', 'IP': 'ip_macro', 'MEM': 'sram_compiler'}[lib_type]
+        name = f'{prefix}_{VTS[i % len(VTS)]}_{i:06d}'
+        libs.append(LibInfo(lib_name=name, lib_path=Path(f'/install/{node}/{name}'), lib_type=lib_type,
+                            version='1.00A', foundry=foundry, node=node))
+    return libs
+
+
+def _timed(func, repeat: int):
+    """执行 repeat 次，返回 (最后一次的结果, 平均耗时毫秒)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量 LibraryIndex 查询速度")
+    parser.add_argument('--libs', type=int, default=100000, help='合成库数量')
+    parser.add_argument('--repeat', type=int, default=10, help='每个查询的重复次数')
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix='bench_library_index_'))
+    try:
+        db_path = tmp_dir / 'index.db'
+        libs = make_libraries(args.libs)
+        start = time.perf_counter()
+        LibraryIndex(db_path).add_libraries(libs)
+        print(f"populate      : {time.perf_counter() - start:8.3f}s  ({args.libs} libraries)")
+
+        index, open_ms = _timed(lambda: LibraryIndex(db_path), args.repeat)
+        print(f"open          : {open_ms:8.3f}ms  (cached LibInfo: {len(index._cache)})")
+
+        queries = [
+            ('filter', lambda: index.search_libraries(foundry='TSMC', node='n3e', lib_type='MEM')),
+            ('filter+glob', lambda: index.search_libraries(foundry='Samsung', lib_name_pattern='stdcell_ulvt_*')),
+            ('count', lambda: index.count_libraries(foundry='Samsung', lib_type='STD')),
+            ('distinct', lambda: index.get_nodes('Samsung')),
+        ]
+        for label, query in queries:
+            result, elapsed = _timed(query, args.repeat)
+            size = result if isinstance(result, int) else len(result)
+            print(f"{label:<14}: {elapsed:8.3f}ms  ({size} results)")
+
+        needle = f'{args.libs // 2:06d}'
+        fts, fts_ms = _timed(lambda: index.search_names(needle), args.repeat)
+        with index._connect() as conn:
+            like, like_ms = _timed(lambda: conn.execute(
+                'SELECT id, lib_name FROM libraries WHERE lib_name LIKE ? ORDER BY lib_name, id',
+                (f'%{needle}%',)).fetchall(), args.repeat)
+        print(f"name (fts)    : {fts_ms:8.3f}ms  ({len(fts)} results)")
+        print(f"name (like)   : {like_ms:8.3f}ms  ({fts_ms and like_ms / fts_ms:.1f}x slower)")
+
+        ok = fts == [tuple(row) for row in like][:len(fts)]
+        print(f"check         : {'ok' if ok else 'FAILED'}")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Package bundle 性能测试
+
+用 tclsh 对比两种方式加载默认 package 的耗时：
+- 逐个 source 每个 package 文件（默认方式）
+- source 一个合并后的 bundle 文件（bundle_packages: 1）
+
+每轮启动一个新的 tclsh 进程，在 Tcl 内部用 clock microseconds 计时，
+排除进程启动本身的开销。收益主要来自减少文件打开次数，
+因此在本地磁盘上差别不大，应在 NFS 上的 edp_center 运行以得到有意义的结果。
+
+用法:
+    python edp_center/benchmarks/bench_package_bundle.py
+    python edp_center/benchmarks/bench_package_bundle.py --synthetic 60 --rounds 20
+    python edp_center/benchmarks/bench_package_bundle.py --project dongting --flow pv_calibre
+"""
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_cmdkit import PackageLoader
+from edp_center.packages.edp_common.path_utils import to_tcl_path
+
+
+def create_synthetic_packages(root: Path, file_count: int, procs_per_file: int = 20) -> Path:
+    """
+    创建一个只有 flow/common/packages/tcl/default 的合成 edp_center
+
+    Args:
+        root: 输出根目录
+        file_count: package 文件数量
+        procs_per_file: 每个文件中的 proc 数量
+
+    Returns:
+        合成 edp_center 路径
+    """
+    edp_center = root / "edp_center"
+    package_dir = edp_center / "flow" / "common" / "packages" / "tcl" / "default"
+    package_dir.mkdir(parents=True)
+    (edp_center / "config").mkdir()
+    for i in range(file_count):
+        lines = [f"# synthetic package {i}"]
+        for j in range(procs_per_file):
+            lines.append(f"proc bench_pkg_{i}_{j} {{args}} {{")
+            lines.append(f"    set result [list {i} {j}]")
+            lines.append("    return $result")
+            lines.append("}")
+        (package_dir / f"pkg_{i:04d}.tcl").write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return edp_center
+
+
+def time_tcl_script(tclsh: str, sources: str, rounds: int) -> list:
+    """
+    在新的 tclsh 进程中计时 source 语句，返回每轮耗时（毫秒）
+    """
+    script = (
+        "set __edp_t0 [clock microseconds]\n"
+        f"{sources}"
+        "puts [expr {([clock microseconds] - $__edp_t0) / 1000.0}]\n"
+    )
+    with tempfile.NamedTemporaryFile('w', suffix='.tcl', delete=False, encoding='utf-8') as f:
+        f.write(script)
+        script_path = f.name
+    try:
+        timings = []
+        for _ in range(rounds):
+            result = subprocess.run([tclsh, script_path], capture_output=True, text=True, check=True)
+            timings.append(float(result.stdout.strip().splitlines()[-1]))
+        return timings
+    finally:
+        Path(script_path).unlink()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="对比 package bundle 与逐个 source 的加载耗时")
+    parser.add_argument('--edp-center', default=str(project_root / 'edp_center'),
+                        help='edp_center 路径（默认：当前仓库）')
+    parser.add_argument('--foundry', default='SAMSUNG')
+    parser.add_argument('--node', default='S8')
+    parser.add_argument('--project', default='dongting')
+    parser.add_argument('--flow', default='pnr_innovus')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='使用 N 个合成 package 文件代替真实的 edp_center')
+    parser.add_argument('--rounds', type=int, default=10, help='每种方式运行的轮数')
+    parser.add_argument('--tclsh', default=shutil.which('tclsh') or 'tclsh')
+    args = parser.parse_args()
+
+    if not shutil.which(args.tclsh):
+        print(f"[ERROR] 找不到 tclsh: {args.tclsh}", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        edp_center = args.edp_center
+        foundry, node, project, flow = args.foundry, args.node, args.project, args.flow
+        if args.synthetic:
+            edp_center = create_synthetic_packages(tmp_path, args.synthetic)
+            foundry, node, project, flow = 'BENCH', 'N0', None, None
+
+        loader = PackageLoader(edp_center)
+        individual = loader.generate_default_sources(foundry=foundry, node=node, project=project, flow_name=flow)
+        bundled = loader.generate_default_sources(foundry=foundry, node=node, project=project, flow_name=flow,
+                                                  bundle_dir=tmp_path / 'bundle')
+        file_count = sum(1 for line in individual.splitlines() if line.startswith('source '))
+        if file_count == 0:
+            print("[ERROR] 没有找到任何 package 文件", file=sys.stderr)
+            return 1
+
+        individual_ms = time_tcl_script(args.tclsh, individual, args.rounds)
+        bundled_ms = time_tcl_script(args.tclsh, bundled, args.rounds)
+
+        print(f"package files : {file_count}")
+        print(f"bundle        : {to_tcl_path(next((tmp_path / 'bundle').iterdir()))}")
+        for label, timings in (('individual', individual_ms), ('bundle', bundled_ms)):
+            print(f"{label:<14}: median {statistics.median(timings):8.3f} ms  "
+                  f"min {min(timings):8.3f} ms  max {max(timings):8.3f} ms  ({len(timings)} rounds)")
+        speedup = statistics.median(individual_ms) / max(statistics.median(bundled_ms), 1e-6)
+        print(f"speedup       : {speedup:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行历史追加性能测试
+
+在已有 N 条记录（默认 2000）的 branch 目录中再追加 100 条，分别测量：
+- 旧方式：读取整个 .run_info YAML、追加一条、写回整个文件
+- RunHistory.append（只追加一行）
+以及 4 个进程同时追加时是否丢失记录。
+
+用法:
+    python edp_center/benchmarks/bench_run_history.py
+    python edp_center/benchmarks/bench_run_history.py --runs 20000
+"""
+
+import argparse
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.main.cli.utils.run_history import RunHistory
+
+
+def make_run(i: int) -> dict:
+    return {
+        'timestamp': f'2025-01-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}',
+        'flow': 'pnr_innovus',
+        'step': f'step{i % 20}',
+        'hooks': {'step': ['step.pre']},
+        'status': 'success' if i % 7 else 'failed',
+        'duration': 100.0 + i,
+        'resources': {'cpu_used': 8, 'peak_memory': 16000, 'queue': 'normal'},
+    }
+
+
+def legacy_append(run_info_file: Path, run: dict):
+    """旧的 update_run_info：读取、追加、整体写回"""
+    runs = []
+    if run_info_file.exists():
+        with open(run_info_file, 'r', encoding='utf-8') as f:
+            runs = (yaml.safe_load(f) or {}).get('runs', [])
+    runs.append(run)
+    with open(run_info_file, 'w', encoding='utf-8') as f:
+        yaml.dump({'runs': runs}, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+
+
+def append_worker(branch_dir: str, worker: int, count: int):
+    history = RunHistory(Path(branch_dir))
+    for i in range(count):
+        history.append(make_run(worker * 100000 + i))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量运行历史追加的耗时")
+    parser.add_argument('--runs', type=int, default=2000, help='已有的记录数')
+    parser.add_argument('--appends', type=int, default=100, help='追加的记录数')
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix='bench_run_history_'))
+    try:
+        legacy_dir = tmp_dir / 'legacy'
+        legacy_dir.mkdir()
+        run_info_file = legacy_dir / '.run_info'
+        with open(run_info_file, 'w', encoding='utf-8') as f:
+            yaml.dump({'runs': [make_run(i) for i in range(args.runs)]}, f, sort_keys=False)
+
+        legacy_count = min(args.appends, 3)
+        start = time.perf_counter()
+        for i in range(legacy_count):
+            legacy_append(run_info_file, make_run(args.runs + i))
+        legacy_time = (time.perf_counter() - start) / legacy_count
+        print(f"yaml rewrite    : {legacy_time * 1000:9.3f}ms/append")
+
+        new_dir = tmp_dir / 'new'
+        new_dir.mkdir()
+        shutil.copy(run_info_file, new_dir / '.run_info')
+        history = RunHistory(new_dir)
+        start = time.perf_counter()
+        history.migrate()
+        migrate_time = time.perf_counter() - start
+        print(f"migrate         : {migrate_time * 1000:9.3f}ms (one time)")
+
+        start = time.perf_counter()
+        for i in range(args.appends):
+            history.append(make_run(args.runs + i))
+        append_time = (time.perf_counter() - start) / args.appends
+        print(f"jsonl append    : {append_time * 1000:9.3f}ms/append  ({legacy_time / append_time:.0f}x)")
+
+        start = time.perf_counter()
+        runs = history.load()
+        load_time = time.perf_counter() - start
+        history.append(make_run(0))
+        start = time.perf_counter()
+        history.load()
+        reload_time = time.perf_counter() - start
+        print(f"load            : {load_time * 1000:9.3f}ms  (after one more append {reload_time * 1000:.3f}ms)")
+
+        concurrent_dir = tmp_dir / 'concurrent'
+        concurrent_dir.mkdir()
+        ctx = multiprocessing.get_context('spawn')
+        workers = [ctx.Process(target=append_worker, args=(str(concurrent_dir), w, args.appends)) for w in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+        concurrent_runs = RunHistory(concurrent_dir).load()
+        print(f"4 processes     : {len(concurrent_runs)} / {4 * args.appends} records")
+
+        ok = (len(runs) == args.runs + legacy_count + args.appends
+              and len(concurrent_runs) == 4 * args.appends)
+        print(f"check           : {'ok' if ok else 'FAILED'}")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行统计性能测试
+
+生成一个有 N 条记录（默认 100000）的运行历史，分别测量：
+- 完整计算：读取所有记录后逐条统计（总体 + 按步骤）
+- 第一次汇总（生成 .run_history.stats.json）
+- 新进程的 edp -stats：读取持久化汇总，只汇总新追加的 1 条记录，再查询总体、按步骤和趋势
+
+用法:
+    python edp_center/benchmarks/bench_run_stats.py
+    python edp_center/benchmarks/bench_run_stats.py --runs 300000 --steps 60
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.main.cli.utils.run_history import RunHistory, RUN_HISTORY_FILE_NAME
+from edp_center.main.cli.utils.run_stats import RunStats
+from edp_center.main.cli.commands.stats_handler import calculate_stats, calculate_step_stats
+
+
+def make_run(i: int, steps: int) -> dict:
+    return {
+        'timestamp': f'2025-{1 + i // 40000 % 12:02d}-{1 + i // 1440 % 28:02d} {i // 60 % 24:02d}:{i % 60:02d}:00',
+        'flow': f'flow{i % steps // 10}',
+        'step': f'step{i % steps}',
+        'hooks': {'step': []},
+        'status': 'success' if i % 7 else 'failed',
+        'duration': float(60 + (i * 37) % 7200),
+        'resources': {'cpu_used': 1 + i % 16, 'peak_memory': 1024 + (i * 13) % 65536, 'queue': 'normal'},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="测量运行统计查询的耗时")
+    parser.add_argument('--runs', type=int, default=100000, help='运行记录数')
+    parser.add_argument('--steps', type=int, default=40, help='步骤数')
+    args = parser.parse_args()
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix='bench_run_stats_'))
+    try:
+        with open(tmp_dir / RUN_HISTORY_FILE_NAME, 'w', encoding='utf-8') as f:
+            for i in range(args.runs):
+                f.write(json.dumps(make_run(i, args.steps)) + '\n')
+
+        start = time.perf_counter()
+        runs = RunHistory(tmp_dir).load()
+        full_overall = calculate_stats(runs)
+        calculate_step_stats(runs)
+        full_time = time.perf_counter() - start
+        print(f"full recompute  : {full_time * 1000:9.1f}ms  ({args.runs} runs)")
+
+        start = time.perf_counter()
+        RunStats(tmp_dir).refresh()
+        build_time = time.perf_counter() - start
+        print(f"first rollup    : {build_time * 1000:9.1f}ms  (one time)")
+
+        RunHistory(tmp_dir).append(make_run(args.runs, args.steps))
+        start = time.perf_counter()
+        stats = RunStats(tmp_dir).refresh()
+        overall = stats.overall_stats()
+        stats.step_stats()
+        stats.trend()
+        stats.overall_stats('step1')
+        query_time = time.perf_counter() - start
+        print(f"edp -stats      : {query_time * 1000:9.1f}ms  ({full_time / query_time:.0f}x)")
+
+        ok = (overall['total_runs'] == args.runs + 1
+              and overall['success_count'] >= full_overall['success_count']
+              and query_time < 1.0)
+        print(f"check           : {'ok' if ok else 'FAILED'}")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+# PYTHON_ARGCOMPLETE_OK
 
 """
 EDP Main Entry Point
@@ -13,9 +14,14 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-# Import and run CLI
-from edp_center.main.cli import main
+# Read-only queries go to the edp daemon when it is running (before importing the CLI)
+from edp_center.main.cli.daemon.client import run_via_daemon
 
 if __name__ == '__main__':
-    sys.exit(main())
+    exit_code = run_via_daemon(sys.argv[1:])
+    if exit_code is None:
+        # Import and run CLI
+        from edp_center.main.cli import main
+        exit_code = main()
+    sys.exit(exit_code)
 
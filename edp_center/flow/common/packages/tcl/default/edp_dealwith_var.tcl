@@ -11,6 +11,45 @@ namespace eval ::edp_var {
     array set descriptions {}
 }
 
+# ==================== Array Write Dispatcher ====================
+# Protected/constrained array elements share ONE write trace per array.
+# The dispatcher looks up "arrayName(index)" in the protected/allowed_values
+# tables, so the cost of a write does not grow with the number of rules
+# defined on the same array (one trace per element would run N callbacks).
+
+# Install the dispatcher on an array (no-op if it is already installed)
+# Usage: ::edp_var::ensure_array_trace <array name in caller's frame> <array name used in rules>
+proc ::edp_var::ensure_array_trace {localName arrayName} {
+    upvar 1 $localName array
+    set cmd [list ::edp_var::array_write_trace $arrayName]
+    if {[lsearch -exact [trace info variable array] [list write $cmd]] == -1} {
+        trace add variable array write $cmd
+    }
+}
+
+# Dispatcher callback: protection is checked first (the protected value is
+# restored), then constraints. The trace stays installed when rules are
+# removed; writes to elements without rules only cost two lookups.
+proc ::edp_var::array_write_trace {arrayName name1 name2 op} {
+    set fullName "${arrayName}($name2)"
+    if {[info exists ::edp_var::protected($fullName)]} {
+        upvar 1 $name1 array
+        set newValue $array($name2)
+        set array($name2) $::edp_var::protected($fullName)
+        puts "Warning: Array element '$fullName' is protected. Attempt to change value from '$::edp_var::protected($fullName)' to '$newValue' was blocked."
+        return
+    }
+    if {[info exists ::edp_var::allowed_values($fullName)]} {
+        upvar 1 $name1 array
+        set newValue $array($name2)
+        if {[lsearch -exact $::edp_var::allowed_values($fullName) $newValue] == -1} {
+            # Restore previous value (before the invalid assignment)
+            # Note: We can't easily get the previous value here, so we'll use error
+            error "ERROR: Cannot set '$fullName' to '$newValue'. Allowed values are: $::edp_var::allowed_values($fullName)"
+        }
+    }
+}
+
 # ==================== Unified Variable Configuration ====================
 # Configure variable with protection, constraint, and description in one call
 # Usage: edp_configure_var varName -protect value -constraint "val1 val2" -description "desc"
@@ -80,6 +119,10 @@ proc edp_configure_vars {varConfigDict} {
 # ==================== Protect System ====================
 # Protect variable from modification
 proc edp_protect_var {varName value} {
+    # Drop an existing rule first, so setting the initial value (or re-protecting
+    # with a new value) is not blocked by a trace that is already installed
+    unset -nocomplain ::edp_var::protected($varName)
+    
     # Check if it's an array element
     if {[regexp {^(.+)\((.+)\)$} $varName -> arrayName elementPath]} {
         upvar 1 $arrayName array
@@ -90,8 +133,8 @@ proc edp_protect_var {varName value} {
         # Store protected value
         set ::edp_var::protected($varName) $value
         
-        # Add write trace
-        trace add variable array write [list ::edp_var::protect_array_trace $varName $elementPath]
+        # Add the shared array write trace (once per array)
+        ::edp_var::ensure_array_trace array $arrayName
     } else {
         upvar 1 $varName var
         
@@ -102,7 +145,10 @@ proc edp_protect_var {varName value} {
         set ::edp_var::protected($varName) $value
         
         # Add write trace
-        trace add variable var write [list ::edp_var::protect_trace $varName]
+        set cmd [list ::edp_var::protect_trace $varName]
+        if {[lsearch -exact [trace info variable var] [list write $cmd]] == -1} {
+            trace add variable var write $cmd
+        }
     }
 }
 
@@ -114,12 +160,8 @@ proc edp_unprotect_var {varName} {
         return
     }
     
-    if {[regexp {^(.+)\((.+)\)$} $varName -> arrayName elementPath]} {
-        upvar 1 $arrayName array
-        if {[info exists array]} {
-            trace remove variable array write [list ::edp_var::protect_array_trace $varName $elementPath]
-        }
-    } else {
+    # Array elements share the dispatcher trace, removing the table entry is enough
+    if {![regexp {^(.+)\((.+)\)$} $varName]} {
         upvar 1 $varName var
         if {[info exists var]} {
             trace remove variable var write [list ::edp_var::protect_trace $varName]
@@ -132,21 +174,15 @@ proc edp_unprotect_var {varName} {
 
 # Protection trace callbacks
 proc ::edp_var::protect_trace {varName name1 name2 op} {
+    if {![info exists ::edp_var::protected($varName)]} {
+        return
+    }
     upvar 1 $name1 var
     set newValue $var
     set var $::edp_var::protected($varName)
     puts "Warning: Variable '$varName' is protected. Attempt to change value from '$::edp_var::protected($varName)' to '$newValue' was blocked."
 }
 
-proc ::edp_var::protect_array_trace {fullName elementPath name1 name2 op} {
-    upvar 1 $name1 array
-    if {$name2 eq $elementPath} {
-        set newValue $array($elementPath)
-        set array($elementPath) $::edp_var::protected($fullName)
-        puts "Warning: Array element '$fullName' is protected. Attempt to change value from '$::edp_var::protected($fullName)' to '$newValue' was blocked."
-    }
-}
-
 # List protected variables
 proc edp_list_protected_vars {} {
     if {[array size ::edp_var::protected] == 0} {
@@ -173,18 +209,20 @@ proc edp_constraint_var {varName allowed_list} {
     # Check if it's an array element
     if {[regexp {^(.+)\((.+)\)$} $varName -> arrayName elementPath]} {
         upvar 1 $arrayName array
-        set ::edp_var::allowed_values($varName) $values
         
         # Initialize array element with first allowed value if it doesn't exist
         if {![info exists array($elementPath)]} {
+            set ::edp_var::allowed_values($varName) $values
             set array($elementPath) [lindex $values 0]
         } elseif {[lsearch -exact $values $array($elementPath)] == -1} {
             set old_value $array($elementPath)
             error "ERROR: Value '$old_value' of variable '$varName' is not in constraint list. Allowed values are: $values"
+        } else {
+            set ::edp_var::allowed_values($varName) $values
         }
         
-        # Add write trace
-        trace add variable array write [list ::edp_var::constraint_array_trace $varName $elementPath]
+        # Add the shared array write trace (once per array)
+        ::edp_var::ensure_array_trace array $arrayName
     } else {
         upvar 1 $varName var
         set ::edp_var::allowed_values($varName) $values
@@ -198,7 +236,10 @@ proc edp_constraint_var {varName allowed_list} {
         }
         
         # Add write trace
-        trace add variable var write [list ::edp_var::constraint_trace $varName]
+        set cmd [list ::edp_var::constraint_trace $varName]
+        if {[lsearch -exact [trace info variable var] [list write $cmd]] == -1} {
+            trace add variable var write $cmd
+        }
     }
 }
 
@@ -210,12 +251,8 @@ proc edp_unconstraint_var {varName} {
         return
     }
     
-    if {[regexp {^(.+)\((.+)\)$} $varName -> arrayName elementPath]} {
-        upvar 1 $arrayName array
-        if {[info exists array]} {
-            trace remove variable array write [list ::edp_var::constraint_array_trace $varName $elementPath]
-        }
-    } else {
+    # Array elements share the dispatcher trace, removing the table entry is enough
+    if {![regexp {^(.+)\((.+)\)$} $varName]} {
         upvar 1 $varName var
         if {[info exists var]} {
             trace remove variable var write [list ::edp_var::constraint_trace $varName]
@@ -227,6 +264,9 @@ proc edp_unconstraint_var {varName} {
 
 # Constraint trace callback
 proc ::edp_var::constraint_trace {varName name1 name2 op} {
+    if {![info exists ::edp_var::allowed_values($varName)]} {
+        return
+    }
     upvar 1 $name1 var
     set newValue $var
     
@@ -237,20 +277,6 @@ proc ::edp_var::constraint_trace {varName name1 name2 op} {
     }
 }
 
-# Array constraint trace callback
-proc ::edp_var::constraint_array_trace {fullName elementPath name1 name2 op} {
-    upvar 1 $name1 array
-    if {$name2 eq $elementPath} {
-        set newValue $array($elementPath)
-        
-        if {[lsearch -exact $::edp_var::allowed_values($fullName) $newValue] == -1} {
-            # Restore previous value (before the invalid assignment)
-            # Note: We can't easily get the previous value here, so we'll use error
-            error "ERROR: Cannot set '$fullName' to '$newValue'. Allowed values are: $::edp_var::allowed_values($fullName)"
-        }
-    }
-}
-
 # List constrained variables
 proc edp_list_constrained_vars {} {
     if {[array size ::edp_var::allowed_values] == 0} {
@@ -4,6 +4,10 @@ package provide lib_info 1.0
 # Create namespace
 namespace eval ::lib_info {
 	namespace export get_physical_info get_lib_info get_sub_spef get_sub_netlist
+	# {array size, index usable} per library array, see ::lib_info::index_usable
+	variable index_state
+	# {array size, dict suffix -> keys} per library array, see ::lib_info::index_suffixes
+	variable index_suffix_state
 }
 
 #############################################################################################################################
@@ -99,6 +103,83 @@ proc ::lib_info::get_sub_netlist {release_dir sub_blk_list {DIR_KEY "NETLIST"} {
 }
 
 
+#############################################################################################################################
+# Description: lib_config.tcl generated by edp_libkit also contains a reverse index array for each library array:
+#		<ARRAY>_BY_LIB(lib_name)              - all keys of one library
+#		The procs below group the keys by library name and by the rest of the key after "lib_name,"
+#		(view, rc, corner, file_type), then apply the same regexps as the scan to the few distinct library names
+#		and key suffixes instead of every key. A plain word pattern (\w+) cannot match across the ",",
+#		so a key matches the scan only if its library name or its suffix matches; the candidates are a superset
+#		of the scan result and the per-key filters of the scan still run on them, both paths return the same keys.
+#		When the index is missing or incomplete (old lib_config.tcl, hand-written entries), fall back to the scan.
+#############################################################################################################################
+
+proc ::lib_info::index_usable {lib_ele} {
+    # Index is complete when BY_LIB covers every key of the array, check once per array size
+    variable index_state
+    upvar #0 $lib_ele lib_array ${lib_ele}_BY_LIB by_lib
+    if {![array exists by_lib]} {return 0}
+    set size [array size lib_array]
+    if {[info exists index_state($lib_ele)] && [lindex $index_state($lib_ele) 0] == $size} {
+        return [lindex $index_state($lib_ele) 1]
+    }
+    set count 0
+    foreach lib_name [array names by_lib] {
+        incr count [llength $by_lib($lib_name)]
+    }
+    set usable [expr {$count == $size}]
+    set index_state($lib_ele) [list $size $usable]
+    return $usable
+}
+
+proc ::lib_info::index_suffixes {lib_ele} {
+    # Return a dict {suffix keys} built from <ARRAY>_BY_LIB, suffix is the key without "lib_name,"
+    # (the whole key when it does not start with the library name), cached per array size
+    variable index_suffix_state
+    upvar #0 $lib_ele lib_array ${lib_ele}_BY_LIB by_lib
+    set size [array size lib_array]
+    if {[info exists index_suffix_state($lib_ele)] && [lindex $index_suffix_state($lib_ele) 0] == $size} {
+        return [lindex $index_suffix_state($lib_ele) 1]
+    }
+    set suffixes [dict create]
+    foreach lib_name [array names by_lib] {
+        set prefix "$lib_name,"
+        set prefix_len [string length $prefix]
+        foreach key $by_lib($lib_name) {
+            if {[string equal -length $prefix_len $prefix $key]} {
+                dict lappend suffixes [string range $key $prefix_len end] $key
+            } else {
+                dict lappend suffixes $key $key
+            }
+        }
+    }
+    set index_suffix_state($lib_ele) [list $size $suffixes]
+    return $suffixes
+}
+
+proc ::lib_info::index_candidates {lib_ele lib_patterns suffix_filter} {
+    # Candidate keys: all keys of the libraries whose name matches any of lib_patterns,
+    # plus the keys whose suffix passes suffix_filter (a command prefix, called with the suffix appended)
+    upvar #0 ${lib_ele}_BY_LIB by_lib
+    set keys [list]
+    foreach lib_name [array names by_lib] {
+        if {[::lib_info::check_match_or $lib_name $lib_patterns]} {lappend keys {*}$by_lib($lib_name)}
+    }
+    dict for {suffix suffix_keys} [::lib_info::index_suffixes $lib_ele] {
+        if {[{*}$suffix_filter $suffix]} {lappend keys {*}$suffix_keys}
+    }
+    return [lsort -unique $keys]
+}
+
+proc ::lib_info::all_words {pattern_list} {
+    # Index lookup is exact only for plain word patterns (they match as substrings and never span a ",")
+    foreach pattern $pattern_list {
+        if {![regexp {^\w+$} $pattern]} {return 0}
+    }
+    return 1
+}
+
+
 #############################################################################################################################
 # Description: this proc help to get PHYSICAL LIB information from the previews setup
 # Arguments: 
@@ -122,10 +203,16 @@ proc ::lib_info::get_physical_info {sub_key} {
             continue
         }
         # Iterate through the array and match keys with sub_key
+        # With the index, candidates are the keys whose library name or suffix matches sub_key, otherwise all keys
         set count 0
-        foreach lib_sub_key [array names lib_array] {
+        if {[::lib_info::all_words [list $sub_key]] && [::lib_info::index_usable $lib_ele]} {
+            set lib_sub_keys [::lib_info::index_candidates $lib_ele [list $sub_key] [list regexp $sub_key]]
+        } else {
+            set lib_sub_keys [array names lib_array]
+        }
+        foreach lib_sub_key $lib_sub_keys {
             if {[regexp $sub_key $lib_sub_key]} {
-                set result_list [concat $result_list $lib_array($lib_sub_key)]
+                lappend result_list {*}$lib_array($lib_sub_key)
                 set count [expr $count + 1]
             }
         }
@@ -159,6 +246,16 @@ proc ::lib_info::check_match_or {input_str input_list} {
     return 0
 }
 
+proc ::lib_info::check_match_or_swapped {input_list input_str} {
+    # check_match_or with the string last, usable as a command prefix
+    return [::lib_info::check_match_or $input_str $input_list]
+}
+
+proc ::lib_info::check_match_key {sub_key pvt_list input_str} {
+    # The sub_key and pvt/pvvt part of the LIBRARY/MEM_LIBRARY match in get_lib_info
+    return [expr {[regexp $sub_key $input_str] && [::lib_info::check_match_or $input_str $pvt_list]}]
+}
+
 proc ::lib_info::check_match_and {input_str input_list} {
     # This proc works for if all ele can match in input_str, return 1
     foreach ele $input_list {
@@ -192,6 +289,10 @@ proc ::lib_info::get_lib_info {sub_key view_list {extral_lib "cdk12m3mx2"}} {
     set ip_db ""
     set mem_db ""
     set std_db ""
+    # Index lookup works only when sub_key is a plain word (lib/db)
+    foreach lib_ele $array_key {
+        set use_index($lib_ele) [expr {[::lib_info::all_words [list $sub_key]] && [array exists ::$lib_ele] && [::lib_info::index_usable $lib_ele]}]
+    }
     foreach view $view_list {
         set combine_voltage [list]
         lassign [split $view "_"] sdc_mode process_corner voltage temperature rc_corner
@@ -206,6 +307,8 @@ proc ::lib_info::get_lib_info {sub_key view_list {extral_lib "cdk12m3mx2"}} {
         }
         # This list contains pvt pvv1t pvv2t ...
         set pvt_match_list [linsert $pvvt_list 0 $pvt]
+        set final_pvvt_list_ip_mode [list]
+        foreach ele $pvt_match_list {lappend final_pvvt_list_ip_mode "$ele,$sub_key\$"}
 
         foreach lib_ele $array_key {
             # Use upvar to access the array by name
@@ -213,21 +316,31 @@ proc ::lib_info::get_lib_info {sub_key view_list {extral_lib "cdk12m3mx2"}} {
             if {![array exists lib_array]} {
                 continue
             }
-            # Iterate through the array and match keys with sub_key
-            foreach lib_sub_key [array names lib_array] {
+            # Iterate through the candidate keys and match keys with sub_key
+            # With the index, candidates are the keys whose library name matches sub_key or pvt/pvvt,
+            # or whose suffix passes the same sub_key and pvt/pvvt regexps as the scan below, otherwise all keys
+            if {$use_index($lib_ele) && [::lib_info::all_words $pvt_match_list]} {
+                if {$lib_ele eq "IP_LIBRARY"} {
+                    set suffix_filter [list ::lib_info::check_match_or_swapped $final_pvvt_list_ip_mode]
+                } else {
+                    set suffix_filter [list ::lib_info::check_match_key $sub_key $pvt_match_list]
+                }
+                set lib_sub_keys [::lib_info::index_candidates $lib_ele [linsert $pvt_match_list 0 $sub_key] $suffix_filter]
+            } else {
+                set lib_sub_keys [array names lib_array]
+            }
+            foreach lib_sub_key $lib_sub_keys {
                 if {$lib_ele eq "MEM_LIBRARY"} {
                     # MEM_LIBRARY Match sub_key(lib/db) and pvt/pvvt and RC info
                     # need pvt sub_key sig_rc_corner match
                     set pvt_match_or [::lib_info::check_match_or $lib_sub_key $pvt_match_list] 
                     if {[regexp $sub_key $lib_sub_key] && $pvt_match_or && [regexp $sig_rc_corner $lib_sub_key] } {
-                        set lib_db [concat $lib_db $lib_array($lib_sub_key)]
-                        set mem_db [concat $mem_db $lib_array($lib_sub_key)]
+                        lappend lib_db {*}$lib_array($lib_sub_key)
+                        lappend mem_db {*}$lib_array($lib_sub_key)
                     }
                 } elseif {$lib_ele eq "IP_LIBRARY"} {
                     # IP_LIBRARY has specific logic
                     # need pvt sub_key sig_rc_corner func match
-                    set final_pvvt_list_ip_mode [list]
-                    foreach ele $pvt_match_list {lappend final_pvvt_list_ip_mode "$ele,$sub_key\$"}
                     if {[::lib_info::check_match_or $lib_sub_key $final_pvvt_list_ip_mode]} {
                         # rc(rcall|sigrcmax) shall map and func(all|FUNC) shall map
                         set match_rc_corner [expr {[regexp ",rcall" $lib_sub_key] || [regexp $sig_rc_corner $lib_sub_key]}]
@@ -235,8 +348,8 @@ proc ::lib_info::get_lib_info {sub_key view_list {extral_lib "cdk12m3mx2"}} {
                         if {$match_rc_corner && $match_sdc_mode} {
                             # For gpio extral requirement, gpio shall not contain keys in $extral_baned_list
                             if {[::lib_info::check_match_or $lib_sub_key $extral_baned_list] == 0} {
-                                set lib_db [concat $lib_db $lib_array($lib_sub_key)]
-                                set ip_db [concat $ip_db $lib_array($lib_sub_key)]
+                                lappend lib_db {*}$lib_array($lib_sub_key)
+                                lappend ip_db {*}$lib_array($lib_sub_key)
                             }
                         }
                     }
@@ -256,13 +369,13 @@ proc ::lib_info::get_lib_info {sub_key view_list {extral_lib "cdk12m3mx2"}} {
                         if {$match_found == 1} {
                             #Case1: cdk version for Samsung K's clock buffer, if exist, the sig_rc_corner must match
                             if {[regexp $sig_rc_corner $lib_sub_key]} {
-                                set lib_db [concat $lib_db $lib_array($lib_sub_key)]
-                                set std_db [concat $std_db $lib_array($lib_sub_key)]
+                                lappend lib_db {*}$lib_array($lib_sub_key)
+                                lappend std_db {*}$lib_array($lib_sub_key)
                             }
                         } else {
                             #Case2: if normal std cell, auto in
-                            set lib_db [concat $lib_db $lib_array($lib_sub_key)]
-                            set std_db [concat $std_db $lib_array($lib_sub_key)]
+                            lappend lib_db {*}$lib_array($lib_sub_key)
+                            lappend std_db {*}$lib_array($lib_sub_key)
                         }
                     }
                 }
@@ -252,6 +252,9 @@ proc edp_run {args} {
         if {$result} {
             edp_run_show_info
         }
+    } elseif {$cmd == "-checkpoint"} {
+        # Show checkpoint manifest (sub_step status and durations) of a checkpointed run
+        edp_sub_steps::checkpoint_report [lindex $args 1]
     } elseif {$cmd == "-help"} {
         puts "========== EDP Sub Steps Manager Help =========="
         puts "  edp_run -init <var_name>     Initialize with variable (e.g., edp(execution_plan,place))"
@@ -269,6 +272,7 @@ proc edp_run {args} {
         puts "  edp_run -to <step_ref> -force  Execute to step with force"
         puts "  edp_run -all                  Execute all steps"
         puts "  edp_run -all -skip <step_ref1> ...  Execute all with skip"
+        puts "  edp_run -checkpoint ?dir?         Show checkpoint manifest (status and duration of each sub_step)"
         puts ""
         puts "  Note: <step_ref> can be either:"
         puts "    - An index number (e.g., 0, 1, 2)"
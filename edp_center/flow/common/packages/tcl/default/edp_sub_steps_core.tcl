@@ -332,5 +332,245 @@ namespace eval edp_sub_steps {
         }
         return [lindex $sub_steps_list $next_idx]
     }
-}
 
+    
+    # ==================== Checkpoint / Resume ====================
+    # run_checkpointed runs a whole execution plan in a normal (non-debug) tool session.
+    # After each sub_step it writes a manifest (status and duration of every sub_step);
+    # every N completed sub_steps it records a checkpoint, optionally saving the design
+    # with save_proc. A rerun with the same plan restores the last checkpoint with
+    # restore_proc and continues from the sub_step after it.
+    
+    proc checkpoint_manifest_file {dir} {
+        return [file join $dir manifest.tcl]
+    }
+    
+    # Read manifest as dict, return empty dict if missing or broken
+    proc read_checkpoint_manifest {dir} {
+        set manifest_file [checkpoint_manifest_file $dir]
+        if {![file exists $manifest_file]} {
+            return [dict create]
+        }
+        if {[catch {
+            set fh [open $manifest_file r]
+            set manifest [read $fh]
+            close $fh
+            dict size $manifest
+        } err]} {
+            puts "WARNING: Ignore broken checkpoint manifest $manifest_file: $err"
+            return [dict create]
+        }
+        return $manifest
+    }
+    
+    # Write manifest atomically (temp file + rename), one key per line
+    proc write_checkpoint_manifest {dir manifest} {
+        file mkdir $dir
+        set manifest_file [checkpoint_manifest_file $dir]
+        set tmp_file "$manifest_file.[pid].tmp"
+        set fh [open $tmp_file w]
+        dict for {key value} $manifest {
+            if {$key eq "steps"} {
+                puts $fh "steps \{"
+                foreach step_info $value {
+                    puts $fh "    [list $step_info]"
+                }
+                puts $fh "\}"
+            } else {
+                puts $fh [list $key $value]
+            }
+        }
+        close $fh
+        file rename -force $tmp_file $manifest_file
+    }
+    
+    # Return index of the sub_step to start from, restore the design if needed
+    proc resume_from_checkpoint {dir manifest plan restore_proc} {
+        variable step_status
+        variable current_index
+        
+        if {[dict size $manifest] == 0} {
+            return 0
+        }
+        if {[dict get $manifest plan] ne $plan} {
+            puts "INFO: Sub_steps changed since last checkpoint, starting from the beginning"
+            return 0
+        }
+        if {[dict get $manifest complete]} {
+            puts "INFO: Last run completed all sub_steps, starting from the beginning"
+            return 0
+        }
+        set last_checkpoint [dict get $manifest last_checkpoint]
+        if {$last_checkpoint < 0} {
+            return 0
+        }
+        
+        # Completed sub_steps can only be skipped when the saved design is restored into this session
+        set design [dict get $manifest design]
+        if {$design eq "" || [llength [glob -nocomplain "$design*"]] == 0} {
+            puts "INFO: No design saved at checkpoint \[$last_checkpoint\], starting from the beginning"
+            return 0
+        }
+        if {$restore_proc eq ""} {
+            puts "INFO: No restore_proc to load checkpoint design $design, starting from the beginning"
+            return 0
+        }
+        puts "========== Restoring checkpoint: $design =========="
+        uplevel #0 [list $restore_proc $design]
+        for {set i 0} {$i <= $last_checkpoint} {incr i} {
+            set status [dict get [lindex [dict get $manifest steps] $i] status]
+            dict set step_status $i [expr {$status eq "skipped" ? "skipped" : "success"}]
+        }
+        set current_index $last_checkpoint
+        puts "========== Resuming after checkpoint \[$last_checkpoint\] [lindex $plan $last_checkpoint] =========="
+        return [expr {$last_checkpoint + 1}]
+    }
+    
+    # Usage: edp_sub_steps::run_checkpointed plan ?-dir dir? ?-every N? ?-save_proc proc? ?-restore_proc proc? ?-resume 0|1?
+    #   -dir          checkpoint directory (default: .edp_checkpoint under current directory, i.e. the step's run dir)
+    #   -every        record a checkpoint after every N completed sub_steps (default 1), the last sub_step is always a checkpoint
+    #   -save_proc    called as "save_proc <path>" at each checkpoint to save the design, <path> is the save file/dir prefix
+    #   -restore_proc called as "restore_proc <path>" before resuming
+    # A checkpoint is only recorded when save_proc wrote the design; without save_proc/restore_proc
+    # a rerun starts from the first sub_step (the manifest still records status and durations).
+    #   -resume       0 to ignore existing manifest and run from the beginning
+    # Sub_steps marked by edp(skip,<proc>) are skipped. Errors of sub_steps are raised again after the manifest is written.
+    proc run_checkpointed {plan args} {
+        variable sub_steps_list
+        variable step_status
+        variable current_index
+        
+        set options [dict create -dir [file join [pwd] .edp_checkpoint] -every 1 -save_proc "" -restore_proc "" -resume 1]
+        foreach {option value} $args {
+            if {![dict exists $options $option]} {
+                error "run_checkpointed: unknown option $option, should be one of [dict keys $options]"
+            }
+            dict set options $option $value
+        }
+        set dir [file normalize [dict get $options -dir]]
+        set every [dict get $options -every]
+        set save_proc [dict get $options -save_proc]
+        set restore_proc [dict get $options -restore_proc]
+        if {![string is integer -strict $every] || $every < 1} {
+            error "run_checkpointed: -every must be a positive integer, got '$every'"
+        }
+        
+        init $plan
+        set current_index -1
+        set count [llength $sub_steps_list]
+        
+        set manifest [dict create]
+        if {[dict get $options -resume]} {
+            set manifest [read_checkpoint_manifest $dir]
+        }
+        set start_idx [resume_from_checkpoint $dir $manifest $plan $restore_proc]
+        
+        # Keep durations of the sub_steps restored from checkpoint
+        set steps {}
+        for {set i 0} {$i < $count} {incr i} {
+            if {$i < $start_idx} {
+                lappend steps [lindex [dict get $manifest steps] $i]
+            } else {
+                lappend steps [dict create index $i name [lindex $sub_steps_list $i] status pending duration_ms 0]
+            }
+        }
+        set last_checkpoint [expr {$start_idx - 1}]
+        set design [expr {$start_idx > 0 ? [dict get $manifest design] : ""}]
+        set new_manifest [dict create plan $plan every $every last_checkpoint $last_checkpoint \
+            design $design complete 0 updated [clock seconds] steps $steps]
+        write_checkpoint_manifest $dir $new_manifest
+        
+        set since_checkpoint 0
+        for {set i $start_idx} {$i < $count} {incr i} {
+            set proc_name [lindex $sub_steps_list $i]
+            set step_info [lindex $steps $i]
+            
+            if {[info exists ::edp(skip,$proc_name)]} {
+                puts "Skipping: \[$i\] $proc_name"
+                dict set step_status $i "skipped"
+                dict set step_info status skipped
+            } else {
+                puts "========== Executing: $proc_name =========="
+                set start_ms [clock milliseconds]
+                set code [catch {uplevel #0 [list $proc_name]} result result_options]
+                dict set step_info duration_ms [expr {[clock milliseconds] - $start_ms}]
+                if {$code == 1} {
+                    dict set step_status $i "failed"
+                    dict set step_info status failed
+                    set current_index $i
+                    dict set new_manifest steps [lreplace [dict get $new_manifest steps] $i $i $step_info]
+                    dict set new_manifest updated [clock seconds]
+                    write_checkpoint_manifest $dir $new_manifest
+                    puts "========== FAILED: $proc_name =========="
+                    puts "Resume from checkpoint \[[dict get $new_manifest last_checkpoint]\] on next run, manifest: [checkpoint_manifest_file $dir]"
+                    return -options $result_options $result
+                }
+                dict set step_status $i "success"
+                dict set step_info status success
+                puts "========== SUCCESS: $proc_name ([dict get $step_info duration_ms] ms) =========="
+            }
+            set current_index $i
+            dict set new_manifest steps [lreplace [dict get $new_manifest steps] $i $i $step_info]
+            
+            incr since_checkpoint
+            if {$since_checkpoint >= $every || $i == $count - 1} {
+                set since_checkpoint 0
+                if {$save_proc ne "" && $i < $count - 1} {
+                    # Save to a new path, then drop the previous checkpoint design
+                    set old_design [dict get $new_manifest design]
+                    set design [file join $dir "design_$i"]
+                    puts "========== Saving checkpoint: $design =========="
+                    uplevel #0 [list $save_proc $design]
+                    if {[llength [glob -nocomplain "$design*"]] > 0} {
+                        dict set new_manifest design $design
+                        dict set new_manifest last_checkpoint $i
+                        if {$old_design ne "" && $old_design ne $design} {
+                            file delete -force {*}[glob -nocomplain "$old_design*"]
+                        }
+                    } else {
+                        puts "WARNING: $save_proc did not write $design*, keeping checkpoint \[[dict get $new_manifest last_checkpoint]\]"
+                    }
+                } elseif {$i == $count - 1} {
+                    dict set new_manifest last_checkpoint $i
+                }
+            }
+            if {$i == $count - 1} {
+                # All sub_steps done, the checkpoint design is no longer needed
+                set old_design [dict get $new_manifest design]
+                if {$old_design ne ""} {
+                    file delete -force {*}[glob -nocomplain "$old_design*"]
+                    dict set new_manifest design ""
+                }
+                dict set new_manifest complete 1
+            }
+            dict set new_manifest updated [clock seconds]
+            write_checkpoint_manifest $dir $new_manifest
+        }
+        return 1
+    }
+    
+    # Print durations recorded in checkpoint manifest, to tune -every
+    proc checkpoint_report {{dir ""}} {
+        if {$dir eq ""} {
+            set dir [file join [pwd] .edp_checkpoint]
+        }
+        set manifest [read_checkpoint_manifest $dir]
+        if {[dict size $manifest] == 0} {
+            puts "No checkpoint manifest in $dir"
+            return
+        }
+        set last_checkpoint [dict get $manifest last_checkpoint]
+        puts "========== Sub Steps Checkpoint =========="
+        foreach step_info [dict get $manifest steps] {
+            set idx [dict get $step_info index]
+            set mark [expr {$idx == $last_checkpoint ? "  <-- checkpoint" : ""}]
+            puts [format "  \[%d\] %-40s %-8s %10.1f s%s" $idx [dict get $step_info name] \
+                [dict get $step_info status] [expr {[dict get $step_info duration_ms] / 1000.0}] $mark]
+        }
+        puts "=========================================="
+        puts "Checkpoint every: [dict get $manifest every] sub_step(s)"
+        puts "Design: [expr {[dict get $manifest design] eq "" ? "not saved" : [dict get $manifest design]}]"
+        puts "Complete: [expr {[dict get $manifest complete] ? "yes" : "no"}]"
+        puts "=========================================="
+    }
+}
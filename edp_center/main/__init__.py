@@ -14,8 +14,14 @@ EDP Main - 统一的工作流管理模块
 7. edp_webkit - Web服务
 """
 
-from .workflow_manager import WorkflowManager
-
 __version__ = '0.1.0'
 __all__ = ['WorkflowManager']
 
+
+def __getattr__(name):
+    # 延迟导入：只使用 CLI 参数解析（edp -h、参数补全）时不加载七个核心模块
+    if name == 'WorkflowManager':
+        from .workflow_manager import WorkflowManager
+        return WorkflowManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
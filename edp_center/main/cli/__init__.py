@@ -7,7 +7,13 @@ CLI 模块
 包含所有命令行接口相关的代码
 """
 
-from .cli import main
-
 __all__ = ['main']
 
+
+def __getattr__(name):
+    # 延迟导入：bin/edp.py 只使用 daemon 客户端时不导入 CLI
+    if name == 'main':
+        from .cli import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
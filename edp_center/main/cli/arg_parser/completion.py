@@ -13,6 +13,17 @@ except ImportError:
     ARGCOMPLETE_AVAILABLE = False
 
 
+def autocomplete(parser):
+    """
+    由 shell 补全调用时（register-python-argcomplete edp）输出补全结果并退出，否则什么也不做
+    
+    Args:
+        parser: 已经添加了所有参数的 ArgumentParser 实例
+    """
+    if ARGCOMPLETE_AVAILABLE:
+        argcomplete.autocomplete(parser)
+
+
 def setup_completions(parser, info_arg=None):
     """
     设置参数补全函数
@@ -25,7 +36,7 @@ def setup_completions(parser, info_arg=None):
         return
     
     # 导入补全辅助函数
-    from ...completion import (
+    from ..completion import (
         complete_projects, complete_foundries, complete_nodes,
         complete_flows, complete_flow_steps, complete_blocks,
         complete_users, complete_branches, complete_versions
@@ -114,7 +125,9 @@ def setup_completions(parser, info_arg=None):
     # 为 branch 参数添加补全
     if branch_arg:
         def complete_branch(prefix, parsed_args, **kwargs):
-            results = complete_branches()
+            block = getattr(parsed_args, 'block', None) if parsed_args else None
+            user = getattr(parsed_args, 'user', None) if parsed_args else None
+            results = complete_branches(block=block, user=user)
             return [r for r in results if r.startswith(prefix)]
         branch_arg.completer = complete_branch
     
@@ -179,7 +192,7 @@ def setup_completions(parser, info_arg=None):
                 foundry=foundry,
                 node=node
             )
-            return [f"{flow}.{s}" for s in steps if s.startswith(step_prefix)]
+            return [s for s in steps if s.startswith(prefix)]
         else:
             project = getattr(parsed_args, 'project', None) if parsed_args else None
             foundry = getattr(parsed_args, 'foundry', None) if parsed_args else None
@@ -201,7 +214,7 @@ def setup_completions(parser, info_arg=None):
                 foundry=foundry,
                 node=node
             )
-            return [f"{flow}.{s}" for s in steps if s.startswith(step_prefix)]
+            return [s for s in steps if s.startswith(prefix)]
         else:
             project = getattr(parsed_args, 'project', None) if parsed_args else None
             foundry = getattr(parsed_args, 'foundry', None) if parsed_args else None
@@ -223,7 +236,7 @@ def setup_completions(parser, info_arg=None):
                 foundry=foundry,
                 node=node
             )
-            return [f"{flow}.{s}" for s in steps if s.startswith(step_prefix)]
+            return [s for s in steps if s.startswith(prefix)]
         else:
             project = getattr(parsed_args, 'project', None) if parsed_args else None
             foundry = getattr(parsed_args, 'foundry', None) if parsed_args else None
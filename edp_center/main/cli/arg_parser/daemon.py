@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Daemon 相关参数定义模块
+"""
+
+import argparse
+
+
+def add_daemon_args(parser: argparse.ArgumentParser) -> None:
+    """添加 -daemon 相关参数"""
+    parser.add_argument(
+        '-daemon', '--daemon',
+        dest='daemon',
+        choices=['start', 'stop', 'status', 'restart'],
+        default=None,
+        help='管理常驻的 edp daemon（启动后 -info/-stats/-history 由 daemon 执行，EDP_DAEMON=0 禁用）'
+    )
+    parser.add_argument(
+        '--daemon-idle-timeout',
+        dest='daemon_idle_timeout',
+        type=float,
+        default=1800.0,
+        help='daemon 空闲多少秒后自动退出（默认: 1800，<= 0 表示不退出）'
+    )
@@ -72,6 +72,29 @@ def add_info_args(parser: argparse.ArgumentParser):
         type=str,
         help='导出性能报告到文件（用于 -stats 选项，例如: --export report.html）'
     )
+    parser.add_argument(
+        '--recommend',
+        action='store_true',
+        help='根据实测的峰值内存和 CPU 使用推荐 cpu_num 和 memory（用于 -stats 选项）'
+    )
+    parser.add_argument(
+        '--percentile',
+        type=float,
+        default=95.0,
+        help='推荐使用的分位数（用于 --recommend，默认: 95）'
+    )
+    parser.add_argument(
+        '--headroom',
+        type=float,
+        default=20.0,
+        help='推荐值在分位数基础上增加的余量百分比（用于 --recommend，默认: 20）'
+    )
+    parser.add_argument(
+        '--overlay',
+        type=str,
+        metavar='FILE',
+        help='将推荐的 cpu_num 和 memory 写入 YAML 配置覆盖文件（用于 --recommend）'
+    )
     
     # ==================== -rollback 选项 ====================
     parser.add_argument(
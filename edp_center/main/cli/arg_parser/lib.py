@@ -51,6 +51,22 @@ def add_lib_args(parser: argparse.ArgumentParser) -> None:
         type=str,
         help='lib_config.tcl中的数组变量名（默认：LIBRARY）'
     )
+    parser.add_argument(
+        '--lib-jobs',
+        type=int,
+        default=1,
+        help='并行处理的库数量（worker 进程数，默认：1 串行；0 表示使用 CPU 核数）'
+    )
+    parser.add_argument(
+        '--lib-incremental',
+        action='store_true',
+        help='增量处理：只重新生成视图目录有变化（或新增）的库，并报告新增/变化/移除的库'
+    )
+    parser.add_argument(
+        '--lib-index-db',
+        type=str,
+        help='增量处理使用的库索引文件（默认：{lib-output-dir}/.libkit_index.db）'
+    )
     parser.add_argument(
         '--lib-gui',
         action='store_true',
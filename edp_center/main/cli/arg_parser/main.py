@@ -17,6 +17,7 @@ from .tutorial import add_tutorial_args
 from .lib import add_lib_args
 from .run import add_run_args
 from .info import add_info_args
+from .daemon import add_daemon_args
 from .completion import setup_completions
 
 
@@ -96,6 +97,11 @@ def create_parser() -> argparse.ArgumentParser:
   edp -lib --foundry Samsung --node ln08lpu_gp -lpath /path/to/lib --lib-type STD --lib-all-versions -odir /path/to/output
   edp -lib --lib-gui  # 启动图形界面
   
+  # 常驻 daemon（启动后 -info/-stats/-history 由 daemon 执行，响应更快）
+  edp -daemon start
+  edp -daemon status
+  edp -daemon stop
+  
 注意：
   - 初始化相关命令请使用 edp_init
   - 所有功能已统一到 edp 命令，包括信息查询（-info, -history, -stats, -rollback, -validate）
@@ -115,6 +121,7 @@ def create_parser() -> argparse.ArgumentParser:
     add_lib_args(parser)
     add_run_args(parser)
     info_arg = add_info_args(parser)  # 信息查询相关参数
+    add_daemon_args(parser)
     add_common_args(parser)
     
     # 设置补全函数
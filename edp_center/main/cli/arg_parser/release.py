@@ -51,6 +51,12 @@ def add_release_args(parser: argparse.ArgumentParser) -> None:
         action='store_true',
         help='覆盖模式：如果版本已存在且包含相同的步骤，则覆盖（需要配合 --append 使用）'
     )
+    parser.add_argument(
+        '--no-verify',
+        dest='release_no_verify',
+        action='store_true',
+        help='复制后不校验文件内容（默认：用 blake2b 校验，并在每个步骤目录写入 checksums.blake2b）'
+    )
     parser.add_argument(
         '--include-all',
         action='store_true',
@@ -9,8 +9,11 @@ EDP Main CLI - 统一的命令行接口
 
 import sys
 
+from .arg_parser.completion import autocomplete
 from .arg_parser.main import create_parser
+from .command_registry import get_handler
 from .command_router import route_subcommands
+from .daemon.client import run_via_daemon
 
 # 初始化日志系统
 from edp_center.packages.edp_common.logging_config import setup_logging
@@ -19,6 +22,11 @@ _logging_initialized = False
 
 def main():
     """运行相关命令的主入口"""
+    # 只读查询命令优先交给常驻的 edp daemon 执行（daemon 未运行时在本进程执行）
+    exit_code = run_via_daemon(sys.argv[1:])
+    if exit_code is not None:
+        return exit_code
+    
     # 初始化日志系统
     global _logging_initialized
     if not _logging_initialized:
@@ -28,6 +36,9 @@ def main():
     # 创建参数解析器
     parser = create_parser()
     
+    # TAB 补全（只从补全缓存读取，见 completion/cache.py）
+    autocomplete(parser)
+    
     # 解析参数
     args = parser.parse_args()
     
@@ -38,7 +49,6 @@ def main():
     # 处理 -branch 命令
     if args.branch:
         manager = create_manager(edp_center_path)
-        from .commands import handle_create_branch
         
         # 创建一个临时的 args 对象来传递参数
         class BranchArgs:
@@ -54,19 +64,21 @@ def main():
                 self.from_branch_step = args.from_branch_step
         
         branch_args = BranchArgs(args)
-        return handle_create_branch(manager, branch_args)
+        return get_handler('branch')(manager, branch_args)
+    
+    # 处理 -daemon 命令
+    if args.daemon:
+        return get_handler('daemon')(args)
     
     # 处理 -release 命令
     if args.release:
         manager = create_manager(edp_center_path)
-        from .commands.release import handle_release_cmd
-        return handle_release_cmd(manager, args)
+        return get_handler('release')(manager, args)
     
     # 处理 -tutorial 命令（快捷方式，等同于 edp_info -tutorial）
     if args.tutorial:
         try:
-            from .commands.tutorial_handler import handle_tutorial_cmd
-            return handle_tutorial_cmd(edp_center_path, args)
+            return get_handler('tutorial')(edp_center_path, args)
         except ImportError as e:
             print(f"[ERROR] 无法导入教程处理器: {e}", file=sys.stderr)
             return 1
@@ -79,15 +91,13 @@ def main():
     # 处理 -run 命令
     if args.run:
         manager = create_manager(edp_center_path)
-        from .commands import handle_run_cmd
-        return handle_run_cmd(manager, args)
+        return get_handler('run')(manager, args)
     
     # 处理 -view 命令
     if args.view:
         try:
             # 导入 view 处理器
-            from .commands.view_handler import handle_view_cmd
-            return handle_view_cmd(args)
+            return get_handler('view')(args)
         except ImportError as e:
             print(f"[ERROR] 导入 View 模块失败: {e}", file=sys.stderr)
             import traceback
@@ -212,7 +222,6 @@ def main():
     # 处理 -graph 命令
     if args.graph:
         manager = create_manager(edp_center_path)
-        from .commands.graph_handler import handle_graph_cmd
         
         # 创建一个临时的 args 对象来传递参数
         class GraphArgs:
@@ -235,13 +244,12 @@ def main():
                 self.user = getattr(args, 'user', None)
         
         graph_args = GraphArgs(args)
-        return handle_graph_cmd(manager, graph_args)
+        return get_handler('graph')(manager, graph_args)
     
     # 处理 -lib 命令
     if args.lib:
         try:
-            from .commands.lib_handler import handle_lib_cmd
-            return handle_lib_cmd(args)
+            return get_handler('lib')(args)
         except ImportError as e:
             print(f"[ERROR] 导入 Lib 模块失败: {e}", file=sys.stderr)
             import traceback
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+命令注册表模块
+命令名 -> "模块:函数"，处理模块只在命令真正执行时才导入。
+
+edp -h、参数补全等轻量命令只需要参数解析器，不应为此导入 WorkflowManager、
+PyYAML、flowkit、cmdkit、configkit 等；新增命令时在 COMMAND_HANDLERS 中登记即可。
+"""
+
+import importlib
+import threading
+from typing import Callable, Dict
+
+# 模块路径相对于 edp_center.main.cli
+COMMAND_HANDLERS: Dict[str, str] = {
+    'init': '.commands.init:handle_init_project',
+    'branch': '.commands.branch:handle_create_branch',
+    'run': '.commands.cmd_handlers:handle_run_cmd',
+    'info': '.commands.cmd_handlers:handle_info_cmd',
+    'create_project': '.commands.create_project:handle_create_project',
+    'tutorial': '.commands.tutorial_handler:handle_tutorial_cmd',
+    'release': '.commands.release:handle_release_cmd',
+    'graph': '.commands.graph_handler:handle_graph_cmd',
+    'history': '.commands.history_handler:handle_history_cmd',
+    'stats': '.commands.stats_handler:handle_stats_cmd',
+    'rollback': '.commands.rollback_handler:handle_rollback_cmd',
+    'lib': '.commands.lib_handler:handle_lib_cmd',
+    'view': '.commands.view_handler:handle_view_cmd',
+    'daemon': '.commands.daemon_handler:handle_daemon_cmd',
+}
+
+_resolved: Dict[str, Callable] = {}
+_lock = threading.Lock()
+
+
+def register_command(name: str, target: str):
+    """
+    登记命令处理函数
+
+    Args:
+        name: 命令名
+        target: "模块:函数"（模块可以是相对于 edp_center.main.cli 的相对路径）
+    """
+    with _lock:
+        COMMAND_HANDLERS[name] = target
+        _resolved.pop(name, None)
+
+
+def get_handler(name: str) -> Callable:
+    """
+    获取命令处理函数（第一次调用时导入处理模块）
+
+    Raises:
+        KeyError: 命令未登记
+        ImportError: 处理模块导入失败
+    """
+    handler = _resolved.get(name)
+    if handler is not None:
+        return handler
+    module_name, _, func_name = COMMAND_HANDLERS[name].partition(':')
+    module = importlib.import_module(module_name, __package__)
+    handler = getattr(module, func_name)
+    with _lock:
+        _resolved[name] = handler
+    return handler
+
+
+def find_handler_target(func_name: str) -> str:
+    """
+    按处理函数名查找其所在模块（用于 commands 包的延迟导出）
+
+    Returns:
+        模块路径（相对于 edp_center.main.cli）
+
+    Raises:
+        KeyError: 没有登记该函数
+    """
+    for target in COMMAND_HANDLERS.values():
+        module_name, _, name = target.partition(':')
+        if name == func_name:
+            return module_name
+    raise KeyError(func_name)
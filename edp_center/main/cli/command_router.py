@@ -8,14 +8,12 @@
 
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from ..workflow_manager import WorkflowManager
-from .commands import (
-    handle_init_project,
-    handle_run_cmd, handle_info_cmd,
-    handle_create_project
-)
-from .commands.graph_handler import handle_graph_cmd
+from .command_registry import get_handler
+
+if TYPE_CHECKING:
+    from ..workflow_manager import WorkflowManager
 
 
 def find_edp_center_path(args) -> Path:
@@ -49,7 +47,7 @@ def find_edp_center_path(args) -> Path:
     return Path(edp_center_path).resolve()
 
 
-def create_manager(edp_center_path: Path) -> WorkflowManager:
+def create_manager(edp_center_path: Path) -> 'WorkflowManager':
     """
     创建 WorkflowManager 实例
     
@@ -62,6 +60,7 @@ def create_manager(edp_center_path: Path) -> WorkflowManager:
     Raises:
         SystemExit: 如果创建失败
     """
+    from ..workflow_manager import WorkflowManager
     try:
         return WorkflowManager(edp_center_path)
     except Exception as e:
@@ -115,13 +114,12 @@ def route_shortcut_commands(args) -> int:
     
     # 处理 -create_project 命令（不需要 WorkflowManager）
     if has_create_project:
-        return handle_create_project(edp_center_path, args)
+        return get_handler('create_project')(edp_center_path, args)
     
     # 处理 -tutorial 命令（不需要 WorkflowManager）
     if has_tutorial:
         try:
-            from .commands.tutorial_handler import handle_tutorial_cmd
-            return handle_tutorial_cmd(edp_center_path, args)
+            return get_handler('tutorial')(edp_center_path, args)
         except ImportError as e:
             print(f"错误: 无法导入教程处理器: {e}", file=sys.stderr)
             return 1
@@ -130,7 +128,7 @@ def route_shortcut_commands(args) -> int:
     manager = create_manager(edp_center_path)
     
     if has_init:
-        return handle_init_project(manager, args)
+        return get_handler('init')(manager, args)
     elif has_branch:
         # 创建一个临时的 args 对象来传递参数
         class BranchArgs:
@@ -146,15 +144,13 @@ def route_shortcut_commands(args) -> int:
                 self.from_branch_step = getattr(args, 'from_branch_step', None)
         
         branch_args = BranchArgs(args)
-        from .commands import handle_create_branch
-        return handle_create_branch(manager, branch_args)
+        return get_handler('branch')(manager, branch_args)
     elif has_run:
         # 处理 -run 命令
-        return handle_run_cmd(manager, args)
+        return get_handler('run')(manager, args)
     elif has_release:
         # 处理 -release 命令
-        from .commands.release import handle_release_cmd
-        return handle_release_cmd(manager, args)
+        return get_handler('release')(manager, args)
     elif has_graph:
         # 处理 -graph 命令
         # 创建一个临时的 args 对象来传递参数
@@ -178,21 +174,18 @@ def route_shortcut_commands(args) -> int:
                 self.user = getattr(args, 'user', None)
         
         graph_args = GraphArgs(args)
-        return handle_graph_cmd(manager, graph_args)
+        return get_handler('graph')(manager, graph_args)
     else:
         # 处理信息查询相关命令
         has_info_flag = any(arg in ('-i', '-info', '--info') for arg in sys.argv)
         if has_info_flag:
-            return handle_info_cmd(manager, args)
+            return get_handler('info')(manager, args)
         elif has_history:
-            from .commands.history_handler import handle_history_cmd
-            return handle_history_cmd(manager, args)
+            return get_handler('history')(manager, args)
         elif has_stats:
-            from .commands.stats_handler import handle_stats_cmd
-            return handle_stats_cmd(manager, args)
+            return get_handler('stats')(manager, args)
         elif has_rollback:
-            from .commands.rollback_handler import handle_rollback_cmd
-            return handle_rollback_cmd(manager, args)
+            return get_handler('rollback')(manager, args)
         elif has_validate:
             # TODO: 实现结果验证功能
             print("⚠️  结果验证功能正在开发中，敬请期待", file=sys.stderr)
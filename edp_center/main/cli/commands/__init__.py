@@ -4,15 +4,12 @@
 """
 命令处理模块
 包含所有命令的处理函数
+
+处理函数按 command_registry 中的登记延迟导入：
+`from .commands import handle_run_cmd` 只会导入 cmd_handlers，而不会导入其他命令的模块。
 """
 
-from .init import handle_init_project
-from .branch import handle_create_branch
-from .cmd_handlers import handle_run_cmd, handle_info_cmd
-from .create_project import handle_create_project
-from .tutorial_handler import handle_tutorial_cmd
-from .release import handle_release_cmd
-from .graph_handler import handle_graph_cmd
+import importlib
 
 __all__ = [
     'handle_init_project',
@@ -25,3 +22,16 @@ __all__ = [
     'handle_graph_cmd',
 ]
 
+
+def __getattr__(name):
+    if name in __all__:
+        from ..command_registry import find_handler_target
+        module = importlib.import_module(find_handler_target(name), __package__.rpartition('.')[0])
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
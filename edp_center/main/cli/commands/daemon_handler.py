@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Daemon 命令处理模块
+处理 -daemon start | stop | status | restart
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from ..daemon.protocol import socket_path
+from ..daemon.server import daemon_status, start_daemon, stop_daemon
+
+
+def _print_status(status: dict) -> None:
+    started = datetime.fromtimestamp(status['started']).strftime('%Y-%m-%d %H:%M:%S')
+    print(f"[INFO] edp daemon 正在运行 (pid {status['pid']}, 启动于 {started}, "
+          f"已处理 {status['requests']} 个请求)", file=sys.stderr)
+    print(f"[INFO] socket: {socket_path()}", file=sys.stderr)
+
+
+def _wait_stopped(timeout: float = 10.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if daemon_status() is None:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def handle_daemon_cmd(args) -> int:
+    """
+    处理 -daemon 命令
+
+    Args:
+        args: 命令行参数对象
+
+    Returns:
+        退出代码
+    """
+    action = args.daemon
+
+    if action == 'status':
+        status = daemon_status()
+        if status is None:
+            print("[INFO] edp daemon 未运行", file=sys.stderr)
+            return 1
+        _print_status(status)
+        return 0
+
+    if action in ('stop', 'restart'):
+        if stop_daemon():
+            if not _wait_stopped():
+                print("[ERROR] edp daemon 没有在规定时间内退出", file=sys.stderr)
+                return 1
+            print("[OK] edp daemon 已停止", file=sys.stderr)
+        elif action == 'stop':
+            print("[INFO] edp daemon 未运行", file=sys.stderr)
+        if action == 'stop':
+            return 0
+
+    try:
+        status = start_daemon(idle_timeout=args.daemon_idle_timeout)
+    except (OSError, PermissionError) as e:
+        print(f"[ERROR] 启动 edp daemon 失败: {e}", file=sys.stderr)
+        return 1
+    if status is None:
+        print(f"[ERROR] edp daemon 启动超时，请查看 {socket_path().parent / 'daemon.log'}", file=sys.stderr)
+        return 1
+    _print_status(status)
+    return 0
@@ -7,18 +7,18 @@
 """
 
 import sys
-import yaml
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional, Any, Tuple
 
 from ..utils import infer_all_info, build_branch_dir
+from ..utils.run_history import RunHistory
 from edp_center.packages.edp_common.error_handler import handle_cli_error
 
 
 def load_run_history(branch_dir: Path) -> List[Dict[str, Any]]:
     """
-    从 .run_info 文件加载运行历史
+    从 branch 目录的运行历史（.run_history.jsonl，以及尚未导入的旧 .run_info）加载运行记录
     
     Args:
         branch_dir: branch 目录路径
@@ -26,23 +26,20 @@ def load_run_history(branch_dir: Path) -> List[Dict[str, Any]]:
     Returns:
         运行历史记录列表（按时间倒序）
     """
-    run_info_file = branch_dir / '.run_info'
-    
-    if not run_info_file.exists():
+    history = RunHistory(branch_dir)
+    if not history.exists():
         return []
     
     try:
-        with open(run_info_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
-            runs = data.get('runs', [])
-            
-            # 按时间戳正序排序（最旧的在最上面，最新的在最下面，方便滚动到底部查看最新记录）
-            runs.sort(key=lambda x: x.get('timestamp', ''), reverse=False)
-            
-            return runs
+        runs = history.load()
     except Exception as e:
-        print(f"[WARN] 读取 .run_info 文件失败: {e}", file=sys.stderr)
+        print(f"[WARN] 读取运行历史失败: {e}", file=sys.stderr)
         return []
+    
+    # 按时间戳正序排序（最旧的在最上面，最新的在最下面，方便滚动到底部查看最新记录）
+    runs.sort(key=lambda x: x.get('timestamp', ''), reverse=False)
+    
+    return runs
 
 
 def filter_history(
@@ -67,55 +64,49 @@ def filter_history(
     Returns:
         过滤后的运行历史记录列表
     """
-    filtered = runs
-    
-    # 步骤过滤
+    # 先准备所有过滤条件，再对记录做一次遍历
+    flow_name = step_name = None
     if step_filter:
-        # 支持 flow.step 或 step 格式
+        # 支持 flow.step 或 step 格式（只给 step 时只匹配 step 名称）
         if '.' in step_filter:
             flow_name, step_name = step_filter.split('.', 1)
-            filtered = [
-                run for run in filtered
-                if run.get('flow') == flow_name and run.get('step') == step_name
-            ]
         else:
-            # 只匹配 step 名称
-            filtered = [
-                run for run in filtered
-                if run.get('step') == step_filter
-            ]
+            step_name = step_filter
     
-    # 状态过滤
     if status_filter:
         status_filter = status_filter.lower()
-        filtered = [
-            run for run in filtered
-            if run.get('status', '').lower() == status_filter
-        ]
     
-    # 日期过滤
+    from_dt = to_dt = None
     if from_date:
         try:
             from_dt = datetime.strptime(from_date, '%Y-%m-%d')
-            filtered = [
-                run for run in filtered
-                if _parse_timestamp(run.get('timestamp', '')) >= from_dt
-            ]
         except ValueError:
             print(f"[WARN] 无效的起始日期格式: {from_date}，忽略此过滤条件", file=sys.stderr)
     
     if to_date:
         try:
-            to_dt = datetime.strptime(to_date, '%Y-%m-%d')
             # 设置为当天的 23:59:59
-            to_dt = to_dt.replace(hour=23, minute=59, second=59)
-            filtered = [
-                run for run in filtered
-                if _parse_timestamp(run.get('timestamp', '')) <= to_dt
-            ]
+            to_dt = datetime.strptime(to_date, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
         except ValueError:
             print(f"[WARN] 无效的结束日期格式: {to_date}，忽略此过滤条件", file=sys.stderr)
     
+    if flow_name is None and step_name is None and not status_filter and from_dt is None and to_dt is None:
+        filtered = runs
+    else:
+        filtered = []
+        for run in runs:
+            if flow_name is not None and run.get('flow') != flow_name:
+                continue
+            if step_name is not None and run.get('step') != step_name:
+                continue
+            if status_filter and (run.get('status') or '').lower() != status_filter:
+                continue
+            if from_dt is not None or to_dt is not None:
+                run_dt = _parse_timestamp(run.get('timestamp', ''))
+                if (from_dt is not None and run_dt < from_dt) or (to_dt is not None and run_dt > to_dt):
+                    continue
+            filtered.append(run)
+    
     # 限制数量
     if limit and limit > 0:
         filtered = filtered[:limit]
@@ -206,6 +197,10 @@ def format_resource_info(run: Dict[str, Any]) -> str:
     if cpu_used is not None:
         parts.append(f"CPU: {cpu_used}")
     
+    cpu_time = resources.get('cpu_time')
+    if cpu_time is not None:
+        parts.append(f"CPU time: {cpu_time / 3600:.1f}h" if cpu_time >= 3600 else f"CPU time: {cpu_time:.0f}s")
+    
     # 内存信息
     peak_memory = resources.get('peak_memory')
     if peak_memory is not None:
@@ -340,7 +335,7 @@ def handle_history_cmd(manager, args) -> int:
         runs = load_run_history(branch_dir)
         
         if not runs:
-            print(f"[INFO] 未找到运行历史记录（.run_info 文件不存在或为空）", file=sys.stderr)
+            print(f"[INFO] 未找到运行历史记录（运行历史文件不存在或为空）", file=sys.stderr)
             print(f"[INFO] 分支目录: {branch_dir}", file=sys.stderr)
             return 0
         
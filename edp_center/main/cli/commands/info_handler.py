@@ -6,17 +6,22 @@ Info 命令处理模块
 处理 -info 命令，显示指定 flow 下所有 step 的状态
 """
 
+import functools
 import sys
-import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional
 
 from ..utils import (
+    get_current_dir,
+    infer_and_validate_project_info,
     infer_project_info,
     infer_work_path_info,
     list_available_flows,
     get_cmd_filename_from_dependency,
-    find_step_flow
+    map_step_flows
 )
+from ..utils.run_history import RunHistory
 from .common_handlers import show_project_list
 from edp_center.packages.edp_cmdkit.sub_steps import read_sub_steps_from_dependency
 from edp_center.packages.edp_common.error_handler import handle_cli_error
@@ -24,7 +29,7 @@ from edp_center.packages.edp_common.error_handler import handle_cli_error
 
 def get_step_execution_status(branch_dir: Path, flow_name: str, step_name: str) -> tuple:
     """
-    从 .run_info 文件获取步骤的执行状态
+    从运行历史获取步骤的执行状态
     
     Args:
         branch_dir: branch 目录路径
@@ -37,39 +42,75 @@ def get_step_execution_status(branch_dir: Path, flow_name: str, step_name: str)
         - status: 'success', 'failed', 或 None（如果未运行）
         - last_timestamp: 最后一次运行的时间戳
     """
-    run_info_file = branch_dir / '.run_info'
-    if not run_info_file.exists():
+    history = RunHistory(branch_dir)
+    if not history.exists():
         return (False, None, None)
     
     try:
-        with open(run_info_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
-            runs = data.get('runs', [])
-            
-            # 查找该步骤的最后一次运行记录
-            matching_runs = [
-                run for run in runs
-                if run.get('flow') == flow_name and run.get('step') == step_name
-            ]
-            
-            if not matching_runs:
-                return (False, None, None)
-            
-            # 获取最后一次运行（按时间戳排序，最新的在前）
-            last_run = sorted(matching_runs, key=lambda x: x.get('timestamp', ''), reverse=True)[0]
-            status = last_run.get('status')
-            timestamp = last_run.get('timestamp')
-            
-            return (True, status, timestamp)
+        # 查找该步骤的最后一次运行记录
+        last_run = history.last_run(flow_name, step_name)
+        if last_run is None:
+            return (False, None, None)
+        
+        return (True, last_run.get('status'), last_run.get('timestamp'))
     except Exception:
         # 如果读取失败，返回未运行状态
         return (False, None, None)
 
 
-def show_flow_status(manager, edp_center_path, foundry, node, project, flow_name, branch_dir: Path = None):
+# 状态检查的最大并行数（网络文件系统上每次 stat / 读取都要等待服务器响应，并行可以重叠等待时间）
+STATUS_MAX_WORKERS = 16
+
+
+def get_last_runs(branch_dir: Path, flow_name: str) -> Dict[str, tuple]:
     """
-    显示指定 flow 的状态信息（辅助函数，可被其他模块调用）
-    
+    一次读取运行历史，获取 flow 下每个步骤的执行状态
+
+    Args:
+        branch_dir: branch 目录路径
+        flow_name: flow 名称
+
+    Returns:
+        {step_name: (has_run_info, status, last_timestamp)}，与 get_step_execution_status 的结果相同；
+        没有运行记录的步骤不在结果中
+    """
+    history = RunHistory(branch_dir)
+    if not history.exists():
+        return {}
+
+    try:
+        last_runs = {}
+        for run in history.iter_runs(flow=flow_name):
+            step_name = run.get('step')
+            last = last_runs.get(step_name)
+            if last is None or run.get('timestamp', '') >= last.get('timestamp', ''):
+                last_runs[step_name] = run
+    except Exception:
+        # 如果读取失败，所有步骤都视为未运行
+        return {}
+    return {step_name: (True, run.get('status'), run.get('timestamp')) for step_name, run in last_runs.items()}
+
+
+def _run_concurrently(tasks: Dict[Any, Callable[[], Any]], max_workers: int) -> Dict[Any, Any]:
+    """用有上限的线程池执行所有任务，返回 {key: 结果}（max_workers <= 1 时依次执行）"""
+    workers = min(max_workers, len(tasks))
+    if workers <= 1:
+        return {key: task() for key, task in tasks.items()}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {key: executor.submit(task) for key, task in tasks.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def collect_flow_status(manager, edp_center_path, foundry, node, project, flow_name,
+                        branch_dir: Path = None, available_flows: Optional[Dict] = None,
+                        max_workers: int = STATUS_MAX_WORKERS) -> Optional[Dict[str, Any]]:
+    """
+    收集指定 flow 的状态快照
+
+    先确定所有步骤需要的文件系统操作（查找步骤所属的 flow、读取 sub_steps、读取运行历史），
+    用有上限的线程池并发执行，再根据结果生成快照。所有步骤所属的 flow 一次查出（map_step_flows），
+    运行历史只读取一次。
+
     Args:
         manager: WorkflowManager 实例
         edp_center_path: EDP Center 路径
@@ -77,147 +118,174 @@ def show_flow_status(manager, edp_center_path, foundry, node, project, flow_name
         node: Node 名称
         project: Project 名称（可能为 None）
         flow_name: Flow 名称
-        
+        branch_dir: branch 目录（为 None 时只显示配置状态）
+        available_flows: list_available_flows 的结果（调用方已经获取时传入，避免重复检查）
+        max_workers: 最大并行数
+
     Returns:
-        bool: 是否成功显示（True=成功，False=失败）
+        {'flow': flow_name, 'order': [step_name, ...],
+         'steps': {step_name: {'ready', 'run', 'pre_steps', 'post_steps', 'sub_steps'}}}，
+        flow 不存在时返回 None
     """
-    try:
-        # 获取所有可用的 flow
-        available_flows = list_available_flows(edp_center_path, foundry, node, project)
-        
-        # 检查 flow 是否存在
-        if flow_name not in available_flows:
-            print(f"[WARN] Flow '{flow_name}' 不存在，无法显示状态", file=sys.stderr)
-            return False
-        
-        # 加载 workflow graph 以获取依赖关系
+    def load_graph():
+        # 加载 workflow graph 以获取依赖关系（失败时返回异常，显示简化状态）
         try:
-            graph = manager.load_workflow(foundry, node, project, flow=None)
+            return manager.load_workflow(foundry, node, project, flow=None)
         except Exception as e:
-            print(f"[WARN] 加载 workflow 失败: {e}，将显示简化状态", file=sys.stderr)
-            graph = None
-        
-        steps_info = available_flows[flow_name]
-        
-        # 获取拓扑排序后的步骤顺序（只包含属于当前 flow 的步骤）
+            return e
+
+    def read_sub_steps(step_name):
         try:
-            if graph:
-                sorted_steps = graph.topological_sort()
-                # 过滤出属于当前 flow 的步骤，并保持拓扑顺序
-                flow_step_order = []
-                for step in sorted_steps:
-                    step_flow = find_step_flow(edp_center_path, foundry, node, project, step.name)
-                    if step_flow == flow_name and step.name in steps_info:
-                        flow_step_order.append(step.name)
-                
-                # 对于不在图中的步骤（可能没有依赖关系），按字母顺序添加到末尾
-                remaining_steps = set(steps_info.keys()) - set(flow_step_order)
-                if remaining_steps:
-                    flow_step_order.extend(sorted(remaining_steps))
-            else:
-                flow_step_order = sorted(steps_info.keys())
+            return read_sub_steps_from_dependency(edp_center_path, foundry, node, project, flow_name, step_name)
         except Exception:
-            # 如果拓扑排序失败（例如有循环依赖），回退到字母顺序
+            # 如果读取 sub_steps 失败，忽略（不影响主流程）
+            return []
+
+    # 第一批：不依赖 flow 内容的操作（解析 dependency.yaml 的 CPU 时间与其他任务的 I/O 等待重叠）
+    tasks: Dict[Any, Callable[[], Any]] = {
+        'graph': load_graph,
+        'step_flows': functools.partial(map_step_flows, edp_center_path, foundry, node, project),
+    }
+    if available_flows is None:
+        tasks['flows'] = functools.partial(list_available_flows, edp_center_path, foundry, node, project)
+    if branch_dir:
+        tasks['runs'] = functools.partial(get_last_runs, branch_dir, flow_name)
+    results = _run_concurrently(tasks, max_workers)
+    if available_flows is None:
+        available_flows = results['flows']
+    step_flows = results['step_flows']
+    last_runs = results.get('runs', {})
+
+    # 检查 flow 是否存在
+    if flow_name not in available_flows:
+        print(f"[WARN] Flow '{flow_name}' 不存在，无法显示状态", file=sys.stderr)
+        return None
+
+    graph = results['graph']
+    if isinstance(graph, Exception):
+        print(f"[WARN] 加载 workflow 失败: {graph}，将显示简化状态", file=sys.stderr)
+        graph = None
+
+    # 第二批：每个 step 的 sub_steps
+    steps_info = available_flows[flow_name]
+    sub_steps = _run_concurrently(
+        {step_name: functools.partial(read_sub_steps, step_name) for step_name in steps_info}, max_workers)
+
+    # 获取拓扑排序后的步骤顺序（只包含属于当前 flow 的步骤）
+    try:
+        if graph:
+            flow_step_order = [step.name for step in graph.topological_sort()
+                               if step_flows.get(step.name) == flow_name and step.name in steps_info]
+            # 对于不在图中的步骤（可能没有依赖关系），按字母顺序添加到末尾
+            remaining_steps = set(steps_info.keys()) - set(flow_step_order)
+            if remaining_steps:
+                flow_step_order.extend(sorted(remaining_steps))
+        else:
             flow_step_order = sorted(steps_info.keys())
-        
-        # 显示分隔线
-        print(f"\n{'='*60}", file=sys.stderr)
-        print(f"[INFO] Flow '{flow_name}' 当前状态:", file=sys.stderr)
-        print(f"{'='*60}", file=sys.stderr)
-        
-        # 按拓扑顺序显示
-        for step_name in flow_step_order:
-            info = steps_info[step_name]
-            ready = info.get('ready', False)
-            
-            # 格式化 step 名称（小写）
-            step_display = step_name.lower()
-            print(f"\n{step_display}:", file=sys.stderr)
-            
-            # STATUS
-            # 首先检查配置就绪状态
-            if not ready:
-                print(f"     STATUS: ERROR, PLEASE CONNECT WITH FLOW OWNER FOR MORE INFORMATION", file=sys.stderr)
-            else:
-                # 如果配置就绪，检查执行状态
-                if branch_dir:
-                    has_run_info, exec_status, last_timestamp = get_step_execution_status(branch_dir, flow_name, step_name)
-                    if has_run_info:
-                        if exec_status == 'success':
-                            print(f"     STATUS: OK (执行成功)", file=sys.stderr)
-                            if last_timestamp:
-                                print(f"     LAST_RUN: {last_timestamp}", file=sys.stderr)
-                        elif exec_status == 'failed':
-                            print(f"     STATUS: ERROR (执行失败)", file=sys.stderr)
-                            if last_timestamp:
-                                print(f"     LAST_RUN: {last_timestamp}", file=sys.stderr)
-                        else:
-                            print(f"     STATUS: OK (配置就绪，未运行)", file=sys.stderr)
-                    else:
-                        print(f"     STATUS: OK (配置就绪，未运行)", file=sys.stderr)
-                else:
-                    print(f"     STATUS: OK (配置就绪)", file=sys.stderr)
-            
-            # PRE_STEP 和 POST_STEP
-            pre_steps = []
-            post_steps = []
-            
-            if graph and step_name in graph.steps:
-                # 获取前置步骤
-                prev_steps = graph.get_prev_steps(step_name)
-                # 将 step_name 映射回 flow_name.step_name 格式
-                for step in prev_steps:
-                    # 查找该 step 属于哪个 flow
-                    step_flow = find_step_flow(edp_center_path, foundry, node, project, step.name)
-                    if step_flow:
-                        pre_steps.append(f"{step_flow}.{step.name}")
-                    else:
-                        pre_steps.append(step.name)
-                
-                # 获取后置步骤
-                next_steps = graph.get_next_steps(step_name)
-                # 将 step_name 映射回 flow_name.step_name 格式
-                for step in next_steps:
-                    # 查找该 step 属于哪个 flow
-                    step_flow = find_step_flow(edp_center_path, foundry, node, project, step.name)
-                    if step_flow:
-                        post_steps.append(f"{step_flow}.{step.name}")
-                    else:
-                        post_steps.append(step.name)
-            
-            # 显示 PRE_STEP
-            if pre_steps:
-                pre_str = ', '.join(sorted(pre_steps))
-                print(f"     PRE_STEP: {pre_str}", file=sys.stderr)
-            else:
-                print(f"     PRE_STEP: NONE", file=sys.stderr)
-            
-            # 显示 POST_STEP
-            if post_steps:
-                post_str = ', '.join(sorted(post_steps))
-                print(f"     POST_STEP: {post_str}", file=sys.stderr)
+    except Exception:
+        # 如果拓扑排序失败（例如有循环依赖），回退到字母顺序
+        flow_step_order = sorted(steps_info.keys())
+
+    def qualified(steps):
+        # 将 step_name 映射回 flow_name.step_name 格式
+        names = []
+        for step in steps:
+            step_flow = step_flows.get(step.name)
+            names.append(f"{step_flow}.{step.name}" if step_flow else step.name)
+        return sorted(names)
+
+    steps = {}
+    for step_name in flow_step_order:
+        in_graph = graph is not None and step_name in graph.steps
+        steps[step_name] = {
+            'ready': steps_info[step_name].get('ready', False),
+            'run': last_runs.get(step_name, (False, None, None)) if branch_dir else None,
+            'pre_steps': qualified(graph.get_prev_steps(step_name)) if in_graph else [],
+            'post_steps': qualified(graph.get_next_steps(step_name)) if in_graph else [],
+            'sub_steps': sub_steps[step_name],
+        }
+    return {'flow': flow_name, 'order': flow_step_order, 'steps': steps}
+
+
+def render_flow_status(snapshot: Dict[str, Any]):
+    """根据 collect_flow_status 的快照显示 flow 状态（不再访问文件系统）"""
+    # 显示分隔线
+    print(f"\n{'='*60}", file=sys.stderr)
+    print(f"[INFO] Flow '{snapshot['flow']}' 当前状态:", file=sys.stderr)
+    print(f"{'='*60}", file=sys.stderr)
+
+    # 按拓扑顺序显示
+    for step_name in snapshot['order']:
+        info = snapshot['steps'][step_name]
+
+        # 格式化 step 名称（小写）
+        step_display = step_name.lower()
+        print(f"\n{step_display}:", file=sys.stderr)
+
+        # STATUS
+        # 首先检查配置就绪状态
+        if not info['ready']:
+            print(f"     STATUS: ERROR, PLEASE CONNECT WITH FLOW OWNER FOR MORE INFORMATION", file=sys.stderr)
+        elif info['run'] is None:
+            print(f"     STATUS: OK (配置就绪)", file=sys.stderr)
+        else:
+            # 如果配置就绪，检查执行状态
+            has_run_info, exec_status, last_timestamp = info['run']
+            if has_run_info and exec_status == 'success':
+                print(f"     STATUS: OK (执行成功)", file=sys.stderr)
+                if last_timestamp:
+                    print(f"     LAST_RUN: {last_timestamp}", file=sys.stderr)
+            elif has_run_info and exec_status == 'failed':
+                print(f"     STATUS: ERROR (执行失败)", file=sys.stderr)
+                if last_timestamp:
+                    print(f"     LAST_RUN: {last_timestamp}", file=sys.stderr)
             else:
-                print(f"     POST_STEP: NONE", file=sys.stderr)
-            
-            # 显示 SUB_STEPS（如果存在）
-            try:
-                sub_steps = read_sub_steps_from_dependency(edp_center_path, foundry, node, project, flow_name, step_name)
-                if sub_steps:
-                    # 提取 proc 名称列表
-                    sub_step_proc_names = []
-                    for sub_step in sub_steps:
-                        if isinstance(sub_step, dict) and len(sub_step) == 1:
-                            _, proc_name = next(iter(sub_step.items()))
-                            sub_step_proc_names.append(proc_name)
-                    
-                    if sub_step_proc_names:
-                        sub_steps_str = ', '.join(sub_step_proc_names)
-                        print(f"     SUB_STEPS: {sub_steps_str}", file=sys.stderr)
-            except Exception:
-                # 如果读取 sub_steps 失败，忽略（不影响主流程）
-                pass
+                print(f"     STATUS: OK (配置就绪，未运行)", file=sys.stderr)
+
+        # PRE_STEP 和 POST_STEP
+        pre_str = ', '.join(info['pre_steps']) or 'NONE'
+        print(f"     PRE_STEP: {pre_str}", file=sys.stderr)
+        post_str = ', '.join(info['post_steps']) or 'NONE'
+        print(f"     POST_STEP: {post_str}", file=sys.stderr)
+
+        # 显示 SUB_STEPS（如果存在）
+        # 提取 proc 名称列表
+        sub_step_proc_names = []
+        for sub_step in info['sub_steps'] or []:
+            if isinstance(sub_step, dict) and len(sub_step) == 1:
+                _, proc_name = next(iter(sub_step.items()))
+                sub_step_proc_names.append(proc_name)
+        if sub_step_proc_names:
+            sub_steps_str = ', '.join(sub_step_proc_names)
+            print(f"     SUB_STEPS: {sub_steps_str}", file=sys.stderr)
+
+    print(f"\n{'='*60}", file=sys.stderr)
+
+
+def show_flow_status(manager, edp_center_path, foundry, node, project, flow_name, branch_dir: Path = None,
+                     available_flows: Optional[Dict] = None):
+    """
+    显示指定 flow 的状态信息（辅助函数，可被其他模块调用）
+    
+    Args:
+        manager: WorkflowManager 实例
+        edp_center_path: EDP Center 路径
+        foundry: Foundry 名称
+        node: Node 名称
+        project: Project 名称（可能为 None）
+        flow_name: Flow 名称
+        branch_dir: branch 目录（为 None 时只显示配置状态）
+        available_flows: list_available_flows 的结果（可选）
         
-        print(f"\n{'='*60}", file=sys.stderr)
+    Returns:
+        bool: 是否成功显示（True=成功，False=失败）
+    """
+    try:
+        snapshot = collect_flow_status(manager, edp_center_path, foundry, node, project, flow_name,
+                                       branch_dir=branch_dir, available_flows=available_flows)
+        if snapshot is None:
+            return False
+        render_flow_status(snapshot)
         return True
         
     except Exception as e:
@@ -312,8 +380,11 @@ def handle_info_cmd(manager, args) -> int:
         # 如果推断失败，继续使用 None（只显示配置状态）
         pass
     
-    # 使用辅助函数显示 flow 状态
-    show_flow_status(manager, edp_center_path, foundry, node, project, flow_name, branch_dir=branch_dir)
+    # 使用辅助函数显示 flow 状态（工作路径中的项目与推断的项目相同时复用已获取的 flow 列表）
+    if project != project_info.get('project'):
+        available_flows = None
+    show_flow_status(manager, edp_center_path, foundry, node, project, flow_name, branch_dir=branch_dir,
+                     available_flows=available_flows)
     
     return 0
 
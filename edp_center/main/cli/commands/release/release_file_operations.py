@@ -3,7 +3,7 @@
 
 """
 RELEASE 文件操作模块
-负责文件复制、查找和权限设置
+负责文件复制、校验、查找和权限设置
 """
 
 import os
@@ -11,10 +11,13 @@ import shutil
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+# 每个 step 目录中的内容摘要文件
+CHECKSUM_FILE_NAME = 'checksums.blake2b'
+
 
 def copy_files_to_release(file_mappings: List[Tuple], 
                           data_dir: Path, 
-                          data_target_dir: Path) -> None:
+                          data_target_dir: Path) -> List[Tuple[Path, Path]]:
     """
     复制文件到 RELEASE 目录
     
@@ -22,7 +25,11 @@ def copy_files_to_release(file_mappings: List[Tuple],
         file_mappings: [(source_path, target_dir, keep_structure, type), ...]
         data_dir: 源数据目录（data/{flow}.{step}/）
         data_target_dir: 目标 step 目录（data/{flow}.{step}/）
+    
+    Returns:
+        复制的文件 [(源文件, 目标文件), ...]（目录展开为其中的文件），用于内容校验
     """
+    copied = []
     for source_path, target_dir, keep_structure, file_type in file_mappings:
         target_base = data_target_dir / target_dir
         target_base.mkdir(parents=True, exist_ok=True)
@@ -33,6 +40,10 @@ def copy_files_to_release(file_mappings: List[Tuple],
             if target_path.exists():
                 shutil.rmtree(target_path)
             shutil.copytree(source_path, target_path)
+            for root, _, files in os.walk(source_path):
+                for name in files:
+                    source_file = Path(root) / name
+                    copied.append((source_file, target_path / source_file.relative_to(source_path)))
             print(f"[INFO] 已复制目录: {source_path.name} -> {target_dir}/")
         else:
             # 复制文件
@@ -52,7 +63,49 @@ def copy_files_to_release(file_mappings: List[Tuple],
                 target_path = target_base / source_path.name
             
             shutil.copy2(source_path, target_path)
+            copied.append((source_path, target_path))
             print(f"[INFO] 已复制文件: {source_path.name} -> {target_dir}/")
+    
+    return copied
+
+
+def verify_release_copies(copied: List[Tuple[Path, Path]], step_target_dir: Path,
+                          hasher=None) -> Path:
+    """
+    校验复制的文件内容与源文件一致，并写入 step 目录的 checksums.blake2b
+    
+    源文件的摘要由共享哈希服务记录（未修改的大文件不重新读取），目标文件并行读取。
+    checksums.blake2b 每行为 "摘要  相对路径"，可以用 b2sum -l 256 -c 检查。
+    
+    Args:
+        copied: [(源文件, 目标文件), ...]
+        step_target_dir: 目标 step 目录
+        hasher: FileHasher 实例（默认使用进程共享的实例）
+    
+    Returns:
+        checksums.blake2b 的路径
+    
+    Raises:
+        RuntimeError: 有文件内容不一致
+    """
+    if hasher is None:
+        from edp_center.packages.edp_common.file_hasher import get_file_hasher
+        hasher = get_file_hasher()
+    
+    digests = hasher.hash_files([p for pair in copied for p in pair], ignore_errors=True)
+    mismatched = [target for source, target in copied
+                  if source not in digests or target not in digests or digests[source] != digests[target]]
+    if mismatched:
+        names = ', '.join(str(p.relative_to(step_target_dir)) for p in mismatched[:5])
+        more = f" 等 {len(mismatched)} 个文件" if len(mismatched) > 5 else ""
+        raise RuntimeError(f"复制后的文件内容与源文件不一致: {names}{more}")
+    
+    relative = sorted((target.relative_to(step_target_dir).as_posix(), target) for _, target in copied)
+    lines = [f"{digests[target]}  {rel_path}" for rel_path, target in relative]
+    checksum_file = step_target_dir / CHECKSUM_FILE_NAME
+    checksum_file.write_text(''.join(line + '\n' for line in lines), encoding='utf-8')
+    print(f"[INFO] 已校验 {len(copied)} 个文件的内容，摘要写入 {CHECKSUM_FILE_NAME}")
+    return checksum_file
 
 
 def find_lib_settings(branch_dir: Path, runs_dir: Path) -> Optional[Path]:
@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import Dict, Optional
 
 from .release_file_mapper import get_file_mappings
-from .release_file_operations import copy_files_to_release, find_lib_settings
+from .release_file_operations import copy_files_to_release, find_lib_settings, verify_release_copies
 
 
 def release_single_step(manager, args, branch_dir: Path, release_dir: Path,
@@ -63,13 +63,14 @@ def release_single_step(manager, args, branch_dir: Path, release_dir: Path,
     step_target_dir.mkdir(parents=True, exist_ok=True)
     
     # 5. 获取文件映射（仅当数据存在时）
+    copied = []
     if has_data:
         file_mappings = get_file_mappings(
             config, flow_name, step_name, data_dir, args
         )
         
         # 6. 复制文件到 step 目录
-        copy_files_to_release(file_mappings, data_dir, step_target_dir)
+        copied = copy_files_to_release(file_mappings, data_dir, step_target_dir)
     else:
         print(f"[INFO] 步骤 {step_dir_name} 无数据文件，仅创建目录结构")
     
@@ -78,6 +79,7 @@ def release_single_step(manager, args, branch_dir: Path, release_dir: Path,
         lib_settings_source = find_lib_settings(branch_dir, runs_dir)
         if lib_settings_source and lib_settings_source.exists():
             shutil.copy2(lib_settings_source, step_target_dir / 'lib_settings.tcl')
+            copied.append((lib_settings_source, step_target_dir / 'lib_settings.tcl'))
             print(f"[INFO] 已复制 lib_settings.tcl 到 {step_dir_name}/")
         else:
             print(f"[WARN] 未找到 lib_settings.tcl，跳过")
@@ -86,9 +88,14 @@ def release_single_step(manager, args, branch_dir: Path, release_dir: Path,
         full_tcl_source = runs_dir / 'full.tcl'
         if full_tcl_source.exists():
             shutil.copy2(full_tcl_source, step_target_dir / 'full.tcl')
+            copied.append((full_tcl_source, step_target_dir / 'full.tcl'))
             print(f"[INFO] 已复制 full.tcl 到 {step_dir_name}/")
     else:
         print(f"[INFO] 步骤 {step_dir_name} 无 runs 目录，跳过 lib_settings.tcl 和 full.tcl")
     
+    # 9. 校验复制的文件内容并写入摘要文件
+    if copied and not getattr(args, 'release_no_verify', False):
+        verify_release_copies(copied, step_target_dir)
+    
     return 'success'
 
@@ -8,11 +8,12 @@ Rollback History - 回滚历史记录模块
 """
 
 import sys
-import yaml
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from ...utils.run_history import RunHistory
+
 
 def load_run_history(branch_dir: Path) -> List[Dict]:
     """
@@ -24,16 +25,14 @@ def load_run_history(branch_dir: Path) -> List[Dict]:
     Returns:
         运行历史记录列表
     """
-    run_info_file = branch_dir / '.run_info'
-    if not run_info_file.exists():
+    history = RunHistory(branch_dir)
+    if not history.exists():
         return []
     
     try:
-        with open(run_info_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
-            return data.get('runs', [])
+        return history.load()
     except Exception as e:
-        print(f"[ERROR] 读取 .run_info 文件失败: {e}", file=sys.stderr)
+        print(f"[ERROR] 读取运行历史失败: {e}", file=sys.stderr)
         return []
 
 
@@ -8,11 +8,12 @@ Run 命令辅助函数模块
 
 import sys
 import re
-import yaml
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 
+from ..utils.run_history import RunHistory
+
 
 # 注意：已移除 #import util 机制，不再需要扫描 util
 
@@ -56,7 +57,7 @@ def get_used_hooks(hooks_dir: Path, step_name: str) -> Dict[str, List[str]]:
 
 def update_run_info(branch_dir: Path, flow_name: str, step_name: str, used_hooks: Dict, step=None, full_tcl_path: Optional[Path] = None) -> None:
     """
-    更新 .run_info 文件，记录运行信息
+    追加一条运行记录到 branch 目录的运行历史（.run_history.jsonl）
     
     Args:
         branch_dir: branch 目录路径
@@ -67,20 +68,6 @@ def update_run_info(branch_dir: Path, flow_name: str, step_name: str, used_hooks
         step: 步骤对象（可选），用于获取执行信息（execution_info）
         full_tcl_path: full.tcl 文件路径（可选），用于记录配置信息
     """
-    run_info_file = branch_dir / '.run_info'
-    
-    # 读取现有的 run_info（如果存在）
-    run_history = []
-    if run_info_file.exists():
-        try:
-            with open(run_info_file, 'r', encoding='utf-8') as f:
-                existing_data = yaml.safe_load(f) or {}
-                run_history = existing_data.get('runs', [])
-        except Exception as e:
-            # 如果读取失败，从空列表开始
-            print(f"[WARN] 读取 .run_info 文件失败: {e}，将创建新文件", file=sys.stderr)
-            run_history = []
-    
     # 创建新的运行记录
     new_run = {
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
@@ -116,6 +103,10 @@ def update_run_info(branch_dir: Path, flow_name: str, step_name: str, used_hooks
             if resources.get('cpu_used') is not None:
                 resource_dict['cpu_used'] = resources.get('cpu_used')
             
+            # 总 CPU 时间（秒）
+            if resources.get('cpu_time') is not None:
+                resource_dict['cpu_time'] = round(resources.get('cpu_time'), 2)
+            
             # 每个 CPU 的使用时间
             if resources.get('cpu_time_per_cpu') is not None:
                 resource_dict['cpu_time_per_cpu'] = round(resources.get('cpu_time_per_cpu'), 2)
@@ -123,6 +114,14 @@ def update_run_info(branch_dir: Path, flow_name: str, step_name: str, used_hooks
             # 峰值内存
             if resources.get('peak_memory') is not None:
                 resource_dict['peak_memory'] = resources.get('peak_memory')  # MB
+            if resources.get('avg_memory') is not None:
+                resource_dict['avg_memory'] = resources.get('avg_memory')  # MB
+            
+            # 申请的资源（LSF 的 cpu_num / memory），用于和实际使用对比
+            if resources.get('cpu_requested') is not None:
+                resource_dict['cpu_requested'] = resources.get('cpu_requested')
+            if resources.get('memory_requested') is not None:
+                resource_dict['memory_requested'] = resources.get('memory_requested')  # MB
             
             # 使用的机器列表（包含每个主机的 CPU 数量）
             if resources.get('hosts'):
@@ -162,21 +161,13 @@ def update_run_info(branch_dir: Path, flow_name: str, step_name: str, used_hooks
             # 如果路径处理失败，记录警告但继续
             print(f"[WARN] 无法处理 full.tcl 路径: {e}", file=sys.stderr)
     
-    # 追加到历史记录
-    run_history.append(new_run)
-    
-    # 构建完整的 run_info 数据结构
-    run_info_data = {
-        'runs': run_history
-    }
-    
-    # 写入文件
+    # 追加到历史记录（只写一行，不重写已有记录）
+    history = RunHistory(branch_dir)
     try:
-        with open(run_info_file, 'w', encoding='utf-8') as f:
-            yaml.dump(run_info_data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-        print(f"[INFO] 已更新运行记录: {run_info_file}", file=sys.stderr)
+        history.append(new_run)
+        print(f"[INFO] 已更新运行记录: {history.path}", file=sys.stderr)
     except Exception as e:
-        print(f"[WARN] 写入 .run_info 文件失败: {e}", file=sys.stderr)
+        print(f"[WARN] 写入运行记录失败: {e}", file=sys.stderr)
 
 
 def create_hooks_files(hooks_dir: Path, step_name: str) -> None:
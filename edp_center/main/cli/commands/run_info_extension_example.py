@@ -2,18 +2,18 @@
 # -*- coding: utf-8 -*-
 
 """
-.run_info 扩展实现示例
+运行记录扩展实现示例
 
-展示如何扩展 update_run_info 函数来收集更多信息
+展示如何扩展 update_run_info 函数来收集更多信息（记录追加到 branch 目录的 .run_history.jsonl）
 """
 
 import sys
-import yaml
-import time
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 
+from ..utils.run_history import RunHistory
+
 
 def update_run_info_extended(
     branch_dir: Path,
@@ -31,7 +31,7 @@ def update_run_info_extended(
     validation: Optional[Dict[str, Any]] = None  # 验证结果
 ) -> None:
     """
-    更新 .run_info 文件，记录扩展的运行信息
+    追加一条扩展的运行记录到 branch 目录的运行历史
     
     Args:
         branch_dir: branch 目录路径
@@ -47,19 +47,6 @@ def update_run_info_extended(
         error: 错误信息
         validation: 验证结果
     """
-    run_info_file = branch_dir / '.run_info'
-    
-    # 读取现有的 run_info（如果存在）
-    run_history = []
-    if run_info_file.exists():
-        try:
-            with open(run_info_file, 'r', encoding='utf-8') as f:
-                existing_data = yaml.safe_load(f) or {}
-                run_history = existing_data.get('runs', [])
-        except Exception as e:
-            print(f"[WARN] 读取 .run_info 文件失败: {e}，将创建新文件", file=sys.stderr)
-            run_history = []
-    
     # 创建新的运行记录（扩展格式）
     new_run = {
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
@@ -93,21 +80,13 @@ def update_run_info_extended(
     if validation:
         new_run['validation'] = validation
     
-    # 追加到历史记录
-    run_history.append(new_run)
-    
-    # 构建完整的 run_info 数据结构
-    run_info_data = {
-        'runs': run_history
-    }
-    
-    # 写入文件
+    # 追加到运行历史（只写一行，不重写已有记录）
+    history = RunHistory(branch_dir)
     try:
-        with open(run_info_file, 'w', encoding='utf-8') as f:
-            yaml.dump(run_info_data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-        print(f"[INFO] 已更新运行记录: {run_info_file}", file=sys.stderr)
-    except Exception as e:
-        print(f"[WARN] 写入 .run_info 文件失败: {e}", file=sys.stderr)
+        history.append(new_run)
+        print(f"[INFO] 已更新运行记录: {history.path}", file=sys.stderr)
+    except OSError as e:
+        print(f"[WARN] 写入运行历史失败: {e}", file=sys.stderr)
 
 
 def collect_lsf_resources(lsf_job_id: str) -> Optional[Dict[str, Any]]:
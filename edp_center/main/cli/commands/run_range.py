@@ -4,23 +4,127 @@
 """
 范围执行模块
 处理 --from 和 --to 参数，支持并行执行多个步骤
+
+执行分为两个阶段：
+1. 准备：并发生成所有步骤的 full.tcl 和处理后的脚本，任何步骤准备失败时报告所有失败的步骤，不执行任何步骤
+2. 执行：按依赖关系启动已准备好的步骤（只启动工具，不再生成文件）
 """
 
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from ..utils import (
     infer_and_validate_project_info, infer_work_path_info,
-    validate_work_path_info, get_current_dir
+    validate_work_path_info, get_current_dir, build_branch_dir, map_step_flows
 )
 from .run_range_helper import get_steps_to_execute
-from .run_single_step import execute_single_step
+from .run_single_step import PreparedStep, prepare_single_step, launch_prepared_step
 from edp_center.packages.edp_common.error_handler import handle_cli_error
 
 # 获取 logger
 logger = logging.getLogger(__name__)
 
+# 准备阶段（生成 full.tcl 和处理脚本）的最大并行数
+PREPARE_MAX_WORKERS = 8
+
+
+class StepArgs:
+    """单个步骤的参数对象（从 run_range 的参数复制，run 设置为该步骤）"""
+    
+    def __init__(self, base_args, flow_step):
+        self.run = flow_step
+        self.work_path = base_args.work_path
+        self.project = base_args.project
+        self.version = base_args.version
+        self.block = base_args.block
+        self.user = base_args.user
+        self.branch = base_args.branch
+        self.foundry = base_args.foundry
+        self.node = base_args.node
+        self.dry_run = getattr(base_args, 'dry_run', False)
+        # debug 现在是布尔值，转换为整数
+        debug_flag = getattr(base_args, 'debug', False)
+        self.debug = 1 if debug_flag else 0
+        self.edp_center = base_args.edp_center
+        self.config = getattr(base_args, 'config', None)
+
+
+def graph_step_name(graph, flow_step: Optional[str]) -> Optional[str]:
+    """
+    依赖图中的 step 名称不带 flow 前缀；参数为 flow.step 格式时去掉 flow 部分
+    
+    Args:
+        graph: 依赖图对象
+        flow_step: 步骤名称（flow.step 或 step）
+        
+    Returns:
+        依赖图中的步骤名称（找不到时原样返回，由调用方报告错误）
+    """
+    if flow_step and flow_step not in graph and '.' in flow_step:
+        step_name = flow_step.split('.', 1)[1]
+        if step_name in graph:
+            return step_name
+    return flow_step
+
+
+def _prepare_step(manager, step_args, flow_step: str, project_info: Dict, work_path_info: Dict,
+                  current_dir: Path) -> Tuple[Optional[PreparedStep], Optional[str]]:
+    """准备单个步骤（在进程池中执行），返回 (PreparedStep, None) 或 (None, 失败原因)"""
+    try:
+        prepared = prepare_single_step(manager, step_args, flow_step, project_info=project_info,
+                                       work_path_info=work_path_info, current_dir=current_dir)
+    except Exception as e:
+        logger.debug(f"准备步骤 {flow_step} 失败", exc_info=True)
+        return None, str(e) or type(e).__name__
+    if prepared is None:
+        return None, "准备失败（原因见上方输出）"
+    return prepared, None
+
+
+def prepare_steps(manager, args, steps: List[str], project_info: Dict, work_path_info: Dict,
+                  current_dir: Path,
+                  max_workers: int = PREPARE_MAX_WORKERS) -> Tuple[Dict[str, PreparedStep], Dict[str, str]]:
+    """
+    并发准备多个步骤（生成 full.tcl、hooks 文件和处理后的脚本）
+    
+    每个步骤的准备互不依赖（full.tcl 和脚本都写到各自的目录），使用有限的进程池并发执行，
+    所有步骤都准备完后返回，失败的步骤不影响其他步骤的准备。
+    
+    使用进程而不是线程：生成 full.tcl 时创建的 Tcl 解释器只能在创建它的线程中释放
+    （由其他线程的垃圾回收释放时 Tcl 会直接 abort），而且 YAML / Tcl 转换主要消耗 CPU。
+    
+    Args:
+        manager: WorkflowManager 实例
+        args: 命令行参数对象
+        steps: 步骤名称列表（格式: flow.step）
+        project_info: 已推断的项目信息
+        work_path_info: 已推断并验证的工作路径信息
+        current_dir: 当前目录
+        max_workers: 最大并行数（<= 1 时依次准备）
+        
+    Returns:
+        (准备好的步骤 {step_name: PreparedStep}, 准备失败的步骤 {step_name: 原因})
+    """
+    tasks = [(manager, StepArgs(args, step_name), step_name, project_info, work_path_info, current_dir)
+                 for step_name in steps]
+    if max_workers <= 1 or len(steps) <= 1:
+        results = [_prepare_step(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(steps))) as executor:
+            results = list(executor.map(_prepare_step, *zip(*tasks)))
+    
+    prepared_steps = {}
+    errors = {}
+    for step_name, (prepared, error) in zip(steps, results):
+        if prepared is not None:
+            prepared_steps[step_name] = prepared
+        else:
+            errors[step_name] = error
+    return prepared_steps, errors
+
 
 @handle_cli_error(error_message="执行步骤范围失败")
 def handle_run_range(manager, args, run_from, run_to, single_step) -> int:
@@ -55,7 +159,9 @@ def handle_run_range(manager, args, run_from, run_to, single_step) -> int:
     
     # 找到需要执行的步骤列表
     try:
-        steps_to_execute = get_steps_to_execute(graph, run_from, run_to, single_step)
+        steps_to_execute = get_steps_to_execute(graph, graph_step_name(graph, run_from),
+                                                graph_step_name(graph, run_to),
+                                                graph_step_name(graph, single_step))
     except ValueError as e:
         print(f"[ERROR] {e}", file=sys.stderr)
         return 1
@@ -64,9 +170,14 @@ def handle_run_range(manager, args, run_from, run_to, single_step) -> int:
         print(f"[ERROR] 没有找到需要执行的步骤", file=sys.stderr)
         return 1
     
+    # 执行和准备步骤使用 flow.step 格式
+    step_flows = map_step_flows(edp_center_path, foundry, node, project)
+    flow_steps = {step_name: f"{step_flows[step_name]}.{step_name}" if step_name in step_flows else step_name
+                  for step_name in steps_to_execute}
+    
     print(f"[INFO] 将执行以下步骤:", file=sys.stderr)
     for i, step_name in enumerate(steps_to_execute, 1):
-        print(f"  {i}. {step_name}", file=sys.stderr)
+        print(f"  {i}. {flow_steps[step_name]}", file=sys.stderr)
     
     # 推断工作路径信息
     work_path_info = infer_work_path_info(current_dir, args, project_info)
@@ -93,6 +204,21 @@ def handle_run_range(manager, args, run_from, run_to, single_step) -> int:
     # 确定 branch 目录路径
     branch_dir = build_branch_dir(work_path_info)
     
+    # 准备阶段：并发生成所有步骤的 full.tcl 和处理后的脚本
+    # 任何步骤准备失败（如缺少 import、constraint 验证失败）时，报告所有失败的步骤，不提交任何步骤
+    print(f"[INFO] 准备 {len(steps_to_execute)} 个步骤...", file=sys.stderr)
+    prepared_steps, prepare_errors = prepare_steps(
+        manager, args, [flow_steps[step_name] for step_name in steps_to_execute],
+        project_info, work_path_info, current_dir, max_workers=PREPARE_MAX_WORKERS
+    )
+    if prepare_errors:
+        print(f"\n[ERROR] 以下 {len(prepare_errors)} 个步骤准备失败，未执行任何步骤:", file=sys.stderr)
+        for step_name in steps_to_execute:
+            if flow_steps[step_name] in prepare_errors:
+                print(f"  - {flow_steps[step_name]}: {prepare_errors[flow_steps[step_name]]}", file=sys.stderr)
+        return 1
+    print(f"[INFO] 所有步骤已准备完成，开始执行", file=sys.stderr)
+    
     # 创建一个步骤名称集合，用于快速查找
     steps_to_execute_set = set(steps_to_execute)
     
@@ -110,36 +236,16 @@ def handle_run_range(manager, args, run_from, run_to, single_step) -> int:
             
             Args:
                 step: Step 对象
-                merged_var: 合并后的配置字典（这里不使用，因为我们使用 execute_single_step）
+                merged_var: 合并后的配置字典（这里不使用，配置在准备阶段已从 full.tcl 读取）
                 
             Returns:
                 bool: 执行是否成功
             """
             step_name = step.name
             
-            # 为这个步骤创建一个临时的 args 对象
-            class StepArgs:
-                def __init__(self, base_args, flow_step):
-                    self.run = flow_step
-                    self.work_path = base_args.work_path
-                    self.project = base_args.project
-                    self.version = base_args.version
-                    self.block = base_args.block
-                    self.user = base_args.user
-                    self.branch = base_args.branch
-                    self.foundry = base_args.foundry
-                    self.node = base_args.node
-                    self.dry_run = getattr(base_args, 'dry_run', False)
-                    # debug 现在是布尔值，转换为整数
-                    debug_flag = getattr(base_args, 'debug', False)
-                    self.debug = 1 if debug_flag else 0
-                    self.edp_center = base_args.edp_center
-                    self.config = getattr(base_args, 'config', None)
-            
-            step_args = StepArgs(args, step_name)
-            
-            # 执行单个步骤
-            result = execute_single_step(manager, step_args, step_name)
+            # 执行已准备好的步骤（只启动工具）
+            flow_step = flow_steps[step_name]
+            result = launch_prepared_step(StepArgs(args, flow_step), prepared_steps[flow_step])
             
             # 更新步骤状态
             if result == 0:
@@ -184,6 +290,10 @@ def handle_run_range(manager, args, run_from, run_to, single_step) -> int:
             if not prev_steps:
                 return True  # 没有前置步骤，可以执行
             
+            # 本次执行范围内的前置步骤必须已经结束（成功或失败）
+            if any(p.name in steps_to_execute_set and p.name not in all_results for p in prev_steps):
+                return False
+            
             failed_prereqs = [p for p in prev_steps if p.name in failed_steps_set]
             
             if strategy == "strict":
@@ -231,7 +341,7 @@ def handle_run_range(manager, args, run_from, run_to, single_step) -> int:
                 if can_execute_step(step, failed_steps_set, strategy):
                     ready_steps.append(step)
             
-            return False
+            return ready_steps
     
     def submit_ready_steps():
         """提交所有可执行的步骤到线程池"""
@@ -12,10 +12,15 @@ import csv
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional, Any, Tuple
-from collections import defaultdict
 
 from ..utils import infer_all_info, build_branch_dir
 from .history_handler import load_run_history, filter_history
+from ..utils.run_history import RunHistory
+from ..utils.run_stats import StepRollup, get_run_stats, rollup_runs, step_display_name
+from .stats_recommend import (
+    DEFAULT_HEADROOM, DEFAULT_PERCENTILE, build_overlay, print_recommendations,
+    recommend_resources, write_overlay
+)
 from edp_center.packages.edp_common.error_handler import handle_cli_error
 
 
@@ -27,63 +32,9 @@ def calculate_stats(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
         runs: 运行历史记录列表
         
     Returns:
-        统计数据字典
+        统计数据字典（另含 p50/p90/p99_duration、max_memory）
     """
-    if not runs:
-        return {
-            'total_runs': 0,
-            'success_count': 0,
-            'failed_count': 0,
-            'unknown_count': 0,
-            'success_rate': 0.0,
-            'avg_duration': None,
-            'min_duration': None,
-            'max_duration': None,
-            'total_duration': 0.0,
-            'avg_cpu': None,
-            'avg_memory': None
-        }
-    
-    # 统计执行次数和状态
-    total_runs = len(runs)
-    success_count = sum(1 for r in runs if r.get('status') == 'success')
-    failed_count = sum(1 for r in runs if r.get('status') == 'failed')
-    unknown_count = total_runs - success_count - failed_count
-    success_rate = (success_count / total_runs * 100) if total_runs > 0 else 0.0
-    
-    # 统计执行时长
-    durations = [r.get('duration') for r in runs if r.get('duration') is not None]
-    avg_duration = sum(durations) / len(durations) if durations else None
-    min_duration = min(durations) if durations else None
-    max_duration = max(durations) if durations else None
-    total_duration = sum(durations) if durations else 0.0
-    
-    # 统计资源使用
-    cpu_values = []
-    memory_values = []
-    for r in runs:
-        resources = r.get('resources', {})
-        if resources.get('cpu_used') is not None:
-            cpu_values.append(resources['cpu_used'])
-        if resources.get('peak_memory') is not None:
-            memory_values.append(resources['peak_memory'])
-    
-    avg_cpu = sum(cpu_values) / len(cpu_values) if cpu_values else None
-    avg_memory = sum(memory_values) / len(memory_values) if memory_values else None
-    
-    return {
-        'total_runs': total_runs,
-        'success_count': success_count,
-        'failed_count': failed_count,
-        'unknown_count': unknown_count,
-        'success_rate': success_rate,
-        'avg_duration': avg_duration,
-        'min_duration': min_duration,
-        'max_duration': max_duration,
-        'total_duration': total_duration,
-        'avg_cpu': avg_cpu,
-        'avg_memory': avg_memory
-    }
+    return StepRollup.from_runs(runs).to_stats()
 
 
 def calculate_step_stats(runs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
@@ -96,21 +47,15 @@ def calculate_step_stats(runs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]
     Returns:
         按步骤分组的统计数据字典 {step_name: stats}
     """
-    step_runs = defaultdict(list)
-    
-    # 按步骤分组
-    for run in runs:
-        flow = run.get('flow', '')
-        step = run.get('step', '')
-        step_name = f"{flow}.{step}" if flow and step else step or flow
-        step_runs[step_name].append(run)
-    
-    # 计算每个步骤的统计
-    step_stats = {}
-    for step_name, step_runs_list in step_runs.items():
-        step_stats[step_name] = calculate_stats(step_runs_list)
+    step_rollups: Dict[str, StepRollup] = {}
+    for (flow, step), rollup in rollup_runs(runs).items():
+        step_name = step_display_name(flow, step)
+        if step_name in step_rollups:
+            step_rollups[step_name].merge(rollup)
+        else:
+            step_rollups[step_name] = rollup
     
-    return step_stats
+    return {step_name: rollup.to_stats() for step_name, rollup in step_rollups.items()}
 
 
 def format_duration(seconds: Optional[float]) -> str:
@@ -173,9 +118,22 @@ def display_stats_cli(runs: List[Dict[str, Any]], step_filter: Optional[str] = N
         print("[INFO] 未找到匹配的历史记录", file=sys.stderr)
         return
     
-    # 计算总体统计
-    overall_stats = calculate_stats(runs)
+    rollup = StepRollup.from_runs(runs)
+    step_stats = calculate_step_stats(runs) if not step_filter and len(runs) > 1 else {}
+    print_stats_cli(rollup.to_stats(), step_stats, rollup.trend() if show_trend else None, step_filter)
+
+
+def print_stats_cli(overall_stats: Dict[str, Any], step_stats: Dict[str, Dict[str, Any]],
+                    trend: Optional[Dict[str, Any]] = None, step_filter: Optional[str] = None) -> None:
+    """
+    显示已经计算好的统计数据
     
+    Args:
+        overall_stats: 总体统计（calculate_stats 的格式）
+        step_stats: 按步骤统计（为空时不显示）
+        trend: 最近执行的趋势（为 None 时不显示）
+        step_filter: 步骤过滤器（用于标题）
+    """
     # 标题
     if step_filter:
         if '.' in step_filter:
@@ -203,6 +161,9 @@ def display_stats_cli(runs: List[Dict[str, Any]], step_filter: Optional[str] = N
         print(f"  - 平均: {format_duration(overall_stats['avg_duration'])}", file=sys.stderr)
         print(f"  - 最短: {format_duration(overall_stats['min_duration'])}", file=sys.stderr)
         print(f"  - 最长: {format_duration(overall_stats['max_duration'])}", file=sys.stderr)
+        print(f"  - P50 / P90 / P99: {format_duration(overall_stats['p50_duration'])} / "
+              f"{format_duration(overall_stats['p90_duration'])} / {format_duration(overall_stats['p99_duration'])}",
+              file=sys.stderr)
         print(f"  - 总计: {format_duration(overall_stats['total_duration'])}", file=sys.stderr)
     
     # 资源使用统计
@@ -210,45 +171,35 @@ def display_stats_cli(runs: List[Dict[str, Any]], step_filter: Optional[str] = N
         print(f"\n💻 资源使用:", file=sys.stderr)
         if overall_stats['avg_cpu'] is not None:
             print(f"  - 平均 CPU: {overall_stats['avg_cpu']:.1f} 核", file=sys.stderr)
+        if overall_stats.get('avg_cpu_efficiency') is not None:
+            print(f"  - 平均 CPU 效率: {overall_stats['avg_cpu_efficiency']:.1f}%", file=sys.stderr)
         if overall_stats['avg_memory'] is not None:
             print(f"  - 平均内存: {format_memory(overall_stats['avg_memory'])}", file=sys.stderr)
+            print(f"  - 峰值内存: {format_memory(overall_stats['max_memory'])}", file=sys.stderr)
     
-    # 按步骤分组统计（如果未指定步骤过滤器）
-    if not step_filter and len(runs) > 1:
-        step_stats = calculate_step_stats(runs)
-        if step_stats:
-            print(f"\n📈 按步骤统计:", file=sys.stderr)
-            print(f"{'步骤':<40} {'执行次数':<10} {'成功率':<10} {'平均时长':<15}", file=sys.stderr)
-            print(f"{'-'*80}", file=sys.stderr)
-            
-            # 按执行次数排序
-            sorted_steps = sorted(step_stats.items(), key=lambda x: x[1]['total_runs'], reverse=True)
-            for step_name, stats in sorted_steps:
-                success_rate_str = f"{stats['success_rate']:.1f}%" if stats['total_runs'] > 0 else "N/A"
-                avg_duration_str = format_duration(stats['avg_duration'])
-                print(f"{step_name:<40} {stats['total_runs']:<10} {success_rate_str:<10} {avg_duration_str:<15}", file=sys.stderr)
+    # 按步骤分组统计
+    if step_stats:
+        print(f"\n📈 按步骤统计:", file=sys.stderr)
+        print(f"{'步骤':<40} {'执行次数':<10} {'成功率':<10} {'平均时长':<15} {'P90时长':<15}", file=sys.stderr)
+        print(f"{'-'*95}", file=sys.stderr)
+        
+        # 按执行次数排序
+        sorted_steps = sorted(step_stats.items(), key=lambda x: x[1]['total_runs'], reverse=True)
+        for step_name, stats in sorted_steps:
+            success_rate_str = f"{stats['success_rate']:.1f}%" if stats['total_runs'] > 0 else "N/A"
+            avg_duration_str = format_duration(stats['avg_duration'])
+            p90_duration_str = format_duration(stats['p90_duration'])
+            print(f"{step_name:<40} {stats['total_runs']:<10} {success_rate_str:<10} {avg_duration_str:<15} {p90_duration_str:<15}", file=sys.stderr)
     
     # 趋势分析（如果启用）
-    if show_trend and len(runs) > 1:
+    if trend and overall_stats['total_runs'] > 1:
         print(f"\n📉 趋势分析:", file=sys.stderr)
-        # 按时间排序
-        sorted_runs = sorted(runs, key=lambda x: x.get('timestamp', ''))
-        
-        # 计算最近几次的执行情况
-        recent_runs = sorted_runs[-10:] if len(sorted_runs) > 10 else sorted_runs
-        recent_success = sum(1 for r in recent_runs if r.get('status') == 'success')
-        recent_failed = sum(1 for r in recent_runs if r.get('status') == 'failed')
-        recent_rate = (recent_success / len(recent_runs) * 100) if recent_runs else 0.0
-        
-        print(f"  - 最近 {len(recent_runs)} 次执行成功率: {recent_rate:.1f}%", file=sys.stderr)
+        print(f"  - 最近 {trend['window']} 次执行成功率: {trend['success_rate']:.1f}%", file=sys.stderr)
         
         # 时长趋势
-        recent_durations = [r.get('duration') for r in recent_runs if r.get('duration') is not None]
-        if recent_durations:
-            recent_avg = sum(recent_durations) / len(recent_durations)
-            if overall_stats['avg_duration']:
-                trend = "📈 上升" if recent_avg > overall_stats['avg_duration'] else "📉 下降"
-                print(f"  - 最近平均时长: {format_duration(recent_avg)} ({trend})", file=sys.stderr)
+        if trend['avg_duration'] is not None and overall_stats['avg_duration']:
+            direction = "📈 上升" if trend['avg_duration'] > overall_stats['avg_duration'] else "📉 下降"
+            print(f"  - 最近平均时长: {format_duration(trend['avg_duration'])} ({direction})", file=sys.stderr)
 
 
 def export_stats(runs: List[Dict[str, Any]], output_path: str, step_filter: Optional[str] = None, show_trend: bool = False):
@@ -280,8 +231,12 @@ def export_stats(runs: List[Dict[str, Any]], output_path: str, step_filter: Opti
             'min_duration': overall_stats['min_duration'],
             'max_duration': overall_stats['max_duration'],
             'total_duration': overall_stats['total_duration'],
+            'p50_duration': overall_stats['p50_duration'],
+            'p90_duration': overall_stats['p90_duration'],
+            'p99_duration': overall_stats['p99_duration'],
             'avg_cpu': overall_stats['avg_cpu'],
-            'avg_memory': overall_stats['avg_memory']
+            'avg_memory': overall_stats['avg_memory'],
+            'max_memory': overall_stats['max_memory']
         },
         'step_stats': {
             step_name: {
@@ -291,7 +246,9 @@ def export_stats(runs: List[Dict[str, Any]], output_path: str, step_filter: Opti
                 'success_rate': round(stats['success_rate'], 2),
                 'avg_duration': stats['avg_duration'],
                 'min_duration': stats['min_duration'],
-                'max_duration': stats['max_duration']
+                'max_duration': stats['max_duration'],
+                'p90_duration': stats['p90_duration'],
+                'max_memory': stats['max_memory']
             }
             for step_name, stats in step_stats.items()
         },
@@ -331,10 +288,14 @@ def export_csv(data: Dict[str, Any], output_file: Path):
         writer.writerow(['汇总', '最短时长(秒)', data['summary']['min_duration']])
         writer.writerow(['汇总', '最长时长(秒)', data['summary']['max_duration']])
         writer.writerow(['汇总', '总时长(秒)', data['summary']['total_duration']])
+        writer.writerow(['汇总', 'P50时长(秒)', data['summary']['p50_duration']])
+        writer.writerow(['汇总', 'P90时长(秒)', data['summary']['p90_duration']])
+        writer.writerow(['汇总', 'P99时长(秒)', data['summary']['p99_duration']])
         if data['summary']['avg_cpu'] is not None:
             writer.writerow(['汇总', '平均CPU(核)', data['summary']['avg_cpu']])
         if data['summary']['avg_memory'] is not None:
             writer.writerow(['汇总', '平均内存(MB)', data['summary']['avg_memory']])
+            writer.writerow(['汇总', '峰值内存(MB)', data['summary']['max_memory']])
         
         writer.writerow([])  # 空行
         
@@ -392,40 +353,58 @@ def handle_stats_cmd(manager, args) -> int:
         print(f"[ERROR] 分支目录不存在: {branch_dir}", file=sys.stderr)
         return 1
     
-    # 加载运行历史
-    runs = load_run_history(branch_dir)
-    
     # 检查是否有数据
-    run_info_file = branch_dir / '.run_info'
-    if not run_info_file.exists():
-        print(f"[INFO] 未找到运行历史记录（.run_info 文件不存在）", file=sys.stderr)
+    if not RunHistory(branch_dir).exists():
+        print(f"[INFO] 未找到运行历史记录（运行历史文件不存在）", file=sys.stderr)
         print(f"[INFO] 分支目录: {branch_dir}", file=sys.stderr)
         print(f"[INFO] 请先执行一些步骤（使用 edp -run），然后再次查看统计", file=sys.stderr)
         return 0
     
-    if not runs:
-        print(f"[INFO] 运行历史记录为空（.run_info 文件存在但无数据）", file=sys.stderr)
+    # 从汇总中查询（只汇总上次查询之后追加的记录）
+    run_stats = get_run_stats(branch_dir)
+    total_runs = run_stats.total_runs
+    if total_runs == 0:
+        print(f"[INFO] 运行历史记录为空（运行历史文件存在但无数据）", file=sys.stderr)
         print(f"[INFO] 分支目录: {branch_dir}", file=sys.stderr)
         return 0
     
     # 应用过滤器
     step_filter = args.stats  # 如果提供了 flow.step 参数
-    if step_filter:
-        original_count = len(runs)
-        runs = filter_history(runs, step_filter=step_filter)
-        if not runs:
-            print(f"[INFO] 未找到匹配的历史记录（步骤 '{step_filter}' 没有执行记录）", file=sys.stderr)
-            print(f"[INFO] 总记录数: {original_count}", file=sys.stderr)
-            return 0
+    rollup = run_stats.query(step_filter)
+    if step_filter and rollup.total_runs == 0:
+        print(f"[INFO] 未找到匹配的历史记录（步骤 '{step_filter}' 没有执行记录）", file=sys.stderr)
+        print(f"[INFO] 总记录数: {total_runs}", file=sys.stderr)
+        return 0
+    
+    # 资源推荐（--recommend）
+    if getattr(args, 'recommend', False):
+        percentile = getattr(args, 'percentile', None) or DEFAULT_PERCENTILE
+        headroom = getattr(args, 'headroom', None)
+        headroom = DEFAULT_HEADROOM if headroom is None else headroom
+        recommendations = recommend_resources(run_stats, step_filter, percentile, headroom)
+        print_recommendations(recommendations, percentile, headroom)
+        overlay_file = getattr(args, 'overlay', None)
+        if overlay_file:
+            try:
+                write_overlay(build_overlay(recommendations), overlay_file, percentile, headroom)
+                print(f"[OK] 推荐配置已写入: {overlay_file}", file=sys.stderr)
+            except OSError as e:
+                print(f"[ERROR] 写入推荐配置失败: {e}", file=sys.stderr)
+                return 1
+        return 0
     
     # 显示统计
     show_trend = getattr(args, 'trend', False)
-    display_stats_cli(runs, step_filter=step_filter, show_trend=show_trend)
+    step_stats = run_stats.step_stats() if not step_filter and total_runs > 1 else {}
+    print_stats_cli(rollup.to_stats(), step_stats, rollup.trend() if show_trend else None, step_filter)
     
-    # 导出功能（如果指定）
+    # 导出功能（如果指定，导出包含详细运行记录）
     export_file = getattr(args, 'export', None)
     if export_file:
         try:
+            runs = load_run_history(branch_dir)
+            if step_filter:
+                runs = filter_history(runs, step_filter=step_filter)
             export_stats(runs, export_file, step_filter=step_filter, show_trend=show_trend)
             print(f"[OK] 统计信息已导出到: {export_file}", file=sys.stderr)
         except Exception as e:
@@ -433,4 +412,3 @@ def handle_stats_cmd(manager, args) -> int:
             return 1
     
     return 0
-
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+资源推荐模块
+处理 -stats --recommend：根据运行历史中实测的峰值内存和 CPU 使用，
+为每个步骤推荐 LSF 的 cpu_num 和 memory，并可输出可直接合并到配置中的 YAML
+"""
+
+import math
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from ..utils.run_stats import RunStats, match_step_filter, step_display_name
+
+DEFAULT_PERCENTILE = 95.0
+DEFAULT_HEADROOM = 20.0
+DEFAULT_MIN_RUNS = 3
+
+# 样本数少于此值时，实测值至少取记录到的最大值（少量样本的分位数不能代表尾部）
+SMALL_SAMPLE_RUNS = 10
+
+# 推荐的内存按此粒度向上取整（MB）
+MEMORY_GRANULARITY = 1000
+
+
+def _round_memory(mb: float) -> int:
+    return max(MEMORY_GRANULARITY, int(math.ceil(mb / MEMORY_GRANULARITY)) * MEMORY_GRANULARITY)
+
+
+def recommend_resources(run_stats: RunStats, step_filter: Optional[str] = None,
+                        percentile: float = DEFAULT_PERCENTILE, headroom: float = DEFAULT_HEADROOM,
+                        min_runs: int = DEFAULT_MIN_RUNS) -> List[Dict[str, Any]]:
+    """
+    按步骤推荐 cpu_num 和 memory
+
+    - memory：峰值内存的 P{percentile} × (1 + headroom%)，按 1000MB 向上取整
+    - cpu_num：实际使用核数（CPU 时间 / 运行时间）的 P{percentile} × (1 + headroom%)，向上取整；
+      不超过当前申请的 cpu_num（CPU 用满不代表需要更多核，只建议减少）
+    样本数少于 min_runs 的指标不给出推荐；少于 SMALL_SAMPLE_RUNS 时实测值至少取记录到的最大值，
+    推荐值不会低于出现过的峰值。
+
+    Args:
+        run_stats: 运行统计汇总
+        step_filter: 步骤过滤器（flow.step 或 step）
+        percentile: 分位数（0-100）
+        headroom: 余量百分比
+        min_runs: 最少样本数
+
+    Returns:
+        推荐列表，每项包含 flow、step、样本数、申请值、实测值和推荐值（无推荐时为 None）
+    """
+    q = min(max(percentile, 0.0), 100.0) / 100
+    factor = 1 + headroom / 100
+    recommendations = []
+    for (flow, step), rollup in sorted(run_stats.rollups.items()):
+        if not match_step_filter(flow, step, step_filter):
+            continue
+        if rollup.memories.count < min_runs and rollup.cores.count < min_runs:
+            continue
+
+        _, cpu_requested, memory_requested = rollup.requested or (None, None, None)
+        item = {
+            'flow': flow,
+            'step': step,
+            'memory_samples': rollup.memories.count,
+            'cpu_samples': rollup.cores.count,
+            'memory_requested': memory_requested,
+            'cpu_requested': cpu_requested,
+            'memory_measured': None,
+            'cores_measured': None,
+            'cpu_efficiency': rollup.to_stats()['avg_cpu_efficiency'],
+            'memory': None,
+            'cpu_num': None,
+        }
+
+        if rollup.memories.count >= min_runs:
+            measured = rollup.memory_quantile(q)
+            if rollup.memories.count < SMALL_SAMPLE_RUNS:
+                measured = max(measured, rollup.memory_max)
+            item['memory_measured'] = measured
+            item['memory'] = _round_memory(max(measured * factor, measured))
+
+        if rollup.cores.count >= min_runs:
+            measured = rollup.cores_quantile(q)
+            if rollup.cores.count < SMALL_SAMPLE_RUNS:
+                measured = max(measured, rollup.cores_max)
+            item['cores_measured'] = measured
+            cpu_num = max(1, int(math.ceil(max(measured * factor, measured))))
+            if cpu_requested:
+                cpu_num = min(cpu_num, int(cpu_requested))
+            item['cpu_num'] = cpu_num
+
+        recommendations.append(item)
+    return recommendations
+
+
+def build_overlay(recommendations: List[Dict[str, Any]]) -> Dict[str, Dict[str, Dict[str, int]]]:
+    """
+    生成配置覆盖（与 config.yaml 相同的 {flow: {step: {cpu_num, memory}}} 结构）
+
+    只包含与当前申请值不同的项。
+    """
+    overlay: Dict[str, Dict[str, Dict[str, int]]] = {}
+    for item in recommendations:
+        values = {}
+        if item['cpu_num'] is not None and item['cpu_num'] != item['cpu_requested']:
+            values['cpu_num'] = item['cpu_num']
+        if item['memory'] is not None and item['memory'] != item['memory_requested']:
+            values['memory'] = item['memory']
+        if values:
+            overlay.setdefault(item['flow'], {})[item['step']] = values
+    return overlay
+
+
+def write_overlay(overlay: Dict[str, Any], output_path: str, percentile: float, headroom: float):
+    """写入 YAML 配置覆盖文件"""
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    header = (
+        f"# edp -stats --recommend 生成于 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"# 峰值内存和 CPU 使用的 P{percentile:g} + {headroom:g}% 余量\n"
+        f"# 合并到 user_config.yaml 或 flow 的 config.yaml 中即可生效\n"
+    )
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(header)
+        if overlay:
+            yaml.safe_dump(overlay, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+
+
+def _format_value(value: Optional[float], unit: str = '') -> str:
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f"{value:.1f}{unit}"
+    return f"{value}{unit}"
+
+
+def print_recommendations(recommendations: List[Dict[str, Any]], percentile: float, headroom: float) -> None:
+    """在 CLI 中显示推荐结果"""
+    print(f"\n{'━'*100}", file=sys.stderr)
+    print(f"资源推荐（P{percentile:g} + {headroom:g}% 余量）", file=sys.stderr)
+    print(f"{'━'*100}", file=sys.stderr)
+
+    if not recommendations:
+        print("[INFO] 没有足够的资源使用记录（需要 LSF 或本地执行记录的 peak_memory / cpu_time）", file=sys.stderr)
+        return
+
+    print(f"{'步骤':<32} {'样本':<6} {'内存申请':<10} {'内存实测':<10} {'内存推荐':<10} "
+          f"{'CPU申请':<8} {'核数实测':<8} {'CPU效率':<8} {'CPU推荐':<8}", file=sys.stderr)
+    print(f"{'-'*100}", file=sys.stderr)
+    for item in recommendations:
+        samples = max(item['memory_samples'], item['cpu_samples'])
+        efficiency = item['cpu_efficiency']
+        print(f"{step_display_name(item['flow'], item['step']):<32} {samples:<6} "
+              f"{_format_value(item['memory_requested']):<10} {_format_value(item['memory_measured']):<10} "
+              f"{_format_value(item['memory']):<10} {_format_value(item['cpu_requested']):<8} "
+              f"{_format_value(item['cores_measured']):<8} "
+              f"{(f'{efficiency:.0f}%' if efficiency is not None else '-'):<8} "
+              f"{_format_value(item['cpu_num']):<8}", file=sys.stderr)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+CLI 启动测试
+测试轻量命令（edp -h）不导入重量级模块，以及命令注册表中的处理函数都可以解析
+"""
+
+import subprocess
+import unittest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+
+from main.cli.command_registry import COMMAND_HANDLERS, get_handler
+
+EDP_SCRIPT = edp_center_root / 'bin' / 'edp.py'
+
+HEAVY_MODULES = (
+    'edp_center.main.workflow_manager',
+    'edp_center.packages.edp_flowkit',
+    'edp_center.packages.edp_cmdkit',
+    'edp_center.packages.edp_configkit',
+    'edp_center.packages.edp_dirkit',
+    'yaml',
+    'tkinter',
+)
+
+
+class TestCliStartup(unittest.TestCase):
+    """测试 CLI 启动时的延迟导入"""
+
+    def test_help_does_not_import_heavy_modules(self):
+        """测试 edp -h 只导入参数解析需要的模块"""
+        result = subprocess.run([sys.executable, '-X', 'importtime', str(EDP_SCRIPT), '-h'],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertIn('usage: edp', result.stdout)
+
+        imported = {line.rsplit('|', 1)[1].strip() for line in result.stderr.splitlines()
+                    if line.startswith('import time:') and 'self [us]' not in line}
+        self.assertIn('edp_center.main.cli.arg_parser.main', imported)
+        heavy = sorted(m for m in imported if any(m == h or m.startswith(h + '.') for h in HEAVY_MODULES))
+        self.assertEqual(heavy, [])
+
+    def test_registry_handlers_resolve(self):
+        """测试注册表中的每个命令都能解析到可调用的处理函数"""
+        for name in COMMAND_HANDLERS:
+            self.assertTrue(callable(get_handler(name)), name)
+
+        from main.cli import commands
+        from main.cli.commands.cmd_handlers import handle_run_cmd
+        self.assertIs(commands.handle_run_cmd, handle_run_cmd)
+        self.assertIs(get_handler('run'), handle_run_cmd)
+        with self.assertRaises(AttributeError):
+            commands.handle_unknown_cmd
+
+
+if __name__ == '__main__':
+    unittest.main()
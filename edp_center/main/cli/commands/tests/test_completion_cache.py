@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+补全缓存测试
+测试分区的生成和过期检查、只刷新过期分区、补全从缓存回答并在后台刷新过期分区
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+sys.path.insert(0, str(edp_center_root.parent))
+
+from main.cli.completion import cache
+from main.cli.completion import helpers
+
+DEPENDENCY = """pnr_innovus:
+  dependency:
+    FP_MODE:
+      - place:
+          out: place.pass
+          cmd: place.tcl
+      - {extra}:
+          in: place.pass
+          cmd: {extra}.tcl
+"""
+
+VERSION_FILE = """project: dongting
+version: P85
+foundry: SAMSUNG
+node: S8
+blocks:
+  block1:
+    users:
+      user1: {}
+      user2: {}
+"""
+
+
+def _touch(path: Path):
+    # 保证 mtime 变化（有些文件系统的时间戳精度较低）
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000))
+
+
+class TestCompletionCache(unittest.TestCase):
+    """测试补全缓存"""
+
+    def setUp(self):
+        cache._loaded.clear()
+        cache._scheduled.clear()
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='edp_completion_test_')).resolve()
+        self.edp_center = self.temp_dir / 'edp_center'
+        self.flow_dir = self.edp_center / 'config' / 'SAMSUNG' / 'S8' / 'common' / 'pnr_innovus'
+        self.flow_dir.mkdir(parents=True)
+        (self.edp_center / 'config' / 'SAMSUNG' / 'S8' / 'dongting').mkdir()
+        self.dependency = self.flow_dir / 'dependency.yaml'
+        self.dependency.write_text(DEPENDENCY.format(extra='postroute'), encoding='utf-8')
+
+        self.version_dir = self.temp_dir / 'WORK_PATH' / 'dongting' / 'P85'
+        self.branch_dir = self.version_dir / 'block1' / 'user1' / 'main'
+        self.branch_dir.mkdir(parents=True)
+        (self.version_dir / '.edp_version').write_text(VERSION_FILE, encoding='utf-8')
+        self.cache_file = cache.get_cache_file_path(self.edp_center)
+
+        self.cwd = os.getcwd()
+        os.chdir(self.branch_dir)
+        self.flows_key = 'flows:SAMSUNG/S8/dongting'
+        self.branches_key = f"branches:{self.version_dir / 'block1'}"
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        cache._loaded.clear()
+        cache._scheduled.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def test_refresh_stale_sections(self):
+        """测试只重新生成来源 mtime 变化的分区"""
+        self.assertTrue(cache.update_completion_cache(self.edp_center))
+        sections = cache.load_completion_cache(self.cache_file)['sections']
+        self.assertEqual(sorted(sections),
+                         sorted(['config', self.flows_key, f"work:{self.version_dir}", self.branches_key]))
+        self.assertEqual(sections[self.flows_key]['data'], {'pnr_innovus': ['place', 'postroute']})
+        self.assertEqual(sections[f"work:{self.version_dir}"]['data']['blocks'], {'block1': ['user1', 'user2']})
+        self.assertTrue(all(cache.is_section_fresh(section) for section in sections.values()))
+
+        # 修改 dependency.yaml、新建 branch 只影响对应的分区
+        self.dependency.write_text(DEPENDENCY.format(extra='route'), encoding='utf-8')
+        _touch(self.dependency)
+        (self.version_dir / 'block1' / 'user1' / 'test1').mkdir()
+        _touch(self.version_dir / 'block1' / 'user1')
+        refreshed = cache.refresh_completion_cache(list(sections), self.edp_center, self.cache_file)
+        self.assertEqual(sorted(refreshed), sorted([self.flows_key, self.branches_key]))
+
+        loaded = cache.load_completion_cache(self.cache_file)
+        self.assertEqual(loaded['sections']['config'], sections['config'])
+        self.assertEqual(cache.get_cached_completions(loaded, 'steps', flow='pnr_innovus'), ['place', 'route'])
+        self.assertEqual(cache.get_cached_completions(loaded, 'branches', version_dir=str(self.version_dir),
+                                                      block='block1', user='user1'), ['main', 'test1'])
+        self.assertEqual(cache.refresh_completion_cache(list(sections), self.edp_center, self.cache_file), [])
+
+    def test_complete_from_cache(self):
+        """测试补全只读取缓存，从当前目录推断项目和 branch，过期分区交给后台刷新"""
+        with patch.object(cache, '_spawn_refresh') as spawn:
+            # 没有缓存时返回空列表，并请求后台生成
+            self.assertEqual(helpers.complete_flow_steps('pnr_innovus'), [])
+            self.assertEqual(spawn.call_count, 1)
+            self.assertIn('config', spawn.call_args[0][0])
+
+            cache.update_completion_cache(self.edp_center)
+            os.unlink(cache._refresh_lock(self.cache_file))
+            cache._scheduled.clear()
+            self.assertEqual(helpers.complete_flow_steps('pnr_innovus'),
+                             ['pnr_innovus.place', 'pnr_innovus.postroute'])
+            self.assertEqual(helpers.complete_flows(), ['pnr_innovus'])
+            self.assertEqual(helpers.complete_branches(), ['main'])
+            self.assertEqual(helpers.complete_users(), ['user1', 'user2'])
+            self.assertEqual(helpers.complete_versions(), ['P85'])
+            self.assertEqual(helpers.complete_projects(), ['dongting'])
+            self.assertEqual(spawn.call_count, 1)
+
+            # 来源变化后仍用缓存中的内容回答，同时只请求刷新过期的分区（每个进程只请求一次）
+            (self.version_dir / 'block1' / 'user1' / 'test1').mkdir()
+            _touch(self.version_dir / 'block1' / 'user1')
+            self.assertEqual(helpers.complete_branches(), ['main'])
+            self.assertEqual(spawn.call_count, 2)
+            command = spawn.call_args[0][0]
+            self.assertEqual(command[command.index('--refresh') + 1:], [self.branches_key])
+            helpers.complete_branches()
+            self.assertEqual(spawn.call_count, 2)
+
+    def test_background_refresh(self):
+        """测试后台刷新进程生成缺失的分区并删除锁文件"""
+        lock = cache._refresh_lock(self.cache_file)
+        self.assertTrue(cache.schedule_refresh(['config', self.flows_key], self.edp_center, self.cache_file))
+        # 刷新进程运行期间不重复启动
+        self.assertFalse(cache.schedule_refresh([self.branches_key], self.edp_center, self.cache_file))
+
+        deadline = time.time() + 60
+        while lock.exists() and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(lock.exists())
+        loaded = cache.load_completion_cache(self.cache_file)
+        self.assertEqual(sorted(loaded['sections']), ['config', self.flows_key])
+        self.assertEqual(cache.get_cached_completions(loaded, 'projects'), ['dongting'])
+
+    def test_spawn_failure_releases_lock(self):
+        """测试刷新进程启动失败时删除锁文件"""
+        lock = cache._refresh_lock(self.cache_file)
+        with patch.object(cache, '_spawn_refresh', side_effect=OSError("no python")):
+            self.assertFalse(cache.schedule_refresh(['config'], self.edp_center, self.cache_file))
+        self.assertFalse(lock.exists())
+        with patch.object(cache, '_spawn_refresh') as spawn:
+            self.assertTrue(cache.schedule_refresh(['config'], self.edp_center, self.cache_file))
+        self.assertEqual(spawn.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+edp daemon 测试
+测试只读命令的判断、客户端与 daemon 之间的请求转发和输出捕获，以及 daemon 拒绝请求时的回退
+"""
+
+import contextlib
+import io
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+sys.path.insert(0, str(edp_center_root.parent))
+
+from edp_center.main.cli.daemon import client
+from edp_center.main.cli.daemon.client import is_daemon_command, run_via_daemon
+from edp_center.main.cli.daemon.protocol import CODE_ROOT, connect, recv_message, send_message
+from edp_center.main.cli.daemon.server import EdpDaemon, daemon_status, stop_daemon
+
+EDP_SCRIPT = edp_center_root / 'bin' / 'edp.py'
+EXAMPLE_BRANCH = edp_center_root.parent / 'Example' / 'WORK_PATH' / 'dongting' / 'P85' / 'block1' / 'user1' / 'main'
+
+
+def _fake_runner(argv):
+    print(f"argv={argv} cwd={os.getcwd()}")
+    print(f"env={os.environ.get('EDP_TEST_VALUE')} daemon={os.environ.get('EDP_DAEMON')}", file=sys.stderr)
+    logging.getLogger('edp.test').warning("logged")
+    if argv[-1] == 'boom':
+        raise ValueError("boom")
+    return 3
+
+
+class TestDaemon(unittest.TestCase):
+    """测试 edp daemon"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='edp_daemon_test_'))
+        os.chmod(self.temp_dir, 0o700)
+        self.socket = self.temp_dir / 'daemon.sock'
+        self._saved_env = dict(os.environ)
+        os.environ['EDP_DAEMON_SOCKET'] = str(self.socket)
+        os.environ.pop('EDP_DAEMON', None)
+        client._attempted = False
+        self.thread = None
+
+    def tearDown(self):
+        if self.thread is not None:
+            stop_daemon(self.socket)
+            self.thread.join(10)
+        os.environ.clear()
+        os.environ.update(self._saved_env)
+        client._attempted = False
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _start(self, **kwargs) -> EdpDaemon:
+        daemon = EdpDaemon(self.socket, idle_timeout=60, **kwargs)
+        ready = threading.Event()
+        self.thread = threading.Thread(target=daemon.serve_forever, kwargs={'ready': ready.set}, daemon=True)
+        self.thread.start()
+        self.assertTrue(ready.wait(30))
+        return daemon
+
+    def _run_client(self, argv):
+        client._attempted = False
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exit_code = run_via_daemon(argv)
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def test_is_daemon_command(self):
+        """测试只有只读查询命令交给 daemon"""
+        self.assertTrue(is_daemon_command(['-info']))
+        self.assertTrue(is_daemon_command(['-prj', 'dongting', '-info', 'pnr_innovus']))
+        self.assertTrue(is_daemon_command(['-stats', '--recommend']))
+        self.assertTrue(is_daemon_command(['-hist']))
+        self.assertFalse(is_daemon_command(['-run', 'pnr_innovus.place']))
+        self.assertFalse(is_daemon_command(['-info', '-run', 'pnr_innovus.place']))
+        self.assertFalse(is_daemon_command(['-h']))
+        self.assertFalse(is_daemon_command([]))
+
+    def test_no_daemon(self):
+        """测试 daemon 未运行或被禁用时返回 None"""
+        self.assertEqual(self._run_client(['-info']), (None, '', ''))
+        self._start(runner=_fake_runner)
+        os.environ['EDP_DAEMON'] = '0'
+        self.assertEqual(self._run_client(['-info']), (None, '', ''))
+
+    def test_forward_request(self):
+        """测试请求在客户端的目录和环境变量下执行，stdout / stderr / 日志按顺序返回"""
+        self._start(runner=_fake_runner)
+        os.environ['EDP_TEST_VALUE'] = 'from-client'
+        logger = logging.getLogger()
+        handler = logging.StreamHandler(sys.__stderr__)
+        logger.addHandler(handler)
+        try:
+            exit_code, stdout, stderr = self._run_client(['-info', 'pnr_innovus'])
+        finally:
+            logger.removeHandler(handler)
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(stdout, f"argv=['-info', 'pnr_innovus'] cwd={os.getcwd()}\n")
+        self.assertEqual(stderr, "env=from-client daemon=0\nlogged\n")
+        # daemon 进程自身的状态已恢复
+        self.assertNotIn('EDP_DAEMON', os.environ)
+        self.assertIs(handler.stream, sys.__stderr__)
+
+        exit_code, _, stderr = self._run_client(['-stats', 'boom'])
+        self.assertEqual(exit_code, 1)
+        self.assertIn('ValueError: boom', stderr)
+        self.assertEqual(daemon_status(self.socket)['requests'], 2)
+
+    def test_env_not_forwarded(self):
+        """测试只有命令需要的环境变量转发给 daemon"""
+        self._start(runner=lambda argv: print(f"{os.environ.get('EDP_TEST_VALUE')} {os.environ.get('SECRET_TOKEN')}"))
+        os.environ['EDP_TEST_VALUE'] = 'kept'
+        os.environ['SECRET_TOKEN'] = 'hidden'
+        self.assertEqual(self._run_client(['-info']), (0, 'kept None\n', ''))
+
+    def test_insecure_socket_dir(self):
+        """测试 socket 目录权限过宽或属于其他用户时客户端在本进程执行"""
+        daemon = self._start(runner=_fake_runner)
+        os.chmod(self.temp_dir, 0o777)
+        try:
+            self.assertIsNone(connect(self.socket))
+            self.assertEqual(self._run_client(['-info']), (None, '', ''))
+        finally:
+            os.chmod(self.temp_dir, 0o700)
+
+        other_uid = os.getuid() + 1
+        with mock.patch('edp_center.main.cli.daemon.protocol.os.getuid', return_value=other_uid):
+            self.assertEqual(self._run_client(['-info']), (None, '', ''))
+        self.assertEqual(daemon.requests, 0)
+        self.assertEqual(self._run_client(['-info'])[0], 3)
+
+    def test_peer_uid_mismatch(self):
+        """测试 daemon 进程不属于当前用户时客户端在本进程执行"""
+        daemon = self._start(runner=_fake_runner)
+        with mock.patch('edp_center.main.cli.daemon.protocol.peer_uid', return_value=os.getuid() + 1):
+            self.assertEqual(self._run_client(['-info']), (None, '', ''))
+        self.assertEqual(daemon.requests, 0)
+
+    def test_fallback(self):
+        """测试使用不同代码的客户端、源文件被修改时 daemon 拒绝请求"""
+        daemon = self._start(runner=_fake_runner)
+        sock = connect(self.socket)
+        with sock:
+            send_message(sock, {'argv': ['-info'], 'cwd': os.getcwd(), 'env': {},
+                                'python': sys.executable, 'code_root': '/other/edp'})
+            self.assertIn('fallback', recv_message(sock))
+
+        source = self.temp_dir / 'module.py'
+        source.write_text('# module\n')
+        daemon._source_mtimes[str(source)] = os.stat(source).st_mtime_ns
+        os.utime(source, ns=(0, 0))
+        self.assertEqual(self._run_client(['-info']), (None, '', ''))
+        self.thread.join(10)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(self.socket.exists())
+        self.assertEqual(daemon.requests, 0)
+
+    @unittest.skipUnless(EXAMPLE_BRANCH.is_dir(), "Example 目录不存在")
+    def test_info_matches_local(self):
+        """测试经过 daemon 的 edp -info 与在本进程执行的输出一致"""
+        self._start()
+        cwd = os.getcwd()
+        os.chdir(EXAMPLE_BRANCH)
+        try:
+            exit_code, stdout, stderr = self._run_client(['-info'])
+        finally:
+            os.chdir(cwd)
+        local = subprocess.run([sys.executable, str(EDP_SCRIPT), '-info'], cwd=str(EXAMPLE_BRANCH),
+                               env=dict(os.environ, EDP_DAEMON='0'), stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True, timeout=120)
+        self.assertEqual((exit_code, stdout, stderr), (local.returncode, local.stdout, local.stderr))
+        self.assertIn('pnr_innovus', stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
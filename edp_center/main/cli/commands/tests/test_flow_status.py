@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+edp -info flow 状态收集测试
+测试并发收集与依次收集的结果相同，以及 map_step_flows 与 find_step_flow 一致
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+sys.path.insert(0, str(edp_center_root.parent))
+
+from edp_center.benchmarks import bench_flow_status as bench
+from main.cli.utils.dependency_parser import find_step_flow, map_step_flows
+
+
+class TestFlowStatus(unittest.TestCase):
+    """测试 flow 状态收集"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='edp_flow_status_test_'))
+        self.branch_dir = bench.create_tree(self.temp_dir, flows=2, steps=6, runs=2)
+        self.edp_center = self.temp_dir / 'edp_center'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parallel_matches_serial(self):
+        """测试并发收集与依次收集得到相同的快照和显示内容"""
+        manager = bench.WorkflowManager(self.edp_center)
+        _, serial_snapshot, serial_text = bench.collect(manager, self.edp_center, self.branch_dir, 1, 0)
+        _, parallel_snapshot, parallel_text = bench.collect(manager, self.edp_center, self.branch_dir, 8, 0)
+
+        self.assertEqual(serial_snapshot, parallel_snapshot)
+        self.assertEqual(serial_text, parallel_text)
+        self.assertEqual(parallel_snapshot['order'], [f'flow0_s{i}' for i in range(6)])
+        step = parallel_snapshot['steps']['flow0_s1']
+        self.assertFalse(step['ready'])
+        self.assertEqual(step['pre_steps'], ['flow0.flow0_s0'])
+        self.assertEqual(step['post_steps'], ['flow0.flow0_s2'])
+        self.assertEqual(step['sub_steps'], [{'flow0_s1_a.tcl': 'flow0::flow0_s1_a'}])
+        self.assertTrue(parallel_snapshot['steps']['flow0_s0']['ready'])
+        self.assertTrue(step['run'][0])
+
+    def test_map_step_flows(self):
+        """测试一次读取得到的 step -> flow 映射与逐个查找相同"""
+        mapping = map_step_flows(self.edp_center, bench.FOUNDRY, bench.NODE, bench.PROJECT)
+        self.assertEqual(len(mapping), 12)
+        for step, flow in mapping.items():
+            self.assertEqual(find_step_flow(self.edp_center, bench.FOUNDRY, bench.NODE, bench.PROJECT, step), flow)
+
+
+if __name__ == '__main__':
+    unittest.main()
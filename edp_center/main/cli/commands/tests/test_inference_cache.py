@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+推断缓存测试
+测试 .edp_version、项目 / 工作路径推断结果和 config 目录树的缓存及其失效
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+
+from main.cli.commands.tests.test_helpers import create_test_args
+from main.cli.utils import unified_inference
+from main.cli.utils.inference import clear_inference_cache, list_projects_direct
+from main.cli.utils.unified_inference import UnifiedInference
+from main.cli.init.params import find_edp_version_file
+from edp_center.packages.edp_common import ProjectNotFoundError
+
+
+def _write_version(path: Path, node: str):
+    path.write_text(f"project: dongting\nversion: P85\nfoundry: SAMSUNG\nnode: {node}\n", encoding='utf-8')
+    # 保证 mtime 变化（有些文件系统的时间戳精度较低）
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000))
+
+
+class TestInferenceCache(unittest.TestCase):
+    """测试推断缓存"""
+
+    def setUp(self):
+        clear_inference_cache()
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='edp_inference_test_'))
+        self.edp_center = self.temp_dir / 'edp_center'
+        self.config_path = self.edp_center / 'config'
+        (self.config_path / 'SAMSUNG' / 'S8' / 'dongting').mkdir(parents=True)
+        (self.config_path / 'SAMSUNG' / 'S8' / 'common').mkdir()
+        (self.config_path / 'SAMSUNG' / 'common').mkdir()
+
+        self.version_dir = self.temp_dir / 'WORK_PATH' / 'dongting' / 'P85'
+        self.branch_dir = self.version_dir / 'block1' / 'user1' / 'main'
+        self.branch_dir.mkdir(parents=True)
+        self.version_file = self.version_dir / '.edp_version'
+        _write_version(self.version_file, 'S8')
+        self.args = create_test_args(edp_center=str(self.edp_center))
+
+    def tearDown(self):
+        clear_inference_cache()
+        shutil.rmtree(self.temp_dir)
+
+    def test_version_file(self):
+        """测试 .edp_version 按 mtime 缓存，返回值修改不影响缓存"""
+        version_file, info = find_edp_version_file(self.branch_dir)
+        self.assertEqual(version_file, self.version_file)
+        self.assertEqual(info['node'], 'S8')
+        info['node'] = 'changed'
+        self.assertEqual(find_edp_version_file(self.branch_dir)[1]['node'], 'S8')
+
+        _write_version(self.version_file, 'S5')
+        self.assertEqual(find_edp_version_file(self.branch_dir)[1]['node'], 'S5')
+
+        # 之后在更近的目录中新建的 .edp_version 优先
+        nearer_file = self.branch_dir.parent / '.edp_version'
+        _write_version(nearer_file, 'S3')
+        self.assertEqual(find_edp_version_file(self.branch_dir), (nearer_file, {
+            'foundry': 'SAMSUNG', 'node': 'S3', 'project': 'dongting', 'version': 'P85'}))
+        nearer_file.unlink()
+        self.assertEqual(find_edp_version_file(self.branch_dir)[0], self.version_file)
+
+        self.version_file.unlink()
+        self.assertEqual(find_edp_version_file(self.branch_dir), (None, None))
+
+    def test_inference_memoized(self):
+        """测试重复推断只计算一次，.edp_version 修改后重新推断"""
+        inference = UnifiedInference(self.edp_center)
+        with patch.object(unified_inference, '_infer_project_info_func',
+                          wraps=unified_inference._infer_project_info_func) as compute:
+            first = inference.infer_project_info(self.branch_dir, self.args)
+            self.assertEqual((first['foundry'], first['node'], first['project']), ('SAMSUNG', 'S8', 'dongting'))
+            first['node'] = 'changed'
+            for _ in range(3):
+                self.assertEqual(inference.infer_project_info(self.branch_dir, self.args)['node'], 'S8')
+            self.assertEqual(compute.call_count, 1)
+
+            # 参数不同时分别缓存
+            other_args = create_test_args(edp_center=str(self.edp_center), node='S5')
+            self.assertEqual(inference.infer_project_info(self.branch_dir, other_args)['node'], 'S5')
+            self.assertEqual(compute.call_count, 2)
+
+            _write_version(self.version_file, 'S5')
+            self.assertEqual(inference.infer_project_info(self.branch_dir, self.args)['node'], 'S5')
+            self.assertEqual(compute.call_count, 3)
+
+        work_path_info = inference.infer_work_path_info(self.branch_dir, self.args)
+        self.assertEqual((work_path_info['version'], work_path_info['block'], work_path_info['branch']),
+                         ('P85', 'block1', 'main'))
+        self.assertEqual(work_path_info['work_path'], (self.temp_dir / 'WORK_PATH').resolve())
+
+        # project_info 不同时分别缓存
+        with patch.object(unified_inference, '_infer_work_path_info_func',
+                          wraps=unified_inference._infer_work_path_info_func) as compute:
+            project_info = inference.infer_project_info(self.branch_dir, self.args)
+            inference.infer_work_path_info(self.branch_dir, self.args, project_info)
+            inference.infer_work_path_info(self.branch_dir, self.args, project_info)
+            inference.infer_work_path_info(self.branch_dir, self.args, dict(project_info, node='S3'))
+            self.assertEqual(compute.call_count, 2)
+
+    def test_project_info_follows_config_tree(self):
+        """测试 config 目录树变化后重新推断项目信息"""
+        self.version_file.write_text("project: tianshan\nversion: P85\n", encoding='utf-8')
+        (self.config_path / 'TSMC' / 'N5' / 'tianshan').mkdir(parents=True)
+        inference = UnifiedInference(self.edp_center)
+        info = inference.infer_project_info(self.branch_dir, self.args)
+        self.assertEqual((info['foundry'], info['node']), ('TSMC', 'N5'))
+
+        (self.config_path / 'TSMC' / 'N5' / 'tianshan').rename(self.config_path / 'SAMSUNG' / 'S8' / 'tianshan')
+        info = inference.infer_project_info(self.branch_dir, self.args)
+        self.assertEqual((info['foundry'], info['node']), ('SAMSUNG', 'S8'))
+
+    def test_config_tree(self):
+        """测试 config 目录树在增删项目、node 目录后更新"""
+        self.assertEqual(list_projects_direct(self.config_path),
+                         [{'foundry': 'SAMSUNG', 'node': 'S8', 'project': 'dongting'}])
+
+        (self.config_path / 'SAMSUNG' / 'S8' / 'kunlun').mkdir()
+        (self.config_path / 'TSMC' / 'N5' / 'tianshan').mkdir(parents=True)
+        self.assertEqual([p['project'] for p in list_projects_direct(self.config_path)],
+                         ['dongting', 'kunlun', 'tianshan'])
+        self.assertEqual([p['project'] for p in list_projects_direct(self.config_path, foundry='SAMSUNG')],
+                         ['dongting', 'kunlun'])
+
+        shutil.rmtree(self.config_path / 'SAMSUNG' / 'S8' / 'dongting')
+        self.assertEqual([p['project'] for p in list_projects_direct(self.config_path, node='S8')], ['kunlun'])
+
+        # 版本文件中没有 foundry/node 时，从 config 目录树查找项目所属的 foundry 和 node
+        self.version_file.write_text("project: tianshan\nversion: P85\n", encoding='utf-8')
+        info = UnifiedInference(self.edp_center).infer_project_info(self.branch_dir, self.args)
+        self.assertEqual((info['foundry'], info['node']), ('TSMC', 'N5'))
+
+    def test_ambiguous_project(self):
+        """测试 config 目录树中有多个同名项目时报错，指定 node 后可以推断"""
+        (self.config_path / 'SAMSUNG' / 'S5' / 'dongting').mkdir(parents=True)
+        self.version_file.write_text("project: dongting\nversion: P85\n", encoding='utf-8')
+        inference = UnifiedInference(self.edp_center)
+        with self.assertRaises(ProjectNotFoundError) as ctx:
+            inference.infer_project_info(self.branch_dir, self.args)
+        self.assertIn('SAMSUNG/S5', str(ctx.exception))
+        self.assertIn('SAMSUNG/S8', str(ctx.exception))
+
+        args = create_test_args(edp_center=str(self.edp_center), node='S5')
+        info = inference.infer_project_info(self.branch_dir, args)
+        self.assertEqual((info['foundry'], info['node']), ('SAMSUNG', 'S5'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行历史存储测试
+测试追加、旧 .run_info 导入（读取时只读）、不完整记录和多进程并发追加
+"""
+
+import multiprocessing
+import unittest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+
+from main.cli.commands.tests.test_helpers import TestFixture, create_test_run_info
+from main.cli.utils.run_history import RunHistory, RUN_HISTORY_FILE_NAME
+from main.cli.commands.run_helpers import update_run_info
+from main.cli.commands.run_info_extension_example import update_run_info_extended
+from main.cli.utils.run_stats import RunStats, ROLLUP_FILE_NAME
+from main.cli.commands.info_handler import get_step_execution_status
+
+
+def _append_worker(branch_dir: str, worker: int, count: int):
+    history = RunHistory(Path(branch_dir))
+    for i in range(count):
+        history.append({'timestamp': f'2025-01-01 10:{worker:02d}:{i:02d}', 'flow': 'pv', 'step': f's{worker}', 'index': i})
+
+
+class TestRunHistory(unittest.TestCase):
+    """测试运行历史存储"""
+
+    def setUp(self):
+        self.fixture = TestFixture()
+        self.branch_dir = self.fixture.branch_dir
+
+    def tearDown(self):
+        self.fixture.cleanup()
+
+    def test_append_and_last_run(self):
+        """测试追加记录和查询步骤最近一次运行"""
+        update_run_info(self.branch_dir, 'pv_calibre', 'ipmerge', {'step': ['step.pre']})
+        history = RunHistory(self.branch_dir)
+        history.append({'timestamp': '2099-01-01 00:00:00', 'flow': 'pv_calibre', 'step': 'ipmerge', 'status': 'failed'})
+        history.append({'timestamp': '2000-01-01 00:00:00', 'flow': 'pv_calibre', 'step': 'ipmerge', 'status': 'success'})
+
+        runs = history.load()
+        self.assertEqual(len(runs), 3)
+        self.assertEqual(runs[0]['hooks'], {'step': ['step.pre']})
+        self.assertEqual(get_step_execution_status(self.branch_dir, 'pv_calibre', 'ipmerge'),
+                         (True, 'failed', '2099-01-01 00:00:00'))
+        self.assertEqual(get_step_execution_status(self.branch_dir, 'pv_calibre', 'drc'), (False, None, None))
+        self.assertEqual([r['status'] for r in history.iter_runs(status='success')], ['success'])
+
+        # 返回的是副本，修改不影响后续读取
+        runs[0]['flow'] = 'changed'
+        self.assertEqual(history.load()[0]['flow'], 'pv_calibre')
+
+    def test_migrate_legacy_run_info(self):
+        """测试导入旧的 .run_info，导入后追加的记录排在旧记录之后"""
+        legacy = [
+            {'timestamp': '2025-01-01 10:00:00', 'flow': 'pv_calibre', 'step': 'ipmerge', 'status': 'success'},
+            {'timestamp': '2025-01-01 11:00:00', 'flow': 'pnr_innovus', 'step': 'place', 'status': 'failed'},
+        ]
+        create_test_run_info(self.branch_dir, legacy)
+        history = RunHistory(self.branch_dir)
+        self.assertTrue(history.exists())
+
+        history.append({'timestamp': '2025-01-02 10:00:00', 'flow': 'pv_calibre', 'step': 'drc'})
+        self.assertFalse((self.branch_dir / '.run_info').exists())
+        self.assertTrue((self.branch_dir / '.run_info.migrated').exists())
+        self.assertEqual([r['step'] for r in history.load()], ['ipmerge', 'place', 'drc'])
+
+    def test_load_does_not_migrate(self):
+        """测试读取（包括统计汇总）只读地解析旧 .run_info，不修改 branch 目录"""
+        legacy = [{'timestamp': '2025-01-01 10:00:00', 'flow': 'pv_calibre', 'step': 'ipmerge',
+                   'status': 'success', 'duration': 60.0}]
+        create_test_run_info(self.branch_dir, legacy)
+        before = sorted(p.name for p in self.branch_dir.iterdir())
+
+        history = RunHistory(self.branch_dir)
+        self.assertEqual([r['step'] for r in history.load()], ['ipmerge'])
+        self.assertEqual(history.last_run('pv_calibre', 'ipmerge')['status'], 'success')
+        self.assertEqual(RunStats(self.branch_dir).refresh().overall_stats()['total_runs'], 1)
+        self.assertTrue((self.branch_dir / '.run_info').exists())
+        self.assertFalse((self.branch_dir / RUN_HISTORY_FILE_NAME).exists())
+        self.assertEqual(sorted(p.name for p in self.branch_dir.iterdir() if p.name != ROLLUP_FILE_NAME), before)
+
+        # 第一次追加时才导入；导入后统计不重复计算旧记录
+        stats = RunStats(self.branch_dir).refresh()
+        update_run_info_extended(self.branch_dir, 'pv_calibre', 'drc', {'step': []}, status='failed', duration=5.0)
+        self.assertFalse((self.branch_dir / '.run_info').exists())
+        self.assertEqual([r['step'] for r in history.load()], ['ipmerge', 'drc'])
+        self.assertEqual(history.load()[-1]['status'], 'failed')
+        self.assertEqual(stats.refresh().overall_stats()['total_runs'], 2)
+
+    def test_skip_partial_and_invalid_lines(self):
+        """测试跳过无法解析的行，末尾不完整的行在写完后读取"""
+        history = RunHistory(self.branch_dir)
+        history.append({'timestamp': '2025-01-01 10:00:00', 'step': 'a'})
+        with open(self.branch_dir / RUN_HISTORY_FILE_NAME, 'ab') as f:
+            f.write(b'not json\n{"timestamp": "2025-01-01 11:00:00", "st')
+        self.assertEqual([r['step'] for r in history.load()], ['a'])
+
+        with open(self.branch_dir / RUN_HISTORY_FILE_NAME, 'ab') as f:
+            f.write(b'ep": "b"}\n')
+        self.assertEqual([r['step'] for r in history.load()], ['a', 'b'])
+
+    def test_concurrent_appends(self):
+        """测试多个进程同时追加不丢失记录"""
+        ctx = multiprocessing.get_context('spawn')
+        workers = [ctx.Process(target=_append_worker, args=(str(self.branch_dir), w, 50)) for w in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join(60)
+            self.assertEqual(p.exitcode, 0)
+
+        runs = RunHistory(self.branch_dir).load()
+        self.assertEqual(len(runs), 200)
+        for w in range(4):
+            self.assertEqual([r['index'] for r in runs if r['step'] == f's{w}'], list(range(50)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+run_range 准备阶段测试
+测试所有步骤都先准备（依次或在进程池中），准备失败的步骤一起报告，且不启动任何步骤
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+sys.path.insert(0, str(edp_center_root.parent))
+
+import main.cli.utils  # noqa: F401  先导入 utils，避免循环导入
+from main.cli.commands import run_range
+from main.cli.commands.run_single_step import PreparedStep
+from edp_center.packages.edp_flowkit.flowkit import Graph, Step
+
+ARGS = argparse.Namespace(run=None, work_path='.', project=None, version=None, block=None, user=None,
+                          branch=None, foundry=None, node=None, dry_run=True, debug=False,
+                          edp_center=None, config=None)
+
+
+def _prepared(flow_step: str) -> PreparedStep:
+    flow_name, step_name = flow_step.split('.', 1)
+    branch_dir = Path('/branch')
+    return PreparedStep(flow_name=flow_name, step_name=step_name, branch_dir=branch_dir,
+                        hooks_dir=branch_dir / 'hooks' / flow_step,
+                        output_file=branch_dir / 'cmds' / flow_name / f'{step_name}.tcl',
+                        full_tcl_path=branch_dir / 'runs' / flow_step / 'full.tcl',
+                        recorded_tcl_path=branch_dir / 'runs' / flow_step / 'full.tcl',
+                        merged_config={'pid': os.getpid()})
+
+
+def _fake_prepare(manager, args, flow_step, **kwargs):
+    if flow_step == 'pnr.route':
+        raise ValueError("constraint 验证失败")
+    if flow_step == 'pnr.cts':
+        return None
+    return _prepared(flow_step)
+
+
+class _Manager:
+    """可以 pickle 的 WorkflowManager 替身（进程池会把 manager 传给每个任务）"""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def load_workflow(self, foundry, node, project, flow=None):
+        return self.graph
+
+
+class TestRunRange(unittest.TestCase):
+    """测试 run_range 的准备阶段"""
+
+    def setUp(self):
+        # place -> cts -> route
+        self.graph = Graph(steps_dict={
+            name: Step(name, f'{name}.tcl', inputs, outputs)
+            for name, inputs, outputs in [('place', [], ['place.pass']), ('cts', ['place.pass'], ['cts.pass']),
+                                          ('route', ['cts.pass'], ['route.pass'])]
+        })
+
+    def test_prepare_steps_reports_all_errors(self):
+        """测试所有步骤都会准备，失败的步骤全部返回"""
+        with patch.object(run_range, 'prepare_single_step', side_effect=_fake_prepare) as prepare:
+            prepared, errors = run_range.prepare_steps(
+                None, ARGS, ['pnr.place', 'pnr.cts', 'pnr.route'], {}, {}, Path('.'), max_workers=1)
+        self.assertEqual(prepare.call_count, 3)
+        self.assertEqual(list(prepared), ['pnr.place'])
+        self.assertEqual(prepared['pnr.place'].output_file, Path('/branch/cmds/pnr/place.tcl'))
+        self.assertEqual(errors, {'pnr.cts': "准备失败（原因见上方输出）", 'pnr.route': "constraint 验证失败"})
+
+    def test_nothing_launched_when_preparation_fails(self):
+        """测试有步骤准备失败时不启动任何步骤"""
+        manager = MagicMock()
+        manager.load_workflow.return_value = self.graph
+        project_info = {'edp_center_path': Path('/edp_center'), 'foundry': 'F', 'node': 'N', 'project': 'prj'}
+        work_path_info = {'work_path': '/wp', 'project': 'prj', 'version': 'P1', 'block': 'blk',
+                          'user': 'usr', 'branch': 'main'}
+        with patch.object(run_range, 'infer_and_validate_project_info', return_value=project_info), \
+                patch.object(run_range, 'infer_work_path_info', return_value=work_path_info), \
+                patch.object(run_range, 'map_step_flows', return_value={'place': 'pnr', 'cts': 'pnr', 'route': 'pnr'}), \
+                patch.object(run_range, 'prepare_single_step', side_effect=_fake_prepare), \
+                patch.object(run_range, 'PREPARE_MAX_WORKERS', 1), \
+                patch.object(run_range, 'launch_prepared_step') as launch:
+            self.assertEqual(run_range.handle_run_range(manager, ARGS, 'pnr.place', 'pnr.route', None), 1)
+        launch.assert_not_called()
+
+    def test_launch_in_dependency_order(self):
+        """测试全部准备好后按依赖顺序启动（前置步骤结束后才启动后续步骤）"""
+        manager = MagicMock()
+        manager.load_workflow.return_value = self.graph
+        project_info = {'edp_center_path': Path('/edp_center'), 'foundry': 'F', 'node': 'N', 'project': 'prj'}
+        work_path_info = {'work_path': '/wp', 'project': 'prj', 'version': 'P1', 'block': 'blk',
+                          'user': 'usr', 'branch': 'main'}
+        launched = []
+
+        def launch(args, prepared):
+            launched.append(f"{prepared.flow_name}.{prepared.step_name}")
+            return 0
+
+        with patch.object(run_range, 'infer_and_validate_project_info', return_value=project_info), \
+                patch.object(run_range, 'infer_work_path_info', return_value=work_path_info), \
+                patch.object(run_range, 'map_step_flows', return_value={'place': 'pnr', 'cts': 'pnr', 'route': 'pnr'}), \
+                patch.object(run_range, 'prepare_single_step', side_effect=lambda m, a, s, **kw: _prepared(s)), \
+                patch.object(run_range, 'PREPARE_MAX_WORKERS', 1), \
+                patch.object(run_range, 'launch_prepared_step', side_effect=launch):
+            self.assertEqual(run_range.handle_run_range(manager, ARGS, 'place', 'route', None), 0)
+        self.assertEqual(launched, ['pnr.place', 'pnr.cts', 'pnr.route'])
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                         '子进程需要继承测试中替换的 prepare_single_step（fork）')
+    def test_process_pool_reports_all_errors(self):
+        """测试 max_workers > 1 时在进程池中准备（参数和结果可以 pickle），失败的步骤全部报告且不启动任何步骤"""
+        steps = ['pnr.place', 'pnr.cts', 'pnr.route', 'pnr.place_opt']
+        with patch.object(run_range, 'prepare_single_step', side_effect=_fake_prepare):
+            prepared, errors = run_range.prepare_steps(
+                _Manager(self.graph), ARGS, steps, {}, {}, Path('.'), max_workers=4)
+        self.assertEqual(sorted(prepared), ['pnr.place', 'pnr.place_opt'])
+        self.assertNotEqual(prepared['pnr.place'].merged_config['pid'], os.getpid())
+        self.assertEqual(errors, {'pnr.cts': "准备失败（原因见上方输出）", 'pnr.route': "constraint 验证失败"})
+
+        project_info = {'edp_center_path': Path('/edp_center'), 'foundry': 'F', 'node': 'N', 'project': 'prj'}
+        work_path_info = {'work_path': '/wp', 'project': 'prj', 'version': 'P1', 'block': 'blk',
+                          'user': 'usr', 'branch': 'main'}
+        stderr = io.StringIO()
+        with patch.object(run_range, 'infer_and_validate_project_info', return_value=project_info), \
+                patch.object(run_range, 'infer_work_path_info', return_value=work_path_info), \
+                patch.object(run_range, 'map_step_flows', return_value={'place': 'pnr', 'cts': 'pnr', 'route': 'pnr'}), \
+                patch.object(run_range, 'prepare_single_step', side_effect=_fake_prepare), \
+                patch.object(run_range, 'PREPARE_MAX_WORKERS', 3), \
+                patch.object(run_range, 'launch_prepared_step') as launch, \
+                patch('sys.stderr', stderr):
+            self.assertEqual(run_range.handle_run_range(_Manager(self.graph), ARGS, 'place', 'route', None), 1)
+        launch.assert_not_called()
+        output = stderr.getvalue()
+        self.assertIn('以下 2 个步骤准备失败', output)
+        self.assertIn('pnr.cts: 准备失败', output)
+        self.assertIn('pnr.route: constraint 验证失败', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行统计汇总测试
+测试分位数草图精度、增量汇总与完整计算一致、持久化汇总只读取新追加的记录
+"""
+
+import math
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+
+from main.cli.commands.tests.test_helpers import TestFixture
+from main.cli.utils.run_history import RunHistory
+from main.cli.utils.run_stats import QuantileSketch, RunStats, ROLLUP_FILE_NAME
+from main.cli.commands.stats_handler import calculate_stats, calculate_step_stats
+
+
+def _make_run(i: int) -> dict:
+    return {
+        'timestamp': f'2025-01-{1 + i // 1440:02d} {i // 60 % 24:02d}:{i % 60:02d}:00',
+        'flow': 'pnr_innovus' if i % 3 else 'pv_calibre',
+        'step': f'step{i % 4}',
+        'status': 'success' if i % 5 else 'failed',
+        'duration': float(10 + (i * 37) % 1000),
+        'resources': {'cpu_used': 1 + i % 8, 'peak_memory': 1000 + (i * 13) % 5000},
+    }
+
+
+class TestRunStats(unittest.TestCase):
+    """测试运行统计汇总"""
+
+    def setUp(self):
+        self.fixture = TestFixture()
+        self.branch_dir = self.fixture.branch_dir
+
+    def tearDown(self):
+        self.fixture.cleanup()
+
+    def test_sketch_quantiles(self):
+        """测试分位数的相对误差不超过 1%，合并后与整体一致"""
+        rng = random.Random(0)
+        values = [rng.lognormvariate(5, 1.5) for _ in range(5000)]
+        left, right = QuantileSketch(), QuantileSketch()
+        for i, value in enumerate(values):
+            (left if i % 2 else right).add(value)
+        left.merge(right)
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            exact = ordered[math.ceil(q * len(ordered)) - 1]
+            self.assertLessEqual(abs(left.quantile(q) - exact) / exact, 0.011)
+        self.assertEqual(QuantileSketch.from_dict(left.to_dict()).quantile(0.9), left.quantile(0.9))
+
+    def test_small_sample_quantiles(self):
+        """测试样本很少时分位数取向上的最近秩（P99 >= P90 >= P50，P90 不会落到较小的值）"""
+        history = RunHistory(self.branch_dir)
+        for i, duration in enumerate([3600, 0.09]):
+            history.append({'timestamp': f'2025-01-01 10:0{i}:00', 'flow': 'pnr_innovus', 'step': 'place',
+                            'status': 'success', 'duration': duration})
+        stats = RunStats(self.branch_dir).refresh().overall_stats()
+        self.assertAlmostEqual(stats['p90_duration'], 3600, delta=3600 * 0.011)
+        self.assertAlmostEqual(stats['p99_duration'], 3600, delta=3600 * 0.011)
+        self.assertAlmostEqual(stats['p50_duration'], 0.09, delta=0.09 * 0.011)
+
+        sketch = QuantileSketch()
+        for value in (100, 10, 1000):
+            sketch.add(value)
+        expected = {0.0: 10, 0.3: 10, 0.5: 100, 0.66: 100, 0.9: 1000, 0.99: 1000, 1.0: 1000}
+        for q, value in expected.items():
+            self.assertAlmostEqual(sketch.quantile(q), value, delta=value * 0.011, msg=q)
+        self.assertLessEqual(sketch.quantile(0.5), sketch.quantile(0.9))
+        self.assertLessEqual(sketch.quantile(0.9), sketch.quantile(0.99))
+
+        sketch = QuantileSketch()
+        for value in (0, 0, 5):
+            sketch.add(value)
+        self.assertEqual(sketch.quantile(0.5), 0.0)
+        self.assertAlmostEqual(sketch.quantile(0.9), 5, delta=0.06)
+
+    def test_incremental_matches_full(self):
+        """测试增量汇总（含持久化后重新加载）与完整计算的结果一致"""
+        runs = [_make_run(i) for i in range(300)]
+        history = RunHistory(self.branch_dir)
+        for run in runs[:200]:
+            history.append(run)
+        RunStats(self.branch_dir).refresh()
+        self.assertTrue((self.branch_dir / ROLLUP_FILE_NAME).exists())
+
+        for run in runs[200:]:
+            history.append(run)
+        stats = RunStats(self.branch_dir).refresh()
+        self.assertEqual(stats.total_runs, 300)
+
+        expected = calculate_stats(runs)
+        actual = stats.overall_stats()
+        for key in ('total_runs', 'success_count', 'failed_count', 'min_duration', 'max_duration', 'max_memory'):
+            self.assertEqual(actual[key], expected[key], key)
+        for key in ('avg_duration', 'avg_cpu', 'avg_memory', 'p50_duration', 'p90_duration', 'p99_duration'):
+            self.assertAlmostEqual(actual[key], expected[key], places=6, msg=key)
+        self.assertEqual(stats.step_stats().keys(), calculate_step_stats(runs).keys())
+
+        place = [r for r in runs if r['step'] == 'step1']
+        self.assertEqual(stats.overall_stats('step1')['total_runs'], len(place))
+        self.assertEqual(stats.overall_stats('pv_calibre.step1')['total_runs'],
+                         sum(1 for r in place if r['flow'] == 'pv_calibre'))
+        recent = sorted(runs, key=lambda r: r['timestamp'])[-10:]
+        self.assertAlmostEqual(stats.trend()['avg_duration'], sum(r['duration'] for r in recent) / 10)
+
+    def test_rollup_reads_only_new_records(self):
+        """测试重新加载持久化汇总后只解析新追加的记录，历史文件被替换后重新汇总"""
+        history = RunHistory(self.branch_dir)
+        for i in range(50):
+            history.append(_make_run(i))
+        RunStats(self.branch_dir).refresh()
+
+        history.append(_make_run(50))
+        stats = RunStats(self.branch_dir)
+        stats._load_persisted()
+        _, _, records, reset = history.read_tail(stats._inode, stats._offset)
+        self.assertEqual((len(records), reset), (1, False))
+        self.assertEqual(stats.refresh().total_runs, 51)
+
+        # 历史文件被重写（如手动清理旧记录）
+        path = self.branch_dir / '.run_history.jsonl'
+        lines = path.read_bytes().splitlines(keepends=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_bytes(b''.join(lines[-5:]))
+        tmp.replace(path)
+        self.assertEqual(RunStats(self.branch_dir).refresh().total_runs, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
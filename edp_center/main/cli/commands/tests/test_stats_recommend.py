@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+资源推荐测试
+测试按分位数和余量推荐 cpu_num / memory，以及生成的 YAML 配置覆盖
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import yaml
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+
+from main.cli.commands.tests.test_helpers import TestFixture
+from main.cli.utils.run_history import RunHistory
+from main.cli.utils.run_stats import RunStats
+from main.cli.commands.stats_recommend import build_overlay, recommend_resources, write_overlay
+
+
+def _make_run(step: str, i: int, peak_memory: int, cpu_time: float, requested=(32, 40000)) -> dict:
+    return {
+        'timestamp': f'2025-01-01 10:{i:02d}:00',
+        'flow': 'pnr_innovus',
+        'step': step,
+        'status': 'success',
+        # duration 包含排队时间，实际运行时间来自 start_time / end_time（1000 秒）
+        'duration': 1500.0,
+        'resources': {
+            'cpu_used': requested[0],
+            'cpu_time': cpu_time,
+            'peak_memory': peak_memory,
+            'start_time': '2025-01-01 09:00:00',
+            'end_time': '2025-01-01 09:16:40',
+            'cpu_requested': requested[0],
+            'memory_requested': requested[1],
+        },
+    }
+
+
+class TestStatsRecommend(unittest.TestCase):
+    """测试资源推荐"""
+
+    def setUp(self):
+        self.fixture = TestFixture()
+        self.branch_dir = self.fixture.branch_dir
+        history = RunHistory(self.branch_dir)
+        # place：内存 10000~19000MB，平均使用 8 核（申请 32 核）
+        for i in range(10):
+            history.append(_make_run('place', i, 10000 + i * 1000, 8000.0))
+        # route：只有 2 次记录，样本不足
+        for i in range(2):
+            history.append(_make_run('route', i, 30000, 60000.0, requested=(64, 24000)))
+        # cts：已经合适，不出现在配置覆盖中
+        for i in range(5):
+            history.append(_make_run('cts', i, 5000, 3800.0, requested=(4, 6000)))
+        self.stats = RunStats(self.branch_dir).refresh()
+
+    def tearDown(self):
+        self.fixture.cleanup()
+
+    def test_recommend(self):
+        """测试推荐值：内存取分位数加余量并取整，CPU 不超过申请值"""
+        recommendations = {r['step']: r for r in recommend_resources(self.stats, percentile=90, headroom=20)}
+        self.assertEqual(sorted(recommendations), ['cts', 'place'])
+
+        place = recommendations['place']
+        self.assertAlmostEqual(place['memory_measured'], 18000, delta=180)
+        self.assertEqual(place['memory'], 22000)
+        self.assertAlmostEqual(place['cores_measured'], 8.0, delta=0.1)
+        self.assertEqual(place['cpu_num'], 10)
+        self.assertAlmostEqual(place['cpu_efficiency'], 25.0)
+        self.assertEqual((place['cpu_requested'], place['memory_requested']), (32, 40000))
+
+        cts = recommendations['cts']
+        self.assertEqual((cts['cpu_num'], cts['memory']), (4, 6000))
+
+        self.assertEqual([r['step'] for r in recommend_resources(self.stats, step_filter='place')], ['place'])
+        self.assertEqual(len(recommend_resources(self.stats, min_runs=2)), 3)
+
+    def test_small_sample_outlier(self):
+        """测试样本很少时推荐值不低于出现过的峰值（单个离群值）"""
+        history = RunHistory(self.branch_dir)
+        for i, peak in enumerate([10000, 10000, 30000]):
+            history.append(_make_run('route_opt', i, peak, 8000.0 if i < 2 else 24000.0))
+        stats = RunStats(self.branch_dir).refresh()
+        for percentile in (50, 90, 95):
+            item = recommend_resources(stats, step_filter='route_opt', percentile=percentile, headroom=0)[0]
+            self.assertEqual(item['memory_measured'], 30000)
+            self.assertGreaterEqual(item['memory'], 30000)
+            self.assertGreaterEqual(item['cpu_num'], 24)
+
+    def test_overlay(self):
+        """测试配置覆盖只包含需要修改的值，并且可以按 config.yaml 的结构读取"""
+        overlay = build_overlay(recommend_resources(self.stats, percentile=90, headroom=20))
+        self.assertEqual(overlay, {'pnr_innovus': {'place': {'cpu_num': 10, 'memory': 22000}}})
+
+        output = self.branch_dir / 'recommend' / 'resources.yaml'
+        write_overlay(overlay, str(output), 90, 20)
+        text = output.read_text(encoding='utf-8')
+        self.assertTrue(text.startswith('# edp -stats --recommend'))
+        self.assertEqual(yaml.safe_load(text), overlay)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+YAML 解析缓存测试
+测试文件未修改时复用解析结果，修改后重新解析
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+test_file_dir = Path(__file__).resolve().parent
+edp_center_root = test_file_dir.parent.parent.parent.parent
+sys.path.insert(0, str(edp_center_root))
+
+from main.cli.utils.yaml_cache import clear_yaml_cache, load_yaml
+
+
+class TestYamlCache(unittest.TestCase):
+    """测试 YAML 解析缓存"""
+
+    def setUp(self):
+        clear_yaml_cache()
+        self.temp_dir = tempfile.mkdtemp(prefix='edp_yaml_cache_test_')
+        self.yaml_file = Path(self.temp_dir) / 'dependency.yaml'
+        self.yaml_file.write_text('pnr_innovus:\n  dependency: {}\n', encoding='utf-8')
+
+    def tearDown(self):
+        clear_yaml_cache()
+        shutil.rmtree(self.temp_dir)
+
+    def test_reuse_and_invalidate(self):
+        """测试缓存命中和按 mtime 失效"""
+        first = load_yaml(self.yaml_file)
+        self.assertEqual(first, {'pnr_innovus': {'dependency': {}}})
+        self.assertIs(load_yaml(str(self.yaml_file)), first)
+
+        self.yaml_file.write_text('pv_calibre:\n  dependency: {}\n', encoding='utf-8')
+        st = os.stat(self.yaml_file)
+        os.utime(self.yaml_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000))
+        self.assertEqual(load_yaml(self.yaml_file), {'pv_calibre': {'dependency': {}}})
+
+        clear_yaml_cache()
+        self.assertIsNot(load_yaml(self.yaml_file), first)
+
+    def test_missing_file(self):
+        """测试文件不存在时抛出 OSError"""
+        with self.assertRaises(OSError):
+            load_yaml(Path(self.temp_dir) / 'missing.yaml')
+
+
+if __name__ == '__main__':
+    unittest.main()
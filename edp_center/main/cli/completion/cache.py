@@ -4,161 +4,324 @@
 """
 补全配置缓存模块
 生成和读取补全配置缓存，避免每次补全时都进行复杂的运算
+
+缓存按分区（section）组织，每个分区记录生成时各个来源目录 / 文件的 mtime：
+
+- config：所有 foundry、foundry/node、foundry/node/project（来源：config 目录树的前三层）
+- flows:{foundry}/{node}/{project}：每个 flow 的 step 列表
+  （来源：common 和项目配置目录、其中的 flow 目录和 dependency.yaml）
+- work:{version 目录}：项目信息、block -> users、同一项目下的所有 version
+  （来源：.edp_version、项目目录和 block 目录）
+- branches:{block 目录}：user -> branches（来源：block 目录和其中的 user 目录）
+
+补全时只检查用到的分区的来源 mtime（几次 stat），并始终直接用缓存中的内容回答；
+过期或缺失的分区交给一个独立的后台进程重新生成，不会阻塞 TAB 补全。
+本模块在补全时被导入，不能在顶层导入 PyYAML 等较重的模块。
 """
 
 import json
+import os
+import subprocess
 import sys
-from pathlib import Path
-from typing import Dict, List, Optional, Any
+import time
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 
 # 补全配置缓存文件路径（在 edp_center 目录下）
 CACHE_FILE_NAME = '.completion_cache.json'
+# 缓存文件格式版本（旧格式的缓存视为空缓存，由后台重新生成）
+CACHE_FORMAT = 2
+# 后台刷新进程的锁文件超过这个时间（秒）视为残留，允许重新启动刷新
+REFRESH_LOCK_TIMEOUT = 120.0
+
+# 本文件所在的 edp_center 和代码根目录（后台刷新进程以 python -m 方式运行本模块）
+_EDP_CENTER = Path(__file__).resolve().parents[3]
+_CODE_ROOT = _EDP_CENTER.parent
+
+# 已加载的缓存：缓存文件 -> ((mtime, 大小), 缓存内容)
+_loaded: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+# 本进程已经请求过后台刷新的分区
+_scheduled: set = set()
 
 
 def get_cache_file_path(edp_center_path: Optional[Path] = None) -> Path:
     """
     获取补全配置缓存文件路径
-    
+
+    环境变量 EDP_COMPLETION_CACHE 可以指定缓存文件（例如 edp_center 目录对用户只读时）。
+
     Args:
         edp_center_path: edp_center 路径，如果为 None 则自动查找
-        
+
     Returns:
         缓存文件路径
     """
+    if os.environ.get('EDP_COMPLETION_CACHE'):
+        return Path(os.environ['EDP_COMPLETION_CACHE'])
+
     if edp_center_path is None:
-        # 简单查找 edp_center 路径（不导入复杂模块）
-        current = Path.cwd()
-        depth = 0
-        max_depth = 10
-        while current != current.parent and depth < max_depth:
-            potential_edp_center = current / 'edp_center'
-            if potential_edp_center.exists() and (potential_edp_center / 'config').exists():
-                edp_center_path = potential_edp_center
-                break
-            current = current.parent
-            depth += 1
-    
+        edp_center_path = find_edp_center()
+
     if edp_center_path is None:
         # 如果找不到 edp_center，使用用户主目录
         return Path.home() / CACHE_FILE_NAME
-    
-    return edp_center_path / CACHE_FILE_NAME
+
+    return Path(edp_center_path) / CACHE_FILE_NAME
+
+
+def find_edp_center(max_depth: int = 10) -> Optional[Path]:
+    """
+    查找 edp_center 路径：先从当前目录向上查找，找不到时使用本模块所在的 edp_center
+
+    Args:
+        max_depth: 最大查找深度（避免在深层目录中卡住）
+
+    Returns:
+        edp_center 路径，如果找不到则返回 None
+    """
+    # 简单查找 edp_center 路径（不导入复杂模块）
+    current = Path.cwd()
+    depth = 0
+    while current != current.parent and depth < max_depth:
+        potential_edp_center = current / 'edp_center'
+        if potential_edp_center.exists() and (potential_edp_center / 'config').exists():
+            return potential_edp_center
+        current = current.parent
+        depth += 1
+    if (_EDP_CENTER / 'config').is_dir():
+        return _EDP_CENTER
+    return None
+
+
+def find_work_context(start_dir: Optional[Path] = None,
+                      max_depth: int = 10) -> Optional[Tuple[Path, Tuple[str, ...]]]:
+    """
+    从当前目录向上查找 .edp_version 所在的 version 目录（只做 stat，不读取文件）
+
+    Args:
+        start_dir: 起始目录（默认为当前目录）
+        max_depth: 最大查找深度
+
+    Returns:
+        (version 目录, 起始目录相对 version 目录的各级名称) 或 None，
+        例如在 {version}/block1/user1/main 下返回 (version 目录, ('block1', 'user1', 'main'))
+    """
+    current = Path(start_dir) if start_dir is not None else Path.cwd()
+    parts: List[str] = []
+    depth = 0
+    while current != current.parent and depth < max_depth:
+        if (current / '.edp_version').is_file():
+            return current, tuple(reversed(parts))
+        parts.append(current.name)
+        current = current.parent
+        depth += 1
+    return None
+
+
+# ==================== 分区生成 ====================
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _stamp(paths: Iterable[Path]) -> Dict[str, Optional[int]]:
+    return {str(path): _mtime(path) for path in paths}
+
+
+def _visible_subdirs(path: Path) -> List[Path]:
+    try:
+        return sorted(p for p in path.iterdir() if p.is_dir() and not p.name.startswith('.'))
+    except OSError:
+        return []
+
+
+def _build_config(edp_center_path: Path) -> Tuple[List[Path], Dict[str, Any]]:
+    config_path = edp_center_path / 'config'
+    sources = [config_path]
+    foundries: List[str] = []
+    nodes: Dict[str, List[str]] = {}
+    projects: Dict[str, List[str]] = {}
+    for foundry_dir in _visible_subdirs(config_path):
+        sources.append(foundry_dir)
+        foundries.append(foundry_dir.name)
+        nodes[foundry_dir.name] = []
+        for node_dir in _visible_subdirs(foundry_dir):
+            # 跳过 common 目录（common 是配置目录，不是 node）
+            if node_dir.name == 'common':
+                continue
+            sources.append(node_dir)
+            nodes[foundry_dir.name].append(node_dir.name)
+            projects[f"{foundry_dir.name}/{node_dir.name}"] = [
+                p.name for p in _visible_subdirs(node_dir) if p.name != 'common']
+    return sources, {'foundries': foundries, 'nodes': nodes, 'projects': projects}
+
+
+def _build_flows(edp_center_path: Path, foundry: str, node: str,
+                 project: str) -> Tuple[List[Path], Dict[str, Any]]:
+    from ..utils.dependency_parser import list_available_flows
+
+    node_path = edp_center_path / 'config' / foundry / node
+    sources: List[Path] = []
+    for config_dir in (node_path / 'common', node_path / project):
+        sources.append(config_dir)
+        for flow_dir in _visible_subdirs(config_dir):
+            sources.extend([flow_dir, flow_dir / 'dependency.yaml'])
+    flows = list_available_flows(edp_center_path, foundry, node, project)
+    return sources, {flow: list(steps) for flow, steps in sorted(flows.items())}
+
+
+def _build_work(version_dir: Path) -> Tuple[List[Path], Dict[str, Any]]:
+    from ..utils.yaml_cache import load_yaml
+
+    version_file = version_dir / '.edp_version'
+    try:
+        info = load_yaml(version_file)
+    except Exception:
+        info = None
+    if not isinstance(info, dict):
+        info = {}
+    # block 和 user 以 .edp_version 中登记的为准（version 目录下还有 RELEASE 等其他目录），
+    # 再加上 block 目录下已经存在的 user 目录
+    project_dir = version_dir.parent
+    sources = [version_file, project_dir]
+    blocks: Dict[str, List[str]] = {}
+    blocks_info = info.get('blocks')
+    if isinstance(blocks_info, dict):
+        for block, block_info in blocks_info.items():
+            users = block_info.get('users') if isinstance(block_info, dict) else None
+            registered = {str(u) for u in users} if isinstance(users, dict) else set()
+            sources.append(version_dir / str(block))
+            existing = {u.name for u in _visible_subdirs(version_dir / str(block))}
+            blocks[str(block)] = sorted(registered | existing)
+
+    versions = [v.name for v in _visible_subdirs(project_dir) if (v / '.edp_version').is_file()]
+    data = {
+        'foundry': info.get('foundry'),
+        'node': info.get('node'),
+        'project': info.get('project') or project_dir.name,
+        'blocks': dict(sorted(blocks.items())),
+        'versions': versions,
+    }
+    return sources, data
+
+
+def _build_branches(block_dir: Path) -> Tuple[List[Path], Dict[str, Any]]:
+    sources = [block_dir]
+    users: Dict[str, List[str]] = {}
+    for user_dir in _visible_subdirs(block_dir):
+        sources.append(user_dir)
+        users[user_dir.name] = [b.name for b in _visible_subdirs(user_dir)]
+    return sources, users
+
+
+def build_section(key: str, edp_center_path: Path) -> Dict[str, Any]:
+    """
+    生成一个缓存分区
+
+    Args:
+        key: 分区名（config / flows:{foundry}/{node}/{project} / work:{version 目录} / branches:{block 目录}）
+        edp_center_path: edp_center 路径
+
+    Returns:
+        {'sources': {来源路径: mtime}, 'updated_at': 生成时间, 'data': 分区内容}
+    """
+    kind, _, arg = key.partition(':')
+    if kind == 'config':
+        sources, data = _build_config(edp_center_path)
+    elif kind == 'flows':
+        foundry, node, project = arg.split('/', 2)
+        sources, data = _build_flows(edp_center_path, foundry, node, project)
+    elif kind == 'work':
+        sources, data = _build_work(Path(arg))
+    elif kind == 'branches':
+        sources, data = _build_branches(Path(arg))
+    else:
+        raise ValueError(f"未知的补全缓存分区: {key}")
+    return {'sources': _stamp(sources), 'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'data': data}
+
+
+def is_section_fresh(section: Optional[Dict[str, Any]]) -> bool:
+    """分区存在，且所有来源的 mtime 与生成时相同"""
+    if not section:
+        return False
+    return all(_mtime(Path(path)) == mtime for path, mtime in section.get('sources', {}).items())
+
+
+def _empty_cache(edp_center_path: Path) -> Dict[str, Any]:
+    return {'format': CACHE_FORMAT, 'edp_center_path': str(edp_center_path), 'sections': {}}
 
 
 def generate_completion_cache(edp_center_path: Optional[Path] = None) -> Dict[str, Any]:
     """
-    生成补全配置缓存
-    
+    生成完整的补全配置缓存（config、每个项目的 flows，以及当前目录所在的 work / branches 分区）
+
     Args:
         edp_center_path: edp_center 路径，如果为 None 则自动查找
-        
+
     Returns:
         补全配置字典
     """
-    from .helpers import (
-        complete_projects, complete_foundries, complete_nodes,
-        complete_flows, complete_blocks, complete_users, complete_versions
-    )
-    
     if edp_center_path is None:
-        from .helpers import find_edp_center_path
-        edp_center_path = find_edp_center_path()
-    
+        edp_center_path = find_edp_center()
+
     if edp_center_path is None:
         return {}
-    
-    cache = {
-        'generated_at': datetime.now().isoformat(),
-        'edp_center_path': str(edp_center_path),
-        'projects': {},
-        'foundries': [],
-        'nodes': {},
-        'flows': {},
-        'blocks': {},
-        'users': {},
-        'versions': []
-    }
-    
+
+    edp_center_path = Path(edp_center_path)
+    cache = _empty_cache(edp_center_path)
+    sections = cache['sections']
     try:
-        # 1. 获取所有 foundry
-        cache['foundries'] = complete_foundries()
-        
-        # 2. 获取所有 foundry/node 组合
-        for foundry in cache['foundries']:
-            nodes = complete_nodes(foundry=foundry)
-            cache['nodes'][foundry] = nodes
-            
-            # 3. 获取每个 foundry/node 下的项目
-            for node in nodes:
-                projects = complete_projects(foundry=foundry, node=node)
-                cache['projects'][f"{foundry}/{node}"] = projects
-                
-                # 4. 获取每个项目的 flow
-                for project in projects:
-                    flows = complete_flows(project=project, foundry=foundry, node=node)
-                    cache['flows'][f"{foundry}/{node}/{project}"] = flows
-        
-        # 5. 从当前目录的 config.yaml 读取 blocks 和 users（如果存在）
-        try:
-            current_dir = Path.cwd()
-            config_file = current_dir / 'config.yaml'
-            if config_file.exists():
-                import yaml
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f) or {}
-                
-                project_config = config.get('project', {})
-                if isinstance(project_config, dict):
-                    blocks_config = project_config.get('blocks', {})
-                    if isinstance(blocks_config, dict):
-                        cache['blocks'] = list(blocks_config.keys())
-                        
-                        # 获取所有 users
-                        users = set()
-                        for block_users in blocks_config.values():
-                            if isinstance(block_users, str):
-                                users.update(block_users.split())
-                            elif isinstance(block_users, list):
-                                users.update(str(u) for u in block_users)
-                        cache['users'] = sorted(users)
-        except Exception:
-            pass
-        
-        # 6. 获取所有 version
-        cache['versions'] = complete_versions()
-        
+        sections['config'] = build_section('config', edp_center_path)
+        for foundry_node, projects in sections['config']['data']['projects'].items():
+            for project in projects:
+                key = f"flows:{foundry_node}/{project}"
+                sections[key] = build_section(key, edp_center_path)
+
+        context = find_work_context()
+        if context is not None:
+            version_dir, parts = context
+            sections[f"work:{version_dir}"] = build_section(f"work:{version_dir}", edp_center_path)
+            if parts:
+                key = f"branches:{version_dir / parts[0]}"
+                sections[key] = build_section(key, edp_center_path)
     except Exception as e:
         # 如果生成缓存失败，返回空字典
         print(f"警告: 生成补全缓存失败: {e}", file=sys.stderr)
         return {}
-    
+
     return cache
 
 
 def save_completion_cache(cache: Dict[str, Any], cache_file: Optional[Path] = None) -> bool:
     """
-    保存补全配置缓存到文件
-    
+    保存补全配置缓存到文件（先写临时文件再替换，补全时不会读到写了一半的文件）
+
     Args:
         cache: 补全配置字典
         cache_file: 缓存文件路径，如果为 None 则自动确定
-        
+
     Returns:
         是否保存成功
     """
     try:
         if cache_file is None:
             cache_file = get_cache_file_path()
-        
+
         # 确保目录存在
         cache_file.parent.mkdir(parents=True, exist_ok=True)
-        
+
         # 保存到文件
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, indent=2, ensure_ascii=False)
-        
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, cache_file)
+
         return True
     except Exception as e:
         print(f"错误: 保存补全缓存失败: {e}", file=sys.stderr)
@@ -167,156 +330,297 @@ def save_completion_cache(cache: Dict[str, Any], cache_file: Optional[Path] = No
 
 def load_completion_cache(cache_file: Optional[Path] = None) -> Optional[Dict[str, Any]]:
     """
-    从文件加载补全配置缓存
-    
+    从文件加载补全配置缓存（文件未变化时直接返回上次加载的内容）
+
     Args:
         cache_file: 缓存文件路径，如果为 None 则自动确定
-        
+
     Returns:
-        补全配置字典，如果加载失败则返回 None
+        补全配置字典，如果加载失败则返回 None；旧格式的缓存返回不含任何分区的缓存
     """
     try:
         if cache_file is None:
             cache_file = get_cache_file_path()
-        
-        if not cache_file.exists():
-            return None
-        
+
+        st = os.stat(cache_file)
+        signature = (st.st_mtime_ns, st.st_size)
+        loaded = _loaded.get(cache_file)
+        if loaded is not None and loaded[0] == signature:
+            return loaded[1]
+
         with open(cache_file, 'r', encoding='utf-8') as f:
             cache = json.load(f)
-        
+
+        if not isinstance(cache, dict) or cache.get('format') != CACHE_FORMAT:
+            cache = _empty_cache(Path(cache.get('edp_center_path', '')) if isinstance(cache, dict) else Path())
+        _loaded[cache_file] = (signature, cache)
         return cache
     except Exception:
         return None
 
 
-def get_cached_completions(cache: Dict[str, Any], 
+# ==================== 后台刷新 ====================
+
+def _spawn_refresh(command: List[str]):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (str(_CODE_ROOT), env.get('PYTHONPATH')) if p)
+    subprocess.Popen(command, cwd=str(_CODE_ROOT), env=env, stdin=subprocess.DEVNULL,
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def _refresh_lock(cache_file: Path) -> Path:
+    return cache_file.with_name(cache_file.name + '.lock')
+
+
+def schedule_refresh(keys: Iterable[str], edp_center_path: Optional[Path] = None,
+                     cache_file: Optional[Path] = None) -> bool:
+    """
+    启动独立的后台进程刷新指定的分区（补全命令本身不等待）
+
+    同一时间只有一个刷新进程（通过锁文件保证），每个进程对同一分区只请求一次。
+    设置环境变量 EDP_COMPLETION_REFRESH=0 可以禁止后台刷新。
+
+    Returns:
+        是否启动了刷新进程
+    """
+    keys = sorted(set(keys) - _scheduled)
+    if not keys or os.environ.get('EDP_COMPLETION_REFRESH') == '0':
+        return False
+    edp_center_path = edp_center_path or find_edp_center()
+    if edp_center_path is None:
+        return False
+    cache_file = cache_file or get_cache_file_path(edp_center_path)
+    lock = _refresh_lock(cache_file)
+    try:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            if time.time() - os.stat(lock).st_mtime < REFRESH_LOCK_TIMEOUT:
+                return False
+            # 残留的锁文件（刷新进程异常退出）
+            os.unlink(lock)
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        os.close(fd)
+    except OSError:
+        return False
+    try:
+        _spawn_refresh([sys.executable, '-m', 'edp_center.main.cli.completion.cache',
+                        '--edp-center', str(edp_center_path), '--output', str(cache_file),
+                        '--lock', str(lock), '--refresh'] + keys)
+    except OSError:
+        # 刷新进程没有启动，不能让锁文件挡住之后的刷新
+        try:
+            os.unlink(lock)
+        except OSError:
+            pass
+        return False
+    _scheduled.update(keys)
+    return True
+
+
+def refresh_completion_cache(keys: Iterable[str], edp_center_path: Path,
+                             cache_file: Optional[Path] = None) -> List[str]:
+    """
+    重新生成过期或缺失的分区并保存（其他分区保持不变）
+
+    Returns:
+        重新生成的分区
+    """
+    edp_center_path = Path(edp_center_path)
+    cache_file = cache_file or get_cache_file_path(edp_center_path)
+    cache = load_completion_cache(cache_file)
+    if not cache or cache.get('edp_center_path') != str(edp_center_path):
+        cache = _empty_cache(edp_center_path)
+    sections = dict(cache['sections'])
+    refreshed = []
+    for key in keys:
+        if is_section_fresh(sections.get(key)):
+            continue
+        try:
+            sections[key] = build_section(key, edp_center_path)
+        except Exception:
+            sections.pop(key, None)
+            continue
+        refreshed.append(key)
+    if refreshed:
+        save_completion_cache(dict(cache, sections=sections), cache_file)
+    return refreshed
+
+
+def ensure_fresh(cache: Optional[Dict[str, Any]], keys: Iterable[str],
+                 edp_center_path: Optional[Path] = None, cache_file: Optional[Path] = None) -> List[str]:
+    """
+    检查补全用到的分区，过期或缺失的交给后台刷新
+
+    Returns:
+        过期或缺失的分区
+    """
+    sections = (cache or {}).get('sections', {})
+    stale = [key for key in keys if not is_section_fresh(sections.get(key))]
+    if stale:
+        schedule_refresh(stale, edp_center_path, cache_file)
+    return stale
+
+
+# ==================== 查询 ====================
+
+def _section_data(cache: Dict[str, Any], key: str) -> Any:
+    section = cache.get('sections', {}).get(key)
+    return section.get('data') if section else None
+
+
+def _matching_flow_sections(cache: Dict[str, Any], foundry: Optional[str], node: Optional[str],
+                            project: Optional[str]) -> List[Dict[str, List[str]]]:
+    result = []
+    for key, section in sorted(cache.get('sections', {}).items()):
+        if not key.startswith('flows:'):
+            continue
+        f, n, p = key[len('flows:'):].split('/', 2)
+        if (foundry and f != foundry) or (node and n != node) or (project and p != project):
+            continue
+        result.append(section.get('data') or {})
+    return result
+
+
+def get_cached_completions(cache: Dict[str, Any],
                            completion_type: str,
                            **kwargs) -> List[str]:
     """
     从缓存中获取补全列表
-    
+
     Args:
         cache: 补全配置缓存
-        completion_type: 补全类型（'projects', 'foundries', 'nodes', 'flows', 'blocks', 'users', 'versions'）
-        **kwargs: 过滤参数（foundry, node, project 等）
-        
+        completion_type: 补全类型（'projects', 'foundries', 'nodes', 'flows', 'steps',
+                         'blocks', 'users', 'versions', 'branches'）
+        **kwargs: 过滤参数（foundry, node, project, flow, version_dir, block, user）
+
     Returns:
         补全列表
     """
     if not cache:
         return []
-    
+
     try:
+        config = _section_data(cache, 'config') or {}
         if completion_type == 'foundries':
-            return cache.get('foundries', [])
-        
+            return list(config.get('foundries', []))
+
         elif completion_type == 'nodes':
             foundry = kwargs.get('foundry')
             if foundry:
-                nodes = cache.get('nodes', {}).get(foundry, [])
-                return nodes
-            else:
-                # 返回所有 foundry 下的所有 nodes
-                all_nodes = set()
-                for nodes in cache.get('nodes', {}).values():
-                    all_nodes.update(nodes)
-                return sorted(all_nodes)
-        
+                return list(config.get('nodes', {}).get(foundry, []))
+            # 返回所有 foundry 下的所有 nodes
+            return sorted({n for nodes in config.get('nodes', {}).values() for n in nodes})
+
         elif completion_type == 'projects':
             foundry = kwargs.get('foundry')
             node = kwargs.get('node')
             if foundry and node:
-                key = f"{foundry}/{node}"
-                return cache.get('projects', {}).get(key, [])
-            else:
-                # 返回所有项目
-                all_projects = set()
-                for projects in cache.get('projects', {}).values():
-                    all_projects.update(projects)
-                return sorted(all_projects)
-        
+                return list(config.get('projects', {}).get(f"{foundry}/{node}", []))
+            # 返回所有项目
+            return sorted({p for key, projects in config.get('projects', {}).items()
+                           if not foundry or key.startswith(f"{foundry}/")
+                           for p in projects})
+
         elif completion_type == 'flows':
-            foundry = kwargs.get('foundry')
-            node = kwargs.get('node')
-            project = kwargs.get('project')
-            if foundry and node and project:
-                key = f"{foundry}/{node}/{project}"
-                return cache.get('flows', {}).get(key, [])
-            elif foundry and node:
-                # 返回该 foundry/node 下所有项目的 flows
-                all_flows = set()
-                for key, flows in cache.get('flows', {}).items():
-                    if key.startswith(f"{foundry}/{node}/"):
-                        all_flows.update(flows)
-                return sorted(all_flows)
-            else:
-                # 返回所有 flows
-                all_flows = set()
-                for flows in cache.get('flows', {}).values():
-                    all_flows.update(flows)
-                return sorted(all_flows)
-        
-        elif completion_type == 'blocks':
-            return cache.get('blocks', [])
-        
+            sections = _matching_flow_sections(cache, kwargs.get('foundry'), kwargs.get('node'),
+                                               kwargs.get('project'))
+            return sorted({flow for flows in sections for flow in flows})
+
+        elif completion_type == 'steps':
+            # 按 dependency.yaml 中的顺序返回，多个项目的同名 flow 合并
+            flow = kwargs.get('flow')
+            steps: Dict[str, None] = {}
+            for flows in _matching_flow_sections(cache, kwargs.get('foundry'), kwargs.get('node'),
+                                                 kwargs.get('project')):
+                steps.update(dict.fromkeys(flows.get(flow, [])))
+            return list(steps)
+
+        version_dir = kwargs.get('version_dir')
+        work = _section_data(cache, f"work:{version_dir}") if version_dir else None
+        if completion_type == 'blocks':
+            return list((work or {}).get('blocks', {}))
+
         elif completion_type == 'users':
+            blocks = (work or {}).get('blocks', {})
             block = kwargs.get('block')
             if block:
-                # 从 config.yaml 读取特定 block 的 users
-                # 这里简化处理，返回所有 users
-                return cache.get('users', [])
-            else:
-                return cache.get('users', [])
-        
+                return list(blocks.get(block, []))
+            return sorted({u for users in blocks.values() for u in users})
+
         elif completion_type == 'versions':
-            return cache.get('versions', [])
-        
+            return list((work or {}).get('versions', []))
+
+        elif completion_type == 'branches':
+            block, user = kwargs.get('block'), kwargs.get('user')
+            if not (version_dir and block and user):
+                return []
+            branches = _section_data(cache, f"branches:{Path(version_dir) / block}") or {}
+            return list(branches.get(user, []))
+
     except Exception:
         pass
-    
+
     return []
 
 
 def update_completion_cache(edp_center_path: Optional[Path] = None) -> bool:
     """
-    更新补全配置缓存
-    
+    重新生成并保存完整的补全配置缓存
+
     Args:
         edp_center_path: edp_center 路径，如果为 None 则自动查找
-        
+
     Returns:
         是否更新成功
     """
     cache = generate_completion_cache(edp_center_path)
     if not cache:
         return False
-    
-    return save_completion_cache(cache)
 
+    return save_completion_cache(cache, get_cache_file_path(Path(cache['edp_center_path'])))
 
-if __name__ == '__main__':
-    # 命令行工具：生成补全缓存
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行工具：生成补全缓存，或（后台刷新进程）刷新指定分区"""
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='生成 EDP 补全配置缓存')
     parser.add_argument('--edp-center', type=str, help='edp_center 路径')
     parser.add_argument('--output', type=str, help='输出文件路径（默认：edp_center/.completion_cache.json）')
-    
-    args = parser.parse_args()
-    
-    edp_center_path = Path(args.edp_center) if args.edp_center else None
+    parser.add_argument('--refresh', nargs='+', metavar='SECTION', help='只刷新过期或缺失的指定分区')
+    parser.add_argument('--lock', type=str, help='刷新完成后删除的锁文件')
+
+    args = parser.parse_args(argv)
+
+    edp_center_path = Path(args.edp_center) if args.edp_center else find_edp_center()
+    if args.refresh:
+        try:
+            if edp_center_path is None:
+                return 1
+            cache_file = Path(args.output) if args.output else None
+            refresh_completion_cache(args.refresh, edp_center_path, cache_file)
+            return 0
+        finally:
+            if args.lock:
+                try:
+                    os.unlink(args.lock)
+                except OSError:
+                    pass
+
     cache = generate_completion_cache(edp_center_path)
-    
+
     if cache:
         cache_file = Path(args.output) if args.output else get_cache_file_path(edp_center_path)
         if save_completion_cache(cache, cache_file):
             print(f"✅ 补全缓存已生成: {cache_file}")
-            print(f"   生成时间: {cache.get('generated_at', 'unknown')}")
-        else:
-            print("❌ 保存补全缓存失败", file=sys.stderr)
-            sys.exit(1)
-    else:
-        print("❌ 生成补全缓存失败", file=sys.stderr)
-        sys.exit(1)
+            print(f"   分区数量: {len(cache['sections'])}")
+            return 0
+        print("❌ 保存补全缓存失败", file=sys.stderr)
+        return 1
+    print("❌ 生成补全缓存失败", file=sys.stderr)
+    return 1
 
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,19 +3,22 @@
 
 """
 命令补全辅助模块
-提供动态补全功能，支持项目、flow、block 等自动补全
+提供动态补全功能，支持项目、flow、step、block、branch 等自动补全
+
+所有补全都只从补全缓存（completion/cache.py）读取，不遍历 config 或 WORK_PATH；
+用到的缓存分区过期或缺失时由后台进程刷新，本次补全仍使用缓存中已有的内容。
+当前目录在某个 version 目录下时，未指定的 foundry / node / project / block / user
+从该 version 的缓存分区和当前目录推断。
 """
 
-import sys
-import os
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional
 
 # 尝试导入补全缓存模块
 try:
     from .cache import (
         load_completion_cache, get_cached_completions,
-        get_cache_file_path
+        ensure_fresh, find_work_context, find_edp_center
     )
     CACHE_AVAILABLE = True
 except ImportError:
@@ -24,7 +27,7 @@ except ImportError:
 
 def find_edp_center_path(max_depth: int = 10) -> Optional[Path]:
     """
-    从当前目录向上查找 edp_center 路径
+    从当前目录向上查找 edp_center 路径（找不到时使用当前代码所在的 edp_center）
     
     Args:
         max_depth: 最大查找深度（避免在深层目录中卡住）
@@ -32,15 +35,48 @@ def find_edp_center_path(max_depth: int = 10) -> Optional[Path]:
     Returns:
         edp_center 路径，如果找不到则返回 None
     """
-    current = Path.cwd()
-    depth = 0
-    while current != current.parent and depth < max_depth:
-        potential_edp_center = current / 'edp_center'
-        if potential_edp_center.exists() and (potential_edp_center / 'config').exists():
-            return potential_edp_center
-        current = current.parent
-        depth += 1
-    return None
+    return find_edp_center(max_depth)
+
+
+def _lookup(completion_type: str, **kwargs) -> List[str]:
+    """
+    从缓存读取补全列表，并让后台刷新用到的过期分区
+
+    Args:
+        completion_type: 补全类型（见 cache.get_cached_completions）
+        **kwargs: 过滤参数，值为 None 的参数从当前目录推断
+    """
+    if not CACHE_AVAILABLE:
+        return []
+
+    try:
+        cache = load_completion_cache() or {}
+        keys = ['config']
+        context = find_work_context()
+        if context is not None:
+            version_dir, parts = context
+            work_key = f"work:{version_dir}"
+            keys.append(work_key)
+            work = cache.get('sections', {}).get(work_key, {}).get('data') or {}
+            kwargs['version_dir'] = str(version_dir)
+            # 只有 flow / step 补全按当前项目过滤（-prj 等参数的补全列出全部）
+            if completion_type in ('flows', 'steps'):
+                for field in ('foundry', 'node', 'project'):
+                    if kwargs.get(field) is None:
+                        kwargs[field] = work.get(field)
+            # 当前目录为 {version}/{block}/{user}/...
+            for field, index in (('block', 0), ('user', 1)):
+                if kwargs.get(field) is None and len(parts) > index:
+                    kwargs[field] = parts[index]
+            if kwargs.get('block'):
+                keys.append(f"branches:{version_dir / kwargs['block']}")
+        if kwargs.get('foundry') and kwargs.get('node') and kwargs.get('project'):
+            keys.append(f"flows:{kwargs['foundry']}/{kwargs['node']}/{kwargs['project']}")
+
+        ensure_fresh(cache, keys)
+        return get_cached_completions(cache, completion_type, **kwargs)
+    except Exception:
+        return []
 
 
 def complete_projects(foundry: Optional[str] = None, 
@@ -55,20 +91,7 @@ def complete_projects(foundry: Optional[str] = None,
     Returns:
         项目名称列表
     """
-    if not CACHE_AVAILABLE:
-        return []
-    
-    try:
-        cache = load_completion_cache()
-        if cache:
-            return get_cached_completions(
-                cache, 'projects',
-                foundry=foundry, node=node
-            )
-    except Exception:
-        pass
-    
-    return []
+    return _lookup('projects', foundry=foundry, node=node)
 
 
 def complete_foundries() -> List[str]:
@@ -78,17 +101,7 @@ def complete_foundries() -> List[str]:
     Returns:
         foundry 名称列表
     """
-    if not CACHE_AVAILABLE:
-        return []
-    
-    try:
-        cache = load_completion_cache()
-        if cache:
-            return get_cached_completions(cache, 'foundries')
-    except Exception:
-        pass
-    
-    return []
+    return _lookup('foundries')
 
 
 def complete_nodes(foundry: Optional[str] = None) -> List[str]:
@@ -101,20 +114,7 @@ def complete_nodes(foundry: Optional[str] = None) -> List[str]:
     Returns:
         node 名称列表
     """
-    if not CACHE_AVAILABLE:
-        return []
-    
-    try:
-        cache = load_completion_cache()
-        if cache:
-            return get_cached_completions(
-                cache, 'nodes',
-                foundry=foundry
-            )
-    except Exception:
-        pass
-    
-    return []
+    return _lookup('nodes', foundry=foundry)
 
 
 def complete_flows(project: Optional[str] = None,
@@ -131,20 +131,7 @@ def complete_flows(project: Optional[str] = None,
     Returns:
         flow 名称列表
     """
-    if not CACHE_AVAILABLE:
-        return []
-    
-    try:
-        cache = load_completion_cache()
-        if cache:
-            return get_cached_completions(
-                cache, 'flows',
-                project=project, foundry=foundry, node=node
-            )
-    except Exception:
-        pass
-    
-    return []
+    return _lookup('flows', project=project, foundry=foundry, node=node)
 
 
 def complete_flow_steps(flow: str,
@@ -161,36 +148,15 @@ def complete_flow_steps(flow: str,
         node: 可选的 node
         
     Returns:
-        step 名称列表（格式：flow.step）
+        step 名称列表（格式：flow.step，按 dependency.yaml 中的顺序）
     """
-    if not CACHE_AVAILABLE:
-        return []
-    
-    try:
-        cache = load_completion_cache()
-        if cache:
-            # 从缓存中获取 flows
-            flows = get_cached_completions(
-                cache, 'flows',
-                project=project, foundry=foundry, node=node
-            )
-            
-            # 检查 flow 是否存在
-            if flow not in flows:
-                return []
-            
-            # 从缓存中获取 flow 的 steps（需要扩展缓存结构）
-            # 暂时返回空列表，需要扩展缓存来支持 steps
-            return []
-    except Exception:
-        pass
-    
-    return []
+    steps = _lookup('steps', flow=flow, project=project, foundry=foundry, node=node)
+    return [f"{flow}.{step}" for step in steps]
 
 
 def complete_blocks(project: Optional[str] = None) -> List[str]:
     """
-    补全 block 列表（仅从缓存读取）
+    补全 block 列表（仅从缓存读取，当前目录所在 version 的 block）
     
     Args:
         project: 可选的项目名称
@@ -198,91 +164,40 @@ def complete_blocks(project: Optional[str] = None) -> List[str]:
     Returns:
         block 名称列表
     """
-    if not CACHE_AVAILABLE:
-        return []
-    
-    try:
-        cache = load_completion_cache()
-        if cache:
-            return get_cached_completions(cache, 'blocks')
-    except Exception:
-        pass
-    
-    return []
+    return _lookup('blocks')
 
 
 def complete_users(block: Optional[str] = None) -> List[str]:
     """
-    补全 user 列表（仅从缓存读取）
+    补全 user 列表（仅从缓存读取，当前目录所在 version 的 user）
     
     Args:
-        block: 可选的 block 名称
+        block: 可选的 block 名称（默认从当前目录推断，推断不出时列出所有 block 的 user）
         
     Returns:
         user 名称列表
     """
-    if not CACHE_AVAILABLE:
-        return []
-    
-    try:
-        cache = load_completion_cache()
-        if cache:
-            return get_cached_completions(
-                cache, 'users',
-                block=block
-            )
-    except Exception:
-        pass
-    
-    return []
+    return _lookup('users', block=block)
 
 
-def complete_branches() -> List[str]:
+def complete_branches(block: Optional[str] = None,
+                      user: Optional[str] = None) -> List[str]:
     """
-    补全 branch 列表（从当前目录结构推断）
+    补全 branch 列表（仅从缓存读取）
+    
+    Args:
+        block: 可选的 block 名称（默认从当前目录推断）
+        user: 可选的 user 名称（默认从当前目录推断）
     
     Returns:
         branch 名称列表
     """
-    try:
-        current_dir = Path.cwd()
-        
-        # 尝试从 .edp_version 文件推断路径
-        from ..init import find_edp_version_file
-        version_file = find_edp_version_file(current_dir)
-        
-        if version_file:
-            # 从 .edp_version 文件读取信息
-            import yaml
-            with open(version_file, 'r', encoding='utf-8') as f:
-                version_info = yaml.safe_load(f) or {}
-            
-            # 注意：.edp_version 文件中的 'version' 键是项目版本名称（如 P85），
-            # 'init_version' 键是初始化文件格式版本号（如 '1.0'）。
-            # 优先从文件内容读取 version，如果没有则从目录名称推断
-            work_path = version_info.get('work_path')
-            project = version_info.get('project')
-            version = version_info.get('version') or version_file.parent.name
-            block = version_info.get('block')
-            user = version_info.get('user')
-            
-            if all([work_path, project, version, block, user]):
-                user_dir = Path(work_path) / project / version / block / user
-                if user_dir.exists():
-                    branches = []
-                    for branch_dir in user_dir.iterdir():
-                        if branch_dir.is_dir() and not branch_dir.name.startswith('.'):
-                            branches.append(branch_dir.name)
-                    return sorted(branches)
-        
-        return []
-    except Exception:
-        return []
+    return _lookup('branches', block=block, user=user)
 
 
 def complete_versions(project: Optional[str] = None) -> List[str]:
     """
-    补全 version 列表（仅从缓存读取）
+    补全 version 列表（仅从缓存读取，当前目录所在项目的 version）
     
     Args:
         project: 可选的项目名称
@@ -290,15 +205,4 @@ def complete_versions(project: Optional[str] = None) -> List[str]:
     Returns:
         version 名称列表
     """
-    if not CACHE_AVAILABLE:
-        return []
-    
-    try:
-        cache = load_completion_cache()
-        if cache:
-            return get_cached_completions(cache, 'versions')
-    except Exception:
-        pass
-    
-    return []
-
+    return _lookup('versions')
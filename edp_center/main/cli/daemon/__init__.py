@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+edp daemon 模块
+可选的每用户常驻进程，保持已导入的模块和解析缓存，通过 Unix domain socket
+执行只读查询命令；客户端在 daemon 不可用时回退到本进程执行。
+
+只导出客户端（只依赖标准库）；服务端在 daemon.server 中，按需导入。
+"""
+
+from .client import is_daemon_command, run_via_daemon
+from .protocol import socket_path
+
+__all__ = ['is_daemon_command', 'run_via_daemon', 'socket_path']
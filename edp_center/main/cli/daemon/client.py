@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+edp daemon 客户端
+只读查询命令（-info、-stats、-history）先尝试交给常驻的 edp daemon 执行；
+daemon 未运行、拒绝请求或通信失败时返回 None，由调用方在本进程执行。
+
+设置 EDP_DAEMON=0 可以禁止使用 daemon。
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional
+
+from .protocol import CODE_ROOT, connect, recv_message, send_message
+
+# 可以交给 daemon 执行的只读查询命令
+DAEMON_FLAGS = frozenset({
+    '-i', '-info', '--info',
+    '-stats', '--stats',
+    '-history', '--history', '-hist',
+})
+
+# 同时出现以下参数时不交给 daemon（会修改工作区、需要交互或启动长期运行的服务）
+LOCAL_ONLY_FLAGS = frozenset({
+    '-run', '--run',
+    '-b', '-branch', '--branch',
+    '-release', '--release',
+    '-rollback', '--rollback',
+    '-tutorial', '--tutorial', '-tutor',
+    '-graph', '--graph',
+    '-lib', '--lib',
+    '-gui', '--gui',
+    '-view', '--view', '-dashboard',
+    '-workflow-web', '--workflow-web', '-workflow', '--workflow',
+    '-stats-web', '--stats-web',
+    '-daemon', '--daemon',
+})
+
+_DISABLED_VALUES = ('0', 'off', 'false', 'no')
+
+# 转发给 daemon 的环境变量（查询命令只需要 EDP 配置、路径、语言和终端相关的变量）
+FORWARDED_ENV = frozenset({
+    'PATH', 'HOME', 'USER', 'LOGNAME', 'SHELL', 'PWD', 'TMPDIR', 'TZ',
+    'LANG', 'LANGUAGE', 'TERM', 'COLORTERM', 'COLUMNS', 'LINES', 'NO_COLOR', 'FORCE_COLOR',
+    'PYTHONPATH', 'PYTHONIOENCODING',
+})
+FORWARDED_ENV_PREFIXES = ('EDP_', 'LC_', 'XDG_')
+
+# 每个进程只尝试一次（bin/edp.py 在导入 CLI 之前尝试，失败后 cli.main 不再重复尝试）
+_attempted = False
+
+
+def is_daemon_command(argv: List[str]) -> bool:
+    """判断命令是否可以交给 daemon 执行"""
+    return (any(arg in DAEMON_FLAGS for arg in argv)
+            and not any(arg in LOCAL_ONLY_FLAGS for arg in argv))
+
+
+def daemon_disabled() -> bool:
+    """EDP_DAEMON=0 时不使用 daemon"""
+    return os.environ.get('EDP_DAEMON', '').strip().lower() in _DISABLED_VALUES
+
+
+def forwarded_env() -> Dict[str, str]:
+    """从当前环境中选出需要转发给 daemon 的变量"""
+    return {name: value for name, value in os.environ.items()
+            if name in FORWARDED_ENV or name.startswith(FORWARDED_ENV_PREFIXES)}
+
+
+def run_via_daemon(argv: List[str]) -> Optional[int]:
+    """
+    通过 daemon 执行命令，并把输出写到本进程的 stdout / stderr
+
+    Args:
+        argv: 命令行参数（不含程序名）
+
+    Returns:
+        退出代码；没有由 daemon 执行时返回 None
+    """
+    global _attempted
+    if _attempted or daemon_disabled() or not is_daemon_command(argv):
+        return None
+    _attempted = True
+    sock = connect()
+    if sock is None:
+        return None
+
+    request = {
+        'argv': list(argv),
+        'cwd': os.getcwd(),
+        'env': forwarded_env(),
+        'python': sys.executable,
+        'code_root': CODE_ROOT,
+        'isatty': [sys.stdout.isatty(), sys.stderr.isatty()],
+    }
+    try:
+        with sock:
+            send_message(sock, request)
+            response = recv_message(sock)
+    except (OSError, ValueError):
+        return None
+    if response is None or 'fallback' in response:
+        return None
+
+    for stream, text in response.get('output', []):
+        (sys.stdout if stream == 'out' else sys.stderr).write(text)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return int(response.get('exit', 0))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+edp daemon 通信协议
+客户端和 daemon 通过每个用户独立的 Unix domain socket 通信，每条消息为
+4 字节大端长度 + UTF-8 JSON。
+
+请求:  {"argv": [...], "cwd": "...", "env": {...}（只含命令需要的变量）, "python": "...", "code_root": "...", "isatty": [stdout, stderr]}
+响应:  {"exit": 0, "output": [["out" | "err", "文本"], ...]}
+       {"fallback": "原因"}（daemon 不处理该请求，客户端改为在本进程执行）
+控制:  {"control": "ping" | "stop"}
+
+客户端连接前检查 socket 及其目录属于当前用户、其他用户不可写，连接后通过
+SO_PEERCRED 确认 daemon 进程属于当前用户，任一检查失败都不发送请求。
+
+本模块只使用标准库，客户端导入它不应增加 edp 的启动耗时。
+"""
+
+import json
+import os
+import socket
+import stat
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# edp_center 所在目录（daemon 只服务使用同一份代码的客户端）
+CODE_ROOT = str(Path(__file__).resolve().parents[4])
+
+_HEADER = struct.Struct('>I')
+# struct ucred: pid, uid, gid
+_PEERCRED = struct.Struct('3i')
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+def socket_path() -> Path:
+    """
+    当前用户的 daemon socket 路径
+
+    优先使用 EDP_DAEMON_SOCKET，其次 $XDG_RUNTIME_DIR/edp-daemon.sock，
+    否则为 $TMPDIR（默认 /tmp）/edp-<uid>/daemon.sock（目录权限 0700）。
+    """
+    override = os.environ.get('EDP_DAEMON_SOCKET')
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return Path(runtime_dir) / 'edp-daemon.sock'
+    return Path(os.environ.get('TMPDIR') or '/tmp') / f'edp-{os.getuid()}' / 'daemon.sock'
+
+
+def ensure_private_dir(path: Path) -> None:
+    """
+    创建 socket 所在目录并确认只有当前用户可以访问
+
+    Raises:
+        PermissionError: 目录属于其他用户，或者其他用户可写
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not _is_private(path.stat()):
+        raise PermissionError(f"daemon socket 目录不安全: {path}")
+
+
+def _is_private(st: os.stat_result) -> bool:
+    """属于当前用户，且同组和其他用户不可写"""
+    return st.st_uid == os.getuid() and not (st.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+
+
+def is_secure_socket(path: Path) -> bool:
+    """socket 及其所在目录属于当前用户、其他用户不可写，且 socket 不是符号链接"""
+    try:
+        dir_st = os.stat(path.parent)
+        sock_st = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(dir_st.st_mode) and _is_private(dir_st)
+            and stat.S_ISSOCK(sock_st.st_mode) and _is_private(sock_st))
+
+
+def peer_uid(sock: socket.socket) -> Optional[int]:
+    """通过 SO_PEERCRED 读取对端进程的 uid，平台不支持时返回 None"""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return None
+    try:
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size)
+    except OSError:
+        return None
+    _pid, uid, _gid = _PEERCRED.unpack(creds)
+    return uid
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    data = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+    读取一条消息
+
+    Returns:
+        消息内容，连接在消息完整之前关闭时返回 None
+
+    Raises:
+        ValueError: 消息过大或不是 JSON 对象
+    """
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"消息过大: {size} 字节")
+    data = _recv_exact(sock, size)
+    if data is None:
+        return None
+    message = json.loads(data.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError("消息必须是 JSON 对象")
+    return message
+
+
+def connect(path: Optional[Path] = None, timeout: Optional[float] = 1.0) -> Optional[socket.socket]:
+    """
+    连接 daemon
+
+    连接前检查 socket 及其目录的属主和权限，连接后检查 daemon 进程的 uid。
+
+    Returns:
+        已连接的 socket（之后的读写不设超时），daemon 未运行或检查不通过时返回 None
+    """
+    if os.name != 'posix' or not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = path or socket_path()
+    if not is_secure_socket(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.settimeout(None)
+    except OSError:
+        sock.close()
+        return None
+    if peer_uid(sock) != os.getuid():
+        sock.close()
+        return None
+    return sock
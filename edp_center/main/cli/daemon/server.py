@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+edp daemon 服务端
+常驻进程，保持 WorkflowManager、flowkit、configkit 等模块以及 dependency.yaml 的解析缓存
+（utils.yaml_cache，按文件 mtime 失效）在内存中，通过 Unix domain socket 执行客户端转发的
+只读查询命令（见 client.DAEMON_FLAGS）。
+
+- 请求逐个串行处理：每个请求切换到客户端的工作目录、环境变量和 sys.argv，
+  捕获 stdout / stderr（包括日志）后返回给客户端
+- 已加载的 edp_center 源文件被修改后，daemon 拒绝请求（客户端改为在本进程执行）并退出
+- 空闲超过 idle_timeout 秒后自动退出
+
+用法:
+    edp -daemon start | stop | status | restart
+    python -m edp_center.main.cli.daemon.server [--socket PATH] [--idle-timeout SECONDS]
+"""
+
+import argparse
+import io
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .protocol import CODE_ROOT, connect, ensure_private_dir, recv_message, send_message, socket_path
+
+DEFAULT_IDLE_TIMEOUT = 1800.0
+
+# 启动时预先导入的模块（第一次请求就不需要等待导入）
+PRELOAD_MODULES = (
+    'edp_center.main.workflow_manager',
+    'edp_center.main.cli.commands.info_handler',
+    'edp_center.main.cli.commands.stats_handler',
+    'edp_center.main.cli.commands.history_handler',
+)
+
+_EDP_SOURCE_ROOT = os.path.join(CODE_ROOT, 'edp_center') + os.sep
+
+
+class _CapturedStream(io.TextIOBase):
+    """把写入的文本按顺序记录为 [stream, text]，保留 stdout 和 stderr 的交错顺序"""
+
+    def __init__(self, name: str, output: List[List[str]], tty: bool):
+        self._name = name
+        self._output = output
+        self._tty = tty
+
+    @property
+    def encoding(self):
+        return 'utf-8'
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return self._tty
+
+    def write(self, text):
+        if text:
+            if self._output and self._output[-1][0] == self._name:
+                self._output[-1][1] += text
+            else:
+                self._output.append([self._name, text])
+        return len(text)
+
+
+def _run_cli(argv: List[str]) -> Any:
+    from ..cli import main
+    return main()
+
+
+def _exit_code(code: Any, stderr) -> int:
+    # 与解释器处理 SystemExit 的方式一致
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+class EdpDaemon:
+    """edp daemon"""
+
+    def __init__(self, path: Optional[Path] = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 runner: Callable[[List[str]], Any] = _run_cli):
+        """
+        Args:
+            path: socket 路径（默认为 protocol.socket_path()）
+            idle_timeout: 空闲多少秒后退出（<= 0 表示不退出）
+            runner: 执行命令的函数，参数为 argv（不含程序名），返回退出代码
+        """
+        self.path = Path(path) if path else socket_path()
+        self.idle_timeout = idle_timeout
+        self.runner = runner
+        self.started = time.time()
+        self.requests = 0
+        self._stopping = False
+        self._source_mtimes: Dict[str, int] = {}
+
+    # ==================== 源文件变化检测 ====================
+
+    def _track_loaded_sources(self):
+        """记录新加载的 edp_center 模块源文件的 mtime"""
+        for module in list(sys.modules.values()):
+            filename = getattr(module, '__file__', None)
+            if not filename or filename in self._source_mtimes or not filename.startswith(_EDP_SOURCE_ROOT):
+                continue
+            try:
+                self._source_mtimes[filename] = os.stat(filename).st_mtime_ns
+            except OSError:
+                continue
+
+    def sources_changed(self) -> bool:
+        """已加载的 edp_center 源文件是否被修改或删除"""
+        for filename, mtime in self._source_mtimes.items():
+            try:
+                if os.stat(filename).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    # ==================== 请求处理 ====================
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """处理一条消息，返回响应"""
+        control = request.get('control')
+        if control == 'ping':
+            return {'pid': os.getpid(), 'started': self.started, 'requests': self.requests,
+                    'code_root': CODE_ROOT, 'python': sys.executable}
+        if control == 'stop':
+            self._stopping = True
+            return {'stopped': True}
+        if control is not None:
+            return {'error': f'未知的控制命令: {control}'}
+
+        if request.get('code_root') != CODE_ROOT or request.get('python') != sys.executable:
+            return {'fallback': 'daemon 使用的 edp_center 或 Python 与客户端不同'}
+        if self.sources_changed():
+            self._stopping = True
+            return {'fallback': 'edp_center 源文件已修改，daemon 退出'}
+
+        self.requests += 1
+        response = self._execute(request)
+        self._track_loaded_sources()
+        return response
+
+    def _execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """在客户端的工作目录、环境变量和参数下执行命令，捕获输出"""
+        argv = [str(arg) for arg in request.get('argv', [])]
+        stdout_tty, stderr_tty = (request.get('isatty') or [False, False])[:2]
+        output: List[List[str]] = []
+        stdout = _CapturedStream('out', output, bool(stdout_tty))
+        stderr = _CapturedStream('err', output, bool(stderr_tty))
+
+        saved_cwd = os.getcwd()
+        saved_argv = sys.argv
+        saved_env = dict(os.environ)
+        saved_streams = (sys.stdin, sys.stdout, sys.stderr)
+        # 只切换输出到控制台的日志处理器（setup_logging 创建的 StreamHandler）
+        console_streams = (sys.stdout, sys.stderr, sys.__stdout__, sys.__stderr__)
+        handlers = [h for h in logging.getLogger().handlers
+                    if type(h) is logging.StreamHandler and h.stream in console_streams]
+        saved_handler_streams = [h.stream for h in handlers]
+        try:
+            os.chdir(request['cwd'])
+            os.environ.clear()
+            os.environ.update(request.get('env') or {})
+            # daemon 内部执行的命令不能再转发给 daemon
+            os.environ['EDP_DAEMON'] = '0'
+            sys.argv = ['edp'] + argv
+            sys.stdin = io.StringIO('')
+            sys.stdout, sys.stderr = stdout, stderr
+            for handler in handlers:
+                handler.setStream(stderr)
+            try:
+                exit_code = _exit_code(self.runner(argv), stderr)
+            except SystemExit as e:
+                exit_code = _exit_code(e.code, stderr)
+            except Exception:
+                traceback.print_exc(file=stderr)
+                exit_code = 1
+        except OSError as e:
+            return {'fallback': f'无法切换到工作目录: {e}'}
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved_streams
+            sys.argv = saved_argv
+            os.environ.clear()
+            os.environ.update(saved_env)
+            os.chdir(saved_cwd)
+            for handler, stream in zip(handlers, saved_handler_streams):
+                handler.setStream(stream)
+            # 请求中新建的日志处理器不能继续指向已结束的请求
+            for handler in logging.getLogger().handlers:
+                if type(handler) is logging.StreamHandler and handler.stream in (stdout, stderr):
+                    handler.setStream(sys.stderr)
+        return {'exit': exit_code, 'output': output}
+
+    # ==================== 主循环 ====================
+
+    def _bind(self) -> socket.socket:
+        ensure_private_dir(self.path.parent)
+        existing = connect(self.path)
+        if existing is not None:
+            existing.close()
+            raise RuntimeError(f"daemon 已在运行: {self.path}")
+        if self.path.exists() or self.path.is_symlink():
+            self.path.unlink()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(str(self.path))
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        return server
+
+    def serve_forever(self, ready: Optional[Callable[[], None]] = None):
+        """
+        监听 socket 并处理请求，直到收到 stop、源文件被修改或空闲超时
+
+        Args:
+            ready: 开始监听后调用（测试用）
+        """
+        for module_name in PRELOAD_MODULES:
+            try:
+                __import__(module_name)
+            except Exception:
+                logging.getLogger(__name__).warning("预加载模块失败: %s", module_name, exc_info=True)
+        self._track_loaded_sources()
+
+        server = self._bind()
+        inode = os.stat(self.path).st_ino
+        try:
+            server.settimeout(self.idle_timeout if self.idle_timeout > 0 else None)
+            if ready is not None:
+                ready()
+            while not self._stopping:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    self._serve_connection(conn)
+        finally:
+            server.close()
+            # 只删除自己创建的 socket 文件
+            try:
+                if os.stat(self.path).st_ino == inode:
+                    self.path.unlink()
+            except OSError:
+                pass
+
+    def _serve_connection(self, conn: socket.socket):
+        conn.settimeout(10.0)
+        try:
+            request = recv_message(conn)
+        except (OSError, ValueError):
+            return
+        if request is None:
+            return
+        response = self.handle_request(request)
+        try:
+            conn.settimeout(None)
+            send_message(conn, response)
+        except OSError:
+            # 客户端已断开（例如用户按了 Ctrl-C）
+            pass
+
+
+# ==================== 启动 / 停止 ====================
+
+def _control(action: str, path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    sock = connect(path)
+    if sock is None:
+        return None
+    try:
+        with sock:
+            send_message(sock, {'control': action})
+            return recv_message(sock)
+    except (OSError, ValueError):
+        return None
+
+
+def daemon_status(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """daemon 运行时返回 {pid, started, requests, code_root, python}，否则返回 None"""
+    return _control('ping', path)
+
+
+def stop_daemon(path: Optional[Path] = None) -> bool:
+    """通知 daemon 退出，返回 daemon 是否在运行"""
+    return _control('stop', path) is not None
+
+
+def start_daemon(idle_timeout: float = DEFAULT_IDLE_TIMEOUT, path: Optional[Path] = None,
+                 wait: float = 10.0) -> Optional[Dict[str, Any]]:
+    """
+    在后台启动 daemon（已在运行时直接返回其状态）
+
+    daemon 的输出写入 socket 所在目录下的 daemon.log。
+
+    Returns:
+        daemon 状态，启动超时返回 None
+    """
+    status = daemon_status(path)
+    if status is not None:
+        return status
+
+    path = Path(path) if path else socket_path()
+    ensure_private_dir(path.parent)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (CODE_ROOT, env.get('PYTHONPATH')) if p)
+    env['EDP_DAEMON'] = '0'
+    command = [sys.executable, '-m', 'edp_center.main.cli.daemon.server',
+               '--socket', str(path), '--idle-timeout', str(idle_timeout)]
+    with open(path.parent / 'daemon.log', 'ab') as log:
+        subprocess.Popen(command, cwd=CODE_ROOT, env=env, stdin=subprocess.DEVNULL,
+                         stdout=log, stderr=log, start_new_session=True)
+
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        status = daemon_status(path)
+        if status is not None:
+            return status
+        time.sleep(0.05)
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='edp daemon（在前台运行）')
+    parser.add_argument('--socket', default=None, help='socket 路径')
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help='空闲多少秒后退出（<= 0 表示不退出）')
+    args = parser.parse_args(argv)
+
+    from edp_center.packages.edp_common.logging_config import setup_logging
+    setup_logging()
+    try:
+        EdpDaemon(args.socket, args.idle_timeout).serve_forever()
+    except (RuntimeError, PermissionError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -436,6 +436,7 @@ class ReleaseCreateDialog(QDialog):
             'overwrite': self.overwrite_check.isChecked(),
             'strict': False,  # 默认非严格模式
             'include_all': False,
+            'release_no_verify': False,
             'include_patterns': None,
             'exclude_patterns': None,
             # 其他可能需要的参数
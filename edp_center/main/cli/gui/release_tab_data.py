@@ -33,6 +33,22 @@ class ReleaseTabDataLoader:
                 default_project = parts[work_path_idx + 1]
                 default_version = parts[work_path_idx + 2]
         
+        # 尝试从当前工作目录推断 project 和 version（如果用户在某个工作目录下）
+        # 与具体的 release 版本无关，扫描前推断一次即可
+        # 注意：infer_work_path_info 需要 args 和 project_info，这里我们使用底层函数
+        # 底层函数只需要 current_dir，args 和 project_info 可以为 None
+        try:
+            from ...utils.inference.path_inference import infer_work_path_info as infer_work_path_info_func
+            # 创建一个简单的 args 对象（空对象即可）
+            class SimpleArgs:
+                pass
+            work_path_info = infer_work_path_info_func(Path.cwd(), SimpleArgs(), None)
+            if work_path_info:
+                default_project = work_path_info.get('project') or default_project
+                default_version = work_path_info.get('version') or default_version
+        except Exception:
+            pass
+        
         # 扫描 RELEASE 目录结构: RELEASE/{block}/{user}/{version}/
         # 只扫描标准的三层结构，确保 version 目录下有 data/ 目录
         for block_dir in self.release_root.iterdir():
@@ -56,30 +72,10 @@ class ReleaseTabDataLoader:
                     if not data_dir.exists():
                         continue
                     
-                    # 尝试从工作目录推断 project 和 version（如果可能）
-                    project = default_project
-                    version = default_version
-                    
-                    # 尝试从当前工作目录推断（如果用户在某个工作目录下）
-                    # 注意：infer_work_path_info 需要 args 和 project_info，这里我们使用底层函数
-                    # 底层函数只需要 current_dir，args 和 project_info 可以为 None
-                    try:
-                        from ...utils.inference.path_inference import infer_work_path_info as infer_work_path_info_func
-                        # 创建一个简单的 args 对象（空对象即可）
-                        class SimpleArgs:
-                            pass
-                        args = SimpleArgs()
-                        work_path_info = infer_work_path_info_func(Path.cwd(), args, None)
-                        if work_path_info:
-                            project = work_path_info.get('project') or project
-                            version = work_path_info.get('version') or version
-                    except Exception:
-                        pass
-                    
                     # 获取版本信息
                     release_info = {
-                        'project': project or 'unknown',
-                        'version': version or 'unknown',
+                        'project': default_project or 'unknown',
+                        'version': default_version or 'unknown',
                         'block': block_dir.name,
                         'user': user_dir.name,
                         'release_version': version_dir.name,  # release 版本号
@@ -18,7 +18,8 @@ except ImportError:
     FLASK_AVAILABLE = False
 
 from ....workflow_manager import WorkflowManager
-from ...commands.stats_handler import load_run_history, calculate_stats, calculate_step_stats, filter_history
+from ...commands.stats_handler import load_run_history, filter_history
+from ...utils.run_stats import get_run_stats
 from ...utils import infer_work_path_info, infer_project_info
 
 
@@ -83,8 +84,7 @@ class StatsWebServer:
                 branch = work_path_info['branch']
                 branch_dir = work_path / project / version / block / user / branch
                 
-                runs = load_run_history(branch_dir)
-                stats = calculate_stats(runs)
+                stats = get_run_stats(branch_dir).overall_stats()
                 
                 return jsonify({'success': True, 'data': stats})
             except Exception as e:
@@ -124,8 +124,7 @@ class StatsWebServer:
                 branch = work_path_info['branch']
                 branch_dir = work_path / project / version / block / user / branch
                 
-                runs = load_run_history(branch_dir)
-                step_stats = calculate_step_stats(runs)
+                step_stats = get_run_stats(branch_dir).step_stats()
                 
                 return jsonify({'success': True, 'data': step_stats})
             except Exception as e:
@@ -127,7 +127,7 @@ class WorkflowWebServer:
         def get_overall_stats():
             """获取总体性能统计"""
             try:
-                from ...commands.stats_handler import load_run_history, calculate_stats
+                from ...utils.run_stats import get_run_stats
                 from ...utils import infer_work_path_info, infer_project_info
                 from pathlib import Path
                 
@@ -165,8 +165,7 @@ class WorkflowWebServer:
                 branch = work_path_info['branch']
                 branch_dir = work_path / project / version / block / user / branch
                 
-                runs = load_run_history(branch_dir)
-                stats = calculate_stats(runs)
+                stats = get_run_stats(branch_dir).overall_stats()
                 
                 return jsonify({'success': True, 'data': stats})
             except Exception as e:
@@ -177,7 +176,7 @@ class WorkflowWebServer:
         def get_step_stats():
             """获取按步骤分组的性能统计"""
             try:
-                from ...commands.stats_handler import load_run_history, calculate_step_stats
+                from ...utils.run_stats import get_run_stats
                 from ...utils import infer_work_path_info, infer_project_info
                 from pathlib import Path
                 
@@ -210,8 +209,7 @@ class WorkflowWebServer:
                 branch = work_path_info['branch']
                 branch_dir = work_path / project / version / block / user / branch
                 
-                runs = load_run_history(branch_dir)
-                step_stats = calculate_step_stats(runs)
+                step_stats = get_run_stats(branch_dir).step_stats()
                 
                 return jsonify({'success': True, 'data': step_stats})
             except Exception as e:
@@ -84,7 +84,7 @@ def _monitor_terminal_execution(step_name: str, step_status: Dict):
     # 等待一段时间后开始检查
     time.sleep(2)
     
-    # 通过检查日志文件或 .run_info 来判断执行状态
+    # 通过检查日志文件或运行历史（.run_history.jsonl）来判断执行状态
     # 这里简化处理，设置一个较长的等待时间
     max_wait_time = 3600  # 最多等待1小时
     check_interval = 5  # 每5秒检查一次
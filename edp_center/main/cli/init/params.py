@@ -5,38 +5,117 @@
 Init 参数推断和解析相关函数
 """
 
+import os
 import sys
+import threading
 import yaml
 from pathlib import Path
 from typing import Optional, Dict, Tuple
 
 from ..utils import get_current_user
 
+# 起始目录 -> (找到的 .edp_version, ((中间目录, st_mtime_ns), ...))；
+# .edp_version -> ((st_mtime_ns, st_size), 内容)
+# 同一个命令（以及 edp daemon 的多次请求）会对同一目录反复推断，命中时只需要 stat 中间目录和文件本身
+_version_file_cache: Dict[Path, Tuple[Path, Tuple[Tuple[Path, Optional[int]], ...]]] = {}
+_version_info_cache: Dict[Path, Tuple[Tuple[int, int], dict]] = {}
+_version_cache_lock = threading.Lock()
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_version_file(version_file: Path) -> Optional[dict]:
+    """读取 .edp_version（内容未变化时使用缓存），文件不存在或无法解析时返回 None"""
+    try:
+        signature = _file_signature(version_file)
+    except OSError:
+        return None
+    with _version_cache_lock:
+        entry = _version_info_cache.get(version_file)
+    if entry is None or entry[0] != signature:
+        try:
+            with open(version_file, 'r', encoding='utf-8') as f:
+                version_info = yaml.safe_load(f) or {}
+        except Exception:
+            return None
+        entry = (signature, version_info)
+        with _version_cache_lock:
+            _version_info_cache[version_file] = entry
+    version_info = entry[1]
+    # 返回副本，调用方修改不会影响缓存
+    return dict(version_info) if isinstance(version_info, dict) else version_info
+
 
 def find_edp_version_file(start_dir: Path) -> Tuple[Optional[Path], Optional[dict]]:
     """
     向上查找 .edp_version 文件，直到根目录
     
+    结果按起始目录缓存，.edp_version 的 mtime 或大小变化后重新读取；
+    起始目录到 .edp_version 所在目录之间的目录 mtime 变化后（例如新建了更近的
+    .edp_version）重新查找。
+    
     Args:
         start_dir: 起始目录
         
     Returns:
         (version_file_path, version_info) 或 (None, None)
     """
+    with _version_cache_lock:
+        entry = _version_file_cache.get(start_dir)
+    if entry is not None and all(_dir_mtime(path) == mtime for path, mtime in entry[1]):
+        version_info = _read_version_file(entry[0])
+        if version_info is not None:
+            return entry[0], version_info
+    
+    searched = []
     search_dir = start_dir
     while search_dir != search_dir.parent:  # 直到根目录
+        # 先记录 mtime 再检查文件，检查之后才新建的 .edp_version 也会使缓存失效
+        mtime = _dir_mtime(search_dir)
         version_file = search_dir / '.edp_version'
         if version_file.exists():
-            try:
-                with open(version_file, 'r', encoding='utf-8') as f:
-                    version_info = yaml.safe_load(f) or {}
+            version_info = _read_version_file(version_file)
+            if version_info is not None:
+                with _version_cache_lock:
+                    _version_file_cache[start_dir] = (version_file, tuple(searched))
                 return version_file, version_info
-            except Exception:
-                pass
+        searched.append((search_dir, mtime))
         search_dir = search_dir.parent
     return None, None
 
 
+def _dir_mtime(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def edp_version_signature(start_dir: Path) -> Optional[Tuple[str, int, int]]:
+    """
+    start_dir 对应的 .edp_version 的 (路径, mtime, 大小)，找不到时返回 None
+    
+    用于判断基于 .edp_version 的推断结果是否仍然有效。
+    """
+    version_file, _ = find_edp_version_file(start_dir)
+    if version_file is None:
+        return None
+    try:
+        return (str(version_file),) + _file_signature(version_file)
+    except OSError:
+        return None
+
+
+def clear_edp_version_cache():
+    """清除 .edp_version 的查找和内容缓存"""
+    with _version_cache_lock:
+        _version_file_cache.clear()
+        _version_info_cache.clear()
+
+
 def infer_params_from_version_file(args, manager, current_dir: Optional[Path] = None) -> bool:
     """
     从 .edp_version 文件推断参数（project, version, work_path, block, user）
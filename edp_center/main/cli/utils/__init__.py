@@ -20,6 +20,7 @@ from .full_tcl_generator import generate_full_tcl
 from .dependency_parser import (
     list_available_flows,
     find_step_flow,
+    map_step_flows,
     get_cmd_filename_from_dependency
 )
 from .param_inference import (
@@ -35,6 +36,8 @@ from .command_helpers import (
     build_branch_dir,
     infer_all_info
 )
+from .run_history import RunHistory, append_run, load_runs
+from .run_stats import RunStats, get_run_stats
 
 __all__ = [
     'get_current_user',
@@ -48,6 +51,7 @@ __all__ = [
     'list_available_flows',
     'get_cmd_filename_from_dependency',
     'find_step_flow',
+    'map_step_flows',
     'create_default_args',
     'infer_all_params',
     'get_foundry_node',
@@ -57,5 +61,10 @@ __all__ = [
     'infer_and_validate_work_path_info',
     'build_branch_dir',
     'infer_all_info',
+    'RunHistory',
+    'append_run',
+    'load_runs',
+    'RunStats',
+    'get_run_stats',
 ]
 
@@ -6,10 +6,29 @@ dependency.yaml 解析器
 负责解析 dependency.yaml 文件，提取 flow 和 step 信息
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from .script_finders import find_source_script
+from .yaml_cache import load_yaml
+
+
+# 并发检查源脚本的最大线程数（每个 step 最多需要 8 次 stat，网络文件系统上并发可以重叠等待时间）
+READY_CHECK_MAX_WORKERS = 16
+
+
+def _check_ready(edp_center_path: Path, foundry: str, node: str, project: Optional[str],
+                 flow_name: str, step_names: List[str]) -> List[bool]:
+    """检查每个 step 的源脚本是否存在（结果与 step_names 顺序相同）"""
+    def is_ready(step_name):
+        return find_source_script(edp_center_path, foundry, node, project, flow_name, step_name) is not None
+
+    workers = min(READY_CHECK_MAX_WORKERS, len(step_names))
+    if workers <= 1:
+        return [is_ready(step_name) for step_name in step_names]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(is_ready, step_names))
 
 
 def list_available_flows(edp_center_path: Path, foundry: str, node: str,
@@ -61,9 +80,7 @@ def list_available_flows(edp_center_path: Path, foundry: str, node: str,
             
             # 读取 dependency.yaml 文件
             try:
-                import yaml
-                with open(dependency_file, 'r', encoding='utf-8') as f:
-                    dependency_config = yaml.safe_load(f) or {}
+                dependency_config = load_yaml(dependency_file) or {}
                 
                 # 从 dependency.yaml 中提取 step 信息
                 # dependency.yaml 格式：
@@ -74,23 +91,14 @@ def list_available_flows(edp_center_path: Path, foundry: str, node: str,
                 steps_info = {}
                 
                 def extract_steps_recursive(data):
-                    """递归提取所有包含 'cmd' 的 step，并检查源脚本是否存在"""
+                    """递归提取所有包含 'cmd' 的 step"""
                     if isinstance(data, dict):
                         # 如果是字典，遍历每个 key-value
                         for key, value in data.items():
                             if isinstance(value, dict):
                                 # 如果 value 包含 'cmd'，说明 key 是一个 step_name
                                 if 'cmd' in value:
-                                    cmd_filename = value['cmd']
-                                    # 检查源脚本文件是否存在
-                                    source_script = find_source_script(
-                                        edp_center_path, foundry, node, project, flow_name, key
-                                    )
-                                    is_ready = source_script is not None
-                                    steps_info[key] = {
-                                        'ready': is_ready,
-                                        'cmd': cmd_filename
-                                    }
+                                    steps_info[key] = {'cmd': value['cmd']}
                                 else:
                                     # 否则继续递归查找
                                     extract_steps_recursive(value)
@@ -99,15 +107,7 @@ def list_available_flows(edp_center_path: Path, foundry: str, node: str,
                                 extract_steps_recursive(value)
                             elif isinstance(value, str) and 'cmd' in data:
                                 # 如果 value 是字符串，但当前字典包含 'cmd'，说明 key 是一个 step_name
-                                cmd_filename = data['cmd']
-                                source_script = find_source_script(
-                                    edp_center_path, foundry, node, project, flow_name, key
-                                )
-                                is_ready = source_script is not None
-                                steps_info[key] = {
-                                    'ready': is_ready,
-                                    'cmd': cmd_filename
-                                }
+                                steps_info[key] = {'cmd': data['cmd']}
                     elif isinstance(data, list):
                         # 如果是列表，递归处理每个元素
                         for item in data:
@@ -120,6 +120,11 @@ def list_available_flows(edp_center_path: Path, foundry: str, node: str,
                         # 递归处理 dependency 结构（支持任意深度嵌套）
                         extract_steps_recursive(dependency)
                 
+                # 检查每个 step 的源脚本文件是否存在（网络文件系统上并发检查）
+                for step_name, is_ready in zip(steps_info, _check_ready(
+                        edp_center_path, foundry, node, project, flow_name, list(steps_info))):
+                    steps_info[step_name]['ready'] = is_ready
+                
                 # 合并到 flows 字典中（项目特定的会覆盖 common）
                 if steps_info:
                     # 如果 flow_name 已存在，合并 step（项目特定的会覆盖 common 的）
@@ -184,9 +189,7 @@ def find_step_flow(edp_center_path: Path, foundry: str, node: str,
             
             # 读取 dependency.yaml 文件
             try:
-                import yaml
-                with open(dependency_file, 'r', encoding='utf-8') as f:
-                    dependency_config = yaml.safe_load(f) or {}
+                dependency_config = load_yaml(dependency_file) or {}
                 
                 if flow_name not in dependency_config:
                     continue
@@ -222,6 +225,67 @@ def find_step_flow(edp_center_path: Path, foundry: str, node: str,
     return None
 
 
+def map_step_flows(edp_center_path: Path, foundry: str, node: str,
+                   project: Optional[str]) -> Dict[str, str]:
+    """
+    一次读取所有 dependency.yaml，获取每个 step 属于哪个 flow
+    
+    结果与对每个 step 调用 find_step_flow 相同（同名 step 属于搜索顺序中第一个包含它的 flow），
+    但每个 dependency.yaml 只读取一次，适合需要查找很多 step 的场景（如 edp -info）。
+    
+    Args:
+        edp_center_path: edp_center 路径
+        foundry: 代工厂名称
+        node: 工艺节点
+        project: 项目名称（可选）
+        
+    Returns:
+        字典 {step_name: flow_name}
+    """
+    config_path = edp_center_path / 'config' / foundry / node
+    
+    # 搜索路径：与 find_step_flow 相同（common 在前，项目特定在后）
+    search_paths = [config_path / 'common']
+    if project:
+        search_paths.append(config_path / project)
+    
+    step_flows: Dict[str, str] = {}
+    
+    def collect_steps(data, flow_name):
+        """递归查找所有包含 'cmd' 的 step"""
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if isinstance(value, dict) and 'cmd' in value:
+                    step_flows.setdefault(key, flow_name)
+                collect_steps(value, flow_name)
+        elif isinstance(data, list):
+            for item in data:
+                collect_steps(item, flow_name)
+    
+    for config_dir in search_paths:
+        if not config_dir.exists():
+            continue
+        
+        for flow_dir in config_dir.iterdir():
+            if not flow_dir.is_dir() or flow_dir.name.startswith('.'):
+                continue
+            
+            flow_name = flow_dir.name
+            dependency_file = flow_dir / 'dependency.yaml'
+            if not dependency_file.exists():
+                continue
+            
+            try:
+                dependency_config = load_yaml(dependency_file) or {}
+                flow_config = dependency_config.get(flow_name)
+                if isinstance(flow_config, dict) and 'dependency' in flow_config:
+                    collect_steps(flow_config['dependency'], flow_name)
+            except Exception:
+                continue
+    
+    return step_flows
+
+
 def get_cmd_filename_from_dependency(edp_center_path: Path, foundry: str, node: str,
                                      project: Optional[str], flow_name: str, step_name: str) -> Optional[str]:
     """
@@ -257,9 +321,7 @@ def get_cmd_filename_from_dependency(edp_center_path: Path, foundry: str, node:
     # 从后往前搜索（项目特定的优先）
     for dependency_file in reversed(search_paths):
         try:
-            import yaml
-            with open(dependency_file, 'r', encoding='utf-8') as f:
-                dependency_config = yaml.safe_load(f) or {}
+            dependency_config = load_yaml(dependency_file) or {}
             
             if flow_name not in dependency_config:
                 continue
@@ -202,7 +202,7 @@ def generate_full_tcl(edp_center_path: Path, foundry: str, node: str, project: O
         # 流程：
         # 1. 生成新的 full.tcl（用于本次实际执行）
         # 2. 立即备份这个新生成的 full.tcl（这是本次运行的配置快照）
-        # 3. 备份文件的路径将记录到 .run_info 中
+        # 3. 备份文件的路径将记录到运行历史（.run_history.jsonl）中
         #
         # 这样每次运行都是独立的，即使后续运行覆盖了 full.tcl，也能找到本次运行的配置
         backup_path = None
@@ -226,7 +226,7 @@ def generate_full_tcl(edp_center_path: Path, foundry: str, node: str, project: O
             backup_path = None
         
         # 返回 (full.tcl 路径, 备份文件路径)
-        # 备份路径将记录到 .run_info 中，用于后续的配置对比
+        # 备份路径将记录到运行历史中，用于后续的配置对比
         return (full_tcl_path, backup_path)
     else:
         # full.tcl 文件未成功创建，抛出异常
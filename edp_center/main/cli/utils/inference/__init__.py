@@ -15,6 +15,7 @@ from .project_inference import (
 )
 from .path_inference import infer_work_path_info
 from .inference_validator import validate_work_path_info
+from .inference_cache import get_config_tree, clear_inference_cache
 
 __all__ = [
     'get_edp_center_path',
@@ -24,5 +25,7 @@ __all__ = [
     'infer_project_info_func',
     'infer_work_path_info',
     'validate_work_path_info',
+    'get_config_tree',
+    'clear_inference_cache',
 ]
 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+推断缓存模块
+一个命令中会对同一目录反复推断项目和工作路径信息（run_range 每个步骤、stats_web 每个请求、
+release 扫描每个版本目录），常驻的 edp daemon 还会在多次请求之间重复推断。本模块提供：
+
+- 推断结果缓存：按 (推断类型, edp_center, 目录, 进程工作目录, 相关命令行参数, 附加键) 缓存，
+  对应的 .edp_version 的路径 / mtime / 大小变化后失效，指定 config 目录时
+  config 目录树变化后也失效；推断失败（None）不缓存，用户修正目录或配置后可以立即生效
+- config 目录树缓存：config/{foundry}/{node}/{project} 列表，
+  config、foundry、node 目录的 mtime 或链接数任一变化后重新扫描
+
+缓存是模块级共享状态，所有读写都在 _cache_lock 保护下进行。返回值都是副本。
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...init.params import clear_edp_version_cache, edp_version_signature
+
+# 影响推断结果的命令行参数
+INFERENCE_ARG_FIELDS = ('edp_center', 'foundry', 'node', 'project', 'work_path',
+                        'version', 'block', 'user', 'branch')
+
+# 缓存键 -> ((.edp_version 签名, config 目录树签名), 推断结果)
+_inference_cache: Dict[Tuple, Tuple[Tuple, Optional[Dict]]] = {}
+# config 目录 -> ({目录: (mtime, 链接数)}, 项目列表)
+_config_tree_cache: Dict[Path, Tuple[Dict[Path, Optional[Tuple[int, int]]], List[Dict[str, str]]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _copy(result: Optional[Dict]) -> Optional[Dict]:
+    return dict(result) if result is not None else None
+
+
+def info_digest(info: Optional[Dict]) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """把推断结果字典转换为可以作为缓存键的元组"""
+    if info is None:
+        return None
+    return tuple(sorted((str(k), str(v)) for k, v in info.items()))
+
+
+def memoize_inference(kind: str, edp_center_path: Path, current_dir: Path, args,
+                      compute: Callable[[], Optional[Dict]], extra_key: Tuple = (),
+                      config_path: Optional[Path] = None) -> Optional[Dict]:
+    """
+    返回缓存的推断结果，缓存无效时调用 compute() 重新推断
+
+    Args:
+        kind: 推断类型（'project' / 'work_path'）
+        edp_center_path: edp_center 路径
+        current_dir: 推断的起始目录
+        args: 命令行参数对象（只使用 INFERENCE_ARG_FIELDS 中的参数）
+        compute: 实际推断函数
+        extra_key: compute 依赖的其他输入（如 info_digest(project_info)），加入缓存键
+        config_path: compute 依赖 config 目录树时指定，目录树变化后缓存失效
+
+    Returns:
+        推断结果的副本
+    """
+    try:
+        key: Tuple[Any, ...] = (kind, str(edp_center_path), str(current_dir), os.getcwd()) + tuple(
+            getattr(args, field, None) for field in INFERENCE_ARG_FIELDS) + (extra_key,)
+        hash(key)
+    except (OSError, TypeError):
+        # 工作目录已被删除或参数不可哈希，不缓存
+        return compute()
+
+    signature = (edp_version_signature(current_dir),
+                 config_tree_stamp(config_path) if config_path is not None else None)
+    with _cache_lock:
+        entry = _inference_cache.get(key)
+    if entry is not None and entry[0] == signature:
+        return _copy(entry[1])
+
+    result = compute()
+    if result is not None:
+        with _cache_lock:
+            _inference_cache[key] = (signature, _copy(result))
+    return _copy(result)
+
+
+def _dir_signature(path: Path) -> Optional[Tuple[int, int]]:
+    # 新建或删除子目录会改变链接数，时间戳精度较低时也能发现变化
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_nlink)
+
+
+def _visible_subdirs(path: Path) -> List[Path]:
+    return sorted(p for p in path.iterdir() if p.is_dir() and not p.name.startswith('.'))
+
+
+def _scan_config_tree(config_path: Path):
+    signatures = {config_path: _dir_signature(config_path)}
+    projects = []
+    if signatures[config_path] is None:
+        return signatures, projects
+    for foundry_dir in _visible_subdirs(config_path):
+        signatures[foundry_dir] = _dir_signature(foundry_dir)
+        for node_dir in _visible_subdirs(foundry_dir):
+            # 跳过 common 目录（common 是配置目录，不是 node）
+            if node_dir.name == 'common':
+                continue
+            signatures[node_dir] = _dir_signature(node_dir)
+            # node_dir 是 node 目录（如 S8），其下的子目录是项目目录（如 dongting）
+            for project_dir in _visible_subdirs(node_dir):
+                if project_dir.name != 'common':
+                    projects.append({
+                        'foundry': foundry_dir.name,
+                        'node': node_dir.name,
+                        'project': project_dir.name
+                    })
+    projects.sort(key=lambda x: (x['foundry'], x['node'], x['project']))
+    return signatures, projects
+
+
+def _config_tree_entry(config_path: Path):
+    with _cache_lock:
+        entry = _config_tree_cache.get(config_path)
+    if entry is None or any(_dir_signature(path) != signature for path, signature in entry[0].items()):
+        entry = _scan_config_tree(config_path)
+        with _cache_lock:
+            _config_tree_cache[config_path] = entry
+    return entry
+
+
+def get_config_tree(config_path: Path) -> List[Dict[str, str]]:
+    """
+    列出 config 目录下所有的 {foundry, node, project}（按 foundry、node、project 排序）
+
+    新增或删除 foundry / node / project 目录会改变其父目录的 mtime 和链接数，
+    因此只需检查 config、foundry、node 三层目录即可判断缓存是否有效。
+    """
+    return [dict(p) for p in _config_tree_entry(config_path)[1]]
+
+
+def config_tree_stamp(config_path: Path) -> Tuple:
+    """config 目录树的签名（get_config_tree 检查的各层目录的 mtime 和链接数）"""
+    signatures = _config_tree_entry(config_path)[0]
+    return tuple(sorted((str(path), signature) for path, signature in signatures.items()))
+
+
+def clear_inference_cache():
+    """清除推断结果、config 目录树和 .edp_version 缓存"""
+    with _cache_lock:
+        _inference_cache.clear()
+        _config_tree_cache.clear()
+    clear_edp_version_cache()
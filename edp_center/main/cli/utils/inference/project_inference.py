@@ -10,7 +10,10 @@ import sys
 from pathlib import Path
 from typing import Optional, Dict, List
 
+from edp_center.packages.edp_common import ProjectNotFoundError
+
 from ...init.params import find_edp_version_file
+from .inference_cache import get_config_tree
 
 
 def get_edp_center_path(edp_center_path: Path, args) -> Optional[Path]:
@@ -57,6 +60,8 @@ def list_projects_direct(config_path: Path, foundry: Optional[str] = None,
     """
     直接扫描目录列出项目（当 ProjectFinder 不可用时使用）
     
+    目录树按目录 mtime 缓存（见 inference_cache.get_config_tree）。
+    
     Args:
         config_path: config 目录路径
         foundry: 可选，过滤指定的 foundry
@@ -65,41 +70,8 @@ def list_projects_direct(config_path: Path, foundry: Optional[str] = None,
     Returns:
         项目信息列表，每个包含 foundry, node, project
     """
-    projects = []
-    
-    if not config_path.exists():
-        return projects
-    
-    # 遍历 config 目录
-    for foundry_dir in config_path.iterdir():
-        if not foundry_dir.is_dir() or foundry_dir.name.startswith('.'):
-            continue
-        
-        if foundry and foundry_dir.name != foundry:
-            continue
-        
-        for node_dir in foundry_dir.iterdir():
-            if not node_dir.is_dir() or node_dir.name.startswith('.'):
-                continue
-            
-            if node and node_dir.name != node:
-                continue
-            
-            # 跳过 common 目录（common 是配置目录，不是 node）
-            if node_dir.name == 'common':
-                continue
-            
-            # 查找项目目录（排除 common）
-            # node_dir 是 node 目录（如 S8），其下的子目录是项目目录（如 dongting）
-            for item in node_dir.iterdir():
-                if item.is_dir() and not item.name.startswith('.') and item.name != 'common':
-                    projects.append({
-                        'foundry': foundry_dir.name,
-                        'node': node_dir.name,
-                        'project': item.name
-                    })
-    
-    return sorted(projects, key=lambda x: (x['foundry'], x['node'], x['project']))
+    return [p for p in get_config_tree(config_path)
+            if (not foundry or p['foundry'] == foundry) and (not node or p['node'] == node)]
 
 
 def infer_project_info_from_version_file(current_dir: Path, args) -> Dict[str, Optional[str]]:
@@ -222,21 +194,30 @@ def infer_project_info(edp_center_path: Path, config_path: Path,
     if project and (not foundry or not node):
         project_info = None
         
-        # 首先尝试使用 project_finder
-        if project_finder:
+        # 首先在缓存的 config 目录树中查找（多个匹配时与 ProjectFinder 一样报错，不猜测）
+        matches = [p for p in list_projects_direct(config_path, foundry, node) if p['project'] == project]
+        if len(matches) > 1:
+            match_info = "\n".join([f"  - {m['foundry']}/{m['node']}" for m in matches])
+            raise ProjectNotFoundError(
+                f"找到多个匹配的项目 '{project}'，请指定 foundry 和/或 node:\n{match_info}",
+                context={
+                    'project_name': project,
+                    'matches': matches,
+                    'foundry': foundry,
+                    'node': node
+                },
+                suggestion=f"请使用以下格式指定:\n  - foundry={matches[0]['foundry']}, node={matches[0]['node']}"
+            )
+        if matches:
+            project_info = matches[0]
+        
+        # 找不到时再尝试 project_finder
+        if not project_info and project_finder:
             try:
                 project_info = project_finder.get_project_info(project, foundry, node)
             except (ValueError, AttributeError):
                 pass
         
-        # 如果 project_finder 不可用或找不到，尝试直接扫描
-        if not project_info:
-            projects = list_projects_direct(config_path, foundry, node)
-            for p in projects:
-                if p['project'] == project:
-                    project_info = p
-                    break
-        
         if project_info:
             if not foundry:
                 foundry = project_info['foundry']
@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行历史存储模块
+
+每个 branch 目录下的运行记录保存在 .run_history.jsonl 中，每行一条 JSON 记录：
+- 追加记录只写一行（O_APPEND + fcntl 文件锁），与历史长度无关；
+  run_range 中并行完成的步骤和同一 branch 下的多个 edp 进程不会互相覆盖记录
+- 读取时跳过不完整的行（如写入中途进程被杀），同一进程内再次读取只解析新追加的部分
+- 旧的 .run_info（YAML，runs 列表）在第一次追加记录时导入，导入后重命名为 .run_info.migrated；
+  读取只解析旧文件（只读，不修改 branch 目录）
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+try:
+    import fcntl
+except ImportError:  # Windows：没有 fcntl，依赖 O_APPEND 的单次写入
+    fcntl = None
+
+RUN_HISTORY_FILE_NAME = '.run_history.jsonl'
+LEGACY_RUN_INFO_FILE_NAME = '.run_info'
+MIGRATED_SUFFIX = '.migrated'
+
+# 导入旧文件时优先使用 libyaml（旧文件可能有上万条记录）
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+class _Locked:
+    """对已打开的文件描述符加排他锁或共享锁（没有 fcntl 时不加锁）"""
+
+    def __init__(self, fd: int, shared: bool = False):
+        self.fd = fd
+        self.shared = shared
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return False
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+class RunHistory:
+    """
+    branch 目录的运行历史
+
+    Example:
+        >>> history = RunHistory(branch_dir)
+        >>> history.append({'timestamp': '2025-01-01 10:00:00', 'flow': 'pv_calibre', 'step': 'ipmerge'})
+        >>> history.last_run('pv_calibre', 'ipmerge')
+    """
+
+    # 进程内的解析结果：文件路径 -> (inode, 已解析的字节数, 记录列表)
+    _parsed: Dict[str, Tuple[int, int, List[Dict[str, Any]]]] = {}
+    _parsed_lock = threading.Lock()
+
+    # 进程内解析过的旧 .run_info：文件路径 -> ((mtime_ns, size), 记录列表)
+    _legacy_parsed: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+
+    def __init__(self, branch_dir: Path):
+        self.branch_dir = Path(branch_dir)
+        self.path = self.branch_dir / RUN_HISTORY_FILE_NAME
+        self.legacy_path = self.branch_dir / LEGACY_RUN_INFO_FILE_NAME
+
+    def exists(self) -> bool:
+        """是否有运行历史文件（包括尚未导入的旧 .run_info）"""
+        return self.path.exists() or self.legacy_path.exists()
+
+    def _open_for_append(self) -> int:
+        return os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _migrate_locked(self, fd: int):
+        """导入旧的 .run_info（调用方已持有锁）"""
+        if not self.legacy_path.exists():
+            return
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                data = yaml.load(f, Loader=_YamlLoader) or {}
+            runs = data.get('runs', []) if isinstance(data, dict) else []
+        except Exception as e:
+            print(f"[WARN] 读取 .run_info 文件失败: {e}，跳过导入", file=sys.stderr)
+            return
+        if runs:
+            _write_all(fd, b''.join(_encode(run) for run in runs if isinstance(run, dict)))
+        os.replace(self.legacy_path, self.legacy_path.with_name(LEGACY_RUN_INFO_FILE_NAME + MIGRATED_SUFFIX))
+        print(f"[INFO] 已将 {len(runs)} 条运行记录从 {self.legacy_path} 导入到 {self.path}", file=sys.stderr)
+
+    def load_legacy(self) -> List[Dict[str, Any]]:
+        """
+        只读地解析尚未导入的旧 .run_info（文件未变化时返回同一个缓存列表，调用方不能修改）
+
+        Returns:
+            旧记录列表，文件不存在或无法解析时返回空列表
+        """
+        key = str(self.legacy_path)
+        try:
+            st = os.stat(self.legacy_path)
+        except OSError:
+            with self._parsed_lock:
+                self._legacy_parsed.pop(key, None)
+            return []
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._parsed_lock:
+            cached = self._legacy_parsed.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                data = yaml.load(f, Loader=_YamlLoader) or {}
+            runs = data.get('runs', []) if isinstance(data, dict) else []
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"[WARN] 读取 .run_info 文件失败: {e}", file=sys.stderr)
+            runs = []
+        runs = [run for run in runs if isinstance(run, dict)]
+        with self._parsed_lock:
+            self._legacy_parsed[key] = (signature, runs)
+        return runs
+
+    @contextlib.contextmanager
+    def reading(self):
+        """
+        读取期间对历史文件加共享锁
+
+        导入旧 .run_info 时持有排他锁，加锁后读取的旧文件和历史文件不会同时包含同一批记录。
+        历史文件不存在时不加锁。
+        """
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            yield
+            return
+        try:
+            with _Locked(fd, shared=True):
+                yield
+        finally:
+            os.close(fd)
+
+    def migrate(self) -> bool:
+        """
+        导入旧的 .run_info（如果存在）
+
+        Returns:
+            是否可以使用新的历史文件（无法写入 branch 目录时返回 False）
+        """
+        if not self.legacy_path.exists():
+            return True
+        try:
+            fd = self._open_for_append()
+        except OSError:
+            return False
+        try:
+            with _Locked(fd):
+                self._migrate_locked(fd)
+        except OSError as e:
+            print(f"[WARN] 导入 .run_info 失败: {e}", file=sys.stderr)
+            return False
+        finally:
+            os.close(fd)
+        return True
+
+    def append(self, record: Dict[str, Any]):
+        """
+        追加一条运行记录
+
+        Raises:
+            OSError: 无法写入历史文件
+        """
+        data = _encode(record)
+        fd = self._open_for_append()
+        try:
+            with _Locked(fd):
+                self._migrate_locked(fd)
+                _write_all(fd, data)
+        finally:
+            os.close(fd)
+
+    def read_tail(self, inode: Optional[int] = None,
+                  offset: int = 0) -> Tuple[Optional[int], int, List[Dict[str, Any]], bool]:
+        """
+        读取从指定位置之后追加的完整记录
+
+        Args:
+            inode: 上次读取时文件的 inode（文件被替换后从头读取）
+            offset: 上次读取到的位置
+
+        Returns:
+            (inode, 新的位置, 记录列表, 是否从头读取)；文件不存在时 inode 为 None
+        """
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return None, 0, [], True
+
+        with f:
+            st = os.fstat(f.fileno())
+            # 文件被替换或截断后重新解析
+            reset = inode != st.st_ino or st.st_size < offset
+            if reset:
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+
+        # 最后一行没有换行符时可能正在写入，留到下次读取
+        end = data.rfind(b'\n') + 1
+        records = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"[WARN] 跳过 {self.path} 中无法解析的记录", file=sys.stderr)
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return st.st_ino, offset + end, records, reset
+
+    def _read_new_records(self) -> List[Dict[str, Any]]:
+        """读取历史文件，只解析上次读取之后追加的部分"""
+        key = str(self.path)
+        with self._parsed_lock:
+            cached_inode, offset, records = self._parsed.get(key, (None, 0, []))
+        inode, offset, new_records, reset = self.read_tail(cached_inode, offset)
+        if inode is None:
+            with self._parsed_lock:
+                self._parsed.pop(key, None)
+            return []
+
+        records = new_records if reset else records + new_records
+        with self._parsed_lock:
+            self._parsed[key] = (inode, offset, records)
+        return records
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        读取所有运行记录（按写入顺序，尚未导入的旧 .run_info 记录排在前面；只读）
+
+        Returns:
+            记录列表（每次返回新的列表和字典副本，调用方可以修改）
+        """
+        with self.reading():
+            legacy = self.load_legacy()
+            records = self._read_new_records()
+        return [dict(run) for run in legacy] + [dict(run) for run in records]
+
+    def iter_runs(self, flow: Optional[str] = None, step: Optional[str] = None,
+                  status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """按 flow、step、status 过滤运行记录（按写入顺序）"""
+        for run in self.load():
+            if flow is not None and run.get('flow') != flow:
+                continue
+            if step is not None and run.get('step') != step:
+                continue
+            if status is not None and run.get('status') != status:
+                continue
+            yield run
+
+    def last_run(self, flow: str, step: str) -> Optional[Dict[str, Any]]:
+        """获取步骤最近一次的运行记录（按时间戳，相同时取后写入的）"""
+        last = None
+        for run in self.iter_runs(flow=flow, step=step):
+            if last is None or run.get('timestamp', '') >= last.get('timestamp', ''):
+                last = run
+        return last
+
+
+def append_run(branch_dir: Path, record: Dict[str, Any]):
+    """追加一条运行记录到 branch 目录的运行历史"""
+    RunHistory(branch_dir).append(record)
+
+
+def load_runs(branch_dir: Path) -> List[Dict[str, Any]]:
+    """读取 branch 目录的所有运行记录（按写入顺序）"""
+    return RunHistory(branch_dir).load()
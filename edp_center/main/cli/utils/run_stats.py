@@ -0,0 +1,483 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行统计模块
+
+按步骤（flow.step）维护运行历史的汇总（rollup），统计查询直接由汇总回答：
+- 执行次数、成功/失败次数、时长的总和/最小/最大、CPU 和内存的平均值与峰值
+- 时长分位数（P50/P90/P99）使用可合并的对数分桶草图（相对误差 1%）
+- 峰值内存和实际使用的核数（CPU 时间 / 运行时间）同样用草图汇总，供资源推荐使用
+- 每个步骤保留最近 N 次执行（按时间戳）用于趋势分析
+汇总持久化在 branch 目录的 .run_history.stats.json 中，记录已经汇总到运行历史文件的哪个位置；
+之后只读取并汇总新追加的记录，与历史总长度无关。尚未导入的旧 .run_info 只读地单独汇总，不写入持久化的汇总。
+"""
+
+import bisect
+import heapq
+import json
+import math
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .run_history import RunHistory
+
+ROLLUP_FILE_NAME = '.run_history.stats.json'
+ROLLUP_VERSION = 2
+
+# 趋势分析使用的最近执行次数
+DEFAULT_TREND_WINDOW = 10
+
+# 分位数草图的相对误差
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """
+    可合并的分位数草图（对数分桶）
+
+    正数 x 落入第 ceil(log(x) / log(gamma)) 个桶，gamma = (1 + a) / (1 - a)；
+    每个桶的代表值与桶内任意值的相对误差不超过 a。两个草图合并只需把桶计数相加。
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float):
+        if value > 0:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+
+    def merge(self, other: 'QuantileSketch'):
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        返回 q 分位数（0 <= q <= 1），没有数据时返回 None
+
+        使用向上取整的最近秩：第 ceil(q * n) 小的值（至少第 1 个），
+        样本很少时 P90/P99 取到较大的值，而不是向下落到较小的值。
+        """
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = self.zero_count
+        if rank <= seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank <= seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'zero': self.zero_count, 'bins': {str(k): v for k, v in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuantileSketch':
+        sketch = cls()
+        sketch.zero_count = data.get('zero', 0)
+        sketch.bins = {int(k): v for k, v in data.get('bins', {}).items()}
+        sketch.count = sketch.zero_count + sum(sketch.bins.values())
+        return sketch
+
+
+def step_display_name(flow: str, step: str) -> str:
+    """步骤的显示名称（flow.step）"""
+    return f"{flow}.{step}" if flow and step else step or flow
+
+
+def _number(value) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+def _run_seconds(resources: Dict[str, Any], duration: Optional[float]) -> Optional[float]:
+    """实际运行时间：优先用资源信息中的开始/结束时间（LSF 不包含排队时间），否则用 duration"""
+    start, end = resources.get('start_time'), resources.get('end_time')
+    if start and end:
+        try:
+            seconds = (datetime.strptime(str(end), '%Y-%m-%d %H:%M:%S')
+                       - datetime.strptime(str(start), '%Y-%m-%d %H:%M:%S')).total_seconds()
+            if seconds > 0:
+                return seconds
+        except ValueError:
+            pass
+    return duration if duration else None
+
+
+class StepRollup:
+    """一个步骤（或多个步骤合并后）的运行汇总"""
+
+    _COUNTERS = ('total_runs', 'success_count', 'failed_count',
+                 'duration_count', 'duration_sum', 'cpu_count', 'cpu_sum', 'memory_count', 'memory_sum',
+                 'efficiency_count', 'efficiency_sum')
+    _EXTREMES = (('duration_min', min), ('duration_max', max), ('memory_max', max), ('cores_max', max),
+                 ('first_timestamp', min), ('last_timestamp', max))
+
+    def __init__(self, trend_window: int = DEFAULT_TREND_WINDOW):
+        self.trend_window = trend_window
+        for name in self._COUNTERS:
+            setattr(self, name, 0)
+        for name, _ in self._EXTREMES:
+            setattr(self, name, None)
+        self.durations = QuantileSketch()
+        self.memories = QuantileSketch()
+        self.cores = QuantileSketch()
+        # 最近一次记录的申请资源：[timestamp, cpu_requested, memory_requested]
+        self.requested: Optional[list] = None
+        # 最近的执行（按时间戳排序）：[timestamp, status, duration]
+        self.recent: List[list] = []
+
+    @classmethod
+    def from_runs(cls, runs: Iterable[Dict[str, Any]], trend_window: int = DEFAULT_TREND_WINDOW) -> 'StepRollup':
+        rollup = cls(trend_window)
+        for run in runs:
+            rollup.add(run)
+        return rollup
+
+    def add(self, run: Dict[str, Any]):
+        """汇总一条运行记录"""
+        self.total_runs += 1
+        status = run.get('status')
+        if status == 'success':
+            self.success_count += 1
+        elif status == 'failed':
+            self.failed_count += 1
+
+        duration = _number(run.get('duration'))
+        if duration is not None:
+            self.duration_count += 1
+            self.duration_sum += duration
+            self.duration_min = duration if self.duration_min is None else min(self.duration_min, duration)
+            self.duration_max = duration if self.duration_max is None else max(self.duration_max, duration)
+            self.durations.add(duration)
+
+        resources = run.get('resources') or {}
+        cpu = _number(resources.get('cpu_used'))
+        if cpu is not None:
+            self.cpu_count += 1
+            self.cpu_sum += cpu
+        memory = _number(resources.get('peak_memory'))
+        if memory is not None:
+            self.memory_count += 1
+            self.memory_sum += memory
+            self.memory_max = memory if self.memory_max is None else max(self.memory_max, memory)
+            self.memories.add(memory)
+
+        # 实际使用的核数 = CPU 时间 / 运行时间；CPU 效率 = 使用的核数 / 分配的核数
+        cpu_time = _number(resources.get('cpu_time'))
+        run_seconds = _run_seconds(resources, duration) if cpu_time is not None else None
+        if run_seconds:
+            cores = cpu_time / run_seconds
+            self.cores.add(cores)
+            self.cores_max = cores if self.cores_max is None else max(self.cores_max, cores)
+            if cpu:
+                self.efficiency_count += 1
+                self.efficiency_sum += cores / cpu
+
+        timestamp = str(run.get('timestamp') or '')
+        requested = [timestamp, _number(resources.get('cpu_requested')), _number(resources.get('memory_requested'))]
+        if (requested[1] is not None or requested[2] is not None) and (
+                self.requested is None or timestamp >= self.requested[0]):
+            self.requested = requested
+        if timestamp:
+            self.first_timestamp = timestamp if self.first_timestamp is None else min(self.first_timestamp, timestamp)
+            self.last_timestamp = timestamp if self.last_timestamp is None else max(self.last_timestamp, timestamp)
+
+        entry = [timestamp, status, duration]
+        if not self.recent or timestamp >= self.recent[-1][0]:
+            self.recent.append(entry)
+        else:
+            self.recent.insert(bisect.bisect_right([e[0] for e in self.recent], timestamp), entry)
+        if len(self.recent) > self.trend_window:
+            del self.recent[:-self.trend_window]
+
+    def merge(self, other: 'StepRollup'):
+        """合并另一个汇总"""
+        for name in self._COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name, pick in self._EXTREMES:
+            mine, theirs = getattr(self, name), getattr(other, name)
+            if theirs is not None:
+                setattr(self, name, theirs if mine is None else pick(mine, theirs))
+        self.durations.merge(other.durations)
+        self.memories.merge(other.memories)
+        self.cores.merge(other.cores)
+        if other.requested is not None and (self.requested is None or other.requested[0] >= self.requested[0]):
+            self.requested = list(other.requested)
+        self.recent = list(heapq.merge(self.recent, other.recent, key=lambda e: e[0]))[-self.trend_window:]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """时长分位数（限制在最小和最大时长之间）"""
+        value = self.durations.quantile(q)
+        if value is None:
+            return None
+        return min(max(value, self.duration_min), self.duration_max)
+
+    def memory_quantile(self, q: float) -> Optional[float]:
+        """峰值内存分位数（MB，不超过记录到的最大值）"""
+        value = self.memories.quantile(q)
+        return None if value is None else min(value, self.memory_max)
+
+    def cores_quantile(self, q: float) -> Optional[float]:
+        """实际使用核数的分位数（不超过记录到的最大值）"""
+        value = self.cores.quantile(q)
+        return None if value is None else min(value, self.cores_max)
+
+    def to_stats(self) -> Dict[str, Any]:
+        """统计数据字典（calculate_stats 的格式，另加分位数和内存峰值）"""
+        total = self.total_runs
+        return {
+            'total_runs': total,
+            'success_count': self.success_count,
+            'failed_count': self.failed_count,
+            'unknown_count': total - self.success_count - self.failed_count,
+            'success_rate': (self.success_count / total * 100) if total > 0 else 0.0,
+            'avg_duration': self.duration_sum / self.duration_count if self.duration_count else None,
+            'min_duration': self.duration_min,
+            'max_duration': self.duration_max,
+            'total_duration': self.duration_sum if self.duration_count else 0.0,
+            'p50_duration': self.quantile(0.5),
+            'p90_duration': self.quantile(0.9),
+            'p99_duration': self.quantile(0.99),
+            'avg_cpu': self.cpu_sum / self.cpu_count if self.cpu_count else None,
+            'avg_memory': self.memory_sum / self.memory_count if self.memory_count else None,
+            'max_memory': self.memory_max,
+            'avg_cpu_efficiency': (self.efficiency_sum / self.efficiency_count * 100) if self.efficiency_count else None,
+            'last_timestamp': self.last_timestamp,
+        }
+
+    def trend(self) -> Dict[str, Any]:
+        """最近 N 次执行的成功率和平均时长"""
+        recent = self.recent
+        durations = [e[2] for e in recent if e[2] is not None]
+        return {
+            'window': len(recent),
+            'success_rate': (sum(1 for e in recent if e[1] == 'success') / len(recent) * 100) if recent else 0.0,
+            'avg_duration': sum(durations) / len(durations) if durations else None,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self._COUNTERS}
+        data.update({name: getattr(self, name) for name, _ in self._EXTREMES})
+        data['durations'] = self.durations.to_dict()
+        data['memories'] = self.memories.to_dict()
+        data['cores'] = self.cores.to_dict()
+        data['requested'] = self.requested
+        data['recent'] = self.recent
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], trend_window: int = DEFAULT_TREND_WINDOW) -> 'StepRollup':
+        rollup = cls(trend_window)
+        for name in cls._COUNTERS:
+            setattr(rollup, name, data.get(name, 0))
+        for name, _ in cls._EXTREMES:
+            setattr(rollup, name, data.get(name))
+        rollup.durations = QuantileSketch.from_dict(data.get('durations', {}))
+        rollup.memories = QuantileSketch.from_dict(data.get('memories', {}))
+        rollup.cores = QuantileSketch.from_dict(data.get('cores', {}))
+        rollup.requested = data.get('requested')
+        rollup.recent = [list(e) for e in data.get('recent', [])][-trend_window:]
+        return rollup
+
+
+def rollup_runs(runs: Iterable[Dict[str, Any]],
+                trend_window: int = DEFAULT_TREND_WINDOW) -> Dict[Tuple[str, str], StepRollup]:
+    """按 (flow, step) 汇总运行记录"""
+    rollups: Dict[Tuple[str, str], StepRollup] = {}
+    for run in runs:
+        key = (run.get('flow') or '', run.get('step') or '')
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = StepRollup(trend_window)
+        rollup.add(run)
+    return rollups
+
+
+def match_step_filter(flow: str, step: str, step_filter: Optional[str]) -> bool:
+    """步骤过滤器（flow.step 或 step）是否匹配"""
+    if not step_filter:
+        return True
+    if '.' in step_filter:
+        flow_name, step_name = step_filter.split('.', 1)
+        return flow == flow_name and step == step_name
+    return step == step_filter
+
+
+class RunStats:
+    """
+    branch 目录运行历史的统计汇总
+
+    Example:
+        >>> stats = RunStats(branch_dir).refresh()
+        >>> stats.overall_stats('pnr_innovus.place')['p90_duration']
+        >>> stats.step_stats()
+    """
+
+    def __init__(self, branch_dir: Path, trend_window: int = DEFAULT_TREND_WINDOW):
+        self.branch_dir = Path(branch_dir)
+        self.history = RunHistory(self.branch_dir)
+        self.rollup_path = self.branch_dir / ROLLUP_FILE_NAME
+        self.trend_window = trend_window
+        # 查询使用的汇总（运行历史文件 + 尚未导入的旧 .run_info）
+        self.rollups: Dict[Tuple[str, str], StepRollup] = {}
+        # 运行历史文件的汇总（持久化）
+        self._history_rollups: Dict[Tuple[str, str], StepRollup] = {}
+        self._legacy_runs: Optional[List[Dict[str, Any]]] = None
+        self._legacy_rollups: Dict[Tuple[str, str], StepRollup] = {}
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load_persisted(self):
+        """读取持久化的汇总（版本或窗口大小不一致时忽略）"""
+        try:
+            with open(self.rollup_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != ROLLUP_VERSION or data.get('trend_window') != self.trend_window:
+            return
+        try:
+            self._history_rollups = {
+                (item['flow'], item['step']): StepRollup.from_dict(item['rollup'], self.trend_window)
+                for item in data.get('steps', [])
+            }
+            self._inode, self._offset = data.get('inode'), data.get('offset', 0)
+        except (KeyError, TypeError, ValueError):
+            self._history_rollups, self._inode, self._offset = {}, None, 0
+
+    def _save(self):
+        """原子地写入汇总（branch 目录不可写时跳过）"""
+        data = {
+            'version': ROLLUP_VERSION,
+            'trend_window': self.trend_window,
+            'inode': self._inode,
+            'offset': self._offset,
+            'steps': [{'flow': flow, 'step': step, 'rollup': rollup.to_dict()}
+                      for (flow, step), rollup in self._history_rollups.items()],
+        }
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=ROLLUP_FILE_NAME + '.', dir=self.branch_dir)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.rollup_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # 汇总只是加速，无法保存时下次重新汇总
+            pass
+
+    def _combine(self):
+        """合并旧 .run_info 和运行历史文件的汇总，供查询使用"""
+        if not self._legacy_rollups:
+            self.rollups = self._history_rollups
+            return
+        combined: Dict[Tuple[str, str], StepRollup] = {}
+        for source in (self._legacy_rollups, self._history_rollups):
+            for key, rollup in source.items():
+                if key not in combined:
+                    combined[key] = StepRollup(self.trend_window)
+                combined[key].merge(rollup)
+        self.rollups = combined
+
+    def refresh(self) -> 'RunStats':
+        """汇总运行历史中新追加的记录（只读运行历史，不导入旧 .run_info）"""
+        with self._lock:
+            if not self._loaded:
+                self._load_persisted()
+                self._loaded = True
+            with self.history.reading():
+                legacy_runs = self.history.load_legacy()
+                inode, offset, records, reset = self.history.read_tail(self._inode, self._offset)
+            # 旧文件未变化时 load_legacy 返回同一个列表
+            if legacy_runs is not self._legacy_runs:
+                self._legacy_runs = legacy_runs
+                self._legacy_rollups = rollup_runs(legacy_runs, self.trend_window)
+
+            if inode is None:
+                changed = bool(self._history_rollups)
+                self._history_rollups, self._inode, self._offset = {}, None, 0
+                if changed:
+                    self._save()
+                self._combine()
+                return self
+            if reset:
+                self._history_rollups = {}
+            for key, rollup in rollup_runs(records, self.trend_window).items():
+                if key in self._history_rollups:
+                    self._history_rollups[key].merge(rollup)
+                else:
+                    self._history_rollups[key] = rollup
+            if reset or records or offset != self._offset:
+                self._inode, self._offset = inode, offset
+                self._save()
+            self._combine()
+        return self
+
+    @property
+    def total_runs(self) -> int:
+        return sum(r.total_runs for r in self.rollups.values())
+
+    def query(self, step_filter: Optional[str] = None) -> StepRollup:
+        """合并匹配过滤器的步骤汇总"""
+        merged = StepRollup(self.trend_window)
+        for (flow, step), rollup in self.rollups.items():
+            if match_step_filter(flow, step, step_filter):
+                merged.merge(rollup)
+        return merged
+
+    def overall_stats(self, step_filter: Optional[str] = None) -> Dict[str, Any]:
+        """总体统计（可按步骤过滤）"""
+        return self.query(step_filter).to_stats()
+
+    def step_stats(self) -> Dict[str, Dict[str, Any]]:
+        """按步骤统计 {flow.step: stats}"""
+        result: Dict[str, StepRollup] = {}
+        for (flow, step), rollup in self.rollups.items():
+            name = step_display_name(flow, step)
+            if name in result:
+                result[name].merge(rollup)
+            else:
+                merged = result[name] = StepRollup(self.trend_window)
+                merged.merge(rollup)
+        return {name: rollup.to_stats() for name, rollup in result.items()}
+
+    def trend(self, step_filter: Optional[str] = None) -> Dict[str, Any]:
+        """最近 N 次执行的趋势"""
+        return self.query(step_filter).trend()
+
+
+_engines: Dict[str, RunStats] = {}
+_engines_lock = threading.Lock()
+
+
+def get_run_stats(branch_dir: Path) -> RunStats:
+    """获取 branch 目录的统计汇总（进程内共享，每次调用只汇总新追加的记录）"""
+    key = str(Path(branch_dir).resolve())
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = RunStats(Path(branch_dir))
+    return engine.refresh()
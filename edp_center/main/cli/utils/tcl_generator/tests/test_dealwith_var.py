@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 edp_dealwith_var.tcl 的变量保护和约束（数组元素共享一个写 trace）
+"""
+
+import sys
+import os
+from pathlib import Path
+from tkinter import Tcl, TclError
+
+# 添加 edp_center 到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../..')))
+
+DEALWITH_VAR_TCL = (Path(__file__).resolve().parents[5] /
+                    "flow" / "common" / "packages" / "tcl" / "default" / "edp_dealwith_var.tcl")
+
+
+class TestDealwithVar:
+    """测试 edp_protect_var / edp_constraint_var"""
+
+    def setup_method(self):
+        """每个测试使用新的 Tcl interpreter"""
+        self.interp = Tcl()
+        self.interp.eval(f"source {{{DEALWITH_VAR_TCL.as_posix()}}}")
+        # 保护提示会 puts 到 stdout，测试中丢弃
+        self.interp.eval("rename puts __edp_test_puts; proc puts {args} {}")
+
+    def test_single_trace_per_array(self):
+        """测试多个受保护/受约束的元素只在数组上安装一个 trace"""
+        for i in range(50):
+            self.interp.eval(f'edp_constraint_var pnr_innovus(step{i},cpu_num) "4 8 16"')
+            self.interp.eval(f'edp_protect_var pnr_innovus(step{i},memory) 1000')
+        traces = self.interp.eval("llength [trace info variable pnr_innovus]")
+        assert traces == "1"
+
+    def test_protected_element_restored(self):
+        """测试受保护的数组元素写入后恢复为保护值，其他元素不受影响"""
+        self.interp.eval("edp_protect_var pnr_innovus(place,memory) 1000")
+        self.interp.eval("set pnr_innovus(place,memory) 2000")
+        self.interp.eval("set pnr_innovus(route,memory) 3000")
+        assert self.interp.eval("set pnr_innovus(place,memory)") == "1000"
+        assert self.interp.eval("set pnr_innovus(route,memory)") == "3000"
+
+    def test_protected_element_written_from_proc(self):
+        """测试在 proc 中通过 global 写入受保护元素"""
+        self.interp.eval("edp_protect_var pnr_innovus(place,memory) 1000")
+        self.interp.eval("proc change {} { global pnr_innovus; set pnr_innovus(place,memory) 1 }")
+        self.interp.eval("change")
+        assert self.interp.eval("set pnr_innovus(place,memory)") == "1000"
+
+    def test_reprotect_with_new_value(self):
+        """测试重新保护时使用新的保护值"""
+        self.interp.eval("edp_protect_var pnr_innovus(place,memory) 1000")
+        self.interp.eval("edp_protect_var pnr_innovus(place,memory) 2000")
+        self.interp.eval("set pnr_innovus(place,memory) 3000")
+        assert self.interp.eval("set pnr_innovus(place,memory)") == "2000"
+
+    def test_constraint_rejects_invalid_value(self):
+        """测试受约束的数组元素拒绝不在允许列表中的值"""
+        self.interp.eval('set pnr_innovus(place,cpu_num) 8')
+        self.interp.eval('edp_constraint_var pnr_innovus(place,cpu_num) "4 8 16"')
+        self.interp.eval("set pnr_innovus(place,cpu_num) 16")
+        assert self.interp.eval("set pnr_innovus(place,cpu_num)") == "16"
+        try:
+            self.interp.eval("set pnr_innovus(place,cpu_num) 3")
+            assert False, "应该抛出约束错误"
+        except TclError as e:
+            assert "Allowed values are: 4 8 16" in str(e)
+
+    def test_unprotect_and_unconstraint(self):
+        """测试移除保护和约束后可以自由写入"""
+        self.interp.eval("edp_protect_var pnr_innovus(place,memory) 1000")
+        self.interp.eval('edp_constraint_var pnr_innovus(place,cpu_num) "4 8 16"')
+        self.interp.eval("edp_unprotect_var pnr_innovus(place,memory)")
+        self.interp.eval("edp_unconstraint_var pnr_innovus(place,cpu_num)")
+        self.interp.eval("set pnr_innovus(place,memory) 2000")
+        self.interp.eval("set pnr_innovus(place,cpu_num) 3")
+        assert self.interp.eval("set pnr_innovus(place,memory)") == "2000"
+        assert self.interp.eval("set pnr_innovus(place,cpu_num)") == "3"
+
+    def test_scalar_protect(self):
+        """测试普通变量的保护"""
+        self.interp.eval("edp_protect_var top_cell chip")
+        self.interp.eval("set top_cell other")
+        assert self.interp.eval("set top_cell") == "chip"
+        self.interp.eval("edp_unprotect_var top_cell")
+        self.interp.eval("set top_cell other")
+        assert self.interp.eval("set top_cell") == "other"
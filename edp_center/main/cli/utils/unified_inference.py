@@ -20,6 +20,7 @@ from .inference.project_inference import (
 )
 from .inference.path_inference import infer_work_path_info as _infer_work_path_info_func
 from .inference.inference_validator import validate_work_path_info as _validate_work_path_info_func
+from .inference.inference_cache import info_digest, memoize_inference
 
 
 class UnifiedInference:
@@ -127,14 +128,14 @@ class UnifiedInference:
                 'node': str,
                 'project': Optional[str]  # 可能为 None（使用 common）
             }
+        
+        结果按目录和参数缓存，.edp_version 或 config 目录树变化后重新推断（见 inference_cache）。
         """
-        return _infer_project_info_func(
-            self.edp_center_path,
-            self.config_path,
-            self.project_finder,
-            current_dir,
-            args
-        )
+        return memoize_inference(
+            'project', self.edp_center_path, current_dir, args,
+            lambda: _infer_project_info_func(self.edp_center_path, self.config_path,
+                                             self.project_finder, current_dir, args),
+            config_path=self.config_path)
     
     def infer_work_path_info(self, current_dir: Path, args, 
                              project_info: Optional[Dict] = None) -> Optional[Dict]:
@@ -165,8 +166,12 @@ class UnifiedInference:
                 'user': Optional[str],
                 'branch': Optional[str]
             }
+        
+        结果按目录、参数和 project_info 缓存，.edp_version 变化后重新推断（见 inference_cache）。
         """
-        return _infer_work_path_info_func(current_dir, args, project_info)
+        return memoize_inference('work_path', self.edp_center_path, current_dir, args,
+                                 lambda: _infer_work_path_info_func(current_dir, args, project_info),
+                                 extra_key=info_digest(project_info))
     
     def infer_all_info(self, current_dir: Path, args) -> Tuple[Optional[Dict], Optional[Dict]]:
         """
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+YAML 解析缓存模块
+按文件路径缓存 yaml.safe_load 的结果，用文件的 mtime 和大小判断缓存是否有效。
+
+一次 edp -info 会多次读取同一批 dependency.yaml（列出 flow、查找 step 所属 flow 等），
+常驻的 edp daemon 中缓存在多次请求之间共享，文件被修改后自动重新解析。
+
+缓存是模块级共享状态，所有读写都在 _cache_lock 保护下进行。
+返回的对象由所有调用方共享，调用方不要修改。
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+# 路径 -> ((st_mtime_ns, st_size), 解析结果)
+_yaml_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def load_yaml(path: Union[str, Path]) -> Any:
+    """
+    读取并解析 YAML 文件（文件未修改时直接返回缓存的结果）
+
+    Args:
+        path: YAML 文件路径
+
+    Returns:
+        解析结果（空文件返回 None，与 yaml.safe_load 一致）
+
+    Raises:
+        OSError: 文件不存在或无法读取
+        yaml.YAMLError: YAML 格式错误（不缓存）
+    """
+    key = os.path.abspath(str(path))
+    signature = _file_signature(key)
+    with _cache_lock:
+        entry = _yaml_cache.get(key)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+
+    import yaml
+    # 优先使用 libyaml（与 yaml.safe_load 的结果相同，速度快一个数量级）
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(key, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=loader)
+    with _cache_lock:
+        _yaml_cache[key] = (signature, data)
+    return data
+
+
+def clear_yaml_cache():
+    """清除所有缓存的解析结果"""
+    with _cache_lock:
+        _yaml_cache.clear()
@@ -161,7 +161,9 @@ class WorkflowManager:
                       foundry: Optional[str] = None,
                       node: Optional[str] = None,
                       project: Optional[str] = None,
-                      flow_name: Optional[str] = None) -> Optional[str]:
+                      flow_name: Optional[str] = None,
+                      package_bundle_dir: Optional[Union[str, Path]] = None,
+                      sub_step_checkpoint: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         处理 Tcl 脚本（使用 edp_cmdkit）
         
@@ -179,6 +181,9 @@ class WorkflowManager:
             node: 工艺节点（如 S8），用于生成默认 source 语句
             project: 项目名称（如 dongting），用于生成默认 source 语句
             flow_name: 流程名称（如 pnr_innovus），用于生成默认 source 语句
+            package_bundle_dir: package bundle 输出目录，提供时默认 package 合并为一个文件后 source
+            sub_step_checkpoint: sub_step checkpoint 配置（every/save_proc/restore_proc/dir），
+                                 提供时 sub_steps 通过 edp_sub_steps::run_checkpointed 执行，重新运行时自动续跑
             
         Returns:
             如果 output_file 为 None，返回处理后的内容字符串
@@ -199,7 +204,9 @@ class WorkflowManager:
             foundry=foundry,
             node=node,
             project=project,
-            flow_name=flow_name
+            flow_name=flow_name,
+            package_bundle_dir=package_bundle_dir,
+            sub_step_checkpoint=sub_step_checkpoint
         )
     
     # ==================== 工作流执行阶段 ====================
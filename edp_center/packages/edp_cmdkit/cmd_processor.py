@@ -8,7 +8,7 @@ CmdProcessor - Tcl 脚本处理器
 """
 
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 import logging
 from .content_assembler import assemble_content_with_hooks
 from .path_preparer import prepare_search_paths
@@ -24,7 +24,12 @@ logger = logging.getLogger(__name__)
 
 
 class CmdProcessor:
-    """Tcl 命令脚本处理器"""
+    """
+    Tcl 命令脚本处理器
+    
+    实例只保存初始化时的配置，单次 process_file 调用的状态（如防止循环引用的已处理文件集合）
+    都在调用内部创建，因此同一个实例可以在多个线程中并发调用 process_file。
+    """
     
     def __init__(self, 
                  base_dir: Optional[Path] = None,
@@ -39,7 +44,6 @@ class CmdProcessor:
             default_recursive: 默认是否递归查找子目录。默认为 True
         """
         self.base_dir = Path(base_dir) if base_dir else Path.cwd()
-        self.processed_files = set()  # 防止循环引用
         self.default_search_paths = []
         if default_search_paths:
             for p in default_search_paths:
@@ -50,8 +54,7 @@ class CmdProcessor:
                     logger.warning(f"默认搜索路径不存在或不是目录，将跳过: {p}")
         self.default_recursive = default_recursive
         
-        # 初始化各个处理器
-        self.import_processor = ImportProcessor(self.processed_files)
+        # 初始化无状态的处理器（ImportProcessor 带有单次调用状态，在 process_file 中创建）
         self.sub_steps_processor = SubStepsProcessor()
     
     def process_file(self, 
@@ -73,7 +76,11 @@ class CmdProcessor:
             # Debug 模式参数
             debug_mode: int = 0,
             # Skip sub_steps 参数
-            skip_sub_steps: Optional[List[str]] = None) -> Optional[str]:
+            skip_sub_steps: Optional[List[str]] = None,
+            # Package bundle 参数
+            package_bundle_dir: Optional[Union[str, Path]] = None,
+            # Sub_step checkpoint 参数
+            sub_step_checkpoint: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         处理 Tcl 文件，解析 #import 指令并生成最终脚本
         
@@ -105,6 +112,11 @@ class CmdProcessor:
             step_name: 步骤名称（如 ipmerge），用于查找 step.pre 和 step.post
             debug_mode: Debug 模式：0=正常执行，1=交互式调试
             skip_sub_steps: 要跳过的 sub_steps 列表（从 user_config.yaml 读取）
+            package_bundle_dir: package bundle 输出目录。提供时默认 package 合并为一个文件后 source，
+                                仅在 prepend_default_sources=True 时生效
+            sub_step_checkpoint: sub_step checkpoint 配置（every/save_proc/restore_proc/dir）。
+                                 提供时自动生成的 sub_steps 调用改为 edp_sub_steps::run_checkpointed，
+                                 重新运行时从最后一个 checkpoint 继续（debug 模式下不生效）
         
         Returns:
             如果 output_file 为 None，返回处理后的内容字符串
@@ -123,8 +135,8 @@ class CmdProcessor:
                 suggestion="请检查文件路径是否正确，或使用绝对路径"
             )
         
-        # 重置已处理文件集合（新文件处理开始时）
-        self.processed_files.clear()
+        # 每次调用使用独立的 ImportProcessor 和已处理文件集合（防止循环引用），不在线程间共享
+        import_processor = ImportProcessor(processed_files=set())
         
         # 准备搜索路径和推断路径信息
         edp_center_path, foundry, node, project, flow_name, search_paths = prepare_search_paths(
@@ -153,7 +165,7 @@ class CmdProcessor:
         #   - 被 source 的文件内部的 #import source 指令（递归处理）
         # 注意：使用字符串处理方式，不需要创建临时文件
         hooks_dir_path = Path(hooks_dir) if hooks_dir else None
-        result = self.import_processor.process_imports_in_content(
+        result = import_processor.process_imports_in_content(
             assembled_content, input_file, search_paths, hooks_dir=hooks_dir_path, step_name=step_name
         )
         
@@ -173,11 +185,16 @@ class CmdProcessor:
                 result, edp_center_path_obj, foundry, node, project, flow_name, step_name, skip_sub_steps
             )
         
+        # 阶段5：sub_step checkpoint（debug 模式由 edp_run 管理调用，不需要）
+        if sub_step_checkpoint is not None and debug_mode != 1:
+            result = self.sub_steps_processor.wrap_sub_steps_with_checkpoint(result, sub_step_checkpoint)
+        
         # 如果需要，在文件头部添加默认的 source 语句
         if prepend_default_sources and edp_center_path:
             result = add_prepend_sources(
                 result, input_file, edp_center_path, foundry, node, project, flow_name,
-                step_name, full_tcl_path, output_file, search_paths, hooks_dir
+                step_name, full_tcl_path, output_file, search_paths, hooks_dir,
+                package_bundle_dir=package_bundle_dir
             )
         
         # 注意：step hooks 已经在整合阶段添加，不需要再次处理
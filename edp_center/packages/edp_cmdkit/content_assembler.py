@@ -185,7 +185,7 @@ def assemble_content_with_hooks(main_script_file: Path,
                 step_pre_content = step_pre_file.read_text(encoding='utf-8')
                 if not is_hook_file_empty(step_pre_content):
                     # 导入生成函数（从 generator 导入，向后兼容）
-                    from ..sub_steps import generate_step_hook_proc
+                    from .sub_steps import generate_step_hook_proc
                     # 生成 proc 定义
                     step_pre_proc = generate_step_hook_proc(flow_name, step_name, 'pre', step_pre_content)
                     result_parts.append(f"# ========== step.pre hook ==========\n")
@@ -223,7 +223,7 @@ def assemble_content_with_hooks(main_script_file: Path,
                 step_post_content = step_post_file.read_text(encoding='utf-8')
                 if not is_hook_file_empty(step_post_content):
                     # 导入生成函数（从 generator 导入，向后兼容）
-                    from ..sub_steps import generate_step_hook_proc
+                    from .sub_steps import generate_step_hook_proc
                     # 生成 proc 定义
                     step_post_proc = generate_step_hook_proc(flow_name, step_name, 'post', step_post_content)
                     result_parts.append(f"\n# ========== step.post hook ==========\n")
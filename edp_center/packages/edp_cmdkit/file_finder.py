@@ -5,11 +5,15 @@
 文件查找模块
 提供在搜索路径中查找文件的功能
 支持文件搜索缓存以提升性能
+
+缓存是模块级共享状态，所有读写都在 _cache_lock 保护下进行，
+可以在多个线程中并发调用 find_file（例如 run_range 并行准备多个 step）。
 """
 
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple
 import os
+import threading
 
 # 文件搜索缓存
 # 结构: {(search_path, file_name): (result_path, timestamp)}
@@ -19,6 +23,9 @@ _file_cache: Dict[Tuple[Path, str], Tuple[Optional[Path], float]] = {}
 # 结构: {search_path: timestamp}
 _dir_timestamps: Dict[Path, float] = {}
 
+# 保护 _file_cache 和 _dir_timestamps 的锁（可重入：_cache_result 内部会调用 _get_dir_timestamp）
+_cache_lock = threading.RLock()
+
 
 def _get_dir_timestamp(search_path: Path) -> float:
     """
@@ -30,15 +37,16 @@ def _get_dir_timestamp(search_path: Path) -> float:
     Returns:
         目录的修改时间戳
     """
-    if search_path not in _dir_timestamps:
-        try:
-            # 获取目录的修改时间
-            _dir_timestamps[search_path] = os.path.getmtime(str(search_path))
-        except OSError:
-            # 如果目录不存在或无法访问，返回 0
-            _dir_timestamps[search_path] = 0.0
-    
-    return _dir_timestamps[search_path]
+    with _cache_lock:
+        if search_path not in _dir_timestamps:
+            try:
+                # 获取目录的修改时间
+                _dir_timestamps[search_path] = os.path.getmtime(str(search_path))
+            except OSError:
+                # 如果目录不存在或无法访问，返回 0
+                _dir_timestamps[search_path] = 0.0
+        
+        return _dir_timestamps[search_path]
 
 
 def _is_cache_valid(search_path: Path, file_name: str) -> bool:
@@ -52,28 +60,46 @@ def _is_cache_valid(search_path: Path, file_name: str) -> bool:
     Returns:
         如果缓存有效返回 True，否则返回 False
     """
-    cache_key = (search_path, file_name)
+    return _lookup_cache(search_path, file_name)[0]
+
+
+def _lookup_cache(search_path: Path, file_name: str) -> Tuple[bool, Optional[Path]]:
+    """
+    读取缓存项并检查其有效性
+    
+    缓存项在加锁时一次性取出，之后的判断只使用这份快照。分开调用 _is_cache_valid
+    和读取 _file_cache 时，其他线程可能在两次调用之间清除缓存，因此 find_file 使用本函数。
     
-    if cache_key not in _file_cache:
-        return False
+    Args:
+        search_path: 搜索路径
+        file_name: 文件名
+        
+    Returns:
+        (缓存是否有效, 缓存的搜索结果)
+    """
+    with _cache_lock:
+        entry = _file_cache.get((search_path, file_name))
+    if entry is None:
+        return False, None
     
-    # 检查目录是否被修改（获取最新时间戳）
+    # 检查目录是否被修改（获取最新时间戳，stat 时不持有锁）
     try:
         current_timestamp = os.path.getmtime(str(search_path))
     except OSError:
         # 如果目录不存在或无法访问，缓存失效
-        return False
+        return False, None
     
     # 获取缓存时的时间戳
-    _, cached_timestamp = _file_cache[cache_key]
+    result, cached_timestamp = entry
     
     # 如果目录时间戳发生变化，缓存失效
     if current_timestamp != cached_timestamp:
         # 更新目录时间戳缓存
-        _dir_timestamps[search_path] = current_timestamp
-        return False
+        with _cache_lock:
+            _dir_timestamps[search_path] = current_timestamp
+        return False, None
     
-    return True
+    return True, result
 
 
 def _get_cached_result(search_path: Path, file_name: str) -> Optional[Path]:
@@ -87,12 +113,7 @@ def _get_cached_result(search_path: Path, file_name: str) -> Optional[Path]:
     Returns:
         缓存的搜索结果，如果缓存无效或不存在返回 None
     """
-    if not _is_cache_valid(search_path, file_name):
-        return None
-    
-    cache_key = (search_path, file_name)
-    result, _ = _file_cache[cache_key]
-    return result
+    return _lookup_cache(search_path, file_name)[1]
 
 
 def _cache_result(search_path: Path, file_name: str, result: Optional[Path]):
@@ -105,8 +126,9 @@ def _cache_result(search_path: Path, file_name: str, result: Optional[Path]):
         result: 搜索结果
     """
     cache_key = (search_path, file_name)
-    timestamp = _get_dir_timestamp(search_path)
-    _file_cache[cache_key] = (result, timestamp)
+    with _cache_lock:
+        timestamp = _get_dir_timestamp(search_path)
+        _file_cache[cache_key] = (result, timestamp)
 
 
 def clear_file_cache():
@@ -115,9 +137,9 @@ def clear_file_cache():
     
     用于在目录结构发生重大变化时手动清除缓存
     """
-    global _file_cache, _dir_timestamps
-    _file_cache.clear()
-    _dir_timestamps.clear()
+    with _cache_lock:
+        _file_cache.clear()
+        _dir_timestamps.clear()
 
 
 def find_file(import_file: str, current_file: Path, search_paths: List[Path], recursive: bool = True) -> Optional[Path]:
@@ -162,22 +184,21 @@ def find_file(import_file: str, current_file: Path, search_paths: List[Path], re
         # 只在 import_path 不包含路径分隔符时递归查找
         if recursive:
             if '/' not in str(import_path) and '\\' not in str(import_path):
-                # 检查缓存
-                cached_result = _get_cached_result(search_path, import_file)
+                # 检查缓存（有效性和结果在同一次加锁内读取）
+                cache_valid, cached_result = _lookup_cache(search_path, import_file)
                 if cached_result is not None:
                     # 验证缓存的文件是否仍然存在
                     if cached_result.exists():
                         return cached_result
                     # 如果缓存的文件不存在了，清除该缓存项
-                    cache_key = (search_path, import_file)
-                    if cache_key in _file_cache:
-                        del _file_cache[cache_key]
-                elif _is_cache_valid(search_path, import_file):
-                    # 缓存有效且结果为 None（之前确认未找到）
-                    # 验证目录是否仍然未修改（如果修改了，可能新增了文件）
-                    return None
+                    with _cache_lock:
+                        _file_cache.pop((search_path, import_file), None)
+                elif cache_valid:
+                    # 缓存有效且结果为 None（之前确认该搜索路径下没有此文件，且目录未修改）
+                    # 继续查找下一个搜索路径
+                    continue
                 
-                # 递归搜索所有子目录（性能瓶颈所在）
+                # 递归搜索所有子目录（性能瓶颈所在，不持有锁，多个线程可能重复搜索同一目录，结果相同）
                 result = None
                 for subdir in search_path.rglob('*'):
                     if subdir.is_dir():
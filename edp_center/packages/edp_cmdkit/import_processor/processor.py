@@ -27,16 +27,20 @@ IMPORT_PATTERN = re.compile(
 
 
 class ImportProcessor:
-    """Import 指令处理器"""
+    """
+    Import 指令处理器
     
-    def __init__(self, processed_files: set):
+    processed_files 是单次处理的状态，实例不应在线程间共享，每次处理创建新实例即可。
+    """
+    
+    def __init__(self, processed_files: Optional[set] = None):
         """
         初始化 ImportProcessor
         
         Args:
-            processed_files: 已处理文件集合（用于防止循环引用）
+            processed_files: 已处理文件集合（用于防止循环引用），为 None 时创建新的集合
         """
-        self.processed_files = processed_files
+        self.processed_files = processed_files if processed_files is not None else set()
         self.import_pattern = IMPORT_PATTERN
         self.source_processor = SourceProcessor()
     
@@ -154,8 +158,7 @@ class ImportProcessor:
                         f"处理 #import 指令失败: {e}",
                         context={
                             'line': line.strip(),
-                            'import_file': import_file,
-                            'import_type': import_type
+                            'import_file': import_file
                         },
                         suggestion="请检查文件格式和内容是否正确"
                     )
@@ -7,12 +7,20 @@ PackageLoader - Tcl 包加载器
 用于生成默认的 source 语句，自动加载 edp_center 中的 packages。
 """
 
+import hashlib
+import os
+import threading
 from pathlib import Path
-from typing import List, Optional, Union, Dict
+from typing import List, Optional, Union, Dict, Tuple
 import logging
 
+from edp_center.packages.edp_common.path_utils import to_tcl_path
+
 logger = logging.getLogger(__name__)
 
+# package bundle 文件名前缀：<prefix><flow_name>_<content_hash>.tcl
+PACKAGE_BUNDLE_PREFIX = "edp_packages_"
+
 
 class PackageLoader:
     """Tcl 包加载器"""
@@ -215,7 +223,8 @@ class PackageLoader:
                                  node: Optional[str] = None,
                                  project: Optional[str] = None,
                                  flow_name: Optional[str] = None,
-                                 include_sub_steps: bool = False) -> str:
+                                 include_sub_steps: bool = False,
+                                 bundle_dir: Optional[Union[str, Path]] = None) -> str:
         """
         生成默认的 source 语句
         
@@ -236,10 +245,14 @@ class PackageLoader:
             project: 项目名称（如 dongting）。如果提供了 project 但没有提供 foundry 和 node，会尝试自动查找
             flow_name: 流程名称（如 pv_calibre），可选
             include_sub_steps: 是否包含 sub_steps 目录（已弃用，sub_steps 现在放在 sub_steps 目录），默认为 False
+            bundle_dir: 打包模式的输出目录。提供时将所有 package 文件合并为一个 bundle 文件，
+                        只生成一条 source 语句（减少 EDA 工具启动时在 NFS 上的文件打开次数）
         
         Returns:
             生成的 source 语句字符串（每行一个 source 语句）
         """
+        from edp_center.packages.edp_common import ValidationError
+        
         # 如果提供了 project 但没有提供 foundry 和 node，尝试自动查找
         if project and (not foundry or not node):
             project_info = self.find_project_info(project)
@@ -270,98 +283,147 @@ class PackageLoader:
                     "  - 或通过 project 参数自动查找"
                 )
             )
-        source_lines = []
+        package_sections = self._collect_default_package_files(foundry, node, project, flow_name)
+        
+        # 打包模式：所有 package 文件合并为一个按内容哈希命名的文件，只 source 这一个文件
+        if bundle_dir is not None:
+            package_files = [f for _, files in package_sections for f in files]
+            if not package_files:
+                return ""
+            bundle_path = self.write_package_bundle(package_files, bundle_dir, flow_name=flow_name)
+            return (
+                "# All packages bundled into a single file (see '# file:' markers inside)\n"
+                f"source {to_tcl_path(bundle_path)}\n\n"
+            )
         
-        # 1. All packages from general common package default path
-        # flow/common/packages/tcl/default/*
-        common_default_dir = self.flow_path / "common" / "packages" / "tcl" / "default"
-        common_default_sources = self._generate_sources_from_dir(common_default_dir)
-        if common_default_sources:
-            source_lines.append("# All packages from general common package default path")
-            source_lines.extend(common_default_sources)
+        source_lines = []
+        for comment, files in package_sections:
+            if comment:
+                source_lines.append(comment)
+            source_lines.extend(f"source {to_tcl_path(f)}" for f in files)
             source_lines.append("")  # 空行分隔
         
+        # 注意：sub_steps 现在放在 sub_steps 目录下（flow/sub_steps/），通过 dependency.yaml 配置自动生成 source 语句
+        # 不再从 packages 目录加载 sub_steps
+        
+        # 移除末尾的空行（如果有）
+        result = '\n'.join(source_lines)
+        if result and not result.endswith('\n'):
+            result += '\n'
+        return result
+    
+    def _collect_default_package_files(self,
+                                       foundry: str,
+                                       node: str,
+                                       project: Optional[str],
+                                       flow_name: Optional[str]) -> List[Tuple[Optional[str], List[Path]]]:
+        """
+        按优先级顺序收集默认 package 文件
+        
+        Args:
+            foundry: 代工厂名称
+            node: 工艺节点
+            project: 项目名称（可选）
+            flow_name: 流程名称（可选）
+        
+        Returns:
+            (分组注释, 文件列表) 的列表，注释为 None 表示不输出注释；空分组已被过滤
+        """
+        tcl_root = self.flow_path / "initialize" / foundry / node
+        candidates = [
+            # 1. All packages from general common package default path
+            # flow/common/packages/tcl/default/*
+            ("# All packages from general common package default path",
+             self.flow_path / "common" / "packages" / "tcl" / "default"),
+        ]
         # flow/common/packages/tcl/<flow_name>/* (if flow_name specified)
         if flow_name:
-            common_flow_dir = self.flow_path / "common" / "packages" / "tcl" / flow_name
-            common_flow_sources = self._generate_sources_from_dir(common_flow_dir)
-            if common_flow_sources:
-                source_lines.extend(common_flow_sources)
-                source_lines.append("")  # 空行分隔
+            candidates.append((None, self.flow_path / "common" / "packages" / "tcl" / flow_name))
         
         # 2. All packages from foundry node level default path
         # flow/initialize/<FOUNDRY>/<NODE>/common/packages/tcl/default/*
-        foundry_node_common_default = (self.flow_path / "initialize" / foundry / node /
-                                      "common" / "packages" / "tcl" / "default")
-        foundry_node_default_sources = self._generate_sources_from_dir(foundry_node_common_default)
-        if foundry_node_default_sources:
-            source_lines.append("# All packages from foundry node level default path")
-            source_lines.extend(foundry_node_default_sources)
-            source_lines.append("")  # 空行分隔
-        
+        candidates.append(("# All packages from foundry node level default path",
+                           tcl_root / "common" / "packages" / "tcl" / "default"))
         # flow/initialize/<FOUNDRY>/<NODE>/common/packages/tcl/<flow_name>/* (if flow_name specified)
         if flow_name:
-            foundry_node_common_flow = (self.flow_path / "initialize" / foundry / node /
-                                       "common" / "packages" / "tcl" / flow_name)
-            foundry_node_flow_sources = self._generate_sources_from_dir(foundry_node_common_flow)
-            if foundry_node_flow_sources:
-                source_lines.extend(foundry_node_flow_sources)
-                source_lines.append("")  # 空行分隔
+            candidates.append((None, tcl_root / "common" / "packages" / "tcl" / flow_name))
         
         # 3. All packages from project level default path
         # flow/initialize/<FOUNDRY>/<NODE>/<PROJECT>/packages/tcl/default/*
         if project:
-            project_default_dir = (self.flow_path / "initialize" / foundry / node / project /
-                                  "packages" / "tcl" / "default")
-            project_default_sources = self._generate_sources_from_dir(project_default_dir)
-            if project_default_sources:
-                source_lines.append("# All packages from project level default path")
-                source_lines.extend(project_default_sources)
-                source_lines.append("")  # 空行分隔
-            
+            candidates.append(("# All packages from project level default path",
+                               tcl_root / project / "packages" / "tcl" / "default"))
             # flow/initialize/<FOUNDRY>/<NODE>/<PROJECT>/packages/tcl/<flow_name>/* (if flow_name specified)
             if flow_name:
-                project_flow_dir = (self.flow_path / "initialize" / foundry / node / project /
-                                   "packages" / "tcl" / flow_name)
-                project_flow_sources = self._generate_sources_from_dir(project_flow_dir)
-                if project_flow_sources:
-                    source_lines.extend(project_flow_sources)
-                    source_lines.append("")  # 空行分隔
+                candidates.append((None, tcl_root / project / "packages" / "tcl" / flow_name))
+        
+        sections = []
+        for comment, dir_path in candidates:
+            files = self._find_tcl_files(dir_path)
+            if files:
+                sections.append((comment, files))
+        return sections
+    
+    def write_package_bundle(self,
+                             package_files: List[Path],
+                             bundle_dir: Union[str, Path],
+                             flow_name: Optional[str] = None) -> Path:
+        """
+        将 package 文件合并为一个按内容哈希命名的 bundle 文件
         
-        # 注意：sub_steps 现在放在 sub_steps 目录下（flow/sub_steps/），通过 dependency.yaml 配置自动生成 source 语句
-        # 不再从 packages 目录加载 sub_steps
+        每个文件前写入 ``# file: <原路径>`` 标记，并通过 ``info script`` 设置为原路径，
+        这样依赖 [info script] 定位自身目录的 package 以及报错信息仍能对应到原文件。
+        文件名包含内容哈希：内容不变时直接复用已有 bundle，不重写文件；
+        任何源文件变化都会得到新的文件名。
         
-        # 移除末尾的空行（如果有）
-        result = '\n'.join(source_lines)
-        if result and not result.endswith('\n'):
-            result += '\n'
-        return result
+        注意：bundle 中 package 文件顶层的 return 会提前结束整个 bundle 的 source。
+        
+        Args:
+            package_files: 按 source 顺序排列的 package 文件列表
+            bundle_dir: bundle 输出目录（通常位于 branch 目录下）
+            flow_name: 流程名称，仅用于 bundle 文件名前缀
+        
+        Returns:
+            bundle 文件路径
+        """
+        parts = []
+        for package_file in package_files:
+            tcl_path = to_tcl_path(package_file)
+            content = package_file.read_text(encoding='utf-8')
+            if not content.endswith('\n'):
+                content += '\n'
+            parts.append(f"# file: {tcl_path}\ninfo script {{{tcl_path}}}\n{content}")
+        body = ''.join(parts)
+        digest = hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]
+        
+        bundle_dir = Path(bundle_dir)
+        bundle_path = bundle_dir / f"{PACKAGE_BUNDLE_PREFIX}{flow_name or 'default'}_{digest}.tcl"
+        if bundle_path.exists():
+            logger.debug(f"package bundle 未变化，复用: {bundle_path}")
+            return bundle_path
+        
+        bundle_dir.mkdir(parents=True, exist_ok=True)
+        header = (
+            "# EDP package bundle (auto-generated, do not edit)\n"
+            f"# {len(package_files)} package files, content hash {digest}\n\n"
+        )
+        # 先写临时文件再 rename，避免并发的 step 读到写了一半的 bundle
+        tmp_path = bundle_path.with_name(f".{bundle_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(header + body, encoding='utf-8')
+        os.replace(tmp_path, bundle_path)
+        logger.info(f"已生成 package bundle: {bundle_path}")
+        return bundle_path
     
-    def _generate_sources_from_dir(self, dir_path: Path) -> List[str]:
+    def _find_tcl_files(self, dir_path: Path) -> List[Path]:
         """
-        从指定目录生成 source 语句列表
+        查找目录下的所有 .tcl 文件（按文件名排序，确保顺序一致）
         
         Args:
             dir_path: 目录路径
         
         Returns:
-            source 语句列表
+            .tcl 文件的绝对路径列表
         """
-        source_lines = []
-        
         if not dir_path.exists() or not dir_path.is_dir():
-            return source_lines
-        
-        # 查找所有 .tcl 文件（按文件名排序，确保顺序一致）
-        tcl_files = sorted(dir_path.glob('*.tcl'))
-        
-        for tcl_file in tcl_files:
-            if tcl_file.is_file():
-                # 生成 source 语句（使用绝对路径，转换为 Tcl 兼容格式）
-                file_path = tcl_file.resolve()
-                # 将 Windows 路径的反斜杠转换为正斜杠（Tcl 兼容）
-                tcl_path = str(file_path).replace('\\', '/')
-                source_lines.append(f"source {tcl_path}")
-        
-        return source_lines
-
+            return []
+        return [f.resolve() for f in sorted(dir_path.glob('*.tcl')) if f.is_file()]
@@ -83,8 +83,8 @@ def prepare_search_paths(
             util_paths = package_loader.get_util_search_paths(input_file)
             if util_paths:
                 # 将 util 路径添加到搜索路径的最前面（优先级最高）
-                if search_paths is None:
-                    search_paths = []
+                # 复制一份再修改，不改动调用者传入的列表（可能在多个线程间共享）
+                search_paths = list(search_paths) if search_paths is not None else []
                 # 将 util 路径添加到最前面，但避免重复
                 for util_path in reversed(util_paths):
                     if util_path not in search_paths:
@@ -11,6 +11,7 @@ from typing import List, Optional
 import logging
 
 from .file_finder import find_file
+from edp_center.packages.edp_common.path_utils import to_tcl_path
 
 # 导入框架异常类（使用别名避免与内置异常冲突）
 from edp_center.packages.edp_common import EDPFileNotFoundError
@@ -28,7 +28,8 @@ def add_prepend_sources(
     full_tcl_path: Optional[Union[str, Path]],
     output_file: Optional[Union[str, Path]],
     search_paths: List[Path],
-    hooks_dir: Optional[Union[str, Path]]
+    hooks_dir: Optional[Union[str, Path]],
+    package_bundle_dir: Optional[Union[str, Path]] = None
 ) -> str:
     """
     在文件头部添加默认的 source 语句
@@ -46,6 +47,7 @@ def add_prepend_sources(
         output_file: 输出文件路径
         search_paths: 搜索路径列表
         hooks_dir: hooks 目录路径
+        package_bundle_dir: package bundle 输出目录，提供时只 source 一个合并后的 bundle 文件
     
     Returns:
         添加了前置 source 语句的内容
@@ -91,7 +93,8 @@ def add_prepend_sources(
                     node=node,
                     project=project,
                     flow_name=flow_name,
-                    include_sub_steps=False  # 不再从 packages 加载 sub_steps
+                    include_sub_steps=False,  # 不再从 packages 加载 sub_steps
+                    bundle_dir=package_bundle_dir
                 )
             except Exception as e:
                 logger.warning(f"生成默认 source 语句时出错: {e}，继续处理")
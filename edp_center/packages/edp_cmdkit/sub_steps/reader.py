@@ -3,15 +3,42 @@
 
 """
 Sub Steps Reader - 读取 sub_steps 配置
+
+dependency.yaml 的解析结果按文件的 mtime 和大小缓存：edp -info 会为同一个 flow 的每个 step
+读取一次 sub_steps，不需要每次都重新解析整个文件。
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
+import os
+import threading
 import yaml
 
 logger = logging.getLogger(__name__)
 
+# dependency.yaml 路径 -> ((st_mtime_ns, st_size), 解析结果)
+_dependency_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_cache_lock = threading.Lock()
+# 优先使用 libyaml（与 yaml.safe_load 的结果相同）
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _load_dependency(dependency_file: Path) -> Any:
+    """读取并解析 dependency.yaml（文件未修改时返回缓存的结果，调用方不要修改）"""
+    key = str(dependency_file)
+    st = os.stat(key)
+    signature = (st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        entry = _dependency_cache.get(key)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+    with open(key, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    with _cache_lock:
+        _dependency_cache[key] = (signature, data)
+    return data
+
 
 def read_sub_steps_from_dependency(edp_center_path: Path, foundry: str, node: str,
                                     project: Optional[str], flow_name: str, step_name: str) -> List[dict]:
@@ -59,8 +86,7 @@ def read_sub_steps_from_dependency(edp_center_path: Path, foundry: str, node: st
             continue
         
         try:
-            with open(dependency_file, 'r', encoding='utf-8') as f:
-                dependency_config = yaml.safe_load(f) or {}
+            dependency_config = _load_dependency(dependency_file) or {}
             
             if flow_name not in dependency_config:
                 continue
@@ -99,7 +125,7 @@ def read_sub_steps_from_dependency(edp_center_path: Path, foundry: str, node: st
                     sub_steps = [{k: v} for k, v in found_sub_steps.items()]
                 elif isinstance(found_sub_steps, list):
                     # 列表格式（每个元素应该是字典）
-                    sub_steps = found_sub_steps
+                    sub_steps = list(found_sub_steps)
                 else:
                     logger.warning(f"sub_steps 格式错误，应该是字典或列表: {found_sub_steps}")
                     sub_steps = []
@@ -3,12 +3,12 @@
 
 """
 Sub-steps 处理模块
-负责处理 sub_steps 相关的逻辑（插入 pre 调用、条件包装、自动生成调用）
+负责处理 sub_steps 相关的逻辑（插入 pre 调用、条件包装、自动生成调用、checkpoint）
 """
 
 import re
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 from .sub_steps import (
     read_sub_steps_from_dependency,
@@ -289,4 +289,57 @@ class SubStepsProcessor:
             logger.debug(f"已在脚本末尾插入自动生成的 sub_steps 调用")
         
         return result
-
+    
+    def wrap_sub_steps_with_checkpoint(self, content: str, checkpoint: Dict[str, Any]) -> str:
+        """
+        将自动生成的 sub_steps 调用替换为 edp_sub_steps::run_checkpointed 调用
+        
+        run_checkpointed（edp_sub_steps_core.tcl）按顺序执行同样的 proc，每个 sub_step 结束后
+        写入 checkpoint manifest，每 N 个 sub_step 记录一个 checkpoint（可选保存 design）；
+        重新运行时自动恢复最后一个 checkpoint 并从下一个 sub_step 继续。
+        
+        应在 wrap_sub_steps_with_conditions 之后调用：skip 的条件包装会被去掉，
+        由 run_checkpointed 在运行时检查 edp(skip,proc_name)。
+        
+        Args:
+            content: 处理后的脚本内容（包含自动生成的 sub_steps 调用）
+            checkpoint: checkpoint 配置，支持的键：
+                - every: 每多少个 sub_step 记录一个 checkpoint（默认 1）
+                - save_proc: 保存 design 的 proc（可选），调用方式 save_proc <path>
+                - restore_proc: 恢复 design 的 proc（可选），调用方式 restore_proc <path>
+                - dir: checkpoint 目录（可选，默认为运行目录下的 .edp_checkpoint）
+        
+        Returns:
+            替换后的内容；如果没有自动生成的 sub_steps 调用，返回原内容
+        """
+        start_marker = "# ========== Auto-generated sub_steps calls =========="
+        end_marker = "# ========== End of auto-generated sub_steps calls =========="
+        start = content.find(start_marker)
+        end = content.find(end_marker, start)
+        if start == -1 or end == -1:
+            return content
+        
+        # 提取执行计划（pre-step / sub_step / post-step proc，去掉 skip 条件包装）
+        plan = []
+        for line in content[start + len(start_marker):end].splitlines():
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#') or stripped == '}' or \
+               stripped.startswith('if {![info exists edp(skip,'):
+                continue
+            plan.append(stripped)
+        if not plan:
+            return content
+        
+        options = [f"-every {int(checkpoint.get('every') or 1)}"]
+        for key in ('save_proc', 'restore_proc', 'dir'):
+            if checkpoint.get(key):
+                options.append(f"-{key} {{{checkpoint[key]}}}")
+        
+        checkpoint_call = (
+            f"{start_marker}\n"
+            "# Sub_steps are automatically generated from dependency.yaml\n"
+            "# Sub_step checkpoint enabled: completed sub_steps are resumed from the last checkpoint on rerun\n"
+            f"edp_sub_steps::run_checkpointed {{{' '.join(plan)}}} {' '.join(options)}\n"
+        )
+        logger.debug(f"已将 {len(plan)} 个 sub_steps 调用替换为 checkpoint 执行")
+        return content[:start] + checkpoint_call + content[end:]
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 CmdProcessor 并发处理
+
+多个线程共享同一个 CmdProcessor（与 WorkflowManager / run_range 的用法一致）并发处理
+数百个 step 脚本，输出必须与串行处理逐字节一致。
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 添加父目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from edp_cmdkit.cmd_processor import CmdProcessor
+from edp_cmdkit.file_finder import find_file, clear_file_cache
+
+
+STEP_COUNT = 240
+HELPER_COUNT = 12
+
+
+class TestCmdProcessorConcurrency(unittest.TestCase):
+    """测试 CmdProcessor 在多线程下的输出一致性"""
+
+    def setUp(self):
+        """创建包含 packages、helpers（多层子目录）、hooks 的 edp_center 结构"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.edp_center = self.temp_path / "edp_center"
+        (self.edp_center / "config").mkdir(parents=True)
+
+        package_dir = self.edp_center / "flow" / "common" / "packages" / "tcl" / "default"
+        package_dir.mkdir(parents=True)
+        for i in range(5):
+            (package_dir / f"pkg_{i}.tcl").write_text(f"proc pkg_{i} {{}} {{ return {i} }}\n")
+
+        cmds_dir = self.edp_center / "flow" / "initialize" / "FOUNDRY" / "NODE" / "common" / "cmds" / "flow1"
+        helpers_dir = cmds_dir / "helpers"
+        for i in range(HELPER_COUNT):
+            # 放在多层子目录中，触发 file_finder 的递归搜索和缓存
+            helper_dir = helpers_dir / f"group_{i % 3}" / f"sub_{i % 4}"
+            helper_dir.mkdir(parents=True, exist_ok=True)
+            (helper_dir / f"helper_{i}.tcl").write_text(f"proc helper_{i} {{}} {{ return {i} }}\n")
+
+        self.steps_dir = cmds_dir / "steps"
+        self.steps_dir.mkdir(parents=True)
+        self.hooks_root = self.temp_path / "branch" / "hooks"
+        self.jobs = []
+        for i in range(STEP_COUNT):
+            step_name = f"step_{i:03d}"
+            imports = "".join(
+                f"#import source helper_{(i + k) % HELPER_COUNT}.tcl\n" for k in range(3)
+            )
+            script = self.steps_dir / f"{step_name}.tcl"
+            script.write_text(f"{imports}puts \"running {step_name}\"\n")
+
+            hooks_dir = self.hooks_root / f"flow1.{step_name}"
+            hooks_dir.mkdir(parents=True)
+            (hooks_dir / "step.pre").write_text(
+                f"#import source helper_{i % HELPER_COUNT}.tcl\nputs \"pre {step_name}\"\n"
+            )
+            (hooks_dir / "step.post").write_text(f"puts \"post {step_name}\"\n")
+            self.jobs.append((script, hooks_dir, step_name))
+
+        self.search_paths = [helpers_dir]
+        self.processor = CmdProcessor(base_dir=self.temp_path)
+
+    def tearDown(self):
+        """每个测试后的清理"""
+        shutil.rmtree(self.temp_dir)
+        clear_file_cache()
+
+    def _process(self, job):
+        script, hooks_dir, step_name = job
+        return self.processor.process_file(
+            script,
+            search_paths=self.search_paths,
+            edp_center_path=self.edp_center,
+            prepend_default_sources=True,
+            hooks_dir=hooks_dir,
+            step_name=step_name
+        )
+
+    def test_parallel_output_identical_to_serial(self):
+        """测试并发处理的输出与串行处理逐字节一致"""
+        clear_file_cache()
+        serial = [self._process(job) for job in self.jobs]
+
+        # 串行输出本身要正确：packages、hooks、helpers 都已展开
+        self.assertIn("pkg_0.tcl", serial[0])
+        self.assertIn("pre step_000", serial[0])
+        self.assertIn("post step_000", serial[0])
+        self.assertIn("helper_1.tcl", serial[0])
+        self.assertNotIn("#import source", serial[0])
+
+        for _ in range(2):
+            clear_file_cache()
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                parallel = list(executor.map(self._process, self.jobs))
+            for step_index, (expected, actual) in enumerate(zip(serial, parallel)):
+                self.assertEqual(expected, actual, f"step_{step_index:03d} 的并发输出与串行输出不一致")
+
+    def test_parallel_output_with_package_bundle(self):
+        """测试多个线程同时生成同一个 package bundle"""
+        bundle_dir = self.temp_path / "branch" / "cmds" / ".packages"
+
+        def process_bundled(job):
+            script, hooks_dir, step_name = job
+            return self.processor.process_file(
+                script,
+                search_paths=self.search_paths,
+                edp_center_path=self.edp_center,
+                prepend_default_sources=True,
+                hooks_dir=hooks_dir,
+                step_name=step_name,
+                package_bundle_dir=bundle_dir
+            )
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            parallel = list(executor.map(process_bundled, self.jobs[:64]))
+        serial = [process_bundled(job) for job in self.jobs[:64]]
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(list(bundle_dir.glob("*.tcl"))), 1)
+        self.assertEqual(list(bundle_dir.glob(".*.tmp")), [])
+
+    def test_find_file_with_concurrent_cache_clear(self):
+        """测试 find_file 与 clear_file_cache 并发调用时结果稳定"""
+        current_file = self.steps_dir / "step_000.tcl"
+        expected = {
+            i: find_file(f"helper_{i}.tcl", current_file, self.search_paths)
+            for i in range(HELPER_COUNT)
+        }
+
+        def lookup(n):
+            if n % 25 == 0:
+                clear_file_cache()
+            i = n % HELPER_COUNT
+            return i, find_file(f"helper_{i}.tcl", current_file, self.search_paths)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lookup, range(2000)))
+        for i, result in results:
+            self.assertEqual(result, expected[i])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -153,6 +153,76 @@ class TestPackageLoader(unittest.TestCase):
         self.assertTrue(any('util' in str(p) for p in search_paths))
 
 
+    def _create_default_packages(self):
+        """创建 common default 和 foundry/node default 两级 package"""
+        common_dir = self.flow_path / "common" / "packages" / "tcl" / "default"
+        common_dir.mkdir(parents=True)
+        (common_dir / "a.tcl").write_text("set ::pkg_a 1\n")
+        (common_dir / "b.tcl").write_text("set ::pkg_b_script [info script]")
+        node_dir = self.flow_path / "initialize" / "FOUNDRY" / "NODE" / "common" / "packages" / "tcl" / "default"
+        node_dir.mkdir(parents=True)
+        (node_dir / "c.tcl").write_text("set ::pkg_c 3\n")
+        return common_dir, node_dir
+
+    def test_generate_default_sources_bundle(self):
+        """测试打包模式只生成一条 source 语句，bundle 保留文件标记"""
+        common_dir, node_dir = self._create_default_packages()
+        bundle_dir = self.temp_path / "branch" / "cmds" / ".packages"
+
+        result = self.loader.generate_default_sources(foundry="FOUNDRY", node="NODE", bundle_dir=bundle_dir)
+        source_lines = [line for line in result.splitlines() if line.startswith("source ")]
+        self.assertEqual(len(source_lines), 1)
+
+        bundles = list(bundle_dir.glob("edp_packages_default_*.tcl"))
+        self.assertEqual(len(bundles), 1)
+        self.assertEqual(source_lines[0], f"source {bundles[0].as_posix()}")
+
+        content = bundles[0].read_text()
+        markers = [line for line in content.splitlines() if line.startswith("# file: ")]
+        self.assertEqual(markers, [
+            f"# file: {(common_dir / 'a.tcl').resolve().as_posix()}",
+            f"# file: {(common_dir / 'b.tcl').resolve().as_posix()}",
+            f"# file: {(node_dir / 'c.tcl').resolve().as_posix()}",
+        ])
+
+    def test_generate_default_sources_bundle_reused_until_source_changes(self):
+        """测试源文件不变时复用 bundle，源文件变化时生成新 bundle"""
+        common_dir, _ = self._create_default_packages()
+        bundle_dir = self.temp_path / "bundle"
+
+        first = self.loader.generate_default_sources(foundry="FOUNDRY", node="NODE", bundle_dir=bundle_dir)
+        bundle = next(bundle_dir.glob("*.tcl"))
+        mtime = bundle.stat().st_mtime_ns
+
+        second = self.loader.generate_default_sources(foundry="FOUNDRY", node="NODE", bundle_dir=bundle_dir)
+        self.assertEqual(first, second)
+        self.assertEqual(bundle.stat().st_mtime_ns, mtime)
+
+        (common_dir / "a.tcl").write_text("set ::pkg_a 2\n")
+        third = self.loader.generate_default_sources(foundry="FOUNDRY", node="NODE", bundle_dir=bundle_dir)
+        self.assertNotEqual(first, third)
+        self.assertEqual(len(list(bundle_dir.glob("*.tcl"))), 2)
+
+    def test_bundle_sources_like_individual_files(self):
+        """测试 bundle 在 Tcl 中的行为与逐个 source 一致（包括 info script）"""
+        import tkinter
+        common_dir, _ = self._create_default_packages()
+        bundle_dir = self.temp_path / "bundle"
+
+        interp = tkinter.Tcl()
+        interp.eval(self.loader.generate_default_sources(foundry="FOUNDRY", node="NODE", bundle_dir=bundle_dir))
+        self.assertEqual(interp.eval("set ::pkg_a"), "1")
+        self.assertEqual(interp.eval("set ::pkg_c"), "3")
+        self.assertEqual(interp.eval("set ::pkg_b_script"), (common_dir / "b.tcl").resolve().as_posix())
+
+    def test_generate_default_sources_bundle_without_packages(self):
+        """测试没有任何 package 时不生成 bundle"""
+        bundle_dir = self.temp_path / "bundle"
+        result = self.loader.generate_default_sources(foundry="FOUNDRY", node="NODE", bundle_dir=bundle_dir)
+        self.assertEqual(result, "")
+        self.assertFalse(bundle_dir.exists())
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 sub_step checkpoint / resume
+
+用 tclsh 作为桩工具运行生成的脚本：save/restore proc 只读写文件，
+第一次运行在中间的 sub_step 崩溃，第二次运行应恢复最后一个 checkpoint 并从下一个 sub_step 继续。
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+import yaml
+from pathlib import Path
+
+# 添加父目录到 Python 路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from edp_cmdkit.cmd_processor import CmdProcessor
+from edp_cmdkit.sub_steps_processor import SubStepsProcessor
+
+SUB_STEPS_CORE_TCL = (Path(__file__).resolve().parents[3] /
+                      "flow" / "common" / "packages" / "tcl" / "default" / "edp_sub_steps_core.tcl")
+SUB_STEPS = ['init_design', 'place', 'cts', 'route', 'save_design']
+TCLSH = shutil.which('tclsh')
+
+
+class TestSubStepCheckpoint(unittest.TestCase):
+    """测试 sub_steps 的 checkpoint 生成与续跑"""
+
+    def setUp(self):
+        """创建包含 sub_steps 的 flow 和 tclsh 桩工具的 save/restore proc"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.edp_center = self.temp_path / "edp_center"
+
+        package_dir = self.edp_center / "flow" / "common" / "packages" / "tcl" / "default"
+        package_dir.mkdir(parents=True)
+        shutil.copy(SUB_STEPS_CORE_TCL, package_dir)
+
+        config_dir = self.edp_center / "config" / "FOUNDRY" / "NODE" / "common" / "flow1"
+        config_dir.mkdir(parents=True)
+        dependency = {'flow1': {'dependency': [
+            {'step1': {'sub_steps': {f'{name}.tcl': f'flow1::{name}' for name in SUB_STEPS}}}
+        ]}}
+        (config_dir / "dependency.yaml").write_text(yaml.dump(dependency, sort_keys=False), encoding='utf-8')
+
+        cmds_dir = self.edp_center / "flow" / "initialize" / "FOUNDRY" / "NODE" / "common" / "cmds" / "flow1"
+        sub_steps_dir = cmds_dir / "sub_steps"
+        sub_steps_dir.mkdir(parents=True)
+        for name in SUB_STEPS:
+            # 每个 sub_step 把自己的名字追加到 executed.log，route 在设置 CRASH_AT 时失败
+            (sub_steps_dir / f"{name}.tcl").write_text(
+                f"proc ::flow1::{name} {{}} {{\n"
+                f"    set fh [open executed.log a]; puts $fh {name}; close $fh\n"
+                f"    if {{[info exists ::env(CRASH_AT)] && $::env(CRASH_AT) eq \"{name}\"}} {{\n"
+                f"        error \"{name} crashed\"\n"
+                f"    }}\n"
+                f"}}\n",
+                encoding='utf-8'
+            )
+        self.script = cmds_dir / "steps" / "step1.tcl"
+        self.script.parent.mkdir()
+        self.script.write_text(
+            "proc stub_save {path} { set fh [open $path.db w]; puts $fh saved; close $fh }\n"
+            "proc stub_restore {path} {\n"
+            "    set fh [open restored.log a]; puts $fh \"[file tail $path] [file exists $path.db]\"; close $fh\n"
+            "}\n",
+            encoding='utf-8'
+        )
+        self.run_dir = self.temp_path / "runs" / "flow1" / "step1"
+        self.run_dir.mkdir(parents=True)
+        self.processor = CmdProcessor(base_dir=self.temp_path)
+
+    def tearDown(self):
+        """每个测试后的清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def _generate(self, checkpoint):
+        return self.processor.process_file(
+            self.script,
+            edp_center_path=self.edp_center,
+            foundry="FOUNDRY",
+            node="NODE",
+            flow_name="flow1",
+            step_name="step1",
+            prepend_default_sources=True,
+            sub_step_checkpoint=checkpoint
+        )
+
+    def _run_tool(self, script_content, crash_at=None):
+        cmd_file = self.run_dir / "step1.tcl"
+        cmd_file.write_text(script_content, encoding='utf-8')
+        env = dict(os.environ)
+        env.pop('CRASH_AT', None)
+        if crash_at:
+            env['CRASH_AT'] = crash_at
+        return subprocess.run([TCLSH, str(cmd_file)], cwd=self.run_dir, env=env,
+                              capture_output=True, text=True)
+
+    def _read_lines(self, name):
+        path = self.run_dir / name
+        return path.read_text(encoding='utf-8').split() if path.exists() else []
+
+    def test_wrap_replaces_calls_with_checkpointed_run(self):
+        """测试 sub_steps 调用（含 skip 条件包装）被替换为 run_checkpointed"""
+        content = (
+            "puts start\n"
+            "# ========== Auto-generated sub_steps calls ==========\n"
+            "# Sub_steps are automatically generated from dependency.yaml\n"
+            "flow1::place_pre\n"
+            "flow1::place\n"
+            "if {![info exists edp(skip,flow1::cts)]} {\n"
+            "flow1::cts\n"
+            "}\n"
+            "# ========== End of auto-generated sub_steps calls ==========\n"
+            "puts done\n"
+        )
+        result = SubStepsProcessor().wrap_sub_steps_with_checkpoint(
+            content, {'every': 2, 'save_proc': 'stub_save', 'restore_proc': ''}
+        )
+        self.assertIn(
+            "edp_sub_steps::run_checkpointed {flow1::place_pre flow1::place flow1::cts} -every 2 -save_proc {stub_save}\n",
+            result
+        )
+        self.assertNotIn("if {![info exists edp(skip,", result)
+        self.assertIn("# ========== End of auto-generated sub_steps calls ==========", result)
+        self.assertTrue(result.startswith("puts start\n"))
+        self.assertTrue(result.endswith("puts done\n"))
+
+    def test_without_checkpoint_calls_unchanged(self):
+        """测试未启用 checkpoint 时仍然直接调用 sub_step proc"""
+        result = self._generate(None)
+        self.assertNotIn("run_checkpointed", result)
+        self.assertIn("\nflow1::route\n", result)
+
+    @unittest.skipIf(TCLSH is None, "需要 tclsh")
+    def test_resume_after_crash(self):
+        """测试崩溃后重新运行从最后一个 checkpoint 继续"""
+        script = self._generate({'every': 2, 'save_proc': 'stub_save', 'restore_proc': 'stub_restore'})
+        self.assertIn("edp_sub_steps::run_checkpointed", script)
+
+        # 第一次运行：route（第 4 个 sub_step）崩溃，checkpoint 在 cts（index 1）之后
+        result = self._run_tool(script, crash_at='route')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("route crashed", result.stderr)
+        self.assertEqual(self._read_lines("executed.log"), ['init_design', 'place', 'cts', 'route'])
+        self.assertTrue((self.run_dir / ".edp_checkpoint" / "design_1.db").exists())
+
+        # 第二次运行：恢复 design_1 后从 cts 继续
+        (self.run_dir / "executed.log").unlink()
+        result = self._run_tool(script)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertEqual(self._read_lines("restored.log"), ['design_1', '1'])
+        self.assertEqual(self._read_lines("executed.log"), ['cts', 'route', 'save_design'])
+
+        # manifest 记录所有 sub_step 的状态和耗时；完成后 checkpoint design 被删除
+        manifest = self._run_tool(
+            f"source {{{SUB_STEPS_CORE_TCL.as_posix()}}}\n"
+            "set m [edp_sub_steps::read_checkpoint_manifest .edp_checkpoint]\n"
+            "puts [dict get $m complete]\n"
+            "foreach s [dict get $m steps] { puts \"[dict get $s name] [dict get $s status] "
+            "[string is integer [dict get $s duration_ms]]\" }\n"
+        ).stdout.splitlines()
+        self.assertEqual(manifest[0], '1')
+        self.assertEqual(manifest[1:], [f"flow1::{name} success 1" for name in SUB_STEPS])
+        self.assertEqual(list((self.run_dir / ".edp_checkpoint").glob("design_*")), [])
+
+        # 完整运行之后再次运行：从头开始
+        (self.run_dir / "executed.log").unlink()
+        result = self._run_tool(script)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(self._read_lines("executed.log"), SUB_STEPS)
+
+    @unittest.skipIf(TCLSH is None, "需要 tclsh")
+    def test_changed_plan_starts_from_beginning(self):
+        """测试 sub_steps 变化后不使用旧的 checkpoint"""
+        script = self._generate({'every': 1})
+        self._run_tool(script, crash_at='route')
+        (self.run_dir / "executed.log").unlink()
+
+        changed_script = script.replace("flow1::save_design}", "}")
+        self.assertNotEqual(changed_script, script)
+        result = self._run_tool(changed_script)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertEqual(self._read_lines("executed.log"), SUB_STEPS[:-1])
+
+    @unittest.skipIf(TCLSH is None, "需要 tclsh")
+    def test_no_saved_design_starts_from_beginning(self):
+        """测试没有保存 design（没有 save_proc 或 restore_proc）时重新运行从头开始"""
+        for checkpoint in ({'every': 1},
+                           {'every': 1, 'save_proc': 'stub_save', 'restore_proc': ''}):
+            with self.subTest(checkpoint=checkpoint):
+                shutil.rmtree(self.run_dir / ".edp_checkpoint", ignore_errors=True)
+                script = self._generate(checkpoint)
+                result = self._run_tool(script, crash_at='route')
+                self.assertNotEqual(result.returncode, 0)
+                (self.run_dir / "executed.log").unlink()
+
+                result = self._run_tool(script)
+                self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+                self.assertEqual(self._read_lines("executed.log"), SUB_STEPS)
+                (self.run_dir / "executed.log").unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,23 +6,47 @@ EDP Common - 公共模块
 提供框架通用的功能和异常类
 """
 
-from .exceptions import (
-    EDPError,
-    ConfigError,
-    FileNotFoundError as EDPFileNotFoundError,
-    ProjectNotFoundError,
-    WorkflowError,
-    ValidationError
-)
-from .logging_config import setup_logging, get_logger
-from .logging_helpers import log_exception, log_error_with_context
-from .error_handler import (
-    handle_error,
-    error_context,
-    handle_cli_error,
-    safe_call
-)
-from .path_utils import to_tcl_path, sanitize_filename, generate_log_filename, ensure_dir
+import importlib
+
+# 属性名 -> (子模块, 子模块中的名称)；第一次访问时才导入子模块，
+# 使只需要 logging_config 等单个模块的调用方（如 edp -h）不必加载 file_hasher 等
+_LAZY_ATTRS = {
+    'EDPError': ('.exceptions', 'EDPError'),
+    'ConfigError': ('.exceptions', 'ConfigError'),
+    'EDPFileNotFoundError': ('.exceptions', 'FileNotFoundError'),
+    'ProjectNotFoundError': ('.exceptions', 'ProjectNotFoundError'),
+    'WorkflowError': ('.exceptions', 'WorkflowError'),
+    'ValidationError': ('.exceptions', 'ValidationError'),
+    'setup_logging': ('.logging_config', 'setup_logging'),
+    'get_logger': ('.logging_config', 'get_logger'),
+    'log_exception': ('.logging_helpers', 'log_exception'),
+    'log_error_with_context': ('.logging_helpers', 'log_error_with_context'),
+    'handle_error': ('.error_handler', 'handle_error'),
+    'error_context': ('.error_handler', 'error_context'),
+    'handle_cli_error': ('.error_handler', 'handle_cli_error'),
+    'safe_call': ('.error_handler', 'safe_call'),
+    'to_tcl_path': ('.path_utils', 'to_tcl_path'),
+    'sanitize_filename': ('.path_utils', 'sanitize_filename'),
+    'generate_log_filename': ('.path_utils', 'generate_log_filename'),
+    'ensure_dir': ('.path_utils', 'ensure_dir'),
+    'FileHasher': ('.file_hasher', 'FileHasher'),
+    'hash_file': ('.file_hasher', 'hash_file'),
+    'get_file_hasher': ('.file_hasher', 'get_file_hasher'),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
 
 __all__ = [
     'EDPError',
@@ -42,6 +66,9 @@ __all__ = [
     'to_tcl_path',
     'sanitize_filename',
     'generate_log_filename',
-    'ensure_dir'
+    'ensure_dir',
+    'FileHasher',
+    'hash_file',
+    'get_file_hasher'
 ]
 
@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文件内容哈希模块
+
+提供共享的文件内容哈希服务（blake2b），用于库文件、RELEASE 拷贝校验和步骤指纹。
+
+- 使用线程池并行读取（hashlib 在处理大块数据时释放 GIL），每次读取一大块到复用的缓冲区
+- 摘要按 (设备, inode, 大小, 修改时间ns) 记录在一个持久化的 SQLite 表中，
+  文件未变化时不再重新读取（GDS/OASIS 等 GB 级文件只在修改后才重新哈希）
+- 批量接口一次查询记录、一次写入新结果
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 摘要长度（字节），32 字节即 64 个十六进制字符
+DIGEST_SIZE = 32
+
+# 单次读取的大小
+DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# 持久化记录的默认位置（可用环境变量 EDP_HASH_CACHE 指定，设为空字符串时只在内存中记录）
+HASH_CACHE_ENV = 'EDP_HASH_CACHE'
+
+
+def default_cache_path() -> Optional[Path]:
+    """返回默认的持久化记录路径（EDP_HASH_CACHE 或 ~/.cache/edp/file_hashes.db）"""
+    env_path = os.environ.get(HASH_CACHE_ENV)
+    if env_path is not None:
+        return Path(env_path) if env_path else None
+    cache_home = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+    return Path(cache_home) / 'edp' / 'file_hashes.db'
+
+
+def hash_file(path: Union[str, Path], buffer_size: int = DEFAULT_BUFFER_SIZE) -> str:
+    """
+    计算单个文件内容的 blake2b 摘要（不使用记录）
+
+    Args:
+        path: 文件路径
+        buffer_size: 单次读取的大小
+
+    Returns:
+        十六进制摘要
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+@dataclass
+class HashStats:
+    """哈希统计（累计）"""
+    hashed: int = 0
+    """实际读取并计算的文件数"""
+    cached: int = 0
+    """使用记录的文件数"""
+    bytes_hashed: int = 0
+    """实际读取的字节数"""
+    errors: int = 0
+
+
+class FileHasher:
+    """
+    文件内容哈希服务
+
+    Example:
+        >>> hasher = FileHasher()
+        >>> digests = hasher.hash_files(gds_files, jobs=8)
+        >>> hasher.hash_file(lef_file)
+    """
+
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None, jobs: Optional[int] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            cache_path: 持久化记录的 SQLite 文件（None 时只在内存中记录）
+            jobs: 默认并行数（None 时为 min(8, CPU 数)）
+            buffer_size: 单次读取的大小
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.jobs = jobs or min(8, os.cpu_count() or 1)
+        self.buffer_size = buffer_size
+        self.stats = HashStats()
+
+        # (dev, inode, size, mtime_ns) -> digest
+        self._memo: Dict[Tuple[int, int, int, int], str] = {}
+        # 统计和数据库访问（多个线程可能共用一个实例）
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        if self.cache_path is not None:
+            try:
+                self._connection()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"无法打开哈希记录 {self.cache_path}，只在内存中记录: {e}")
+                self.cache_path = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """获取当前进程的数据库连接（fork 后重新打开）"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.cache_path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    dev INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    path TEXT,
+                    hashed_at REAL,
+                    PRIMARY KEY (dev, inode, size, mtime_ns)
+                ) WITHOUT ROWID
+            ''')
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _stat_key(path: Path) -> Tuple[int, int, int, int]:
+        st = os.stat(path)
+        return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _lookup(self, keys: List[Tuple[int, int, int, int]]) -> Dict[Tuple[int, int, int, int], str]:
+        """查询记录（内存，再查持久化表）"""
+        found = {key: self._memo[key] for key in keys if key in self._memo}
+        missing = [key for key in keys if key not in found]
+        if not missing or self.cache_path is None:
+            return found
+        with self._lock:
+            conn = self._connection()
+            # 分批查询，避免超出 SQLite 的参数个数限制
+            for start in range(0, len(missing), 200):
+                batch = missing[start:start + 200]
+                clause = ' OR '.join(['(dev = ? AND inode = ? AND size = ? AND mtime_ns = ?)'] * len(batch))
+                params = [value for key in batch for value in key]
+                for dev, inode, size, mtime_ns, digest in conn.execute(
+                        f'SELECT dev, inode, size, mtime_ns, digest FROM file_hashes WHERE {clause}', params):
+                    found[(dev, inode, size, mtime_ns)] = digest
+            self._memo.update(found)
+        return found
+
+    def _record(self, results: List[Tuple[Tuple[int, int, int, int], str, Path]]):
+        """记录新计算的摘要（一个事务）"""
+        for key, digest, _ in results:
+            self._memo[key] = digest
+        if not results or self.cache_path is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._write_records(results, now)
+
+    def _write_records(self, results: List[Tuple[Tuple[int, int, int, int], str, Path]], now: float):
+        conn = self._connection()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(
+                'INSERT OR REPLACE INTO file_hashes (dev, inode, size, mtime_ns, digest, path, hashed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(*key, digest, str(path), now) for key, digest, path in results]
+            )
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            logger.warning(f"写入哈希记录失败: {e}")
+
+    def _hash_one(self, path: Path, key: Tuple[int, int, int, int]) -> Tuple[str, Tuple[int, int, int, int]]:
+        """读取并计算一个文件，返回 (摘要, 计算后的 stat 键)"""
+        digest = hash_file(path, self.buffer_size)
+        # 读取期间文件被修改时不记录（下次重新计算）
+        after = self._stat_key(path)
+        with self._lock:
+            self.stats.hashed += 1
+            self.stats.bytes_hashed += key[2]
+        return digest, after
+
+    def hash_files(self, paths: Iterable[Union[str, Path]], jobs: Optional[int] = None,
+                   progress: Optional[Callable[[int, int], None]] = None,
+                   ignore_errors: bool = False) -> Dict[Path, str]:
+        """
+        批量计算文件内容摘要
+
+        Args:
+            paths: 文件路径列表
+            jobs: 并行数（默认使用构造时的 jobs）
+            progress: 每完成一个需要读取的文件调用 progress(done, total)
+            ignore_errors: 为 True 时跳过无法读取的文件（不出现在结果中），否则抛出 OSError
+
+        Returns:
+            {路径: 十六进制摘要}，路径与输入相同（Path 对象）
+        """
+        paths = [Path(p) for p in paths]
+        keys: Dict[Path, Tuple[int, int, int, int]] = {}
+        for path in paths:
+            try:
+                keys[path] = self._stat_key(path)
+            except OSError:
+                with self._lock:
+                    self.stats.errors += 1
+                if not ignore_errors:
+                    raise
+
+        found = self._lookup(list(set(keys.values())))
+        result: Dict[Path, str] = {}
+        # 同一个文件（相同 inode）只读取一次
+        pending: Dict[Tuple[int, int, int, int], Path] = {}
+        for path, key in keys.items():
+            if key in found:
+                result[path] = found[key]
+                with self._lock:
+                    self.stats.cached += 1
+            else:
+                pending.setdefault(key, path)
+
+        computed: Dict[Tuple[int, int, int, int], str] = {}
+        records = []
+        if pending:
+            jobs = max(1, min(jobs or self.jobs, len(pending)))
+            items = sorted(pending.items(), key=lambda item: -item[0][2])  # 大文件先开始
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = [(key, path, executor.submit(self._hash_one, path, key)) for key, path in items]
+                for done, (key, path, future) in enumerate(futures, 1):
+                    try:
+                        digest, after = future.result()
+                    except OSError:
+                        with self._lock:
+                            self.stats.errors += 1
+                        if not ignore_errors:
+                            raise
+                        continue
+                    computed[key] = digest
+                    if after == key:
+                        records.append((key, digest, path))
+                    if progress:
+                        progress(done, len(futures))
+            self._record(records)
+
+        for path, key in keys.items():
+            if path not in result and key in computed:
+                result[path] = computed[key]
+        return {path: result[path] for path in paths if path in result}
+
+    def hash_file(self, path: Union[str, Path]) -> str:
+        """计算单个文件的内容摘要（使用记录）"""
+        return self.hash_files([path])[Path(path)]
+
+    def hash_tree(self, root: Union[str, Path], jobs: Optional[int] = None) -> Dict[str, str]:
+        """
+        计算目录下所有文件的内容摘要
+
+        Returns:
+            {相对路径（/ 分隔）: 摘要}，按相对路径排序
+        """
+        root = Path(root)
+        files = sorted(Path(dirpath) / name for dirpath, _, names in os.walk(root) for name in names)
+        digests = self.hash_files(files, jobs=jobs)
+        return {path.relative_to(root).as_posix(): digests[path] for path in files}
+
+    def compare_files(self, pairs: Iterable[Tuple[Union[str, Path], Union[str, Path]]],
+                      jobs: Optional[int] = None) -> List[Tuple[Path, Path]]:
+        """
+        比较成对文件的内容（如源文件和拷贝）
+
+        Args:
+            pairs: [(源文件, 目标文件), ...]
+
+        Returns:
+            内容不同（或目标无法读取）的 (源文件, 目标文件) 列表
+        """
+        pairs = [(Path(a), Path(b)) for a, b in pairs]
+        digests = self.hash_files([p for pair in pairs for p in pair], jobs=jobs, ignore_errors=True)
+        return [(a, b) for a, b in pairs
+                if a not in digests or b not in digests or digests[a] != digests[b]]
+
+    def close(self):
+        """关闭数据库连接"""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+_default_hasher: Optional[FileHasher] = None
+
+
+def get_file_hasher() -> FileHasher:
+    """获取进程共享的 FileHasher（使用默认的持久化记录位置）"""
+    global _default_hasher
+    if _default_hasher is None:
+        _default_hasher = FileHasher(default_cache_path())
+    return _default_hasher
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 FileHasher：摘要正确性、按 (inode, 大小, 修改时间) 的持久化记录、批量比较，以及 RELEASE 拷贝校验
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_common.file_hasher import FileHasher, hash_file
+from edp_center.main.cli.commands.release.release_file_operations import (
+    CHECKSUM_FILE_NAME, copy_files_to_release, verify_release_copies
+)
+
+
+def _make_files(root: Path, count: int = 5):
+    root.mkdir(parents=True, exist_ok=True)
+    files = []
+    for i in range(count):
+        path = root / f'cell_{i}.gds'
+        path.write_bytes(os.urandom(1000 * (i + 1)))
+        files.append(path)
+    return files
+
+
+def test_hash_files_memoized_across_instances(tmp_path):
+    """测试批量摘要与 hashlib 一致；未修改的文件使用记录，修改后重新计算"""
+    files = _make_files(tmp_path / 'lib')
+    os.link(files[0], tmp_path / 'lib' / 'hardlink.gds')
+    files.append(tmp_path / 'lib' / 'hardlink.gds')
+    db = tmp_path / 'hashes.db'
+
+    hasher = FileHasher(db, jobs=3, buffer_size=1024)
+    digests = hasher.hash_files(files)
+    assert list(digests) == files
+    assert all(digests[f] == hashlib.blake2b(f.read_bytes(), digest_size=32).hexdigest() for f in files)
+    assert digests[files[0]] == digests[files[-1]] == hash_file(files[0])
+    assert hasher.stats.hashed == 5          # 硬链接只读取一次
+
+    again = FileHasher(db)
+    assert again.hash_files(files) == digests
+    assert (again.stats.hashed, again.stats.cached) == (0, 6)
+
+    files[1].write_bytes(b'modified')
+    os.utime(files[1], ns=(1, 1))
+    assert again.hash_file(files[1]) == hashlib.blake2b(b'modified', digest_size=32).hexdigest()
+    assert again.stats.hashed == 1
+
+    with pytest.raises(OSError):
+        again.hash_files([tmp_path / 'missing.gds'])
+    assert again.hash_files([tmp_path / 'missing.gds', files[2]], ignore_errors=True) == {files[2]: digests[files[2]]}
+
+
+def test_compare_files_and_tree(tmp_path):
+    """测试成对比较和目录摘要"""
+    files = _make_files(tmp_path / 'src', 3)
+    shutil.copytree(tmp_path / 'src', tmp_path / 'dst')
+    (tmp_path / 'dst' / 'cell_2.gds').write_bytes(b'truncated')
+
+    hasher = FileHasher()
+    pairs = [(f, tmp_path / 'dst' / f.name) for f in files] + [(files[0], tmp_path / 'dst' / 'missing.gds')]
+    assert hasher.compare_files(pairs) == pairs[2:]
+    tree = hasher.hash_tree(tmp_path / 'src')
+    assert list(tree) == ['cell_0.gds', 'cell_1.gds', 'cell_2.gds']
+
+
+def test_verify_release_copies(tmp_path):
+    """测试 RELEASE 复制后的内容校验和 checksums.blake2b"""
+    data_dir = tmp_path / 'data' / 'pnr.place'
+    _make_files(data_dir / 'output', 2)
+    (data_dir / 'reports').mkdir()
+    (data_dir / 'reports' / 'timing.rpt').write_text('slack 0.1\n')
+    target = tmp_path / 'release' / 'pnr.place'
+    mappings = [(data_dir / 'output' / 'cell_0.gds', 'output', False, 'file'),
+                (data_dir / 'reports', 'reports', False, 'directory')]
+
+    copied = copy_files_to_release(mappings, data_dir, target)
+    assert [t.relative_to(target).as_posix() for _, t in copied] == ['output/cell_0.gds', 'reports/reports/timing.rpt']
+
+    hasher = FileHasher()
+    checksum_file = verify_release_copies(copied, target, hasher)
+    assert checksum_file == target / CHECKSUM_FILE_NAME
+    lines = checksum_file.read_text().splitlines()
+    assert [line.split('  ', 1)[1] for line in lines] == ['output/cell_0.gds', 'reports/reports/timing.rpt']
+
+    (target / 'output' / 'cell_0.gds').write_bytes(b'corrupt')
+    with pytest.raises(RuntimeError, match='cell_0.gds'):
+        verify_release_copies(copied, target, hasher)
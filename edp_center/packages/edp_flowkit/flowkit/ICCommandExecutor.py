@@ -14,6 +14,7 @@ import logging
 import time
 import re
 from .run_graph import get_flow_var
+from .resource_usage import run_with_usage, collect_lsf_usage
 
 # 配置日志记录器
 logger = logging.getLogger(__name__)
@@ -200,7 +201,8 @@ class ICCommandExecutor:
                 success = self._run_lsf(step, cmd, log_file, work_dir, merged_var, wait_lsf)
             else:
                 timeout = get_flow_var(step, "timeout", merged_var, default=None)  # 默认为None，表示没有超时限制
-                success = self._run_local(step, cmd, log_file, work_dir, timeout)
+                sample_interval = get_flow_var(step, "resource_sample_interval", merged_var, default=None)
+                success = self._run_local(step, cmd, log_file, work_dir, timeout, sample_interval)
             
             # 记录执行结果
             end_time = time.time()
@@ -348,9 +350,9 @@ class ICCommandExecutor:
 
         return lsf_cmd
 
-    def _run_local(self, step, cmd, log_file, work_dir, timeout=None):
+    def _run_local(self, step, cmd, log_file, work_dir, timeout=None, sample_interval=None):
         """
-        在本地执行命令
+        在本地执行命令，并将资源使用记录到 execution_info['resources']
 
         Args:
             step: 步骤对象
@@ -358,6 +360,7 @@ class ICCommandExecutor:
             log_file (str): 日志文件路径
             work_dir (str): 工作目录
             timeout (int, optional): 超时时间（秒），如果为None则没有超时限制
+            sample_interval (float, optional): 从 /proc 采样进程树内存的间隔（秒），为None时不采样
 
         Returns:
             bool: 执行是否成功
@@ -372,21 +375,23 @@ class ICCommandExecutor:
             # 打开日志文件
             with open(log_file, 'w') as f:
                 # 执行命令
-                result = subprocess.run(
+                returncode, resources = run_with_usage(
                     cmd,
-                    shell=True,
                     stdout=f,
-                    stderr=subprocess.STDOUT,
+                    cwd=work_dir,
                     timeout=timeout,  # 如果为None，则没有超时限制
-                    cwd=work_dir
+                    sample_interval=sample_interval
                 )
 
+            if hasattr(step, 'execution_info') and resources:
+                step.execution_info['resources'] = resources
+
             # 检查命令是否成功执行
-            if result.returncode == 0:
+            if returncode == 0:
                 logger.info(f"步骤 {step.name} 执行成功")
                 return True
             else:
-                logger.error(f"步骤 {step.name} 执行失败，返回码: {result.returncode}")
+                logger.error(f"步骤 {step.name} 执行失败，返回码: {returncode}")
                 return False
 
         except subprocess.TimeoutExpired:
@@ -459,12 +464,32 @@ class ICCommandExecutor:
                 return True
 
             # 等待作业完成
-            return self._wait_lsf_job(step, job_id, merged_var)
+            success = self._wait_lsf_job(step, job_id, merged_var)
+            self._record_lsf_resources(step, job_id, merged_var)
+            return success
 
         except Exception as e:
             logger.error(f"步骤 {step.name} 提交到LSF时出错: {str(e)}")
             return False
 
+    def _record_lsf_resources(self, step, job_id, merged_var):
+        """
+        作业结束后查询资源使用，连同申请的 CPU 数和内存记录到 execution_info['resources']
+
+        Args:
+            step: 步骤对象
+            job_id (str): LSF作业ID
+            merged_var (dict): 合并后的配置字典
+        """
+        if not hasattr(step, 'execution_info'):
+            return
+        resources = collect_lsf_usage(job_id)
+        if not resources:
+            logger.warning(f"无法获取LSF作业 {job_id} 的资源使用信息")
+        resources['cpu_requested'] = get_flow_var(step, "cpu_num", merged_var, default=1)
+        resources['memory_requested'] = get_flow_var(step, "memory", merged_var, default=4000)
+        step.execution_info['resources'] = resources
+
     def _wait_lsf_job(self, step, job_id, merged_var):
         """
         等待LSF作业完成
@@ -8,6 +8,9 @@ import yaml
 import copy
 from .step import Step
 
+# 有 libyaml 时使用 C 实现的解析器（结果相同，速度快得多）
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 def deep_merge(dict1, dict2):
     """
@@ -51,7 +54,7 @@ def yaml2dict(yaml_files):
     # 依次解析并合并每个YAML文件
     for yaml_file in yaml_files:
         with open(yaml_file, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YamlLoader)
             if data:
                 result = deep_merge(result, data)
 
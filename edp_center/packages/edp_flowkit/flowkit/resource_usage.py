@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+resource_usage模块 - 步骤资源使用统计
+
+本地执行：用 os.wait4 等待子进程，得到整个进程树（shell 及其已回收的子进程）的
+CPU 时间和单进程峰值内存；可选地按固定间隔从 /proc 采样进程树的总 RSS。
+LSF 执行：作业结束后解析 bjobs -l（作业已被清理时用 bacct -l）的输出。
+
+返回的资源字典与 run_helpers.update_run_info 读取的 execution_info['resources'] 一致：
+    cpu_used, cpu_time, cpu_time_per_cpu, peak_memory (MB), avg_memory (MB),
+    hosts ([{'host', 'cpus'}]), queue, start_time, end_time
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_MEMORY_UNITS_MB = {'K': 1.0 / 1024, 'M': 1.0, 'G': 1024.0, 'T': 1024.0 * 1024}
+
+
+def _format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime(TIME_FORMAT)
+
+
+def _exit_code(status):
+    """将 wait 状态转换为与 subprocess 一致的返回码（被信号杀死时为负数）"""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+class _TreeSampler:
+    """后台线程：按间隔从 /proc 采样进程树的总 RSS，记录峰值（MB）"""
+
+    def __init__(self, pid, interval):
+        self.pid = pid
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._page_mb = os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith('linux') and os.path.isdir('/proc/self')
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, self.sample())
+            self._stop.wait(self.interval)
+
+    def sample(self):
+        """进程树当前的总 RSS（MB）"""
+        children = {}
+        rss = {}
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat', 'rb') as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            # comm 可能包含空格和括号，从最后一个 ')' 之后开始按空格切分
+            fields = stat[stat.rfind(b')') + 2:].split()
+            pid = int(entry)
+            children.setdefault(int(fields[1]), []).append(pid)
+            rss[pid] = int(fields[21])
+
+        total = 0
+        pending = [self.pid]
+        while pending:
+            pid = pending.pop()
+            total += rss.get(pid, 0)
+            pending.extend(children.get(pid, ()))
+        return total * self._page_mb
+
+
+def run_with_usage(cmd, stdout=None, cwd=None, timeout=None, sample_interval=None):
+    """
+    在 shell 中执行命令并统计资源使用
+
+    Args:
+        cmd (str): 要执行的命令
+        stdout: 标准输出（标准错误合并到标准输出）
+        cwd (str, optional): 工作目录
+        timeout (float, optional): 超时时间（秒），超时后杀死进程
+        sample_interval (float, optional): /proc 采样间隔（秒），为空时不采样
+
+    Returns:
+        tuple: (返回码, 资源字典)
+
+    Raises:
+        subprocess.TimeoutExpired: 执行超时
+    """
+    start = time.time()
+    proc = subprocess.Popen(cmd, shell=True, stdout=stdout, stderr=subprocess.STDOUT, cwd=cwd)
+
+    sampler = None
+    if sample_interval and _TreeSampler.available():
+        sampler = _TreeSampler(proc.pid, sample_interval).start()
+
+    if not hasattr(os, 'wait4'):
+        # Windows：没有 wait4，只记录时间
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            if sampler:
+                sampler.stop()
+        return returncode, {'start_time': _format_time(start), 'end_time': _format_time(time.time())}
+
+    # wait4 在当前线程阻塞等待，超时由定时器线程杀死进程；
+    # 锁保证定时器不会向已被回收（pid 可能被复用）的进程发信号
+    lock = threading.Lock()
+    state = {'reaped': False, 'timed_out': False}
+
+    def _kill():
+        with lock:
+            if not state['reaped']:
+                state['timed_out'] = True
+                os.kill(proc.pid, 9)
+
+    timer = threading.Timer(timeout, _kill) if timeout else None
+    if timer:
+        timer.daemon = True
+        timer.start()
+    try:
+        while True:
+            try:
+                _, status, rusage = os.wait4(proc.pid, 0)
+                break
+            except InterruptedError:
+                continue
+        with lock:
+            state['reaped'] = True
+            proc.returncode = _exit_code(status)
+    finally:
+        if timer:
+            timer.cancel()
+        if sampler:
+            sampler.stop()
+    end = time.time()
+
+    if state['timed_out']:
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    # ru_maxrss：Linux 为 KB，macOS 为字节；是进程树中单个进程的峰值
+    maxrss_mb = rusage.ru_maxrss / (1024.0 * 1024 if sys.platform == 'darwin' else 1024.0)
+    if sampler:
+        maxrss_mb = max(maxrss_mb, sampler.peak_mb)
+    resources = {
+        'cpu_time': round(rusage.ru_utime + rusage.ru_stime, 2),
+        'user_time': round(rusage.ru_utime, 2),
+        'system_time': round(rusage.ru_stime, 2),
+        'peak_memory': int(round(maxrss_mb)),
+        'start_time': _format_time(start),
+        'end_time': _format_time(end),
+    }
+    return proc.returncode, resources
+
+
+# ---------------------------------------------------------------------------
+# LSF 输出解析
+# ---------------------------------------------------------------------------
+
+# bjobs -l / bacct -l 的长行按固定宽度折行，续行以 21 个空格开头
+_CONTINUATION_RE = re.compile(r'\n {21}')
+_EVENT_TIME_RE = re.compile(
+    r'^(?:\w{3} )?(?P<month>\w{3})\s+(?P<day>\d+) (?P<clock>\d+:\d+:\d+)(?: (?P<year>\d{4}))?:\s*(?P<event>.*)$',
+    re.MULTILINE)
+_HOSTS_RE = re.compile(r'on (?:Host\(s\) )?((?:<[^>]+>\s*)+)')
+_HOST_RE = re.compile(r'<(?:(\d+)\*)?([^>]+)>')
+_CPU_TIME_RE = re.compile(r'CPU time used is ([\d.]+) seconds')
+_MEMORY_RE = re.compile(r'(MAX|AVG) MEM:\s*([\d.]+)\s*([KMGT])')
+_QUEUE_RE = re.compile(r'Queue <([^>]+)>')
+_ACCT_MEMORY_RE = re.compile(r'^([\d.]+)\s*([KMGT])', re.IGNORECASE)
+
+
+def _memory_mb(value, unit):
+    return int(round(float(value) * _MEMORY_UNITS_MB[unit.upper()]))
+
+
+def _event_time(match, now):
+    """LSF 事件时间（通常不带年份，取不晚于当前时间的最近一年）"""
+    year = match.group('year')
+    text = f"{match.group('month')} {match.group('day')} {match.group('clock')}"
+    try:
+        if year:
+            return datetime.strptime(f"{text} {year}", '%b %d %H:%M:%S %Y')
+        parsed = datetime.strptime(f"{text} {now.year}", '%b %d %H:%M:%S %Y')
+    except ValueError:
+        return None
+    if parsed > now:
+        parsed = parsed.replace(year=now.year - 1)
+    return parsed
+
+
+def _parse_accounting_table(text):
+    """解析 bacct -l 末尾的 'CPU_T WAIT TURNAROUND ... MEM SWAP' 表格"""
+    lines = text.splitlines()
+    for i, line in enumerate(lines[:-1]):
+        header = line.split()
+        if 'CPU_T' in header:
+            values = lines[i + 1].split()
+            if len(values) == len(header):
+                return dict(zip(header, values))
+    return {}
+
+
+def parse_lsf_job_report(text, now=None):
+    """
+    解析 bjobs -l 或 bacct -l 的输出
+
+    Args:
+        text (str): 命令输出
+        now (datetime, optional): 当前时间，用于补全事件时间的年份
+
+    Returns:
+        dict: 资源字典（只包含解析到的字段）
+    """
+    now = now or datetime.now()
+    text = _CONTINUATION_RE.sub('', text.replace('\r\n', '\n'))
+    resources = {}
+
+    queue = _QUEUE_RE.search(text)
+    if queue:
+        resources['queue'] = queue.group(1)
+
+    for match in _EVENT_TIME_RE.finditer(text):
+        event = match.group('event')
+        if event.startswith(('Started', 'Dispatched')):
+            when = _event_time(match, now)
+            if when:
+                resources['start_time'] = when.strftime(TIME_FORMAT)
+            hosts = _HOSTS_RE.search(event)
+            if hosts and 'hosts' not in resources:
+                counts = {}
+                for cpus, host in _HOST_RE.findall(hosts.group(1)):
+                    counts[host] = counts.get(host, 0) + int(cpus or 1)
+                resources['hosts'] = [{'host': host, 'cpus': cpus} for host, cpus in counts.items()]
+                resources['cpu_used'] = sum(counts.values())
+        elif event.startswith(('Done successfully', 'Exited', 'Completed')):
+            when = _event_time(match, now)
+            if when:
+                resources['end_time'] = when.strftime(TIME_FORMAT)
+
+    cpu_time = _CPU_TIME_RE.search(text)
+    if cpu_time:
+        resources['cpu_time'] = float(cpu_time.group(1))
+    for kind, value, unit in _MEMORY_RE.findall(text):
+        resources['peak_memory' if kind == 'MAX' else 'avg_memory'] = _memory_mb(value, unit)
+
+    table = _parse_accounting_table(text)
+    if 'cpu_time' not in resources and table.get('CPU_T', '').replace('.', '', 1).isdigit():
+        resources['cpu_time'] = float(table['CPU_T'])
+    mem = _ACCT_MEMORY_RE.match(table.get('MEM', ''))
+    if 'peak_memory' not in resources and mem:
+        resources['peak_memory'] = _memory_mb(mem.group(1), mem.group(2))
+
+    if resources.get('cpu_time') is not None and resources.get('cpu_used'):
+        resources['cpu_time_per_cpu'] = round(resources['cpu_time'] / resources['cpu_used'], 2)
+    return resources
+
+
+def collect_lsf_usage(job_id, timeout=60):
+    """
+    查询已结束的 LSF 作业的资源使用
+
+    先用 bjobs -l（作业结束后仍会保留一段时间），没有资源信息时再用 bacct -l。
+
+    Returns:
+        dict: 资源字典，查询失败时为空字典
+    """
+    resources = {}
+    for query in (f"bjobs -l {job_id}", f"bacct -l {job_id}"):
+        try:
+            result = subprocess.run(query, shell=True, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, text=True, timeout=timeout)
+        except (OSError, subprocess.SubprocessError):
+            continue
+        if result.returncode != 0 or not result.stdout.strip():
+            continue
+        parsed = parse_lsf_job_report(result.stdout)
+        for key, value in parsed.items():
+            resources.setdefault(key, value)
+        if 'cpu_time' in resources and 'peak_memory' in resources:
+            break
+    return resources
@@ -119,11 +119,12 @@ class TestICCommandExecutor(unittest.TestCase):
         expected_cmd = f"cat {dirs['cmds']}/test_script.tcl > {dirs['logs']}/output.log"
         self.assertEqual(replaced_cmd, expected_cmd)
 
-    @patch('subprocess.run')
+    @patch('flowkit.ICCommandExecutor.run_with_usage')
     def test_run_local(self, mock_run):
         """测试本地执行"""
         # 模拟成功执行
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_run.return_value = (0, {'cpu_time': 1.5, 'peak_memory': 120})
+        self.step.execution_info = {}
 
         # 执行命令
         result = self.executor._run_local(
@@ -137,10 +138,11 @@ class TestICCommandExecutor(unittest.TestCase):
         # 验证结果
         self.assertTrue(result)
         mock_run.assert_called_once()
+        self.assertEqual(self.step.execution_info['resources'], {'cpu_time': 1.5, 'peak_memory': 120})
 
         # 模拟失败执行
         mock_run.reset_mock()
-        mock_run.return_value = MagicMock(returncode=1)
+        mock_run.return_value = (1, {})
 
         # 执行命令
         result = self.executor._run_local(
@@ -155,7 +157,7 @@ class TestICCommandExecutor(unittest.TestCase):
         self.assertFalse(result)
         mock_run.assert_called_once()
 
-    @patch('subprocess.run')
+    @patch('flowkit.ICCommandExecutor.run_with_usage')
     def test_run_local_timeout(self, mock_run):
         """测试本地执行超时"""
         # 模拟超时
@@ -174,11 +176,11 @@ class TestICCommandExecutor(unittest.TestCase):
         self.assertFalse(result)
         mock_run.assert_called_once()
 
-    @patch('subprocess.run')
+    @patch('flowkit.ICCommandExecutor.run_with_usage')
     def test_run_cmd_local(self, mock_run):
         """测试 run_cmd 方法（本地执行）"""
         # 模拟成功执行
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_run.return_value = (0, {})
 
         # 执行命令
         result = self.executor.run_cmd(self.step, self.config)
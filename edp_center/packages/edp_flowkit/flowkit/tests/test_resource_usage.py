@@ -0,0 +1,136 @@
+"""
+测试 resource_usage 模块
+
+本地执行的资源统计，以及 bjobs -l / bacct -l 输出的解析（使用 fixtures 中的样例输出）。
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+import logging
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+# 添加父目录到 Python 路径，以便能够导入 flowkit 模块
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from flowkit.resource_usage import run_with_usage, parse_lsf_job_report
+from flowkit.ICCommandExecutor import ICCommandExecutor
+from flowkit.step import Step
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return f.read()
+
+
+class TestParseLsfJobReport(unittest.TestCase):
+    """测试 LSF 输出解析"""
+
+    def test_bjobs_done(self):
+        """测试解析 bjobs -l（折行、多主机、MAX/AVG MEM）"""
+        resources = parse_lsf_job_report(read_fixture("bjobs_l_done.txt"), now=NOW)
+        self.assertEqual(resources, {
+            'queue': 'normal',
+            'start_time': '2025-11-10 18:09:50',
+            'end_time': '2025-11-10 19:09:50',
+            'hosts': [{'host': 'comp01', 'cpus': 8}, {'host': 'comp02', 'cpus': 8}],
+            'cpu_used': 16,
+            'cpu_time': 28800.5,
+            'peak_memory': 22016,
+            'avg_memory': 12288,
+            'cpu_time_per_cpu': 1800.03,
+        })
+
+    def test_bacct_exit(self):
+        """测试解析 bacct -l（重复主机名、CPU_T/MEM 表格）"""
+        resources = parse_lsf_job_report(read_fixture("bacct_l_exit.txt"), now=NOW)
+        self.assertEqual(resources['queue'], 'short')
+        self.assertEqual(resources['hosts'], [{'host': 'comp03', 'cpus': 4}])
+        self.assertEqual(resources['start_time'], '2025-12-30 23:55:00')
+        self.assertEqual(resources['end_time'], '2025-12-31 01:05:00')
+        self.assertEqual(resources['cpu_time'], 8000.0)
+        self.assertEqual(resources['peak_memory'], 6656)
+        self.assertEqual(resources['cpu_time_per_cpu'], 2000.0)
+
+    def test_unrelated_output(self):
+        """测试无法识别的输出"""
+        self.assertEqual(parse_lsf_job_report("Job <1> is not found\n", now=NOW), {})
+
+
+class TestRunWithUsage(unittest.TestCase):
+    """测试本地执行的资源统计"""
+
+    @unittest.skipUnless(hasattr(os, 'wait4'), "需要 os.wait4")
+    def test_child_tree_usage(self):
+        """测试统计子进程（shell 启动的 python）的 CPU 时间和峰值内存"""
+        script = ("import time; data = bytearray(64 * 1024 * 1024); end = time.time() + 0.3\n"
+                  "while time.time() < end: pass")
+        cmd = f'"{sys.executable}" -c "{script}"'
+        returncode, resources = run_with_usage(cmd, stdout=subprocess.DEVNULL, sample_interval=0.05)
+        self.assertEqual(returncode, 0)
+        self.assertGreater(resources['cpu_time'], 0.1)
+        self.assertGreaterEqual(resources['peak_memory'], 64)
+        self.assertLessEqual(resources['start_time'], resources['end_time'])
+
+    def test_exit_code_and_timeout(self):
+        """测试返回码和超时"""
+        returncode, _ = run_with_usage("exit 3", stdout=subprocess.DEVNULL)
+        self.assertEqual(returncode, 3)
+        with self.assertRaises(subprocess.TimeoutExpired):
+            run_with_usage("sleep 10", stdout=subprocess.DEVNULL, timeout=0.2)
+
+
+class TestLsfResources(unittest.TestCase):
+    """测试 LSF 作业结束后记录资源使用"""
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.executor = ICCommandExecutor(self.base_dir, {})
+        self.step = Step("pnr_innovus.place", "place.tcl")
+        self.step.execution_info = {}
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+        logging.disable(logging.NOTSET)
+
+    @patch('subprocess.run')
+    def test_run_lsf_records_resources(self, mock_run):
+        """测试提交、等待完成后从 bjobs -l 记录资源"""
+        outputs = {
+            "bsub": "Job <8123456> is submitted to queue <normal>.\n",
+            "bjobs -noheader": "8123456 user1 DONE normal login01 8*comp01 place Nov 10 18:09\n",
+            "bjobs -l": read_fixture("bjobs_l_done.txt"),
+        }
+
+        def fake_run(cmd, **kwargs):
+            for prefix, stdout in outputs.items():
+                if cmd.startswith(prefix):
+                    return MagicMock(returncode=0, stdout=stdout, stderr="")
+            return MagicMock(returncode=255, stdout="", stderr="not found")
+
+        mock_run.side_effect = fake_run
+        config = {"pnr_innovus": {"place": {"cpu_num": 16, "memory": 32000}}, "edp": {"lsf_poll_interval": 0}}
+        result = self.executor._run_lsf(self.step, "bsub -q normal place", "place.log",
+                                        self.base_dir, config)
+
+        self.assertTrue(result)
+        resources = self.step.execution_info['resources']
+        self.assertEqual(self.step.execution_info['job_id'], "8123456")
+        self.assertEqual(resources['cpu_used'], 16)
+        self.assertEqual(resources['peak_memory'], 22016)
+        self.assertEqual(resources['cpu_requested'], 16)
+        self.assertEqual(resources['memory_requested'], 32000)
+        # bjobs -l 已包含资源信息，不再调用 bacct
+        self.assertFalse(any(c.args[0].startswith("bacct") for c in mock_run.call_args_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+批量生成 lib_config.tcl（支持多进程并行）
+
+gen-lib 的主要耗时在 NFS 上的 stat/readdir 等待，而不是 CPU，所以多个库可以并行处理。
+- 每个进程对每个 (foundry, node) 只加载一次适配器（AdapterFactory.get_adapter 的进程内缓存），所有库共享
+- 结果按输入顺序汇总，输出与串行处理一致，与完成顺序无关
+- 每完成一个库回调一次进度，最后输出耗时和吞吐量
+"""
+
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .foundry_adapters import AdapterFactory, FoundryAdapter
+from .generator import LibConfigGenerator
+
+logger = logging.getLogger(__name__)
+
+# 进程内缓存：(foundry, node, array_name, output_dir) -> 生成器（适配器由 AdapterFactory 缓存）
+_generators: Dict[Tuple[str, str, Optional[str], str], LibConfigGenerator] = {}
+
+
+@dataclass
+class GenLibOptions:
+    """gen-lib 的处理参数（所有库相同）"""
+    foundry: str
+    node: str
+    lib_type: str
+    output_dir: Path
+    array_name: Optional[str] = None
+    version: Optional[str] = None
+    all_versions: bool = False
+
+
+@dataclass
+class GenLibResult:
+    """单个库的处理结果"""
+    index: int
+    lib_path: Path
+    generated_files: List[Path] = field(default_factory=list)
+    unchanged_files: List[Path] = field(default_factory=list)
+    """generated_files 中内容未变化、没有重写的文件"""
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def written_files(self) -> List[Path]:
+        """generated_files 中实际写入（新建或内容变化）的文件"""
+        unchanged = set(self.unchanged_files)
+        return [f for f in self.generated_files if f not in unchanged]
+
+
+def get_shared_adapter(foundry: str, node: str) -> FoundryAdapter:
+    """
+    获取当前进程中 (foundry, node) 共享的适配器，第一次调用（或节点配置文件修改后）时加载 YAML 配置
+
+    Args:
+        foundry: Foundry名称
+        node: 工艺节点
+
+    Returns:
+        FoundryAdapter 实例
+    """
+    return AdapterFactory.get_adapter(foundry, node)
+
+
+def _get_generator(options: GenLibOptions) -> LibConfigGenerator:
+    """获取当前进程中与 options 对应的生成器（共享适配器）"""
+    key = (options.foundry.lower(), options.node.lower(), options.array_name, str(options.output_dir))
+    adapter = get_shared_adapter(options.foundry, options.node)
+    generator = _generators.get(key)
+    if generator is None or generator.adapter is not adapter:
+        generator = LibConfigGenerator(
+            foundry=options.foundry,
+            ori_path=options.output_dir,  # 临时值，不会用到
+            output_base_dir=options.output_dir,
+            array_name=options.array_name,
+            node=options.node,
+            adapter=adapter
+        )
+        _generators[key] = generator
+    return generator
+
+
+def generate_library(index: int, lib_path: Path, options: GenLibOptions) -> GenLibResult:
+    """
+    处理单个库（在 worker 进程或当前进程中执行），异常转换为结果中的错误信息
+
+    Args:
+        index: 库在输入列表中的位置
+        lib_path: 库目录路径
+        options: 处理参数
+
+    Returns:
+        GenLibResult
+    """
+    start = time.perf_counter()
+    result = GenLibResult(index=index, lib_path=lib_path)
+    try:
+        generator = _get_generator(options)
+        if options.all_versions:
+            result.generated_files = generator.generate_all_versions(lib_path, lib_type=options.lib_type)
+        else:
+            result.generated_files = generator.generate_from_directory(
+                lib_path,
+                lib_type=options.lib_type,
+                version=options.version  # 如果为None，会使用最新版本
+            )
+        result.unchanged_files = list(generator.unchanged_files)
+    except Exception as e:
+        logger.debug(f"处理库 {lib_path.name} 时出错", exc_info=True)
+        result.error = str(e) or type(e).__name__
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """解析并行数：None/1 为串行，0 或负数表示使用 CPU 核数"""
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def run_gen_lib(lib_paths: List[Path], options: GenLibOptions, jobs: int = 1,
+                progress: Optional[Callable[[int, int, GenLibResult], None]] = None) -> List[GenLibResult]:
+    """
+    批量处理多个库
+
+    Args:
+        lib_paths: 库目录路径列表
+        options: 处理参数
+        jobs: worker 进程数（1 表示在当前进程中串行处理）
+        progress: 每完成一个库调用 progress(done, total, result)
+
+    Returns:
+        按 lib_paths 顺序排列的 GenLibResult 列表
+    """
+    total = len(lib_paths)
+    jobs = min(resolve_jobs(jobs), max(total, 1))
+    results: List[Optional[GenLibResult]] = [None] * total
+
+    # 先在当前进程加载适配器：fork 出来的 worker 直接继承，不需要再读 YAML
+    get_shared_adapter(options.foundry, options.node)
+
+    if jobs <= 1:
+        for index, lib_path in enumerate(lib_paths):
+            results[index] = generate_library(index, lib_path, options)
+            if progress:
+                progress(index + 1, total, results[index])
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(generate_library, index, lib_path, options)
+                   for index, lib_path in enumerate(lib_paths)]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results[result.index] = result
+            if progress:
+                progress(done, total, result)
+    return results
+
+
+def print_progress(done: int, total: int, result: GenLibResult) -> None:
+    """默认的进度输出（每个库完成时一行）"""
+    if result.ok:
+        print(f"[{done}/{total}] {result.lib_path.name}: "
+              f"生成 {len(result.generated_files)} 个文件 ({result.elapsed:.2f}s)")
+        unchanged = set(result.unchanged_files)
+        for file_path in result.generated_files:
+            if file_path in unchanged:
+                print(f"  [OK] 未变化: {file_path.name}")
+            else:
+                print(f"  [OK] 已生成: {file_path.name}")
+    else:
+        print(f"[{done}/{total}] {result.lib_path.name}: 失败 ({result.elapsed:.2f}s)")
+        print(f"  [ERROR] 失败: {result.error}", file=sys.stderr)
+
+
+def print_summary(results: List[GenLibResult], elapsed: float, jobs: int) -> int:
+    """
+    输出总结（成功/失败数、耗时、吞吐量、按输入顺序排列的失败和生成文件列表）
+
+    Returns:
+        退出代码（有失败时为 1）
+    """
+    total = len(results)
+    failed = [r for r in results if not r.ok]
+    all_generated_files = [f for r in results for f in r.generated_files]
+    unchanged_count = sum(len(r.unchanged_files) for r in results)
+    throughput = total / elapsed if elapsed > 0 else 0.0
+
+    print()
+    print("=" * 60)
+    print(f"[SUMMARY] 处理完成:")
+    print(f"  成功: {total - len(failed)}/{total}")
+    if failed:
+        print(f"  失败: {len(failed)}/{total}")
+    print(f"  共生成: {len(all_generated_files)} 个lib_config.tcl文件"
+          f"（写入 {len(all_generated_files) - unchanged_count}，内容未变化 {unchanged_count}）")
+    print(f"  并行数: {resolve_jobs(jobs)}")
+    print(f"  耗时: {elapsed:.2f}s（{throughput:.2f} 库/秒）")
+    print("=" * 60)
+
+    if failed:
+        print("\n失败的库:")
+        for result in failed:
+            print(f"  - {result.lib_path}: {result.error}")
+
+    if all_generated_files:
+        print("\n生成的文件列表:")
+        for file_path in all_generated_files:
+            print(f"  - {file_path}")
+
+    return 0 if not failed else 1
@@ -5,18 +5,32 @@
 CacheManager - 缓存管理器
 
 提供基于时间戳的智能缓存失效机制。
+
+两级缓存：
+- 内存：OrderedDict 实现的 LRU（命中、插入、淘汰都是 O(1)）
+- 磁盘：缓存目录下的单个 SQLite 文件（WAL 模式），按原始键保存。多个进程（如并行的 gen-lib）
+  可以同时读写；磁盘上按总字节数（超出时淘汰最久未访问的条目）和 TTL 限制
+其他进程修改磁盘缓存后（PRAGMA data_version 变化），本进程内存中的持久化条目在下次读取时
+逐个与磁盘上的 created_at 比较，只有被其他进程改写或删除的条目才作废。
+读取时的访问时间批量写入（写入新条目需要淘汰前、或 close() 时），读取不产生写事务。
 """
 
-import json
+import fnmatch
+import os
 import pickle
+import sqlite3
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 from datetime import datetime, timedelta
 import logging
-import hashlib
 
 logger = logging.getLogger(__name__)
 
+# 磁盘缓存默认的总大小上限
+DEFAULT_MAX_DISK_BYTES = 512 * 1024 * 1024
+
 
 class CacheEntry:
     """缓存条目"""
@@ -34,6 +48,11 @@ class CacheEntry:
         self.created_at = datetime.now()
         self.accessed_at = datetime.now()
         
+        # 过期时间（TTL），None 表示不过期
+        self.expires_at: Optional[datetime] = None
+        # 是否已写入磁盘缓存（其他进程修改磁盘缓存后需要作废）
+        self.persisted = False
+        
         # 记录源文件的修改时间
         self.source_mtime = None
         if source_path and source_path.exists():
@@ -45,13 +64,15 @@ class CacheEntry:
         
         Args:
             max_age: 最大缓存时间，如果为None则只检查源文件时间戳
-            
+        
         Returns:
             缓存是否有效
         """
-        # 检查最大缓存时间
+        # 检查最大缓存时间和 TTL
         if max_age and (datetime.now() - self.created_at) > max_age:
             return False
+        if self.expires_at and datetime.now() >= self.expires_at:
+            return False
         
         # 检查源文件是否被修改
         if self.source_path and self.source_path.exists():
@@ -72,13 +93,22 @@ class CacheEntry:
 class CacheManager:
     """缓存管理器"""
     
-    def __init__(self, cache_dir: Optional[Path] = None, max_memory_entries: int = 1000):
+    DB_NAME = 'cache.db'
+    
+    # 读取时的访问时间先记在内存中，攒够这么多条再一次写入数据库
+    TOUCH_FLUSH_SIZE = 256
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_memory_entries: int = 1000,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+                 default_ttl: Optional[timedelta] = None):
         """
         初始化缓存管理器
         
         Args:
             cache_dir: 缓存目录，如果为None则使用默认目录
             max_memory_entries: 内存缓存的最大条目数
+            max_disk_bytes: 磁盘缓存的总大小上限（字节，按序列化后的大小计算）
+            default_ttl: 默认的缓存有效期（None 表示不过期，可在 set() 中单独指定）
         """
         if cache_dir is None:
             # 使用默认缓存目录
@@ -87,26 +117,123 @@ class CacheManager:
         
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / self.DB_NAME
         
         self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.default_ttl = default_ttl
         
-        # 内存缓存
-        self._memory_cache: Dict[str, CacheEntry] = {}
+        # 内存缓存（LRU：最近使用的在末尾）
+        self._memory_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         
         # 缓存统计
         self._stats = {
             'hits': 0,
             'misses': 0,
-            'evictions': 0
+            'evictions': 0,
+            'disk_evictions': 0,
+            'expired': 0
         }
+        
+        # 数据库连接（fork 后在子进程中重新打开）
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._data_version: Optional[int] = None
+        # 磁盘缓存被其他进程修改后，需要在读取时重新验证的内存条目
+        self._unverified: set = set()
+        self._pending_touches: Dict[str, float] = {}
+        self._init_database()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """获取当前进程的数据库连接（自动提交模式，写操作显式使用事务）"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn_pid = os.getpid()
+            self._data_version = None
+        return self._conn
     
-    def _get_cache_key(self, key: str) -> str:
-        """生成缓存键的哈希值"""
-        return hashlib.md5(key.encode()).hexdigest()
+    def _init_database(self):
+        """初始化磁盘缓存数据库"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    source_path TEXT,
+                    source_mtime REAL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    expires_at REAL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries (expires_at)')
+            
+            # 总大小由触发器维护，判断是否超出上限时不需要扫描全表
+            conn.execute('CREATE TABLE IF NOT EXISTS cache_meta (id INTEGER PRIMARY KEY CHECK (id = 0), total_size INTEGER)')
+            conn.execute('INSERT OR IGNORE INTO cache_meta (id, total_size) '
+                         'SELECT 0, COALESCE(SUM(size), 0) FROM cache_entries')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS cache_size_ai AFTER INSERT ON cache_entries BEGIN
+                    UPDATE cache_meta SET total_size = total_size + new.size WHERE id = 0;
+                END
+            ''')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS cache_size_ad AFTER DELETE ON cache_entries BEGIN
+                    UPDATE cache_meta SET total_size = total_size - old.size WHERE id = 0;
+                END
+            ''')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS cache_size_au AFTER UPDATE OF size ON cache_entries BEGIN
+                    UPDATE cache_meta SET total_size = total_size - old.size + new.size WHERE id = 0;
+                END
+            ''')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def _sync_with_disk(self):
+        """
+        其他进程修改过磁盘缓存时，把内存中的持久化条目标记为需要重新验证
+        
+        PRAGMA data_version 只在其他连接提交修改后变化，本进程自己的写操作不会改变它
+        """
+        version = self._connection().execute('PRAGMA data_version').fetchone()[0]
+        if self._data_version is not None and version != self._data_version:
+            self._unverified.update(k for k, e in self._memory_cache.items() if e.persisted)
+        self._data_version = version
+    
+    def _verify_memory_entry(self, key: str, entry: CacheEntry) -> bool:
+        """
+        检查内存条目是否仍与磁盘条目一致（其他进程重新写入或删除后 created_at 变化）
+        
+        只比较 created_at，不读取和反序列化 value
+        """
+        self._unverified.discard(key)
+        row = self._connection().execute(
+            'SELECT created_at FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        return row is not None and abs(row[0] - entry.created_at.timestamp()) < 1e-6
     
-    def _get_cache_file_path(self, cache_key: str) -> Path:
-        """获取缓存文件路径"""
-        return self.cache_dir / f"{cache_key}.cache"
+    @staticmethod
+    def _entry_from_row(row) -> CacheEntry:
+        """从数据库行恢复缓存条目（不访问源文件）"""
+        value, source_path, source_mtime, created_at, expires_at = row
+        entry = CacheEntry.__new__(CacheEntry)
+        entry.data = pickle.loads(value)
+        entry.source_path = Path(source_path) if source_path else None
+        entry.source_mtime = datetime.fromtimestamp(source_mtime) if source_mtime is not None else None
+        entry.created_at = datetime.fromtimestamp(created_at)
+        entry.accessed_at = datetime.now()
+        entry.expires_at = datetime.fromtimestamp(expires_at) if expires_at is not None else None
+        entry.persisted = True
+        return entry
     
     def get(self, key: str, max_age: Optional[timedelta] = None) -> Optional[Any]:
         """
@@ -115,56 +242,63 @@ class CacheManager:
         Args:
             key: 缓存键
             max_age: 最大缓存时间
-            
+        
         Returns:
             缓存的数据，如果不存在或已过期则返回None
         """
-        cache_key = self._get_cache_key(key)
+        self._sync_with_disk()
         
         # 首先检查内存缓存
-        if cache_key in self._memory_cache:
-            entry = self._memory_cache[cache_key]
+        entry = self._memory_cache.get(key)
+        if entry is not None and key in self._unverified and not self._verify_memory_entry(key, entry):
+            # 其他进程改写或删除了这个条目，从磁盘重新读取
+            del self._memory_cache[key]
+            entry = None
+        if entry is not None:
             if entry.is_valid(max_age):
                 entry.touch()
+                self._memory_cache.move_to_end(key)
+                if entry.persisted:
+                    self._touch_disk_entry(key)
                 self._stats['hits'] += 1
                 logger.debug(f"内存缓存命中: {key}")
                 return entry.data
-            else:
-                # 缓存过期，删除
-                del self._memory_cache[cache_key]
+            # 缓存过期，删除
+            del self._memory_cache[key]
         
         # 检查磁盘缓存
-        cache_file = self._get_cache_file_path(cache_key)
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'rb') as f:
-                    entry = pickle.load(f)
-                
+        conn = self._connection()
+        try:
+            row = conn.execute(
+                'SELECT value, source_path, source_mtime, created_at, expires_at FROM cache_entries WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is not None:
+                entry = self._entry_from_row(row)
                 if entry.is_valid(max_age):
-                    # 加载到内存缓存
-                    entry.touch()
-                    self._add_to_memory_cache(cache_key, entry)
+                    self._touch_disk_entry(key)
+                    self._add_to_memory_cache(key, entry)
                     self._stats['hits'] += 1
                     logger.debug(f"磁盘缓存命中: {key}")
                     return entry.data
-                else:
-                    # 缓存过期，删除文件
-                    cache_file.unlink()
-            
-            except Exception as e:
-                logger.warning(f"读取缓存文件失败: {e}")
-                # 删除损坏的缓存文件
-                try:
-                    cache_file.unlink()
-                except:
-                    pass
+                if not entry.is_valid():
+                    # TTL 到期或源文件已修改，删除（只是超过调用方的 max_age 时保留）
+                    conn.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+                    self._stats['expired'] += 1
+        except Exception as e:
+            logger.warning(f"读取缓存失败: {e}")
+            # 删除损坏的缓存条目
+            try:
+                conn.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+            except sqlite3.Error:
+                pass
         
         self._stats['misses'] += 1
         logger.debug(f"缓存未命中: {key}")
         return None
     
-    def set(self, key: str, data: Any, source_path: Optional[Path] = None, 
-            persist_to_disk: bool = True) -> bool:
+    def set(self, key: str, data: Any, source_path: Optional[Path] = None,
+            persist_to_disk: bool = True, ttl: Optional[timedelta] = None) -> bool:
         """
         设置缓存数据
         
@@ -173,57 +307,131 @@ class CacheManager:
             data: 要缓存的数据
             source_path: 源文件路径（用于时间戳检查）
             persist_to_disk: 是否持久化到磁盘
-            
+            ttl: 有效期（默认使用 default_ttl）
+        
         Returns:
             是否成功设置
         """
         try:
-            cache_key = self._get_cache_key(key)
+            self._sync_with_disk()
             entry = CacheEntry(data, source_path)
-            
-            # 添加到内存缓存
-            self._add_to_memory_cache(cache_key, entry)
+            ttl = ttl if ttl is not None else self.default_ttl
+            if ttl is not None:
+                entry.expires_at = entry.created_at + ttl
             
             # 持久化到磁盘
             if persist_to_disk:
-                cache_file = self._get_cache_file_path(cache_key)
-                with open(cache_file, 'wb') as f:
-                    pickle.dump(entry, f)
+                value = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+                if len(value) > self.max_disk_bytes:
+                    logger.debug(f"缓存数据超过磁盘缓存上限，只保存在内存中: {key}")
+                else:
+                    now = time.time()
+                    self._write_disk_entry(key, value, entry, now)
+                    entry.persisted = True
+            else:
+                # 只保存在内存中：同时删除旧的磁盘条目，避免内存淘汰后读到旧数据
+                self._connection().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+            
+            # 添加到内存缓存
+            self._add_to_memory_cache(key, entry)
             
             logger.debug(f"已缓存: {key}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"设置缓存失败: {e}")
             return False
     
-    def _add_to_memory_cache(self, cache_key: str, entry: CacheEntry):
-        """添加条目到内存缓存"""
-        # 检查是否需要清理内存缓存
-        if len(self._memory_cache) >= self.max_memory_entries:
-            self._evict_lru_entries()
-        
-        self._memory_cache[cache_key] = entry
+    def _touch_disk_entry(self, key: str):
+        """记录磁盘条目的访问时间（批量写入，避免每次读取都产生一个写事务）"""
+        self._pending_touches[key] = time.time()
+        if len(self._pending_touches) >= self.TOUCH_FLUSH_SIZE:
+            self._flush_touches()
     
-    def _evict_lru_entries(self):
-        """清理最近最少使用的缓存条目"""
-        if not self._memory_cache:
+    def _flush_touches(self, conn: Optional[sqlite3.Connection] = None):
+        """把记录的访问时间写入数据库（在调用方的事务中，或单独一个事务）"""
+        if not self._pending_touches:
             return
+        touches = [(accessed_at, key) for key, accessed_at in self._pending_touches.items()]
+        self._pending_touches.clear()
+        if conn is not None:
+            conn.executemany('UPDATE cache_entries SET accessed_at = ? WHERE key = ?', touches)
+            return
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('UPDATE cache_entries SET accessed_at = ? WHERE key = ?', touches)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def _write_disk_entry(self, key: str, value: bytes, entry: CacheEntry, now: float):
+        """写入一个磁盘条目，并在超出总大小上限时淘汰最久未访问的条目（一个事务）"""
+        self._pending_touches.pop(key, None)
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('''
+                INSERT OR REPLACE INTO cache_entries
+                (key, value, size, source_path, source_mtime, created_at, accessed_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                key, value, len(value),
+                str(entry.source_path) if entry.source_path else None,
+                entry.source_mtime.timestamp() if entry.source_mtime else None,
+                entry.created_at.timestamp(), now,
+                entry.expires_at.timestamp() if entry.expires_at else None
+            ))
+            total_size = conn.execute('SELECT total_size FROM cache_meta WHERE id = 0').fetchone()[0]
+            if total_size > self.max_disk_bytes:
+                self._flush_touches(conn)
+                self._stats['disk_evictions'] += self._evict_disk_entries(conn, self.max_disk_bytes, now)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    @staticmethod
+    def _evict_disk_entries(conn: sqlite3.Connection, max_bytes: int, now: float) -> int:
+        """
+        先删除已过期的条目，仍然超出上限时按访问时间从旧到新删除，直到总大小降到上限的 90%
+        （留出余量，避免之后每次写入都触发淘汰）
         
-        # 按访问时间排序，删除最旧的条目
-        sorted_entries = sorted(
-            self._memory_cache.items(),
-            key=lambda x: x[1].accessed_at
-        )
-        
-        # 删除最旧的25%条目
-        evict_count = max(1, len(sorted_entries) // 4)
-        for i in range(evict_count):
-            cache_key, _ = sorted_entries[i]
-            del self._memory_cache[cache_key]
+        Returns:
+            删除的条目数量
+        """
+        removed = conn.execute('DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?',
+                               (now,)).rowcount
+        total_size = conn.execute('SELECT total_size FROM cache_meta WHERE id = 0').fetchone()[0]
+        if total_size <= max_bytes:
+            return removed
+        
+        to_free = total_size - int(max_bytes * 0.9)
+        victims = []
+        cursor = conn.execute('SELECT key, size FROM cache_entries ORDER BY accessed_at')
+        while to_free > 0:
+            rows = cursor.fetchmany(256)
+            if not rows:
+                break
+            for key, size in rows:
+                victims.append((key,))
+                to_free -= size
+                if to_free <= 0:
+                    break
+        cursor.close()
+        conn.executemany('DELETE FROM cache_entries WHERE key = ?', victims)
+        return removed + len(victims)
+    
+    def _add_to_memory_cache(self, key: str, entry: CacheEntry):
+        """添加条目到内存缓存（超出上限时淘汰最久未使用的条目）"""
+        self._unverified.discard(key)
+        self._memory_cache[key] = entry
+        self._memory_cache.move_to_end(key)
+        while len(self._memory_cache) > self.max_memory_entries:
+            evicted_key, _ = self._memory_cache.popitem(last=False)
+            self._unverified.discard(evicted_key)
             self._stats['evictions'] += 1
-        
-        logger.debug(f"已清理 {evict_count} 个内存缓存条目")
     
     def invalidate(self, key: str) -> bool:
         """
@@ -231,65 +439,49 @@ class CacheManager:
         
         Args:
             key: 缓存键
-            
+        
         Returns:
             是否成功失效
         """
-        cache_key = self._get_cache_key(key)
-        
         # 从内存缓存删除
-        if cache_key in self._memory_cache:
-            del self._memory_cache[cache_key]
-        
-        # 删除磁盘缓存文件
-        cache_file = self._get_cache_file_path(cache_key)
-        if cache_file.exists():
-            try:
-                cache_file.unlink()
-                logger.debug(f"已失效缓存: {key}")
-                return True
-            except Exception as e:
-                logger.error(f"删除缓存文件失败: {e}")
-                return False
+        self._memory_cache.pop(key, None)
         
-        return True
+        # 删除磁盘缓存条目
+        try:
+            self._connection().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+            logger.debug(f"已失效缓存: {key}")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"删除磁盘缓存失败: {e}")
+            return False
     
     def invalidate_pattern(self, pattern: str) -> int:
         """
         使匹配模式的缓存失效
         
         Args:
-            pattern: 缓存键模式（支持通配符）
-            
+            pattern: 缓存键模式（fnmatch 通配符 * ? [...]，区分大小写）
+        
         Returns:
-            失效的缓存数量
+            失效的缓存数量（内存和磁盘中的同一个键只计一次）
         """
-        import fnmatch
-        
-        invalidated_count = 0
-        
-        # 内存缓存中查找匹配的键
-        keys_to_remove = []
-        for cache_key in self._memory_cache.keys():
-            # 这里需要反向查找原始key，简化处理，直接清空内存缓存
-            pass
-        
-        # 磁盘缓存中查找匹配的文件
-        for cache_file in self.cache_dir.glob("*.cache"):
-            # 简化处理：如果模式是通配符，删除所有缓存文件
-            if '*' in pattern or '?' in pattern:
-                try:
-                    cache_file.unlink()
-                    invalidated_count += 1
-                except:
-                    pass
-        
-        # 如果是通配符模式，清空内存缓存
-        if '*' in pattern or '?' in pattern:
-            memory_count = len(self._memory_cache)
-            self._memory_cache.clear()
-            invalidated_count += memory_count
-        
+        self._sync_with_disk()
+        memory_keys = [key for key in self._memory_cache if fnmatch.fnmatchcase(key, pattern)]
+        for key in memory_keys:
+            del self._memory_cache[key]
+        
+        conn = self._connection()
+        glob = pattern.replace('[!', '[^')
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            disk_keys = {row[0] for row in conn.execute('SELECT key FROM cache_entries WHERE key GLOB ?', (glob,))}
+            conn.execute('DELETE FROM cache_entries WHERE key GLOB ?', (glob,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        
+        invalidated_count = len(disk_keys.union(memory_keys))
         logger.debug(f"已失效 {invalidated_count} 个缓存条目")
         return invalidated_count
     
@@ -297,12 +489,16 @@ class CacheManager:
         """清空所有缓存"""
         # 清空内存缓存
         self._memory_cache.clear()
+        self._unverified.clear()
         
-        # 删除所有磁盘缓存文件
+        # 清空磁盘缓存
+        self._connection().execute('DELETE FROM cache_entries')
+        
+        # 删除旧版本（每个条目一个 pickle 文件）留下的缓存文件
         for cache_file in self.cache_dir.glob("*.cache"):
             try:
                 cache_file.unlink()
-            except:
+            except OSError:
                 pass
         
         logger.info("已清空所有缓存")
@@ -312,37 +508,47 @@ class CacheManager:
         total_requests = self._stats['hits'] + self._stats['misses']
         hit_rate = (self._stats['hits'] / total_requests * 100) if total_requests > 0 else 0
         
+        disk_entries, = self._connection().execute('SELECT COUNT(*) FROM cache_entries').fetchone()
+        disk_bytes, = self._connection().execute('SELECT total_size FROM cache_meta WHERE id = 0').fetchone()
         return {
             'hits': self._stats['hits'],
             'misses': self._stats['misses'],
             'evictions': self._stats['evictions'],
+            'disk_evictions': self._stats['disk_evictions'],
+            'expired': self._stats['expired'],
             'hit_rate': f"{hit_rate:.1f}%",
             'memory_entries': len(self._memory_cache),
-            'disk_files': len(list(self.cache_dir.glob("*.cache")))
+            'disk_entries': disk_entries,
+            'disk_files': disk_entries,
+            'disk_bytes': disk_bytes
         }
     
-    def cleanup_expired(self, max_age: timedelta = timedelta(days=7)):
+    def cleanup_expired(self, max_age: timedelta = timedelta(days=7)) -> int:
         """
-        清理过期的缓存文件
+        清理过期的磁盘缓存条目（TTL 已到期，或创建时间超过 max_age）
         
         Args:
             max_age: 最大缓存时间
-        """
-        cleaned_count = 0
         
-        for cache_file in self.cache_dir.glob("*.cache"):
+        Returns:
+            清理的条目数量
+        """
+        now = time.time()
+        cleaned_count = self._connection().execute(
+            'DELETE FROM cache_entries WHERE created_at < ? OR (expires_at IS NOT NULL AND expires_at <= ?)',
+            (now - max_age.total_seconds(), now)
+        ).rowcount
+        self._stats['expired'] += cleaned_count
+        
+        logger.info(f"已清理 {cleaned_count} 个过期缓存条目")
+        return cleaned_count
+    
+    def close(self):
+        """写入记录的访问时间并关闭数据库连接"""
+        if self._conn is not None and self._conn_pid == os.getpid():
             try:
-                # 检查文件修改时间
-                file_mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
-                if (datetime.now() - file_mtime) > max_age:
-                    cache_file.unlink()
-                    cleaned_count += 1
-            except:
-                # 删除无法访问的文件
-                try:
-                    cache_file.unlink()
-                    cleaned_count += 1
-                except:
-                    pass
-        
-        logger.info(f"已清理 {cleaned_count} 个过期缓存文件")
\ No newline at end of file
+                self._flush_touches()
+            except sqlite3.Error as e:
+                logger.warning(f"写入缓存访问时间失败: {e}")
+            self._conn.close()
+        self._conn = None
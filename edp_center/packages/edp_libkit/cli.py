@@ -8,9 +8,10 @@ EDP LibKit CLI - 命令行接口
 """
 
 import sys
+import time
 import argparse
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 import logging
 
 try:
@@ -21,8 +22,8 @@ except ImportError:
     def setup_logging(level='INFO'):
         logging.basicConfig(level=getattr(logging, level.upper()))
 
-from .generator import LibConfigGenerator
-from .foundry_adapters import AdapterFactory
+from .view_collector import ViewFileCollector
+from .batch_gen import GenLibOptions, get_shared_adapter, resolve_jobs, run_gen_lib, print_progress, print_summary
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,12 @@ def main():
   
   # 处理所有版本
   edp-libkit gen-lib --foundry Samsung --lib-path /path/to/library_dir --lib-type STD --node ln08lpu_gp --all-versions --output-dir /path/to/output
+  
+  # 8 个进程并行处理安装目录下的所有库
+  edp-libkit gen-lib --foundry Samsung --lib-path /path/to/0711_install --lib-type STD --node ln08lpu_gp --jobs 8 --output-dir /path/to/output
+  
+  # 增量刷新：只重新生成有变化的库（每晚刷新未变化的安装目录只需扫描签名）
+  edp-libkit gen-lib --foundry Samsung --lib-path /path/to/0711_install --lib-type STD --node ln08lpu_gp --incremental --output-dir /path/to/output
         """
     )
     
@@ -119,6 +126,22 @@ def main():
         type=str,
         help='lib_config.tcl中的数组变量名（默认：LIBRARY）'
     )
+    gen_lib_parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='并行处理的库数量（worker 进程数，默认：1 串行；0 表示使用 CPU 核数）'
+    )
+    gen_lib_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='增量处理：只重新生成视图目录有变化（或新增）的库，并报告新增/变化/移除的库'
+    )
+    gen_lib_parser.add_argument(
+        '--index-db',
+        type=Path,
+        help='增量处理使用的库索引文件（默认：{output-dir}/.libkit_index.db）'
+    )
     gen_lib_parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -179,44 +202,43 @@ def _is_valid_library_directory(lib_path: Path, adapter, lib_type: str) -> bool:
         return False
 
 
-def _find_library_directories(parent_path: Path, adapter, lib_type: str) -> List[Path]:
+def _find_library_directories(parent_path: Path, adapter, lib_type: str,
+                              collector: Optional[ViewFileCollector] = None) -> List[Path]:
     """
     在父目录下查找所有有效的库目录
     
+    父目录只读取一次：同一次扫描结果既用于判断父目录是否直接包含视图目录，也用于列出候选子目录。
+    
     Args:
         parent_path: 父目录路径
         adapter: FoundryAdapter 实例
         lib_type: 库类型（STD/IP/MEM）
+        collector: 目录扫描器（可选，用于统计目录读取次数）
         
     Returns:
         找到的库目录路径列表
     """
+    collector = collector or ViewFileCollector()
     library_dirs = []
     
-    # 首先检查父目录本身是否直接包含视图目录（不是通过子目录找到的）
     # 获取视图类型列表
     view_types = adapter.get_standard_view_types(lib_type)
     if not view_types:
         view_types = ['gds', 'lef', 'liberty', 'verilog']
     
-    # 检查父目录是否直接包含视图目录
-    has_direct_views = False
-    for view_type in view_types[:3]:  # 只检查前3个常见的
-        if (parent_path / view_type).exists() and (parent_path / view_type).is_dir():
-            has_direct_views = True
-            break
+    subdirs, _ = collector.scan(parent_path)
     
-    if has_direct_views:
+    # 检查父目录是否直接包含视图目录（只检查前3个常见的）
+    if set(view_types[:3]) & set(subdirs):
         # 父目录本身是库目录
         return [parent_path]
     
     # 父目录不是库目录，检查子目录
-    if parent_path.exists() and parent_path.is_dir():
-        for item in parent_path.iterdir():
-            if item.is_dir():
-                # 检查子目录是否是库目录
-                if _is_valid_library_directory(item, adapter, lib_type):
-                    library_dirs.append(item)
+    for name in subdirs:
+        item = parent_path / name
+        # 检查子目录是否是库目录
+        if _is_valid_library_directory(item, adapter, lib_type):
+            library_dirs.append(item)
     
     return sorted(library_dirs)
 
@@ -281,9 +303,9 @@ def handle_gen_lib(args) -> int:
     print(f"[INFO] 输出目录: {args.output_dir}")
     print()
     
-    # 创建适配器用于检测库目录
+    # 创建适配器用于检测库目录（与后续生成共享）
     try:
-        adapter = AdapterFactory.create_adapter(args.foundry, args.node)
+        adapter = get_shared_adapter(args.foundry, args.node)
     except Exception as e:
         print(f"[ERROR] 无法创建适配器: {e}", file=sys.stderr)
         return 1
@@ -321,68 +343,36 @@ def handle_gen_lib(args) -> int:
         print("[ERROR] 没有找到任何库目录", file=sys.stderr)
         return 1
     
-    # 更新库路径列表
-    lib_paths = expanded_lib_paths
+    # 更新库路径列表（用户指定的目录作为增量处理的扫描范围）
+    roots, lib_paths = lib_paths, expanded_lib_paths
     if len(lib_paths) != len([p for p in lib_paths if p.exists()]):
         print(f"[INFO] 展开后待处理库数量: {len(lib_paths)}")
     
     # 批量处理
-    all_generated_files = []
-    success_count = 0
-    fail_count = 0
-    
-    for idx, lib_path in enumerate(lib_paths, 1):
-        print(f"[{idx}/{len(lib_paths)}] 处理库: {lib_path.name}")
-        
-        try:
-            # 创建生成器（使用库目录的父目录作为 ori_path，但实际上不会用到）
-            generator = LibConfigGenerator(
-                foundry=args.foundry,
-                ori_path=lib_path.parent,  # 临时值，不会用到
-                output_base_dir=args.output_dir,
-                array_name=args.array_name,
-                node=args.node
-            )
-            
-            # 根据版本参数选择处理方式
-            if args.all_versions:
-                # 处理所有版本
-                generated_files = generator.generate_all_versions(lib_path, lib_type=args.lib_type)
-            else:
-                # 处理指定版本或最新版本
-                generated_files = generator.generate_from_directory(
-                    lib_path, 
-                    lib_type=args.lib_type,
-                    version=args.version  # 如果为None，会使用最新版本
-                )
-            all_generated_files.extend(generated_files)
-            success_count += 1
-            
-            for file_path in generated_files:
-                print(f"  [OK] 已生成: {file_path.name}")
-        
-        except Exception as e:
-            fail_count += 1
-            logger.exception(f"处理库 {lib_path.name} 时出错")
-            print(f"  [ERROR] 失败: {e}", file=sys.stderr)
-            continue
-    
-    # 输出总结
-    print()
-    print("=" * 60)
-    print(f"[SUMMARY] 处理完成:")
-    print(f"  成功: {success_count}/{len(lib_paths)}")
-    if fail_count > 0:
-        print(f"  失败: {fail_count}/{len(lib_paths)}")
-    print(f"  共生成: {len(all_generated_files)} 个lib_config.tcl文件")
-    print("=" * 60)
-    
-    if all_generated_files:
-        print("\n生成的文件列表:")
-        for file_path in all_generated_files:
-            print(f"  - {file_path}")
-    
-    return 0 if fail_count == 0 else 1
+    jobs = resolve_jobs(args.jobs)
+    if jobs > 1:
+        print(f"[INFO] 并行处理: {jobs} 个进程")
+    options = GenLibOptions(
+        foundry=args.foundry,
+        node=args.node,
+        lib_type=args.lib_type,
+        output_dir=args.output_dir,
+        array_name=args.array_name,
+        version=args.version,  # 如果为None，会使用最新版本
+        all_versions=args.all_versions
+    )
+    if args.incremental:
+        from .incremental_index import IncrementalIndexer, print_refresh_report
+        from .library_index import LibraryIndex
+        index_path = args.index_db or Path(args.output_dir) / '.libkit_index.db'
+        print(f"[INFO] 增量处理，索引文件: {index_path}")
+        indexer = IncrementalIndexer(LibraryIndex(index_path), options)
+        report = indexer.refresh(lib_paths, roots=roots, jobs=jobs, progress=print_progress)
+        return print_refresh_report(report)
+    
+    start = time.perf_counter()
+    results = run_gen_lib(lib_paths, options, jobs=jobs, progress=print_progress)
+    return print_summary(results, time.perf_counter() - start, jobs)
 
 
 if __name__ == '__main__':
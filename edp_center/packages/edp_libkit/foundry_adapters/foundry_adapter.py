@@ -5,10 +5,15 @@
 Foundry Adapter - Foundry适配器
 
 统一的foundry适配器入口，根据foundry和node动态加载对应的适配器
+
+AdapterFactory.get_adapter() 在进程内按 (foundry, node, 配置文件修改时间) 缓存已加载的适配器：
+一次运行中所有库共享同一个适配器（YAML 只读取一次，匹配规则只编译一次），配置文件修改后自动重新加载。
 """
 
+import os
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import importlib
 
 from .interface import BaseFoundryAdapter
@@ -149,11 +154,59 @@ class FoundryAdapter(BaseFoundryAdapter):
 class AdapterFactory:
     """适配器工厂"""
     
+    # 进程内的适配器缓存：(foundry, node) -> (配置文件修改时间ns, 适配器)
+    _registry: Dict[Tuple[str, Optional[str]], Tuple[Optional[int], FoundryAdapter]] = {}
+    _registry_lock = threading.Lock()
+    
+    # 本进程中创建适配器的次数（统计/测试用）
+    created_count = 0
+    
     @staticmethod
     def create_adapter(foundry: str, node: Optional[str] = None) -> FoundryAdapter:
-        """创建适配器实例"""
+        """创建适配器实例（每次都重新加载配置；一般应使用 get_adapter）"""
+        AdapterFactory.created_count += 1
         return FoundryAdapter(foundry, node)
     
+    @staticmethod
+    def _config_mtime(foundry: str, node: Optional[str]) -> Optional[int]:
+        """节点配置文件的修改时间（ns），没有节点或文件不存在时为 None"""
+        if not node:
+            return None
+        from .node_adapter import node_config_path
+        try:
+            return os.stat(node_config_path(foundry, node)).st_mtime_ns
+        except OSError:
+            return None
+    
+    @classmethod
+    def get_adapter(cls, foundry: str, node: Optional[str] = None) -> FoundryAdapter:
+        """
+        获取进程内共享的适配器（第一次调用或节点配置文件修改后才创建）
+        
+        Args:
+            foundry: Foundry名称（不区分大小写）
+            node: 工艺节点（不区分大小写）
+        
+        Returns:
+            FoundryAdapter 实例
+        """
+        key = (foundry.lower(), node.lower() if node else None)
+        mtime = cls._config_mtime(*key)
+        with cls._registry_lock:
+            cached = cls._registry.get(key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            # create_adapter 通过类属性调用，测试中可以替换
+            adapter = AdapterFactory.create_adapter(foundry, node)
+            cls._registry[key] = (mtime, adapter)
+            return adapter
+    
+    @classmethod
+    def clear_cache(cls):
+        """清空适配器缓存"""
+        with cls._registry_lock:
+            cls._registry.clear()
+    
     @staticmethod
     def get_supported_foundries() -> List[str]:
         """获取支持的foundry列表"""
@@ -173,6 +226,5 @@ class AdapterFactory:
     @staticmethod
     def get_supported_nodes(foundry: str) -> List[str]:
         """获取指定foundry支持的节点列表"""
-        adapter = FoundryAdapter(foundry)
-        return adapter.get_supported_nodes()
+        return AdapterFactory.get_adapter(foundry).get_supported_nodes()
 
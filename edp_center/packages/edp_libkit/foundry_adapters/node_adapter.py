@@ -20,9 +20,21 @@ except ImportError:
 
 from .interface import BaseFoundryAdapter
 from ..lib_info import LibInfo
+from ..view_collector import compile_patterns
 
 logger = logging.getLogger(__name__)
 
+# 版本目录名（预编译，每个库的每个目录都会匹配）
+_VERSION_DIR_RE = re.compile(r'^\d+\.\d+[A-Za-z]?$')
+_V_VERSION_DIR_RE = re.compile(r'^v\d+\.\d+')
+_VERSION_PREFIX_RE = re.compile(r'^\d+\.\d+')
+_VERSION_SORT_RE = re.compile(r'^(\d+)\.(\d+)([A-Za-z]?)$')
+
+
+def node_config_path(foundry: str, node_key: str) -> Path:
+    """节点 YAML 配置文件路径：foundry_adapters/{foundry}/{node_key}.config.yaml"""
+    return Path(__file__).parent / foundry / f'{node_key}.config.yaml'
+
 
 class BaseNodeAdapter(BaseFoundryAdapter):
     """节点适配器实现类"""
@@ -44,6 +56,26 @@ class BaseNodeAdapter(BaseFoundryAdapter):
         # 验证节点配置是否加载成功
         if not self.node_info:
             raise ValueError(f"未知的节点或配置文件不存在: {foundry}/{node_key}")
+        
+        self._compile_config()
+    
+    def _compile_config(self):
+        """
+        预编译配置中的匹配规则（适配器在进程内共享，只编译一次）
+        
+        - view_file_regexes: {视图类型: 匹配该视图所有文件模式的正则}
+        - PVT corner 前缀：按配置顺序组成一个正则，与逐个 startswith 的结果相同（取第一个匹配的前缀）
+        """
+        self.view_file_regexes = {
+            view_type: compile_patterns(tuple([patterns] if isinstance(patterns, str) else patterns))
+            for view_type, patterns in self.view_file_patterns.items() if patterns
+        }
+        prefixes = [str(prefix) for prefix in self.pvt_corner_mapping]
+        self._rc_corner_prefix_re = (
+            re.compile('|'.join(re.escape(prefix) for prefix in prefixes)) if prefixes else None
+        )
+        self._rc_corner_lookup = {str(k): v for k, v in self.pvt_corner_mapping.items()}
+        self._rc_corner_cache: Dict[str, str] = {}
     
     def _load_node_config(self):
         """
@@ -56,11 +88,7 @@ class BaseNodeAdapter(BaseFoundryAdapter):
         - standard_view_types: 视图类型配置
         - view_file_patterns: 文件模式配置
         """
-        # 获取当前文件所在目录的父目录（foundry_adapters）
-        current_file = Path(__file__)
-        foundry_adapters_dir = current_file.parent
-        foundry_dir = foundry_adapters_dir / self.foundry
-        config_file = foundry_dir / f'{self.node_key}.config.yaml'
+        config_file = node_config_path(self.foundry, self.node_key)
         
         # 初始化配置
         self.node_info = {}
@@ -331,9 +359,9 @@ class BaseNodeAdapter(BaseFoundryAdapter):
         if lib_name.startswith('v'):
             # 检查 v1.12, v2.0 等格式
             remaining = lib_name[1:]  # 去掉v
-            if re.match(r'^\d+\.\d+', remaining) or remaining.replace('.', '').isdigit():
+            if _VERSION_PREFIX_RE.match(remaining) or remaining.replace('.', '').isdigit():
                 is_version_dir = True
-        elif re.match(r'^\d+\.\d+[A-Za-z]?$', lib_name):
+        elif _VERSION_DIR_RE.match(lib_name):
             # 检查 1.01a, 2.00A 等格式
             is_version_dir = True
         
@@ -387,14 +415,20 @@ class BaseNodeAdapter(BaseFoundryAdapter):
         - 'pg' = Power Gate（电源门控）
         - 不存在 'ulvt' 格式
         """
-        pvt_corner_lower = pvt_corner.lower()
-        
+        rc_corner = self._rc_corner_cache.get(pvt_corner)
+        if rc_corner is None:
+            rc_corner = self._match_rc_corner(pvt_corner.lower())
+            self._rc_corner_cache[pvt_corner] = rc_corner
+        return rc_corner
+    
+    def _match_rc_corner(self, pvt_corner_lower: str) -> str:
+        """extract_rc_corner 的匹配逻辑（结果按 corner 名缓存）"""
         # 对于 Samsung，使用 startswith 匹配（因为可能有 'ff', 'ffgs', 'sfg' 等变体）
         if self.foundry == 'samsung':
             # 首先尝试直接匹配（最简单版本）
-            for prefix, rc_corner in self.pvt_corner_mapping.items():
-                if pvt_corner_lower.startswith(prefix):
-                    return rc_corner
+            match = self._rc_corner_prefix_re.match(pvt_corner_lower) if self._rc_corner_prefix_re else None
+            if match:
+                return self._rc_corner_lookup[match.group(0)]
             
             # 检查变体格式（如 'sfg' 可能是 'ss' 的变体）
             # 'sfg' 可能是 'slow-fast' 或类似的组合，通常归类为 'ss'（worst case）
@@ -408,15 +442,15 @@ class BaseNodeAdapter(BaseFoundryAdapter):
                 parts = pvt_corner_lower.split('_')
                 # 检查每个部分，找到以 ff/ss/tt 开头的部分
                 for part in parts:
-                    for prefix, rc_corner in self.pvt_corner_mapping.items():
-                        if part.startswith(prefix):
-                            return rc_corner
+                    match = self._rc_corner_prefix_re.match(part) if self._rc_corner_prefix_re else None
+                    if match:
+                        return self._rc_corner_lookup[match.group(0)]
                     # 检查变体格式
                     if part.startswith('sfg'):
                         return 'sigcmax'
         else:
             # 对于 SMIC 和 TSMC，使用精确匹配
-            return self.pvt_corner_mapping.get(pvt_corner_lower, 'typical')
+            return self._rc_corner_lookup.get(pvt_corner_lower, 'typical')
         
         return 'typical'
     
@@ -466,10 +500,10 @@ class BaseNodeAdapter(BaseFoundryAdapter):
         for root, dirs, files in os.walk(lib_path):
             for dir_name in dirs:
                 # 匹配格式：数字.数字字母（如 2.00A, 1.01a）
-                if re.match(r'^\d+\.\d+[A-Za-z]?$', dir_name):
+                if _VERSION_DIR_RE.match(dir_name):
                     versions.append(dir_name)
                 # 匹配格式：v数字.数字（如 v1.12, v2.0）
-                elif re.match(r'^v\d+\.\d+', dir_name):
+                elif _V_VERSION_DIR_RE.match(dir_name):
                     versions.append(dir_name)
         
         return versions
@@ -510,7 +544,7 @@ class BaseNodeAdapter(BaseFoundryAdapter):
         version_clean = version.lstrip('v')
         
         # 提取数字和字母部分
-        match = re.match(r'^(\d+)\.(\d+)([A-Za-z]?)$', version_clean)
+        match = _VERSION_SORT_RE.match(version_clean)
         if match:
             major = int(match.group(1))
             minor = int(match.group(2))
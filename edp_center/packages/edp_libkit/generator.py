@@ -14,6 +14,7 @@ from typing import Dict, List, Optional
 from .lib_info import LibInfo
 from .foundry_adapters import FoundryAdapter, AdapterFactory
 from .lib_generator import LibGenerator
+from .view_collector import ViewFileCollector
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +23,8 @@ class LibConfigGenerator:
     """库配置生成器"""
     
     def __init__(self, foundry: str, ori_path: Path, output_base_dir: Optional[Path] = None,
-                 array_name: Optional[str] = None, node: Optional[str] = None):
+                 array_name: Optional[str] = None, node: Optional[str] = None,
+                 adapter: Optional[FoundryAdapter] = None):
         """
         初始化生成器
         
@@ -32,14 +34,15 @@ class LibConfigGenerator:
             output_base_dir: lib_config.tcl输出基础目录（如果为None，则放在框架内部）
             array_name: lib_config.tcl中的数组变量名（默认：LIBRARY）
             node: 工艺节点（如 'ln08lpu_gp'，可选）
+            adapter: 已加载的适配器（可选）。批量处理时多个生成器共享同一个适配器，不再重复加载 YAML 配置
         """
         self.foundry = foundry
         self.ori_path = Path(ori_path).resolve()
         self.output_base_dir = output_base_dir
         self.node = node
         
-        # 创建适配器
-        self.adapter = AdapterFactory.create_adapter(foundry, node)
+        # 创建适配器（或使用共享的适配器）
+        self.adapter = adapter if adapter is not None else AdapterFactory.get_adapter(foundry, node)
         logger.info(f"使用适配器: {type(self.adapter).__name__}")
         
         # 根据foundry设置默认array_name
@@ -47,6 +50,10 @@ class LibConfigGenerator:
             array_name = 'LIBRARY'  # 默认都是 LIBRARY
         
         self.lib_generator = LibGenerator(array_name=array_name)
+        self.file_collector = ViewFileCollector()
+        
+        # 最近一次 generate_from_directory/generate_all_versions 中内容未变化（未重写）的文件
+        self.unchanged_files: List[Path] = []
     
 
     
@@ -99,31 +106,11 @@ class LibConfigGenerator:
             # SMIC格式：直接返回view_dirs结构，让lib_generator处理
             return view_dirs
         
-        # Samsung格式：收集文件列表
-        view_files = {}
-        
-        for view_type, view_path in view_dirs.items():
-            # 获取文件匹配模式（可能是字符串或列表）
-            pattern = self.adapter.get_view_file_pattern(view_type)
-            
-            # 查找匹配的文件
-            files = []
-            if isinstance(pattern, list):
-                # 多个模式：匹配所有模式的文件
-                for p in pattern:
-                    matched = list(view_path.glob(p))
-                    files.extend(matched)
-                    if matched:
-                        logger.debug(f"{view_type}: 模式 '{p}' 找到 {len(matched)} 个文件")
-            else:
-                # 单个模式：向后兼容
-                files = list(view_path.glob(pattern))
-            
-            # 去重并排序
-            if files:
-                files = sorted(set(files))  # 使用 set 去重
-                view_files[view_type] = files
-                logger.debug(f"{view_type}: 总共找到 {len(files)} 个文件")
+        # Samsung格式：收集文件列表（每个目录只读取一次，所有模式同时匹配）
+        view_patterns = {view_type: self.adapter.get_view_file_pattern(view_type) for view_type in view_dirs}
+        view_files = self.file_collector.collect(view_dirs, view_patterns)
+        for view_type, files in view_files.items():
+            logger.debug(f"{view_type}: 总共找到 {len(files)} 个文件")
         
         return view_files
     
@@ -143,28 +130,18 @@ class LibConfigGenerator:
         output_path.mkdir(parents=True, exist_ok=True)
         return output_path / 'lib_config.tcl'
     
-    def generate_from_directory(self, lib_dir: Path, lib_type: str, version: Optional[str] = None) -> List[Path]:
+    def resolve_lib_info(self, lib_dir: Path, lib_type: str, version: Optional[str] = None) -> LibInfo:
         """
-        从给定目录生成lib_config.tcl（必须指定库类型）
-        
-        这是现在推荐使用的方法，要求用户明确指定库类型，不依赖自动识别。
+        提取库信息（名称、版本），库类型使用用户指定的类型
         
         Args:
-            lib_dir: 库目录路径（可以是任意目录，不要求特定前缀）
-            lib_type: 库类型（STD/IP/MEM），必须由用户指定
-            version: 指定版本号（如 '2.00A'）。如果为None，自动选择最新版本
+            lib_dir: 库目录路径
+            lib_type: 库类型（STD/IP/MEM）
+            version: 指定版本号。如果为None且目录中未包含版本，使用最新版本
             
         Returns:
-            生成的lib_config.tcl文件路径列表
+            LibInfo
         """
-        logger.info(f"处理目录: {lib_dir}, 库类型: {lib_type}")
-        
-        if not lib_dir.exists():
-            raise ValueError(f"目录不存在: {lib_dir}")
-        
-        if not lib_dir.is_dir():
-            raise ValueError(f"路径不是目录: {lib_dir}")
-        
         # 使用适配器提取库信息（名称、版本等）
         lib_info = self.adapter.extract_lib_info(lib_dir)
         # 覆盖为用户指定的库类型（不依赖自动识别）
@@ -182,6 +159,32 @@ class LibConfigGenerator:
                     lib_info.version = self.adapter._node_adapter._get_latest_version(all_versions)
                     logger.info(f"自动选择最新版本: {lib_info.version}")
         
+        return lib_info
+    
+    def generate_from_directory(self, lib_dir: Path, lib_type: str, version: Optional[str] = None) -> List[Path]:
+        """
+        从给定目录生成lib_config.tcl（必须指定库类型）
+        
+        这是现在推荐使用的方法，要求用户明确指定库类型，不依赖自动识别。
+        
+        Args:
+            lib_dir: 库目录路径（可以是任意目录，不要求特定前缀）
+            lib_type: 库类型（STD/IP/MEM），必须由用户指定
+            version: 指定版本号（如 '2.00A'）。如果为None，自动选择最新版本
+            
+        Returns:
+            生成的lib_config.tcl文件路径列表
+        """
+        logger.info(f"处理目录: {lib_dir}, 库类型: {lib_type}")
+        
+        if not lib_dir.exists():
+            raise ValueError(f"目录不存在: {lib_dir}")
+        
+        if not lib_dir.is_dir():
+            raise ValueError(f"路径不是目录: {lib_dir}")
+        
+        self.unchanged_files = []
+        lib_info = self.resolve_lib_info(lib_dir, lib_type, version)
         logger.info(f"库信息: {lib_info}")
         
         try:
@@ -200,8 +203,11 @@ class LibConfigGenerator:
             output_path = self._determine_output_path(lib_info)
             
             # 生成lib_config.tcl
-            self.lib_generator.generate(lib_info, view_files, output_path, self.adapter)
-            logger.info(f"已生成: {output_path}")
+            if self.lib_generator.generate(lib_info, view_files, output_path, self.adapter):
+                logger.info(f"已生成: {output_path}")
+            else:
+                self.unchanged_files.append(output_path)
+                logger.info(f"内容未变化: {output_path}")
             
             return [output_path]
             
@@ -225,6 +231,7 @@ class LibConfigGenerator:
             生成的lib_config.tcl文件路径列表
         """
         logger.info(f"处理目录的所有版本: {lib_dir}, 库类型: {lib_type}")
+        self.unchanged_files = []
         
         if not lib_dir.exists():
             raise ValueError(f"目录不存在: {lib_dir}")
@@ -289,8 +296,11 @@ class LibConfigGenerator:
                 output_path = base_output_dir / output_filename
                 
                 # 生成lib_config.tcl
-                self.lib_generator.generate(lib_info, view_files, output_path, self.adapter)
-                logger.info(f"已生成: {output_path}")
+                if self.lib_generator.generate(lib_info, view_files, output_path, self.adapter):
+                    logger.info(f"已生成: {output_path}")
+                else:
+                    self.unchanged_files.append(output_path)
+                    logger.info(f"内容未变化: {output_path}")
                 generated_files.append(output_path)
                 
             except Exception as e:
@@ -290,7 +290,7 @@ class LibKitGUI:
             return
         
         try:
-            adapter = AdapterFactory.create_adapter(foundry)
+            adapter = AdapterFactory.get_adapter(foundry)
             nodes = adapter.get_supported_nodes()
             self.node_combo['values'] = nodes
             if nodes:
@@ -434,7 +434,7 @@ class LibKitGUI:
             
             # 创建适配器用于检测库目录
             try:
-                adapter = AdapterFactory.create_adapter(foundry, node)
+                adapter = AdapterFactory.get_adapter(foundry, node)
             except Exception as e:
                 logging.error(f"无法创建适配器: {e}")
                 self.generate_button.config(state='normal')
@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+增量库索引 - 根据视图目录签名只重新生成有变化的库
+
+LibInfo/FileInfo 的校验和只覆盖顶层路径，视图目录深处的变化检测不到，所以原来只能全部重新生成。
+这里为每个库记录各视图目录的签名（目录中每个条目的名称、大小、修改时间），保存在 LibraryIndex 中；
+再次运行时：
+- 只用 scandir 读取视图目录计算签名（不生成），与记录比较
+- 只有新增的库、签名或生成参数变化的库、输出文件丢失的库才重新生成 lib_config.tcl 并更新索引
+- 记录中存在但已不在扫描范围内（或目录已删除）的库从索引中移除
+- 报告新增、变化、移除和未变化的库
+
+签名按视图目录计算（非递归，与 gen-lib 收集文件的范围一致）：子目录只记录其自身的修改时间，
+子目录中增删条目会改变子目录的修改时间，因此也能检测到。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .batch_gen import GenLibOptions, GenLibResult, _get_generator, get_shared_adapter, resolve_jobs, run_gen_lib
+from .lib_info import FileInfo, LibInfo, ViewInfo
+from .library_index import LibraryIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ViewSignature:
+    """一个视图目录的签名"""
+    view_path: Path
+    signature: str
+    files: List[FileInfo] = field(default_factory=list)
+
+    @property
+    def file_count(self) -> int:
+        return len(self.files)
+
+    @property
+    def total_size(self) -> int:
+        return sum(f.size or 0 for f in self.files)
+
+
+@dataclass
+class LibraryState:
+    """扫描得到的库当前状态（未生成）"""
+    lib_path: Path
+    lib_info: Optional[LibInfo] = None
+    views: Dict[str, ViewSignature] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass
+class RefreshReport:
+    """一次增量刷新的结果"""
+    added: List[Path] = field(default_factory=list)
+    changed: Dict[Path, List[str]] = field(default_factory=dict)
+    """{库目录: 变化原因（变化的视图或 options/output）}"""
+    removed: List[Path] = field(default_factory=list)
+    unchanged: List[Path] = field(default_factory=list)
+    results: List[GenLibResult] = field(default_factory=list)
+    """重新生成的库的处理结果"""
+    scan_time: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def failed(self) -> List[GenLibResult]:
+        return [r for r in self.results if not r.ok]
+
+
+def compute_view_signature(view_path: Path) -> ViewSignature:
+    """
+    读取一次视图目录，计算签名
+
+    签名是目录中所有条目（按名称排序）的 (名称, 是否目录, 大小, 修改时间ns) 的 blake2b 摘要。
+    目录不存在时签名为空字符串。
+
+    Args:
+        view_path: 视图目录
+
+    Returns:
+        ViewSignature（files 为目录中的文件条目）
+    """
+    view_path = Path(view_path)
+    entries = []
+    try:
+        with os.scandir(view_path) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                    is_dir = entry.is_dir()
+                except OSError:
+                    # 失效的符号链接等：只记录名称
+                    entries.append((entry.name, False, -1, 0))
+                    continue
+                entries.append((entry.name, is_dir, stat.st_size, stat.st_mtime_ns))
+    except OSError:
+        return ViewSignature(view_path=view_path, signature='')
+
+    entries.sort()
+    digest = hashlib.blake2b(digest_size=16)
+    files = []
+    for name, is_dir, size, mtime_ns in entries:
+        digest.update(f'{name}\0{int(is_dir)}\0{size}\0{mtime_ns}\n'.encode('utf-8', 'surrogateescape'))
+        if not is_dir:
+            files.append(FileInfo(file_path=view_path / name, file_type=view_path.name, size=max(size, 0),
+                                  modified_time=datetime.fromtimestamp(mtime_ns / 1e9)))
+    return ViewSignature(view_path=view_path, signature=digest.hexdigest(), files=files)
+
+
+def _flatten_view_dirs(view_dirs: Dict[str, object], prefix: str = '') -> Dict[str, Path]:
+    """
+    把 find_view_directories 的结果展开为 {view_key: 目录}
+
+    Samsung 格式的值是目录；SMIC 格式包含 'root' 和 'pvt_dirs': {pvt_name: 目录} 等嵌套结构。
+    """
+    flat = {}
+    for key, value in view_dirs.items():
+        view_key = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(_flatten_view_dirs(value, f'{view_key}/'))
+        elif isinstance(value, (list, tuple)):
+            flat.update(_flatten_view_dirs({str(i): v for i, v in enumerate(value)}, f'{view_key}/'))
+        elif isinstance(value, (str, Path)):
+            flat[view_key] = Path(value)
+    return flat
+
+
+class IncrementalIndexer:
+    """增量刷新一组库的 lib_config.tcl 和库索引"""
+
+    def __init__(self, index: LibraryIndex, options: GenLibOptions):
+        """
+        Args:
+            index: 库索引（同时保存视图目录签名）
+            options: gen-lib 处理参数
+        """
+        self.index = index
+        self.options = options
+        self.adapter = get_shared_adapter(options.foundry, options.node)
+        # 生成范围：同一个范围内的库才会被比较和移除
+        self.scope = '|'.join([options.foundry, options.node, options.lib_type,
+                               str(Path(options.output_dir).resolve())])
+        # 影响生成结果的其他参数，变化时所有库都需要重新生成
+        self.options_key = json.dumps({'version': options.version, 'all_versions': options.all_versions,
+                                       'array_name': options.array_name}, sort_keys=True)
+
+    def scan_library(self, lib_path: Path) -> LibraryState:
+        """
+        读取库的当前状态：库信息和各视图目录的签名（不生成）
+
+        Args:
+            lib_path: 库目录
+
+        Returns:
+            LibraryState，出错时 error 不为空
+        """
+        state = LibraryState(lib_path=lib_path)
+        try:
+            if not lib_path.is_dir():
+                raise ValueError(f"目录不存在: {lib_path}")
+            state.lib_info = _get_generator(self.options).resolve_lib_info(
+                lib_path, self.options.lib_type, self.options.version)
+
+            if self.options.all_versions and getattr(self.adapter, '_node_adapter', None):
+                view_dirs = {version: self.adapter.find_view_directories(lib_path, self.options.lib_type,
+                                                                         version=version)
+                             for version in self.adapter._node_adapter._find_all_versions(lib_path)}
+            else:
+                view_dirs = self.adapter.find_view_directories(lib_path, self.options.lib_type,
+                                                               version=self.options.version)
+            state.views = {key: compute_view_signature(view_path)
+                           for key, view_path in _flatten_view_dirs(view_dirs).items()}
+        except Exception as e:
+            logger.debug(f"扫描库 {lib_path} 时出错", exc_info=True)
+            state.error = str(e) or type(e).__name__
+        return state
+
+    def _compare(self, state: LibraryState, recorded: Dict) -> List[str]:
+        """比较当前状态和记录，返回变化原因（空列表表示未变化）"""
+        if state.error:
+            return ['error']
+        if recorded['options'] != self.options_key:
+            return ['options']
+        current = {key: view.signature for key, view in state.views.items()}
+        reasons = sorted(key for key in set(current) | set(recorded['views'])
+                         if current.get(key) != recorded['views'].get(key))
+        if not reasons and (not recorded['generated_files']
+                            or not all(p.exists() for p in recorded['generated_files'])):
+            reasons = ['output']
+        return reasons
+
+    def refresh(self, lib_paths: List[Path], roots: Optional[Iterable[Path]] = None, jobs: int = 1,
+                progress: Optional[Callable[[int, int, GenLibResult], None]] = None) -> RefreshReport:
+        """
+        增量刷新
+
+        Args:
+            lib_paths: 当前的库目录列表（安装目录已展开）
+            roots: 扫描范围（用户指定的目录）。记录中位于这些目录下、但不在 lib_paths 中的库视为已移除；
+                目录已不存在的库总是视为已移除。默认为 lib_paths
+            jobs: 并行数（扫描签名使用线程，重新生成使用进程）
+            progress: 重新生成时每完成一个库调用 progress(done, total, result)
+
+        Returns:
+            RefreshReport
+        """
+        start = time.perf_counter()
+        report = RefreshReport()
+        jobs = resolve_jobs(jobs)
+        lib_paths = [Path(p) for p in lib_paths]
+        roots = [Path(p) for p in (roots if roots is not None else lib_paths)]
+
+        recorded = self.index.get_library_sources(self.scope)
+        # 签名扫描的耗时都在 stat/readdir 上，用线程并行
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            states = list(executor.map(self.scan_library, lib_paths))
+        report.scan_time = time.perf_counter() - start
+
+        to_generate: List[LibraryState] = []
+        for state in states:
+            record = recorded.get(str(state.lib_path))
+            if record is None:
+                report.added.append(state.lib_path)
+                to_generate.append(state)
+                continue
+            reasons = self._compare(state, record)
+            if reasons:
+                report.changed[state.lib_path] = reasons
+                to_generate.append(state)
+            else:
+                report.unchanged.append(state.lib_path)
+
+        current = {str(p) for p in lib_paths}
+        for lib_path, record in recorded.items():
+            path = Path(lib_path)
+            if lib_path in current:
+                continue
+            if not path.exists() or any(path == root or root in path.parents for root in roots):
+                self.index.remove_library(record['lib_id'])
+                self.index.remove_library_source(path)
+                report.removed.append(path)
+
+        if to_generate:
+            report.results = run_gen_lib([s.lib_path for s in to_generate], self.options, jobs=jobs,
+                                         progress=progress)
+        for state, result in zip(to_generate, report.results):
+            if result.ok and state.lib_info is not None:
+                self._update_index(state, result, recorded.get(str(state.lib_path)))
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _update_index(self, state: LibraryState, result: GenLibResult, record: Optional[Dict]):
+        """重新生成成功后更新库索引和签名记录"""
+        lib_info = state.lib_info
+        lib_info.views.clear()
+        for key, view in state.views.items():
+            lib_info.add_view(ViewInfo(view_type=key, view_path=view.view_path, files=view.files))
+        lib_info.update_statistics()
+
+        lib_id = lib_info.get_unique_id()
+        if record and record['lib_id'] != lib_id:
+            # 例如最新版本变化后库ID改变
+            self.index.remove_library(record['lib_id'])
+        self.index.add_library(lib_info)
+        self.index.save_library_source(
+            state.lib_path, lib_id, self.scope, self.options_key,
+            {key: (view.view_path, view.signature, view.file_count, view.total_size)
+             for key, view in state.views.items()},
+            result.generated_files
+        )
+
+
+def print_refresh_report(report: RefreshReport) -> int:
+    """
+    输出增量刷新总结
+
+    Returns:
+        退出代码（有失败时为 1）
+    """
+    failed = report.failed
+    generated = [f for r in report.results for f in r.generated_files]
+
+    print()
+    print("=" * 60)
+    print(f"[SUMMARY] 增量刷新完成:")
+    print(f"  新增: {len(report.added)}")
+    print(f"  变化: {len(report.changed)}")
+    print(f"  移除: {len(report.removed)}")
+    print(f"  未变化: {len(report.unchanged)}（跳过生成）")
+    if failed:
+        print(f"  失败: {len(failed)}")
+    unchanged_count = sum(len(r.unchanged_files) for r in report.results)
+    print(f"  共生成: {len(generated)} 个lib_config.tcl文件"
+          f"（写入 {len(generated) - unchanged_count}，内容未变化 {unchanged_count}）")
+    print(f"  耗时: {report.elapsed:.2f}s（扫描签名 {report.scan_time:.2f}s）")
+    print("=" * 60)
+
+    for title, paths in (("新增的库", report.added), ("移除的库（已从索引删除，输出文件保留）", report.removed)):
+        if paths:
+            print(f"\n{title}:")
+            for lib_path in paths:
+                print(f"  - {lib_path}")
+    if report.changed:
+        print("\n变化的库:")
+        for lib_path, reasons in report.changed.items():
+            print(f"  - {lib_path}: {', '.join(reasons)}")
+    if failed:
+        print("\n失败的库:")
+        for result in failed:
+            print(f"  - {result.lib_path}: {result.error}", file=sys.stderr)
+
+    return 0 if not failed else 1
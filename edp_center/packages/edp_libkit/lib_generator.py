@@ -5,26 +5,91 @@
 LibGenerator - lib_config.tcl 生成器
 
 负责生成库级别的 lib_config.tcl 文件。
+
+生成的内容是确定的（除可选的生成时间注释外）：与已有文件的内容摘要相同时不重写，
+保持文件的修改时间，下游基于修改时间的缓存（full.tcl 重新生成、rsync、release 对比）不会失效；
+有变化时先写入同目录下的临时文件再重命名，读取方不会看到写了一半的文件。
 """
 
+import hashlib
+import os
+import re
+import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
 from .lib_info import LibInfo
 
+# 生成时间注释行的前缀（比较内容时忽略）
+TIMESTAMP_HEADER_PREFIX = '# Generated at:'
+
+
+def _content_digest(content: str) -> bytes:
+    """计算内容摘要（忽略生成时间注释行）"""
+    digest = hashlib.blake2b(digest_size=32)
+    for line in content.splitlines(keepends=True):
+        if not line.startswith(TIMESTAMP_HEADER_PREFIX):
+            digest.update(line.encode('utf-8'))
+    return digest.digest()
+
+
+def write_if_changed(output_path: Path, content: str) -> bool:
+    """
+    内容有变化时原子地写入文件（临时文件 + 重命名），没有变化时不写入
+    
+    Args:
+        output_path: 输出文件路径
+        content: 文件内容
+    
+    Returns:
+        True 表示已写入，False 表示内容未变化（文件和修改时间保持不变）
+    """
+    try:
+        existing = output_path.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        existing = None
+    if existing is not None and _content_digest(existing) == _content_digest(content):
+        return False
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = output_path.stat().st_mode & 0o7777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{output_path.name}.', suffix='.tmp', dir=output_path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return True
+
 
 class LibGenerator:
     """lib_config.tcl 生成器"""
     
-    def __init__(self, array_name: str = 'LIBRARY'):
+    def __init__(self, array_name: str = 'LIBRARY', timestamp_header: bool = False):
         """
         初始化生成器
         
         Args:
             array_name: lib_config.tcl中的数组变量名（默认：LIBRARY，可以是MEM_LIBRARY等）
+            timestamp_header: 是否写入生成时间注释（只在内容有变化、实际写入时更新）
         """
         self.array_name = array_name
+        self.timestamp_header = timestamp_header
+        # 累计的写入/未变化文件数
+        self.written_count = 0
+        self.unchanged_count = 0
     
     # 视图类型的格式定义
     VIEW_FORMATS = {
@@ -61,15 +126,38 @@ class LibGenerator:
     }
     
     def generate(self, lib_info: LibInfo, view_files: Dict[str, List[Path]], 
-                 output_path: Path, adapter: Optional[object] = None) -> None:
+                 output_path: Path, adapter: Optional[object] = None) -> bool:
         """
-        生成 lib_config.tcl 文件
+        生成 lib_config.tcl 文件（内容与已有文件相同时不重写）
         
         Args:
             lib_info: 库信息
             view_files: {view_type: [file_paths]} 字典
             output_path: 输出文件路径
             adapter: Foundry适配器（用于SMIC格式的特殊处理）
+        
+        Returns:
+            True 表示已写入，False 表示内容未变化
+        """
+        written = write_if_changed(output_path, self.render(lib_info, view_files, adapter))
+        if written:
+            self.written_count += 1
+        else:
+            self.unchanged_count += 1
+        return written
+    
+    def render(self, lib_info: LibInfo, view_files: Dict[str, List[Path]],
+               adapter: Optional[object] = None) -> str:
+        """
+        生成 lib_config.tcl 的内容（相同的输入总是得到相同的内容，生成时间注释除外）
+        
+        Args:
+            lib_info: 库信息
+            view_files: {view_type: [file_paths]} 字典
+            adapter: Foundry适配器（用于SMIC格式的特殊处理）
+        
+        Returns:
+            文件内容
         """
         entries = []
         
@@ -77,7 +165,8 @@ class LibGenerator:
         entries.append(f"# Library: {lib_info.lib_name}")
         if lib_info.version:
             entries.append(f"# Version: {lib_info.version}")
-        entries.append(f"# Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.timestamp_header:
+            entries.append(f"{TIMESTAMP_HEADER_PREFIX} {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         entries.append("")
         
         # 检查是否是SMIC格式（通过adapter类型判断）
@@ -108,9 +197,40 @@ class LibGenerator:
                         lib_info.lib_name, view_type, files
                     ))
         
-        # 写入文件
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text('\n'.join(entries) + '\n', encoding='utf-8')
+        # 追加反向索引（供 lib_info::get_lib_info / get_physical_info 直接查找）
+        entries.extend(self._generate_index_entries(lib_info.lib_name, entries))
+        
+        return '\n'.join(entries) + '\n'
+    
+    @property
+    def index_array_name(self) -> str:
+        """反向索引数组名（按库名索引）"""
+        return f"{self.array_name}_BY_LIB"
+    
+    def _generate_index_entries(self, cell_name: str, entries: List[str]) -> List[str]:
+        """
+        生成反向索引条目
+        
+        例如：
+        set LIBRARY_BY_LIB(cell_name) {{cell_name,gds,gds} {cell_name,ccs_lvf,sigcmax,sspg0p585v125c,db}}
+        
+        多个 lib_config.tcl 被 source 到同一个解释器时 BY_LIB 按库名覆盖，
+        Tcl 端通过比较 BY_LIB 中的 key 总数与主数组大小判断索引是否完整。
+        """
+        entry_pattern = re.compile(rf"^set {re.escape(self.array_name)}\((.*?)\) \{{")
+        keys = []
+        for line in entries:
+            match = entry_pattern.match(line)
+            if match and match.group(1) not in keys:
+                keys.append(match.group(1))
+        if not keys:
+            return []
+        
+        return [
+            "",
+            "# Index (used by lib_info::get_lib_info / get_physical_info)",
+            f"set {self.index_array_name}({cell_name}) {{{' '.join('{' + k + '}' for k in keys)}}}",
+        ]
     
     def _generate_multi_file_entry(self, cell_name: str, view_type: str, 
                                    files: List[Path]) -> List[str]:
@@ -371,7 +491,7 @@ class LibGenerator:
             root_path = view_files['root']
             if isinstance(root_path, Path):
                 # 处理根目录下的文件
-                for file_path in root_path.iterdir():
+                for file_path in sorted(root_path.iterdir()):
                     if file_path.is_file():
                         file_name = file_path.name
                         file_path_normalized = self._normalize_path(file_path)
@@ -392,13 +512,13 @@ class LibGenerator:
         if 'pvt_dirs' in view_files:
             pvt_dirs = view_files['pvt_dirs']
             if isinstance(pvt_dirs, dict):
-                for pvt_name, pvt_dir in pvt_dirs.items():
+                for pvt_name, pvt_dir in sorted(pvt_dirs.items()):
                     # 提取rc_corner和libcorner
                     rc_corner = adapter.extract_rc_corner(pvt_name)
                     libcorner = adapter.map_pvt_to_libcorner(pvt_name)
                     
                     # 处理该PVT目录下的文件
-                    for file_path in pvt_dir.iterdir():
+                    for file_path in sorted(pvt_dir.iterdir()):
                         if file_path.is_file():
                             file_name = file_path.name
                             file_path_normalized = self._normalize_path(file_path)
@@ -39,6 +39,9 @@ class FileInfo:
     modified_time: Optional[datetime] = None
     """文件修改时间"""
     
+    content_hash: Optional[str] = None
+    """文件内容摘要（blake2b，按需计算，见 calculate_content_hash）"""
+    
     def calculate_checksum(self) -> str:
         """计算文件校验和"""
         if not self.file_path.exists():
@@ -58,6 +61,19 @@ class FileInfo:
             self.size = stat.st_size
             self.modified_time = datetime.fromtimestamp(stat.st_mtime)
             self.checksum = self.calculate_checksum()
+    
+    def calculate_content_hash(self, hasher=None) -> str:
+        """
+        计算文件内容摘要（读取文件内容；未修改的文件使用共享哈希服务的记录，不重新读取）
+        
+        Args:
+            hasher: FileHasher 实例（默认使用进程共享的实例）
+        """
+        if hasher is None:
+            from edp_center.packages.edp_common.file_hasher import get_file_hasher
+            hasher = get_file_hasher()
+        self.content_hash = hasher.hash_file(self.file_path)
+        return self.content_hash
 
 
 @dataclass
@@ -213,6 +229,26 @@ class LibInfo:
         self.statistics.last_updated = datetime.now()
         self.updated_at = datetime.now()
     
+    def update_content_hashes(self, hasher=None, jobs: Optional[int] = None) -> int:
+        """
+        批量计算所有视图文件的内容摘要（并行读取，无法读取的文件跳过）
+        
+        Args:
+            hasher: FileHasher 实例（默认使用进程共享的实例）
+            jobs: 并行数
+        
+        Returns:
+            得到摘要的文件数量
+        """
+        if hasher is None:
+            from edp_center.packages.edp_common.file_hasher import get_file_hasher
+            hasher = get_file_hasher()
+        files = [f for view in self.views.values() for f in view.files]
+        digests = hasher.hash_files([f.file_path for f in files], jobs=jobs, ignore_errors=True)
+        for file_info in files:
+            file_info.content_hash = digests.get(Path(file_info.file_path))
+        return sum(1 for f in files if f.content_hash)
+    
     def get_unique_id(self) -> str:
         """获取库的唯一标识符"""
         parts = [self.foundry or "unknown", self.node or "unknown", self.lib_type, self.lib_name]
@@ -5,191 +5,232 @@
 Library Type Detector - 库类型自动检测器
 
 根据目录结构自动识别库类型（STD/IP/MEM）
+
+每个目录只做两件事：用一个预编译的正则匹配路径字符串（祖先目录名中的 MEM/STD/IP 特征），
+再用一次 scandir 读取库目录本身（FE-Common、BE-Common、DesignWare_logic_libs 等特征子目录）。
+结果按目录缓存（以目录的 st_mtime_ns 校验，目录增删条目后自动失效；条目数有上限），
+扫描大量候选目录时不再为每个特征单独 stat。
 """
 
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 路径特征：MEM 关键词（不区分大小写，任意一级目录名包含即可）、STD_Cell、名为 IP 的祖先目录
+_PATH_MARKERS_RE = re.compile(r'(?P<mem>(?i:mem|sram))|(?P<std>STD_Cell)|/(?P<ip>IP)(?=/)')
+
+# 版本目录名（如 2.00A, 1.01a）
+_VERSION_DIR_RE = re.compile(r'^\d+\.\d+[A-Za-z]?$')
+
+# 检测结果缓存的最大条目数（超出后淘汰最早写入的条目）
+CACHE_MAX_ENTRIES = 65536
+
 
 class LibraryTypeDetector:
     """库类型自动检测器"""
-    
+
     # IP库的特征目录
     IP_MARKERS = ['FE-Common', 'BE-Common']
-    
+
     # STD库的特征目录/文件名模式
     STD_MARKERS = ['v-logic_', 'DesignWare_logic_libs', 'STD_Cell']
-    
-    # MEM库的特征目录
+
+    # MEM库的特征目录（不区分大小写；'mem_compiler'、'memory' 都包含 'mem'）
     MEM_MARKERS = ['mem_compiler', 'memory', 'SRAM', 'MEM', 'sram']
-    
+
+    # 目录 -> (目录 st_mtime_ns, (库类型, 子目录名))
+    _cache: Dict[str, Tuple[int, Tuple[Optional[str], Tuple[str, ...]]]] = {}
+    _cache_lock = threading.Lock()
+
     @classmethod
-    def detect_library_type(cls, lib_path: Path) -> Optional[str]:
+    def clear_cache(cls):
+        """清空检测结果缓存（缓存已按目录 mtime 校验，一般无需手动调用）"""
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    @classmethod
+    def _cache_put(cls, key: str, mtime_ns: int, result: Tuple[Optional[str], Tuple[str, ...]]):
+        """写入缓存，超出 CACHE_MAX_ENTRIES 时淘汰最早写入的条目"""
+        with cls._cache_lock:
+            cls._cache.pop(key, None)
+            cls._cache[key] = (mtime_ns, result)
+            while len(cls._cache) > CACHE_MAX_ENTRIES:
+                del cls._cache[next(iter(cls._cache))]
+
+    @staticmethod
+    def _scan(lib_path: Path) -> Optional[Tuple[FrozenSet[str], Tuple[str, ...]]]:
         """
-        自动检测库类型
-        
-        Args:
-            lib_path: 库目录路径
-            
+        读取一次库目录
+
         Returns:
-            库类型：'STD', 'IP', 'MEM' 或 None（无法识别）
+            (所有条目名, 排序后的子目录名)，目录不存在或不是目录时返回 None
         """
-        if not lib_path.exists() or not lib_path.is_dir():
+        names, dirs = [], []
+        try:
+            with os.scandir(lib_path) as it:
+                for entry in it:
+                    names.append(entry.name)
+                    try:
+                        if entry.is_dir():
+                            dirs.append(entry.name)
+                    except OSError:
+                        pass
+        except OSError:
             return None
-        
-        # 检查IP库特征
-        if cls._is_ip_library(lib_path):
+        return frozenset(names), tuple(sorted(dirs))
+
+    @staticmethod
+    def _is_version_name(name: str) -> bool:
+        """目录名是否像版本目录（v1.12、1.0 等）"""
+        return name.startswith('v') or name.replace('.', '').isdigit()
+
+    @classmethod
+    def _classify(cls, lib_path: Path, names: FrozenSet[str]) -> Optional[str]:
+        """
+        根据路径和库目录的条目名分类
+
+        优先级：IP（特征子目录，或父目录名包含 IP 且当前目录像版本目录）> MEM（任意一级目录名包含关键词）
+        > STD（v-logic_ 前缀、DesignWare_logic_libs 子目录、祖先目录名包含 STD_Cell）> 祖先目录名为 IP
+        """
+        if any(marker in names for marker in cls.IP_MARKERS):
             return 'IP'
-        
-        # 检查MEM库特征
-        if cls._is_mem_library(lib_path):
+
+        name = lib_path.name
+        parent = lib_path.parent
+        if 'IP' in parent.name and cls._is_version_name(name):
+            return 'IP'
+
+        parent_str = parent.as_posix()
+        found = set()
+        for match in _PATH_MARKERS_RE.finditer(f'{parent_str}/{name}'):
+            if match.group('mem'):
+                found.add('MEM')
+            elif match.group('std') and match.start() < len(parent_str):
+                found.add('STD')
+            elif match.group('ip'):
+                found.add('IP_ANCESTOR')
+
+        if 'MEM' in found:
             return 'MEM'
-        
-        # 检查STD库特征
-        if cls._is_std_library(lib_path):
+        if name.startswith('v-logic_') or 'DesignWare_logic_libs' in names or 'STD' in found:
             return 'STD'
-        
-        # 如果无法确定，尝试从父目录结构推断
-        return cls._infer_from_parent_structure(lib_path)
-    
-    @classmethod
-    def _is_ip_library(cls, lib_path: Path) -> bool:
-        """判断是否为IP库"""
-        # IP库通常有FE-Common或BE-Common目录
-        for marker in cls.IP_MARKERS:
-            if (lib_path / marker).exists():
-                return True
-        
-        # 检查父目录是否为IP目录
-        parent = lib_path.parent
-        if parent.name == 'IP' or 'IP' in parent.name:
-            # 检查是否有版本目录（v1.0, v1.12等）
-            if lib_path.name.startswith('v') or lib_path.name.replace('.', '').isdigit():
-                return True
-        
-        return False
-    
+        if 'IP_ANCESTOR' in found:
+            return 'IP'
+        return None
+
     @classmethod
-    def _is_mem_library(cls, lib_path: Path) -> bool:
-        """判断是否为MEM库"""
-        # 检查目录名是否包含MEM相关关键词
-        lib_name_lower = lib_path.name.lower()
-        for marker in cls.MEM_MARKERS:
-            if marker.lower() in lib_name_lower:
-                return True
-        
-        # 检查父目录是否为MEM相关目录
-        parent = lib_path.parent
-        parent_name_lower = parent.name.lower()
-        for marker in cls.MEM_MARKERS:
-            if marker.lower() in parent_name_lower:
-                return True
-        
-        # 检查是否在MEM相关目录下
-        for ancestor in lib_path.parents:
-            if any(marker.lower() in ancestor.name.lower() for marker in cls.MEM_MARKERS):
-                return True
-        
-        return False
-    
+    def _detect(cls, lib_path: Path) -> Tuple[Optional[str], Tuple[str, ...]]:
+        """
+        检测库类型并缓存（同时缓存子目录名，供 detect_library_info 使用）
+
+        分类只依赖路径字符串和目录自身的条目名，条目增删会更新目录的 mtime，
+        因此每次先 stat 一次目录，mtime 未变时才使用缓存。目录不存在时不缓存。
+        """
+        key = str(lib_path)
+        try:
+            mtime_ns = os.stat(lib_path).st_mtime_ns
+        except OSError:
+            return (None, ())
+
+        cached = cls._cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        scanned = cls._scan(lib_path)
+        if scanned is None:
+            result = (None, ())
+        else:
+            names, dirs = scanned
+            result = (cls._classify(lib_path, names), dirs)
+        cls._cache_put(key, mtime_ns, result)
+        return result
+
     @classmethod
-    def _is_std_library(cls, lib_path: Path) -> bool:
-        """判断是否为STD库"""
-        # STD库通常有v-logic_前缀
-        if lib_path.name.startswith('v-logic_'):
-            return True
-        
-        # 检查是否有DesignWare_logic_libs目录
-        if (lib_path / 'DesignWare_logic_libs').exists():
-            return True
-        
-        # 检查父目录是否为STD_Cell
-        parent = lib_path.parent
-        if parent.name == 'STD_Cell' or 'STD_Cell' in str(parent):
-            return True
-        
-        # 检查是否在STD_Cell目录下
-        for ancestor in lib_path.parents:
-            if 'STD_Cell' in ancestor.name:
-                return True
-        
-        return False
-    
+    def detect_library_type(cls, lib_path: Path) -> Optional[str]:
+        """
+        自动检测库类型
+
+        Args:
+            lib_path: 库目录路径
+
+        Returns:
+            库类型：'STD', 'IP', 'MEM' 或 None（无法识别）
+        """
+        return cls._detect(Path(lib_path))[0]
+
     @classmethod
-    def _infer_from_parent_structure(cls, lib_path: Path) -> Optional[str]:
-        """从父目录结构推断库类型"""
-        # 检查父目录结构
-        path_str = str(lib_path)
-        
-        if '/IP/' in path_str or '\\IP\\' in path_str:
-            return 'IP'
-        
-        if '/STD_Cell/' in path_str or '\\STD_Cell\\' in path_str:
-            return 'STD'
-        
-        if any(marker in path_str for marker in cls.MEM_MARKERS):
-            return 'MEM'
-        
-        return None
-    
+    def detect_library_types(cls, lib_paths: Iterable[Path], jobs: int = 1) -> Dict[Path, Optional[str]]:
+        """
+        批量检测库类型
+
+        Args:
+            lib_paths: 库目录路径列表
+            jobs: 并行线程数（网络文件系统上目录读取的延迟可以重叠）
+
+        Returns:
+            {库目录: 库类型}，按输入顺序
+        """
+        lib_paths: List[Path] = [Path(p) for p in lib_paths]
+        if jobs > 1 and len(lib_paths) > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                types = list(executor.map(cls.detect_library_type, lib_paths))
+        else:
+            types = [cls.detect_library_type(p) for p in lib_paths]
+        return dict(zip(lib_paths, types))
+
     @classmethod
     def detect_library_info(cls, lib_path: Path, foundry: str, node: Optional[str] = None) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
         检测库类型、库名称和版本
-        
+
         Args:
             lib_path: 库目录路径
             foundry: Foundry名称
             node: 节点名称（可选）
-            
+
         Returns:
             (lib_type, lib_name, version) 元组
         """
-        lib_type = cls.detect_library_type(lib_path)
-        
+        lib_path = Path(lib_path)
+        lib_type, subdirs = cls._detect(lib_path)
+
         # 提取库名称和版本
         lib_name = None
         version = None
-        
+
         if lib_type == 'IP':
             # IP库：目录结构通常是 IP/ip_name/version/
             # 如果当前目录是版本目录，父目录是库名
-            if lib_path.name.startswith('v') or lib_path.name.replace('.', '').isdigit():
+            if cls._is_version_name(lib_path.name):
                 lib_name = lib_path.parent.name
                 version = lib_path.name
             else:
                 lib_name = lib_path.name
-                # 查找版本目录
-                for item in lib_path.iterdir():
-                    if item.is_dir() and (item.name.startswith('v') or item.name.replace('.', '').isdigit()):
-                        version = item.name
-                        break
-        
+                # 查找版本目录（使用检测时读取的子目录名）
+                version = next((d for d in subdirs if cls._is_version_name(d)), None)
+
         elif lib_type == 'STD':
             # STD库：目录名通常是 v-logic_libname
             if lib_path.name.startswith('v-logic_'):
                 lib_name = lib_path.name.replace('v-logic_', '')
             else:
                 lib_name = lib_path.name
-            
-            # 尝试从路径中提取版本
-            for ancestor in lib_path.parents:
-                # 查找版本号模式（如 2.00A, 1.01a）
-                import re
-                if re.match(r'^\d+\.\d+[A-Za-z]?$', ancestor.name):
-                    version = ancestor.name
-                    break
-        
+
+            # 尝试从路径中提取版本（如 2.00A, 1.01a）
+            version = next((a.name for a in lib_path.parents if _VERSION_DIR_RE.match(a.name)), None)
+
         elif lib_type == 'MEM':
             # MEM库：目录名通常是库名
             lib_name = lib_path.name
-        
+
         else:
             # 无法识别，使用目录名作为库名
             lib_name = lib_path.name
-        
-        return lib_type, lib_name, version
 
+        return lib_type, lib_name, version
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Liberty 流式扫描器
+
+按块读取 .lib / .lib.gz 文件（内存占用与文件大小无关），只提取库级信息：
+- library 名称、单位（*_unit）、nom_process / nom_voltage / nom_temperature
+- operating_conditions 组（process / voltage / temperature / tree_type）
+- cell 名称
+
+不构建语法树：扫描时只跟踪花括号深度，只有 library 级（深度 1）和 operating_conditions
+组内的文本会被解码和解析，cell 内部的 pin / timing / 查找表等内容只做花括号匹配后跳过。
+注释（/* ... */）中的花括号会被忽略；引号字符串中的花括号不做特殊处理（Liberty 中不会出现）。
+"""
+
+import gzip
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+HEADER_CHUNK_SIZE = 64 * 1024
+
+_GROUP_RE = re.compile(r'(\w+)\s*\(\s*(.*?)\s*\)\s*$', re.S)
+_SIMPLE_ATTR_RE = re.compile(r'^\s*(\w+)\s*:\s*(.*?)\s*$', re.S)
+_COMPLEX_ATTR_RE = re.compile(r'^\s*(\w+)\s*\((.*)\)\s*$', re.S)
+
+# 库级文本的最大缓存长度（正常的库级语句很短，防止异常文件占用内存）
+_MAX_PENDING = 1024 * 1024
+
+
+@dataclass
+class LibertyHeader:
+    """Liberty 文件的库级信息"""
+
+    file_path: Path
+    """Liberty 文件路径"""
+
+    library_name: Optional[str] = None
+    """library 组名称"""
+
+    units: Dict[str, str] = field(default_factory=dict)
+    """单位，如 {'time_unit': '1ns', 'capacitive_load_unit': '1pf'}"""
+
+    nom_process: Optional[float] = None
+    nom_voltage: Optional[float] = None
+    nom_temperature: Optional[float] = None
+
+    default_operating_conditions: Optional[str] = None
+    """默认 operating_conditions 名称"""
+
+    operating_conditions: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    """{name: {'process': ..., 'voltage': ..., 'temperature': ..., 'tree_type': ...}}"""
+
+    attributes: Dict[str, str] = field(default_factory=dict)
+    """其他库级属性（delay_model、technology 等）"""
+
+    cells: List[str] = field(default_factory=list)
+    """cell 名称（按文件中的顺序）"""
+
+    complete: bool = False
+    """是否扫描到 library 组结束（只扫描头部时为 False）"""
+
+    bytes_scanned: int = 0
+    """扫描的（解压后）字节数"""
+
+
+def _strip_value(value: str) -> str:
+    return value.strip().strip('"').strip()
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(_strip_value(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class _LibertyStreamParser:
+    """增量解析器：feed() 接收任意切分的数据块"""
+
+    def __init__(self, header: LibertyHeader, with_cells: bool = True):
+        self.header = header
+        self.with_cells = with_cells
+        self.done = False
+        self._depth = 0
+        self._in_comment = False
+        self._carry = b''
+        self._pending = bytearray()
+        self._oc_name: Optional[str] = None
+        self._oc: Dict[str, str] = {}
+        self._attrs: Dict[str, str] = {}
+
+    def _shallow(self) -> bool:
+        return self._depth <= 1 or (self._depth == 2 and self._oc_name is not None)
+
+    def _text(self, segment: bytes):
+        if segment and self._shallow():
+            self._pending += segment
+            if len(self._pending) > _MAX_PENDING:
+                del self._pending[:-_MAX_PENDING // 2]
+
+    def _statements(self) -> List[str]:
+        """取出缓存的文本并按 ';' 切分，最后一段是未结束的语句（组头）"""
+        text = self._pending.decode('latin-1')
+        self._pending.clear()
+        return text.split(';')
+
+    @staticmethod
+    def _parse_attributes(statements: List[str], target: Dict[str, str]):
+        for statement in statements:
+            match = _SIMPLE_ATTR_RE.match(statement)
+            if match:
+                target[match.group(1)] = _strip_value(match.group(2))
+                continue
+            match = _COMPLEX_ATTR_RE.match(statement)
+            if match:
+                target[match.group(1)] = ''.join(_strip_value(v) for v in match.group(2).split(','))
+
+    def _open(self):
+        statements = self._statements()
+        group = _GROUP_RE.search(statements[-1])
+        group_type = group.group(1) if group else None
+        group_name = _strip_value(group.group(2)) if group else ''
+
+        if self._depth == 0:
+            if group_type == 'library':
+                self.header.library_name = group_name
+        elif self._depth == 1:
+            self._parse_attributes(statements[:-1], self._attrs)
+            if group_type == 'cell':
+                if not self.with_cells:
+                    self.done = True
+                self.header.cells.append(group_name)
+            elif group_type == 'operating_conditions':
+                self._oc_name, self._oc = group_name, {}
+        elif self._depth == 2 and self._oc_name is not None:
+            self._parse_attributes(statements[:-1], self._oc)
+        self._depth += 1
+
+    def _close(self):
+        if self._depth == 2 and self._oc_name is not None:
+            self._parse_attributes(self._statements()[:-1], self._oc)
+            self.header.operating_conditions[self._oc_name] = self._oc
+            self._oc_name = None
+        elif self._depth == 1:
+            self._parse_attributes(self._statements(), self._attrs)
+            self.header.complete = True
+            self.done = True
+        self._pending.clear()
+        self._depth = max(self._depth - 1, 0)
+
+    def feed(self, data: bytes):
+        buf = self._carry + data if self._carry else data
+        self._carry = b''
+        size = len(buf)
+        pos = 0
+        # 下一个注释的位置（缓存，只在被越过后重新查找，避免每次都扫描到块末尾）
+        next_comment = buf.find(b'/*')
+        while not self.done:
+            if self._in_comment:
+                end = buf.find(b'*/', pos)
+                if end < 0:
+                    # '*' 和 '/' 可能被切到两个块中
+                    self._carry = b'*' if buf.endswith(b'*') else b''
+                    return
+                pos = end + 2
+                self._in_comment = False
+            if 0 <= next_comment < pos:
+                next_comment = buf.find(b'/*', pos)
+
+            if not self._shallow():
+                # cell 内部：只找下一个 '}'，中间的 '{' 用 count 计数，不解码也不解析
+                close = buf.find(b'}', pos)
+                limit = close if close >= 0 else size
+                if 0 <= next_comment < limit:
+                    self._depth += buf.count(b'{', pos, next_comment)
+                    pos = next_comment + 2
+                    self._in_comment = True
+                    continue
+                if close < 0:
+                    self._depth += buf.count(b'{', pos, size)
+                    if buf.endswith(b'/'):
+                        self._carry = b'/'
+                    return
+                self._depth += buf.count(b'{', pos, close)
+                self._close()
+                pos = close + 1
+                continue
+
+            # library 级：收集文本，遇到花括号时解析
+            found = [index for index in (buf.find(b'{', pos), buf.find(b'}', pos), next_comment) if index >= 0]
+            if not found:
+                tail = buf[pos:]
+                if tail.endswith(b'/'):
+                    self._carry = b'/'
+                    tail = tail[:-1]
+                self._text(tail)
+                return
+            start = min(found)
+            self._text(buf[pos:start])
+            if start == next_comment:
+                self._in_comment = True
+                pos = start + 2
+                continue
+            if buf[start] == 0x7b:  # '{'
+                self._open()
+            else:
+                self._close()
+            pos = start + 1
+
+    def finish(self) -> LibertyHeader:
+        header = self.header
+        attrs = self._attrs
+        header.units = {k: v for k, v in attrs.items() if k.endswith('_unit')}
+        header.nom_process = _to_float(attrs.get('nom_process'))
+        header.nom_voltage = _to_float(attrs.get('nom_voltage'))
+        header.nom_temperature = _to_float(attrs.get('nom_temperature'))
+        header.default_operating_conditions = attrs.get('default_operating_conditions')
+        header.attributes = {k: v for k, v in attrs.items()
+                             if not k.endswith('_unit') and not k.startswith('nom_')
+                             and k != 'default_operating_conditions'}
+        return header
+
+
+def _open_liberty(file_path: Path):
+    if file_path.suffix == '.gz':
+        return gzip.open(file_path, 'rb')
+    return open(file_path, 'rb')
+
+
+def scan_liberty(file_path: Union[str, Path], with_cells: bool = True,
+                 chunk_size: Optional[int] = None) -> LibertyHeader:
+    """
+    流式扫描一个 Liberty 文件
+
+    Args:
+        file_path: .lib 或 .lib.gz 文件路径（以 .gz 结尾时按 gzip 解压）
+        with_cells: 是否扫描全部 cell 名称。为 False 时读到第一个 cell 就停止，只返回库级信息
+        chunk_size: 每次读取的字节数（默认：扫描全部 cell 时 4MB，只扫描头部时 64KB）
+
+    Returns:
+        LibertyHeader
+
+    Raises:
+        OSError: 文件无法读取或不是有效的 gzip 文件
+        EOFError: gzip 文件被截断
+    """
+    file_path = Path(file_path)
+    if chunk_size is None:
+        chunk_size = DEFAULT_CHUNK_SIZE if with_cells else HEADER_CHUNK_SIZE
+    header = LibertyHeader(file_path=file_path)
+    parser = _LibertyStreamParser(header, with_cells=with_cells)
+    with _open_liberty(file_path) as f:
+        while not parser.done:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            header.bytes_scanned += len(data)
+            parser.feed(data)
+    if with_cells and not header.complete:
+        logger.warning(f"Liberty 文件不完整（library 组未结束）: {file_path}")
+    return parser.finish()
+
+
+def is_liberty_file(file_path: Union[str, Path]) -> bool:
+    """判断是否为 Liberty 文本文件（.lib / .lib.gz，包括 .lib_ccs_tn_lvf_dths.gz 等变体）"""
+    name = Path(file_path).name
+    if name.endswith('.gz'):
+        name = name[:-3]
+    return bool(re.search(r'\.lib(_\w+)?$', name))
@@ -5,16 +5,23 @@
 LibraryIndex - 库索引管理器
 
 提供集中式的库目录管理和快速搜索功能。
+
+所有查询都直接在 SQLite 中执行（带 (foundry, node, lib_type) 等索引），打开索引时不加载任何库；
+查询结果按需转换为 LibInfo（带 LRU 缓存）。库名和 cell 名另外建立 FTS5（trigram）全文索引，
+支持子串和通配符搜索。
 """
 
+import hashlib
 import json
 import sqlite3
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from datetime import datetime
 import logging
 
 from .lib_info import LibInfo, LibraryStatistics
+from .liberty_scanner import LibertyHeader, scan_liberty
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +29,18 @@ logger = logging.getLogger(__name__)
 class LibraryIndex:
     """库索引管理器"""
     
-    def __init__(self, index_path: Optional[Path] = None):
+    # 数据库结构版本（PRAGMA user_version）：1 = 已建立 FTS 全文索引，2 = liberty_cells 记录来源文件
+    SCHEMA_VERSION = 2
+    
+    def __init__(self, index_path: Optional[Path] = None, cache_size: int = 1024):
         """
         初始化库索引
         
+        打开索引的开销与库数量无关：只创建（不存在的）表和索引，不加载任何库。
+        
         Args:
             index_path: 索引文件路径，如果为None则使用默认路径
+            cache_size: 已转换为 LibInfo 的库的缓存数量
         """
         if index_path is None:
             # 使用默认路径：libkit目录下的index.db
@@ -37,21 +50,25 @@ class LibraryIndex:
         self.index_path = Path(index_path)
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # 内存中的索引缓存
-        self._libraries: Dict[str, LibInfo] = {}
-        self._foundries: Set[str] = set()
-        self._nodes: Set[str] = set()
-        self._lib_types: Set[str] = set()
+        # 已转换的 LibInfo 缓存（LRU），值为 (行校验和, LibInfo)，行内容变化后重新转换
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[str, LibInfo]]" = OrderedDict()
+        
+        # 是否支持 FTS5 trigram（不支持时名称搜索回退到 GLOB）
+        self._fts_enabled = False
         
         # 初始化数据库
         self._init_database()
-        
-        # 加载现有索引
-        self._load_index()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库连接（行以 sqlite3.Row 返回）"""
+        conn = sqlite3.connect(self.index_path)
+        conn.row_factory = sqlite3.Row
+        return conn
     
     def _init_database(self):
         """初始化SQLite数据库"""
-        with sqlite3.connect(self.index_path) as conn:
+        with self._connect() as conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS libraries (
                     id TEXT PRIMARY KEY,
@@ -81,38 +98,156 @@ class LibraryIndex:
                 )
             ''')
             
+            # (foundry, node) 的查询由 idx_foundry_node_type 覆盖，删除旧版本创建的重复索引
+            conn.execute('DROP INDEX IF EXISTS idx_foundry_node')
+            
             conn.execute('''
-                CREATE INDEX IF NOT EXISTS idx_foundry_node ON libraries (foundry, node)
+                CREATE INDEX IF NOT EXISTS idx_lib_type ON libraries (lib_type)
             ''')
             
+            # Liberty 文件的库级信息和 cell 名称（由 liberty_scanner 流式扫描得到）
             conn.execute('''
-                CREATE INDEX IF NOT EXISTS idx_lib_type ON libraries (lib_type)
+                CREATE TABLE IF NOT EXISTS liberty_files (
+                    file_path TEXT PRIMARY KEY,
+                    lib_id TEXT,
+                    library_name TEXT,
+                    nom_process REAL,
+                    nom_voltage REAL,
+                    nom_temperature REAL,
+                    default_operating_conditions TEXT,
+                    units TEXT,
+                    operating_conditions TEXT,
+                    cell_count INTEGER,
+                    file_size INTEGER,
+                    file_mtime REAL,
+                    indexed_at TEXT
+                )
             ''')
             
+            # 旧版本的 liberty_cells 没有记录 cell 来自哪个文件，重新扫描文件时无法删除旧的 cell；
+            # 删除后由下次扫描重建（同时清空 liberty_files，使下次扫描不会因文件未变化而跳过）
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(liberty_cells)')]
+            if columns and 'file_path' not in columns:
+                conn.execute('DROP TABLE liberty_cells')
+                conn.execute('DELETE FROM liberty_files')
+            
+            # 每个 Liberty 文件提供的 cell（同一个库的多个 corner 文件通常包含相同的 cell）
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS liberty_cells (
+                    file_path TEXT,
+                    lib_id TEXT,
+                    cell_name TEXT,
+                    PRIMARY KEY (file_path, cell_name)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_liberty_files_lib ON liberty_files (lib_id)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_liberty_files_pvt ON liberty_files (nom_voltage, nom_temperature)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_liberty_cells_name ON liberty_cells (cell_name)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_liberty_cells_lib ON liberty_cells (lib_id)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_foundry_node_type ON libraries (foundry, node, lib_type)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_lib_name ON libraries (lib_name)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_views_lib ON views (lib_id)
+            ''')
+            
+            # 增量索引：每个库源目录的生成参数和各视图目录的签名（条目名、大小、修改时间）
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS library_sources (
+                    lib_path TEXT PRIMARY KEY,
+                    lib_id TEXT,
+                    scope TEXT,
+                    options TEXT,
+                    generated_files TEXT,
+                    indexed_at TEXT
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS view_signatures (
+                    lib_path TEXT,
+                    view_key TEXT,
+                    view_path TEXT,
+                    signature TEXT,
+                    file_count INTEGER,
+                    total_size INTEGER,
+                    PRIMARY KEY (lib_path, view_key)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_library_sources_scope ON library_sources (scope)
+            ''')
+            
+            self._fts_enabled = self._init_fts(conn)
             conn.commit()
     
-    def _load_index(self):
-        """从数据库加载索引到内存"""
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """
+        创建库名和 cell 名的 FTS5 全文索引（外部内容表 + 触发器同步）
+        
+        旧版本的数据库第一次打开时从现有数据重建全文索引。
+        
+        Returns:
+            是否支持 FTS5 trigram
+        """
         try:
-            with sqlite3.connect(self.index_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute('SELECT * FROM libraries')
-                
-                for row in cursor:
-                    lib_info = self._row_to_libinfo(row)
-                    self._libraries[lib_info.get_unique_id()] = lib_info
-                    
-                    # 更新集合
-                    if lib_info.foundry:
-                        self._foundries.add(lib_info.foundry)
-                    if lib_info.node:
-                        self._nodes.add(lib_info.node)
-                    self._lib_types.add(lib_info.lib_type)
-                
-                logger.info(f"已加载 {len(self._libraries)} 个库到索引")
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS library_name_fts USING fts5(
+                    lib_name, content='libraries', content_rowid='rowid', tokenize='trigram'
+                )
+            ''')
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS cell_name_fts USING fts5(
+                    cell_name, content='liberty_cells', content_rowid='rowid', tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.debug(f"SQLite 不支持 FTS5 trigram，名称搜索使用 GLOB: {e}")
+            return False
         
-        except Exception as e:
-            logger.warning(f"加载索引失败: {e}")
+        for table, fts, column in (('libraries', 'library_name_fts', 'lib_name'),
+                                   ('liberty_cells', 'cell_name_fts', 'cell_name')):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts} (rowid, {column}) VALUES (new.rowid, new.{column});
+                END
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', old.rowid, old.{column});
+                END
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {table} BEGIN
+                    INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', old.rowid, old.{column});
+                    INSERT INTO {fts} (rowid, {column}) VALUES (new.rowid, new.{column});
+                END
+            ''')
+        
+        if conn.execute('PRAGMA user_version').fetchone()[0] < self.SCHEMA_VERSION:
+            conn.execute("INSERT INTO library_name_fts (library_name_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO cell_name_fts (cell_name_fts) VALUES ('rebuild')")
+            conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+        return True
     
     def _row_to_libinfo(self, row: sqlite3.Row) -> LibInfo:
         """将数据库行转换为LibInfo对象"""
@@ -149,221 +284,515 @@ class LibraryIndex:
         
         Args:
             lib_info: 库信息
-            
+        
         Returns:
             是否成功添加
         """
+        return self.add_libraries([lib_info]) == 1
+    
+    def add_libraries(self, lib_infos: Iterable[LibInfo]) -> int:
+        """
+        批量添加库到索引（一个事务）
+        
+        Args:
+            lib_infos: 库信息列表
+        
+        Returns:
+            成功添加的数量
+        """
+        lib_infos = list(lib_infos)
         try:
-            lib_id = lib_info.get_unique_id()
-            
-            # 更新内存索引
-            self._libraries[lib_id] = lib_info
-            
-            # 更新集合
-            if lib_info.foundry:
-                self._foundries.add(lib_info.foundry)
-            if lib_info.node:
-                self._nodes.add(lib_info.node)
-            self._lib_types.add(lib_info.lib_type)
-            
-            # 更新数据库
-            self._save_library_to_db(lib_info)
-            
-            logger.debug(f"已添加库到索引: {lib_info}")
-            return True
-            
+            with self._connect() as conn:
+                for lib_info in lib_infos:
+                    self._save_library_to_db(conn, lib_info)
+                conn.commit()
         except Exception as e:
             logger.error(f"添加库到索引失败: {e}")
-            return False
+            return 0
+        
+        for lib_info in lib_infos:
+            # 下次读取时从数据库行重新转换
+            self._cache.pop(lib_info.get_unique_id(), None)
+            logger.debug(f"已添加库到索引: {lib_info}")
+        return len(lib_infos)
     
-    def _save_library_to_db(self, lib_info: LibInfo):
-        """保存库信息到数据库"""
-        with sqlite3.connect(self.index_path) as conn:
-            lib_id = lib_info.get_unique_id()
-            
-            # 序列化复杂数据
-            metadata_json = json.dumps(lib_info.metadata) if lib_info.metadata else None
-            statistics_json = json.dumps({
-                'total_files': lib_info.statistics.total_files,
-                'total_size': lib_info.statistics.total_size,
-                'view_counts': lib_info.statistics.view_counts,
-                'pvt_corner_coverage': lib_info.statistics.pvt_corner_coverage,
-                'completeness_score': lib_info.statistics.completeness_score,
-                'missing_components': lib_info.statistics.missing_components,
-                'last_updated': lib_info.statistics.last_updated.isoformat() if lib_info.statistics.last_updated else None
-            })
-            
-            # 插入或更新库信息
+    def _save_library_to_db(self, conn: sqlite3.Connection, lib_info: LibInfo):
+        """保存库信息到数据库（不提交）"""
+        lib_id = lib_info.get_unique_id()
+        
+        # 序列化复杂数据
+        metadata_json = json.dumps(lib_info.metadata) if lib_info.metadata else None
+        statistics_json = json.dumps({
+            'total_files': lib_info.statistics.total_files,
+            'total_size': lib_info.statistics.total_size,
+            'view_counts': lib_info.statistics.view_counts,
+            'pvt_corner_coverage': lib_info.statistics.pvt_corner_coverage,
+            'completeness_score': lib_info.statistics.completeness_score,
+            'missing_components': lib_info.statistics.missing_components,
+            'last_updated': lib_info.statistics.last_updated.isoformat() if lib_info.statistics.last_updated else None
+        })
+        
+        # 插入或更新库信息（UPSERT 保持 rowid 不变，并触发全文索引的更新触发器）
+        conn.execute('''
+            INSERT INTO libraries 
+            (id, lib_name, lib_path, lib_type, version, foundry, node, adapter_type, 
+             created_at, updated_at, metadata, statistics)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                lib_name = excluded.lib_name, lib_path = excluded.lib_path, lib_type = excluded.lib_type,
+                version = excluded.version, foundry = excluded.foundry, node = excluded.node,
+                adapter_type = excluded.adapter_type, created_at = excluded.created_at,
+                updated_at = excluded.updated_at, metadata = excluded.metadata, statistics = excluded.statistics
+        ''', (
+            lib_id,
+            lib_info.lib_name,
+            str(lib_info.lib_path),
+            lib_info.lib_type,
+            lib_info.version,
+            lib_info.foundry,
+            lib_info.node,
+            lib_info.adapter_type,
+            lib_info.created_at.isoformat() if lib_info.created_at else None,
+            lib_info.updated_at.isoformat() if lib_info.updated_at else None,
+            metadata_json,
+            statistics_json
+        ))
+        
+        # 删除旧的视图信息
+        conn.execute('DELETE FROM views WHERE lib_id = ?', (lib_id,))
+        
+        # 插入视图信息
+        for view_type, view_info in lib_info.views.items():
             conn.execute('''
-                INSERT OR REPLACE INTO libraries 
-                (id, lib_name, lib_path, lib_type, version, foundry, node, adapter_type, 
-                 created_at, updated_at, metadata, statistics)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO views (lib_id, view_type, view_path, file_count, total_size, pvt_corners)
+                VALUES (?, ?, ?, ?, ?, ?)
             ''', (
                 lib_id,
-                lib_info.lib_name,
-                str(lib_info.lib_path),
-                lib_info.lib_type,
-                lib_info.version,
-                lib_info.foundry,
-                lib_info.node,
-                lib_info.adapter_type,
-                lib_info.created_at.isoformat() if lib_info.created_at else None,
-                lib_info.updated_at.isoformat() if lib_info.updated_at else None,
-                metadata_json,
-                statistics_json
+                view_type,
+                str(view_info.view_path),
+                view_info.file_count,
+                view_info.total_size,
+                json.dumps(list(view_info.pvt_corners))
             ))
-            
-            # 删除旧的视图信息
-            conn.execute('DELETE FROM views WHERE lib_id = ?', (lib_id,))
-            
-            # 插入视图信息
-            for view_type, view_info in lib_info.views.items():
-                conn.execute('''
-                    INSERT INTO views (lib_id, view_type, view_path, file_count, total_size, pvt_corners)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    lib_id,
-                    view_type,
-                    str(view_info.view_path),
-                    view_info.file_count,
-                    view_info.total_size,
-                    json.dumps(list(view_info.pvt_corners))
-                ))
-            
-            conn.commit()
+    
+    def _cache_put(self, lib_id: str, checksum: str, lib_info: LibInfo):
+        """放入 LibInfo 缓存（超出容量时淘汰最久未使用的）"""
+        self._cache[lib_id] = (checksum, lib_info)
+        self._cache.move_to_end(lib_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+    
+    @staticmethod
+    def _row_checksum(row: sqlite3.Row) -> str:
+        """数据库行内容的校验和（其他进程或连接更新了这一行时变化）"""
+        return hashlib.md5(repr(tuple(row)).encode('utf-8')).hexdigest()
+    
+    def _hydrate(self, row: sqlite3.Row) -> LibInfo:
+        """把数据库行转换为 LibInfo（缓存的对象与行的校验和一致时直接返回）"""
+        lib_id = row['id']
+        checksum = self._row_checksum(row)
+        cached = self._cache.get(lib_id)
+        if cached is not None and cached[0] == checksum:
+            lib_info = cached[1]
+        else:
+            lib_info = self._row_to_libinfo(row)
+        self._cache_put(lib_id, checksum, lib_info)
+        return lib_info
     
     def get_library(self, lib_id: str) -> Optional[LibInfo]:
         """根据ID获取库信息"""
-        return self._libraries.get(lib_id)
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM libraries WHERE id = ?', (lib_id,)).fetchone()
+        return self._hydrate(row) if row else None
+    
+    @staticmethod
+    def _build_filter(foundry: Optional[str] = None,
+                      node: Optional[str] = None,
+                      lib_type: Optional[str] = None,
+                      lib_name_pattern: Optional[str] = None) -> Tuple[str, List[Any]]:
+        """构建 WHERE 子句（fnmatch 通配符转换为 SQLite GLOB：[!...] -> [^...]）"""
+        conditions, params = [], []
+        for column, value in (('foundry', foundry), ('node', node), ('lib_type', lib_type)):
+            if value:
+                conditions.append(f'{column} = ?')
+                params.append(value)
+        if lib_name_pattern:
+            conditions.append('lib_name GLOB ?')
+            params.append(lib_name_pattern.replace('[!', '[^'))
+        return (' WHERE ' + ' AND '.join(conditions)) if conditions else '', params
     
-    def search_libraries(self, 
+    def search_libraries(self,
                         foundry: Optional[str] = None,
                         node: Optional[str] = None,
                         lib_type: Optional[str] = None,
-                        lib_name_pattern: Optional[str] = None) -> List[LibInfo]:
+                        lib_name_pattern: Optional[str] = None,
+                        limit: Optional[int] = None) -> List[LibInfo]:
         """
         搜索库
         
+        过滤在 SQLite 中执行，只有匹配的行才转换为 LibInfo。
+        
         Args:
             foundry: Foundry名称
             node: 节点名称
             lib_type: 库类型
             lib_name_pattern: 库名称模式（支持通配符）
+            limit: 最多返回的数量（可选）
+        
+        Returns:
+            匹配的库列表（按添加顺序）
+        """
+        where, params = self._build_filter(foundry, node, lib_type, lib_name_pattern)
+        sql = f'SELECT * FROM libraries{where} ORDER BY rowid'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._hydrate(row) for row in rows]
+    
+    def count_libraries(self,
+                        foundry: Optional[str] = None,
+                        node: Optional[str] = None,
+                        lib_type: Optional[str] = None,
+                        lib_name_pattern: Optional[str] = None) -> int:
+        """统计匹配的库数量（不转换为 LibInfo）"""
+        where, params = self._build_filter(foundry, node, lib_type, lib_name_pattern)
+        with self._connect() as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM libraries{where}', params).fetchone()[0]
+    
+    def search_names(self, text: str, kind: str = 'library', limit: int = 100) -> List[Tuple[str, str]]:
+        """
+        按名称全文搜索库名或 cell 名
+        
+        Args:
+            text: 名称中的子串（不区分大小写）；包含 * ? [ 时按通配符匹配整个名称（区分大小写）
+            kind: 'library'（库名）或 'cell'（Liberty cell 名）
+            limit: 最多返回的数量
+        
+        Returns:
+            [(lib_id, name), ...] 列表（按名称排序）
+        """
+        if kind == 'library':
+            table, fts, column, id_column = 'libraries', 'library_name_fts', 'lib_name', 'id'
+        elif kind == 'cell':
+            table, fts, column, id_column = 'liberty_cells', 'cell_name_fts', 'cell_name', 'lib_id'
+        else:
+            raise ValueError(f"未知的名称类型: {kind}（应为 library 或 cell）")
+        
+        # 子串搜索不区分大小写（与 trigram MATCH 一致），通配符按 fnmatch 区分大小写
+        is_pattern = any(c in text for c in '*?[')
+        if is_pattern:
+            condition, param = f'{column} GLOB ?', text.replace('[!', '[^')
+        else:
+            condition = f"{column} LIKE ? ESCAPE '\\'"
+            param = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        
+        # trigram 至少需要 3 个字符；更短的子串直接扫描基础表
+        if self._fts_enabled and (is_pattern or len(text) >= 3):
+            if is_pattern:
+                condition = f'{fts}.{condition}'
+            else:
+                condition, param = f'{fts} MATCH ?', '"' + text.replace('"', '""') + '"'
+            sql = (f'SELECT DISTINCT t.{id_column}, t.{column} FROM {fts} JOIN {table} t ON t.rowid = {fts}.rowid '
+                   f'WHERE {condition} ORDER BY t.{column}, t.{id_column} LIMIT ?')
+        else:
+            sql = (f'SELECT DISTINCT {id_column}, {column} FROM {table} '
+                   f'WHERE {condition} ORDER BY {column}, {id_column} LIMIT ?')
+        
+        with self._connect() as conn:
+            return [tuple(row) for row in conn.execute(sql, (param, limit)).fetchall()]
+    
+    def index_liberty_file(self, lib_id: str, file_path: Path, force: bool = False) -> Optional[LibertyHeader]:
+        """
+        流式扫描 Liberty 文件并保存库级信息和 cell 名称
+        
+        文件大小和修改时间与已保存的记录相同时跳过扫描（除非 force=True）。
+        重新扫描时在同一个事务中先删除该文件之前的 cell，已删除或改名的 cell 不会残留。
+        
+        Args:
+            lib_id: 库ID（LibInfo.get_unique_id()）
+            file_path: .lib 或 .lib.gz 文件路径
+            force: 是否强制重新扫描
+        
+        Returns:
+            扫描得到的 LibertyHeader；跳过或扫描失败时返回 None
+        """
+        file_path = Path(file_path)
+        try:
+            stat = file_path.stat()
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT lib_id, file_size, file_mtime FROM liberty_files WHERE file_path = ?',
+                    (str(file_path),)
+                ).fetchone()
+            if not force and row is not None and tuple(row) == (lib_id, stat.st_size, stat.st_mtime):
+                logger.debug(f"Liberty 文件未变化，跳过: {file_path}")
+                return None
             
+            header = scan_liberty(file_path)
+        except (OSError, EOFError) as e:
+            logger.error(f"扫描 Liberty 文件失败: {file_path}: {e}")
+            return None
+        
+        with self._connect() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO liberty_files
+                (file_path, lib_id, library_name, nom_process, nom_voltage, nom_temperature,
+                 default_operating_conditions, units, operating_conditions, cell_count,
+                 file_size, file_mtime, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                str(file_path),
+                lib_id,
+                header.library_name,
+                header.nom_process,
+                header.nom_voltage,
+                header.nom_temperature,
+                header.default_operating_conditions,
+                json.dumps(header.units),
+                json.dumps(header.operating_conditions),
+                len(header.cells),
+                stat.st_size,
+                stat.st_mtime,
+                datetime.now().isoformat()
+            ))
+            conn.execute('DELETE FROM liberty_cells WHERE file_path = ?', (str(file_path),))
+            conn.executemany(
+                'INSERT OR IGNORE INTO liberty_cells (file_path, lib_id, cell_name) VALUES (?, ?, ?)',
+                ((str(file_path), lib_id, cell) for cell in header.cells)
+            )
+            conn.commit()
+        
+        logger.debug(f"已索引 Liberty 文件: {file_path}（{len(header.cells)} 个 cell）")
+        return header
+    
+    def index_liberty_files(self, lib_id: str, file_paths: Iterable[Path], force: bool = False) -> int:
+        """
+        批量扫描 Liberty 文件
+        
         Returns:
-            匹配的库列表
+            实际扫描的文件数量（不包括未变化而跳过的文件）
         """
+        return sum(1 for file_path in file_paths
+                   if self.index_liberty_file(lib_id, file_path, force=force) is not None)
+    
+    def find_libraries_by_cell(self, cell_pattern: str) -> Dict[str, List[str]]:
+        """
+        查找提供指定 cell 的库
+        
+        Args:
+            cell_pattern: cell 名称（支持通配符 * ?）
+        
+        Returns:
+            {lib_id: [cell_name, ...]} 字典
+        """
+        if self._fts_enabled:
+            # 以通配符开头的模式用不上 cell_name 索引，通过 trigram 全文索引查找
+            sql = ('SELECT DISTINCT c.lib_id, c.cell_name FROM cell_name_fts '
+                   'JOIN liberty_cells c ON c.rowid = cell_name_fts.rowid '
+                   'WHERE cell_name_fts.cell_name GLOB ? ORDER BY c.lib_id, c.cell_name')
+        else:
+            sql = ('SELECT DISTINCT lib_id, cell_name FROM liberty_cells WHERE cell_name GLOB ? '
+                   'ORDER BY lib_id, cell_name')
+        with self._connect() as conn:
+            rows = conn.execute(sql, (cell_pattern.replace('[!', '[^'),)).fetchall()
+        
+        results: Dict[str, List[str]] = {}
+        for lib_id, cell_name in rows:
+            results.setdefault(lib_id, []).append(cell_name)
+        return results
+    
+    def get_liberty_cells(self, lib_id: str) -> List[str]:
+        """获取库的所有 cell 名称"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT DISTINCT cell_name FROM liberty_cells WHERE lib_id = ? ORDER BY cell_name', (lib_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def find_liberty_files(self,
+                           lib_id: Optional[str] = None,
+                           process: Optional[float] = None,
+                           voltage: Optional[float] = None,
+                           temperature: Optional[float] = None,
+                           tolerance: float = 1e-6) -> List[Dict[str, Any]]:
+        """
+        按 nom_process / nom_voltage / nom_temperature 查找 Liberty 文件（corner）
+        
+        Args:
+            lib_id: 库ID（可选）
+            process: 工艺系数（可选）
+            voltage: 电压（可选）
+            temperature: 温度（可选）
+            tolerance: 数值比较的容差
+        
+        Returns:
+            Liberty 文件信息字典列表（按文件路径排序）
+        """
+        conditions, params = [], []
+        if lib_id is not None:
+            conditions.append('lib_id = ?')
+            params.append(lib_id)
+        for column, value in (('nom_process', process), ('nom_voltage', voltage),
+                              ('nom_temperature', temperature)):
+            if value is not None:
+                conditions.append(f'ABS({column} - ?) <= ?')
+                params.extend([value, tolerance])
+        
+        sql = 'SELECT * FROM liberty_files'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY file_path'
+        
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(sql, params).fetchall()
+        
         results = []
+        for row in rows:
+            item = dict(row)
+            item['file_path'] = Path(item['file_path'])
+            item['units'] = json.loads(item['units']) if item['units'] else {}
+            item['operating_conditions'] = (json.loads(item['operating_conditions'])
+                                            if item['operating_conditions'] else {})
+            results.append(item)
+        return results
+    
+    def get_library_sources(self, scope: str) -> Dict[str, Dict[str, Any]]:
+        """
+        获取某个生成范围内记录的全部库源目录（增量索引用，一次查询）
         
-        for lib_info in self._libraries.values():
-            # 检查foundry
-            if foundry and lib_info.foundry != foundry:
-                continue
-            
-            # 检查node
-            if node and lib_info.node != node:
-                continue
-            
-            # 检查lib_type
-            if lib_type and lib_info.lib_type != lib_type:
-                continue
-            
-            # 检查库名称模式
-            if lib_name_pattern:
-                import fnmatch
-                if not fnmatch.fnmatch(lib_info.lib_name, lib_name_pattern):
-                    continue
+        Args:
+            scope: 生成范围（foundry/node/lib_type/输出目录）
             
-            results.append(lib_info)
+        Returns:
+            {lib_path: {'lib_id', 'options', 'generated_files', 'views': {view_key: signature}}}
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT lib_path, lib_id, options, generated_files FROM library_sources WHERE scope = ?', (scope,)
+            ).fetchall()
+            sources = {row['lib_path']: {
+                'lib_id': row['lib_id'],
+                'options': row['options'],
+                'generated_files': [Path(p) for p in json.loads(row['generated_files'] or '[]')],
+                'views': {}
+            } for row in rows}
+            signatures = conn.execute('''
+                SELECT s.lib_path, s.view_key, s.signature FROM view_signatures s
+                JOIN library_sources l ON l.lib_path = s.lib_path WHERE l.scope = ?
+            ''', (scope,))
+            for lib_path, view_key, signature in signatures:
+                sources[lib_path]['views'][view_key] = signature
+        return sources
+    
+    def save_library_source(self, lib_path: Path, lib_id: str, scope: str, options: str,
+                            view_signatures: Dict[str, Tuple[Path, str, int, int]],
+                            generated_files: Iterable[Path]):
+        """
+        记录库源目录的生成参数和视图目录签名（替换旧记录）
         
-        return results
+        Args:
+            lib_path: 库源目录
+            lib_id: 库ID
+            scope: 生成范围
+            options: 生成参数（版本选择等）
+            view_signatures: {view_key: (view_path, signature, file_count, total_size)}
+            generated_files: 生成的 lib_config.tcl 文件
+        """
+        lib_path = str(lib_path)
+        with self._connect() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO library_sources
+                (lib_path, lib_id, scope, options, generated_files, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (lib_path, lib_id, scope, options, json.dumps([str(p) for p in generated_files]),
+                  datetime.now().isoformat()))
+            conn.execute('DELETE FROM view_signatures WHERE lib_path = ?', (lib_path,))
+            conn.executemany('''
+                INSERT INTO view_signatures (lib_path, view_key, view_path, signature, file_count, total_size)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(lib_path, key, str(view_path), signature, file_count, total_size)
+                  for key, (view_path, signature, file_count, total_size) in view_signatures.items()])
+            conn.commit()
+    
+    def remove_library_source(self, lib_path: Path):
+        """删除库源目录的记录和视图目录签名"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM view_signatures WHERE lib_path = ?', (str(lib_path),))
+            conn.execute('DELETE FROM library_sources WHERE lib_path = ?', (str(lib_path),))
+            conn.commit()
+    
+    def _distinct(self, column: str, **filters) -> List[str]:
+        """查询某一列的不同取值（使用 (foundry, node, lib_type) 索引）"""
+        where, params = self._build_filter(**filters)
+        where = (where + ' AND ' if where else ' WHERE ') + f'{column} IS NOT NULL'
+        with self._connect() as conn:
+            rows = conn.execute(f'SELECT DISTINCT {column} FROM libraries{where} ORDER BY {column}', params)
+            return [row[0] for row in rows]
     
     def get_foundries(self) -> List[str]:
         """获取所有foundry列表"""
-        return sorted(list(self._foundries))
+        return self._distinct('foundry')
     
     def get_nodes(self, foundry: Optional[str] = None) -> List[str]:
         """获取节点列表"""
-        if foundry:
-            nodes = set()
-            for lib_info in self._libraries.values():
-                if lib_info.foundry == foundry and lib_info.node:
-                    nodes.add(lib_info.node)
-            return sorted(list(nodes))
-        else:
-            return sorted(list(self._nodes))
+        return self._distinct('node', foundry=foundry)
     
     def get_lib_types(self, foundry: Optional[str] = None, node: Optional[str] = None) -> List[str]:
         """获取库类型列表"""
-        if foundry or node:
-            lib_types = set()
-            for lib_info in self._libraries.values():
-                if foundry and lib_info.foundry != foundry:
-                    continue
-                if node and lib_info.node != node:
-                    continue
-                lib_types.add(lib_info.lib_type)
-            return sorted(list(lib_types))
-        else:
-            return sorted(list(self._lib_types))
+        return self._distinct('lib_type', foundry=foundry, node=node)
     
     def get_statistics(self) -> Dict[str, int]:
         """获取索引统计信息"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT COUNT(*), COUNT(DISTINCT foundry), COUNT(DISTINCT node), COUNT(DISTINCT lib_type) '
+                'FROM libraries'
+            ).fetchone()
         return {
-            'total_libraries': len(self._libraries),
-            'foundries': len(self._foundries),
-            'nodes': len(self._nodes),
-            'lib_types': len(self._lib_types)
+            'total_libraries': row[0],
+            'foundries': row[1],
+            'nodes': row[2],
+            'lib_types': row[3]
         }
     
     def remove_library(self, lib_id: str) -> bool:
         """从索引中移除库"""
         try:
-            if lib_id in self._libraries:
-                del self._libraries[lib_id]
-                
-                # 从数据库删除
-                with sqlite3.connect(self.index_path) as conn:
+            self._cache.pop(lib_id, None)
+            with self._connect() as conn:
+                removed = conn.execute('DELETE FROM libraries WHERE id = ?', (lib_id,)).rowcount
+                if removed:
                     conn.execute('DELETE FROM views WHERE lib_id = ?', (lib_id,))
-                    conn.execute('DELETE FROM libraries WHERE id = ?', (lib_id,))
-                    conn.commit()
-                
-                # 重新构建集合（简单方法）
-                self._rebuild_sets()
-                
-                logger.debug(f"已从索引移除库: {lib_id}")
-                return True
-            
-            return False
+                    conn.execute('DELETE FROM liberty_files WHERE lib_id = ?', (lib_id,))
+                    conn.execute('DELETE FROM liberty_cells WHERE lib_id = ?', (lib_id,))
+                    conn.execute('DELETE FROM view_signatures WHERE lib_path IN '
+                                 '(SELECT lib_path FROM library_sources WHERE lib_id = ?)', (lib_id,))
+                    conn.execute('DELETE FROM library_sources WHERE lib_id = ?', (lib_id,))
+                conn.commit()
             
+            if removed:
+                logger.debug(f"已从索引移除库: {lib_id}")
+            return removed > 0
+        
         except Exception as e:
             logger.error(f"从索引移除库失败: {e}")
             return False
     
-    def _rebuild_sets(self):
-        """重新构建foundry/node/lib_type集合"""
-        self._foundries.clear()
-        self._nodes.clear()
-        self._lib_types.clear()
-        
-        for lib_info in self._libraries.values():
-            if lib_info.foundry:
-                self._foundries.add(lib_info.foundry)
-            if lib_info.node:
-                self._nodes.add(lib_info.node)
-            self._lib_types.add(lib_info.lib_type)
-    
     def clear_index(self):
         """清空索引"""
-        self._libraries.clear()
-        self._foundries.clear()
-        self._nodes.clear()
-        self._lib_types.clear()
+        self._cache.clear()
         
-        with sqlite3.connect(self.index_path) as conn:
+        with self._connect() as conn:
             conn.execute('DELETE FROM views')
+            conn.execute('DELETE FROM liberty_files')
+            conn.execute('DELETE FROM liberty_cells')
+            conn.execute('DELETE FROM view_signatures')
+            conn.execute('DELETE FROM library_sources')
             conn.execute('DELETE FROM libraries')
             conn.commit()
         
-        logger.info("已清空库索引")
\ No newline at end of file
+        logger.info("已清空库索引")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试批量生成 lib_config.tcl：串行/并行结果一致、按输入顺序汇总、共享适配器、内容未变化时不重写
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit import batch_gen
+from edp_center.packages.edp_libkit.batch_gen import GenLibOptions, run_gen_lib
+from edp_center.packages.edp_libkit.foundry_adapters import AdapterFactory
+from edp_center.packages.edp_libkit.generator import LibConfigGenerator
+from edp_center.packages.edp_libkit.lib_generator import write_if_changed
+
+CORNERS = ['sspg0p675vm40c', 'ffpg0p825v125c', 'tt0p75v25c']
+
+
+def _create_std_library(root: Path, lib_name: str) -> Path:
+    """创建一个 Samsung STD 结构的库目录"""
+    lib_dir = root / f'v-logic_{lib_name}'
+    version_dir = lib_dir / 'DesignWare_logic_libs' / 'samsung08nvllg' / '20hs' / 'hdf' / 'hvt' / '2.00A'
+    files = [version_dir / 'gds' / f'{lib_name}.gds', version_dir / 'lef' / f'{lib_name}.lef']
+    files += [version_dir / 'ccs_lvf' / f'{lib_name}_{c}.db' for c in CORNERS]
+    for file_path in files:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.touch()
+    return lib_dir
+
+
+def _options(output_dir: Path) -> GenLibOptions:
+    return GenLibOptions(foundry='Samsung', node='ln08lpu_gp', lib_type='STD', output_dir=output_dir)
+
+
+def _read_outputs(output_dir: Path) -> dict:
+    return {
+        str(p.relative_to(output_dir)): [l for l in p.read_text(encoding='utf-8').splitlines()
+                                         if not l.startswith('# Generated at')]
+        for p in sorted(output_dir.rglob('lib_config*.tcl'))
+    }
+
+
+def test_parallel_matches_serial(tmp_path):
+    """测试并行处理的结果顺序、生成文件和内容与串行一致，失败的库按输入顺序报告"""
+    lib_dirs = [_create_std_library(tmp_path / 'install', f'stdlib{i}') for i in range(6)]
+    lib_dirs.insert(2, tmp_path / 'install' / 'missing_lib')
+
+    serial = run_gen_lib(lib_dirs, _options(tmp_path / 'serial'), jobs=1)
+    progress = []
+    parallel = run_gen_lib(lib_dirs, _options(tmp_path / 'parallel'), jobs=3,
+                           progress=lambda done, total, r: progress.append((done, total, r.index)))
+
+    assert [r.lib_path for r in parallel] == lib_dirs
+    assert [r.ok for r in parallel] == [r.ok for r in serial] == [True, True, False, True, True, True, True]
+    assert "目录不存在" in parallel[2].error
+    assert [len(r.generated_files) for r in parallel] == [1, 1, 0, 1, 1, 1, 1]
+    assert [f.name for r in parallel for f in r.generated_files] == ['lib_config.tcl'] * 6
+
+    # 进度按完成顺序回调，每个库一次
+    assert [p[0] for p in progress] == list(range(1, 8))
+    assert sorted(p[2] for p in progress) == list(range(7))
+
+    serial_outputs = _read_outputs(tmp_path / 'serial')
+    assert len(serial_outputs) == 6
+    assert serial_outputs == _read_outputs(tmp_path / 'parallel')
+
+
+def test_shared_adapter(tmp_path, monkeypatch):
+    """测试同一进程中所有库共享一个 (foundry, node) 适配器"""
+    created = []
+    original = AdapterFactory.create_adapter
+
+    def counting_create_adapter(foundry, node=None):
+        created.append((foundry, node))
+        return original(foundry, node)
+
+    monkeypatch.setattr(AdapterFactory, '_registry', {})
+    monkeypatch.setattr(batch_gen, '_generators', {})
+    monkeypatch.setattr(AdapterFactory, 'create_adapter', staticmethod(counting_create_adapter))
+
+    lib_dirs = [_create_std_library(tmp_path / 'install', f'stdlib{i}') for i in range(4)]
+    results = run_gen_lib(lib_dirs, _options(tmp_path / 'out'), jobs=1)
+    results += run_gen_lib(lib_dirs, _options(tmp_path / 'out2'), jobs=1)
+
+    assert all(r.ok for r in results)
+    assert created == [('Samsung', 'ln08lpu_gp')]
+    assert batch_gen.get_shared_adapter('samsung', 'LN08LPU_GP') is batch_gen.get_shared_adapter('Samsung', 'ln08lpu_gp')
+
+    # 不传 adapter 的生成器（GUI 的用法）也使用缓存的适配器
+    generator = LibConfigGenerator(foundry='Samsung', ori_path=tmp_path, output_base_dir=tmp_path / 'gui',
+                                   node='ln08lpu_gp')
+    assert generator.generate_from_directory(lib_dirs[0], 'STD')
+    assert len(created) == 1
+
+    # 节点配置文件修改后重新加载，生成器随之更新
+    monkeypatch.setattr(AdapterFactory, '_config_mtime', staticmethod(lambda foundry, node: 42))
+    results = run_gen_lib(lib_dirs, _options(tmp_path / 'out'), jobs=1)
+    assert all(r.ok for r in results)
+    assert len(created) == 2
+    assert batch_gen._get_generator(_options(tmp_path / 'out')).adapter is AdapterFactory.get_adapter('samsung', 'ln08lpu_gp')
+
+
+def test_precompiled_rc_corner_matching():
+    """测试预编译的 PVT corner 前缀匹配与逐个 startswith 的结果一致"""
+    node_adapter = AdapterFactory.get_adapter('Samsung', 'ln08lpu_gp')._node_adapter
+    corners = ['ffpg0p825v125c', 'sspg0p675vm40c', 'tt0p75v25c', 'sfg0p675vn40c', 'dlvl_ffpg0p715v125c_i0p825v',
+               'pg_tt0p85v85c', 'unknown', 'FFPG0P825V125C']
+    expected = []
+    for corner in corners:
+        lower = corner.lower()
+        parts = [lower] + (lower.split('_') if '_' in lower else [])
+        rc = next((v for part in parts for k, v in node_adapter.pvt_corner_mapping.items() if part.startswith(k)), None)
+        expected.append(rc or ('sigcmax' if any(p.startswith('sfg') for p in parts) else 'typical'))
+    assert [node_adapter.extract_rc_corner(c) for c in corners] == expected
+    assert expected[:3] == ['sigcmin', 'sigcmax', 'typical']
+    assert node_adapter.view_file_regexes['gds'].match('cell.gds')
+
+
+def test_unchanged_outputs_not_rewritten(tmp_path):
+    """测试再次生成时内容未变化的文件不重写（修改时间不变），只有变化的库重新写入"""
+    lib_dirs = [_create_std_library(tmp_path / 'install', f'stdlib{i}') for i in range(3)]
+    output_dir = tmp_path / 'out'
+    first = run_gen_lib(lib_dirs, _options(output_dir), jobs=1)
+    assert [len(r.written_files) for r in first] == [1, 1, 1]
+    assert not any(l.startswith('# Generated at') for p in output_dir.rglob('*.tcl') for l in p.read_text().splitlines())
+    for config_file in output_dir.rglob('lib_config.tcl'):
+        os.utime(config_file, ns=(1, 1))
+
+    new_corner = next(lib_dirs[1].rglob('ccs_lvf')) / 'stdlib1_ss0p6v0c.db'
+    new_corner.touch()
+    second = run_gen_lib(lib_dirs, _options(output_dir), jobs=1)
+    assert [len(r.unchanged_files) for r in second] == [1, 0, 1]
+    assert [r.written_files for r in second] == [[], second[1].generated_files, []]
+    assert [f.stat().st_mtime_ns == 1 for r in second for f in r.generated_files] == [True, False, True]
+    assert 'stdlib1_ss0p6v0c.db' in second[1].generated_files[0].read_text()
+
+    # 只有生成时间注释不同时也不重写；没有留下临时文件
+    target = tmp_path / 'cfg.tcl'
+    assert write_if_changed(target, '# Generated at: 2024-01-01 00:00:00\nset A 1\n')
+    assert not write_if_changed(target, '# Generated at: 2025-01-01 00:00:00\nset A 1\n')
+    assert write_if_changed(target, 'set A 2\n')
+    assert [p.name for p in tmp_path.iterdir() if p.is_file()] == ['cfg.tcl']
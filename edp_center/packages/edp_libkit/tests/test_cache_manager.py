@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 CacheManager：LRU 淘汰顺序、磁盘大小上限和 TTL、按原始键的模式失效、多进程并发访问
+"""
+
+import multiprocessing
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.cache_manager import CacheManager
+
+
+def test_memory_lru_order(tmp_path):
+    """测试内存缓存淘汰最久未使用的条目，磁盘条目仍可读取"""
+    cache = CacheManager(tmp_path, max_memory_entries=3)
+    for key in ['a', 'b', 'c']:
+        cache.set(key, key.upper())
+    assert cache.get('a') == 'A'          # a 变为最近使用
+    cache.set('d', 'D')                   # 淘汰 b
+    assert list(cache._memory_cache) == ['c', 'a', 'd']
+    assert cache.get_stats()['evictions'] == 1
+
+    cache.set('e', 'E', persist_to_disk=False)
+    assert 'c' not in cache._memory_cache
+    assert cache.get('b') == 'B'          # 从磁盘读取
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['memory_entries'], stats['disk_entries']) == (2, 0, 3, 4)
+
+
+def test_disk_size_limit_and_ttl(tmp_path):
+    """测试磁盘总大小超出上限时淘汰最久未访问的条目，TTL 到期的条目失效"""
+    cache = CacheManager(tmp_path, max_memory_entries=1, max_disk_bytes=10000)
+    for i in range(20):
+        cache.set(f'k{i}', b'x' * 1000)
+        if i > 0:
+            time.sleep(0.001)
+            assert cache.get('k0') is not None    # 从磁盘读取并刷新访问时间：经常读取的 k0 不会被淘汰
+    stats = cache.get_stats()
+    assert stats['disk_bytes'] <= 10000 and stats['disk_evictions'] > 0
+    assert cache.get('k0') is not None and cache.get('k1') is None and cache.get('k19') is not None
+
+    cache.set('short', 1, ttl=timedelta(milliseconds=50))
+    cache.set('other', 2)
+    time.sleep(0.06)
+    assert cache.get('short') is None
+    assert cache.get_stats()['expired'] == 1
+    assert cache.get('other') == 2
+    assert CacheManager(tmp_path, default_ttl=timedelta(seconds=0)).cleanup_expired(timedelta(days=1)) == 0
+
+
+def test_invalidate_pattern_uses_original_keys(tmp_path):
+    """测试模式失效只删除匹配原始键的条目（内存和磁盘）"""
+    cache = CacheManager(tmp_path)
+    keys = ['lib:std:a', 'lib:std:b', 'lib:mem:a', 'view:std:a']
+    for key in keys:
+        cache.set(key, key)
+    cache.set('lib:std:memory_only', 1, persist_to_disk=False)
+
+    assert cache.invalidate_pattern('lib:std:*') == 3
+    assert [k for k in keys if cache.get(k) is not None] == ['lib:mem:a', 'view:std:a']
+    assert cache.invalidate_pattern('*:[!m]*:a') == 1
+    assert CacheManager(tmp_path).get('lib:mem:a') == 'lib:mem:a'
+
+
+def _writer(cache_dir, worker, count):
+    cache = CacheManager(Path(cache_dir), max_memory_entries=10)
+    for i in range(count):
+        assert cache.set(f'w{worker}:{i}', {'worker': worker, 'i': i})
+        assert cache.get(f'w{worker}:{i // 2}') == {'worker': worker, 'i': i // 2}
+    cache.set('shared', worker)
+
+
+def test_multi_process_access(tmp_path):
+    """测试多个进程同时读写同一个缓存，并且其他进程的修改使本进程的内存条目失效"""
+    cache = CacheManager(tmp_path)
+    cache.set('shared', 'parent')
+    assert cache.get('shared') == 'parent'
+
+    ctx = multiprocessing.get_context('spawn')
+    processes = [ctx.Process(target=_writer, args=(str(tmp_path), w, 100)) for w in range(4)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join(60)
+    assert [p.exitcode for p in processes] == [0] * 4
+
+    assert cache.get_stats()['disk_entries'] == 401
+    assert cache.get('shared') in range(4)
+    assert cache.get('w3:99') == {'worker': 3, 'i': 99}
+
+
+def test_other_writer_only_invalidates_changed_entries(tmp_path):
+    """测试其他连接提交修改后，只有被改写或删除的内存条目作废，其余条目仍从内存返回"""
+    cache = CacheManager(tmp_path)
+    other = CacheManager(tmp_path)
+    data = {'name': 'unchanged'}
+    cache.set('unchanged', data)
+    cache.set('rewritten', 'old')
+    cache.set('removed', 'old')
+
+    other.set('rewritten', 'new')
+    other.set('added', 'new')
+    other.invalidate('removed')
+
+    assert cache.get('unchanged') is data
+    assert cache.get('rewritten') == 'new'
+    assert cache.get('removed') is None
+    assert cache.get('added') == 'new'
@@ -283,8 +283,8 @@ class TestCacheManagerProperties:
         for key in keys:
             assert self.cache_manager.get(key) is None
         
-        # 验证失效数量正确（至少应该等于设置的数量）
-        assert invalidated_count >= len(keys)
+        # 验证失效数量正确（按不同的键计数）
+        assert invalidated_count == len(set(keys))
     
     @given(st.lists(st.tuples(cache_key_strategy(), cache_data_strategy()), min_size=1, max_size=10))
     def test_cache_statistics_property(self, key_data_pairs):
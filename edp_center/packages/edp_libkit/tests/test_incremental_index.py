@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试增量库索引：未变化的库跳过生成，只重新生成视图目录有变化的库，报告新增/变化/移除
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.batch_gen import GenLibOptions
+from edp_center.packages.edp_libkit.incremental_index import IncrementalIndexer, compute_view_signature
+from edp_center.packages.edp_libkit.library_index import LibraryIndex
+
+CORNERS = ['sspg0p675vm40c', 'ffpg0p825v125c']
+
+
+def _create_std_library(root: Path, lib_name: str) -> Path:
+    """创建一个 Samsung STD 结构的库目录"""
+    lib_dir = root / f'v-logic_{lib_name}'
+    version_dir = lib_dir / 'DesignWare_logic_libs' / 'samsung08nvllg' / '20hs' / 'hdf' / 'hvt' / '2.00A'
+    files = [version_dir / 'gds' / f'{lib_name}.gds', version_dir / 'lef' / f'{lib_name}.lef']
+    files += [version_dir / 'ccs_lvf' / f'{lib_name}_{c}.db' for c in CORNERS]
+    for file_path in files:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text('x')
+    return lib_dir
+
+
+def _indexer(tmp_path: Path, **kwargs) -> IncrementalIndexer:
+    options = GenLibOptions(foundry='Samsung', node='ln08lpu_gp', lib_type='STD',
+                            output_dir=tmp_path / 'out', **kwargs)
+    return IncrementalIndexer(LibraryIndex(tmp_path / 'index.db'), options)
+
+
+def test_view_signature(tmp_path):
+    """测试签名随条目名称、大小变化，与读取顺序无关"""
+    (tmp_path / 'a.db').write_text('1')
+    (tmp_path / 'sub').mkdir()
+    first = compute_view_signature(tmp_path)
+    assert first.signature == compute_view_signature(tmp_path).signature
+    assert [f.file_path.name for f in first.files] == ['a.db'] and first.total_size == 1
+
+    (tmp_path / 'a.db').write_text('22')
+    second = compute_view_signature(tmp_path)
+    assert second.signature != first.signature
+    (tmp_path / 'b.db').touch()
+    assert compute_view_signature(tmp_path).signature != second.signature
+    assert compute_view_signature(tmp_path / 'missing').signature == ''
+
+
+def test_refresh_only_changed(tmp_path):
+    """测试第二次刷新跳过全部库，只重新生成有变化的库，并报告新增/变化/移除"""
+    install = tmp_path / 'install'
+    lib_dirs = [_create_std_library(install, f'stdlib{i}') for i in range(4)]
+
+    report = _indexer(tmp_path).refresh(lib_dirs, roots=[install])
+    assert report.added == lib_dirs and not report.changed and not report.removed
+    assert [r.ok for r in report.results] == [True] * 4
+
+    index = LibraryIndex(tmp_path / 'index.db')
+    assert index.count_libraries(foundry='samsung', lib_type='STD') == 4
+    lib = index.search_libraries(lib_name_pattern='stdlib0')[0]
+    assert lib.version == '2.00A'
+    assert lib.statistics.view_counts == {'gds': 1, 'lef': 1, 'ccs_lvf': 2}
+
+    report = _indexer(tmp_path).refresh(lib_dirs, roots=[install])
+    assert report.unchanged == lib_dirs and report.results == []
+
+    # 视图目录深处新增文件、删除库目录、删除输出文件
+    version_dir = next(lib_dirs[1].rglob('ccs_lvf'))
+    (version_dir / 'stdlib1_tt0p75v25c.db').touch()
+    removed = lib_dirs.pop(2)
+    for path in sorted(removed.rglob('*'), reverse=True):
+        path.unlink() if path.is_file() else path.rmdir()
+    removed.rmdir()
+    (tmp_path / 'out' / 'stdlib3' / 'lib_config.tcl').unlink()
+
+    report = _indexer(tmp_path).refresh(lib_dirs, roots=[install])
+    assert report.changed == {lib_dirs[1]: ['ccs_lvf'], lib_dirs[2]: ['output']}
+    assert report.removed == [removed]
+    assert report.unchanged == [lib_dirs[0]]
+    assert [r.lib_path for r in report.results] == [lib_dirs[1], lib_dirs[2]]
+    assert 'tt0p75v25c' in (tmp_path / 'out' / 'stdlib1' / 'lib_config.tcl').read_text(encoding='utf-8')
+    assert (tmp_path / 'out' / 'stdlib3' / 'lib_config.tcl').exists()
+
+    index = LibraryIndex(tmp_path / 'index.db')
+    assert sorted(l.lib_name for l in index.search_libraries()) == ['stdlib0', 'stdlib1', 'stdlib3']
+    assert index.search_libraries(lib_name_pattern='stdlib1')[0].statistics.view_counts['ccs_lvf'] == 3
+
+    # 生成参数变化时全部重新生成
+    report = _indexer(tmp_path, array_name='LIB').refresh(lib_dirs, roots=[install])
+    assert list(report.changed.values()) == [['options']] * 3
+    assert len(report.results) == 3
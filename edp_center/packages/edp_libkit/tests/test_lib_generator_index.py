@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 lib_config.tcl 中的反向索引，以及 lib_info 使用索引查询的结果与扫描一致
+"""
+
+import sys
+from pathlib import Path
+from tkinter import Tcl
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.lib_info import LibInfo
+from edp_center.packages.edp_libkit.lib_generator import LibGenerator
+from edp_center.packages.edp_libkit.foundry_adapters import AdapterFactory
+
+GET_LIB_TCL = project_root / 'edp_center' / 'flow' / 'common' / 'packages' / 'tcl' / 'default' / 'edp_get_lib.tcl'
+
+CORNERS = ['sspg0p675vm40c', 'ffpg0p825v125c', 'tt0p75v25c', 'sspg0p675v1p62vm40c']
+VIEWS = 'func_sspg_0p6750v_m40c_Cmax func_ffpg_0p8250v_125c_Cmin'
+
+
+def _generate(output_dir: Path, lib_name: str, array_name: str = 'LIBRARY') -> Path:
+    """生成一个合成库的 lib_config.tcl"""
+    lib_dir = output_dir / 'libs' / lib_name
+    view_files = {
+        'gds': [lib_dir / 'gds' / f'{lib_name}.gds'],
+        'lef': [lib_dir / 'lef' / f'{lib_name}.lef'],
+        'ccs_lvf': [lib_dir / 'ccs_lvf' / f'{lib_name}_{c}.{ext}' for c in CORNERS for ext in ('db', 'lib.gz')],
+    }
+    lib_info = LibInfo(lib_name=lib_name, lib_path=lib_dir, lib_type='STD', foundry='samsung', node='ln08lpu_gp')
+    output_path = output_dir / lib_name / 'lib_config.tcl'
+    adapter = AdapterFactory.create_adapter('samsung', 'ln08lpu_gp')
+    LibGenerator(array_name).generate(lib_info, view_files, output_path, adapter)
+    return output_path
+
+
+def _interp(*config_files: Path) -> Tcl:
+    interp = Tcl()
+    interp.eval(f"source {{{GET_LIB_TCL.as_posix()}}}")
+    for config_file in config_files:
+        interp.eval(f"source {{{config_file.as_posix()}}}")
+    # 查询时会 puts 统计信息，测试中丢弃
+    interp.eval("rename puts __edp_test_puts; proc puts {args} {}")
+    return interp
+
+
+def _query(interp: Tcl) -> tuple:
+    db = interp.eval(f"lsort [lib_info::get_lib_info db {{{VIEWS}}}]")
+    lef = interp.eval("lsort [lib_info::get_physical_info lef]")
+    return db, lef
+
+
+def test_index_entries_generated(tmp_path):
+    """测试生成的 lib_config.tcl 包含按库名的索引"""
+    content = _generate(tmp_path, 'stdlib_a').read_text(encoding='utf-8')
+    assert "set LIBRARY_BY_LIB(stdlib_a) {" in content
+    assert "{stdlib_a,lef,lef}" in content.split("set LIBRARY_BY_LIB(stdlib_a)")[1]
+
+    interp = _interp(tmp_path / 'stdlib_a' / 'lib_config.tcl')
+    assert interp.eval("llength $LIBRARY_BY_LIB(stdlib_a)") == interp.eval("array size LIBRARY")
+
+
+def test_indexed_query_matches_scan(tmp_path):
+    """测试使用索引查询与删除索引后扫描 array names 的结果一致"""
+    configs = [_generate(tmp_path, f'stdlib_{i}') for i in range(5)]
+    configs.append(_generate(tmp_path, 'memlib_0', array_name='MEM_LIBRARY'))
+    interp = _interp(*configs)
+    assert interp.eval("lib_info::index_usable LIBRARY") == "1"
+
+    indexed_db, indexed_lef = _query(interp)
+    # STD 每个库命中 sspg0p675vm40c、GPIO 风格的 sspg0p675v1p62vm40c 和 ffpg0p825v125c，
+    # MEM 库的 corner 同时满足 RC 匹配，也命中这 3 个
+    assert len(indexed_db.split()) == 5 * 3 + 3
+    assert len(indexed_lef.split()) == 6
+
+    interp.eval("array unset LIBRARY_BY_LIB; array unset MEM_LIBRARY_BY_LIB")
+    assert interp.eval("lib_info::index_usable LIBRARY") == "0"
+    assert _query(interp) == (indexed_db, indexed_lef)
+
+
+def test_incomplete_index_falls_back_to_scan(tmp_path):
+    """测试混入没有索引的条目时回退到扫描"""
+    interp = _interp(_generate(tmp_path, 'stdlib_a'))
+    interp.eval("set LIBRARY(handmade,lef,lef) {/path/to/handmade.lef}")
+    assert interp.eval("lib_info::index_usable LIBRARY") == "0"
+    assert "/path/to/handmade.lef" in interp.eval("lib_info::get_physical_info lef")
+
+    # 重复 source 同一个文件不影响结果
+    interp = _interp(*([tmp_path / 'stdlib_a' / 'lib_config.tcl'] * 2))
+    assert interp.eval("lib_info::index_usable LIBRARY") == "1"
+    assert len(interp.eval("lib_info::get_physical_info lef").split()) == 1
+
+
+# 与扫描匹配规则相关的特殊 key：部分 sub_key、组合 corner 名、库名或中间字段中的 pvt / sub_key
+IRREGULAR_KEYS = {
+    'LIBRARY': [
+        'stdlib_x,ccs_lvf,sigcmax,sspg0p675vm40c_ccs,db',        # corner 带后缀
+        'stdlib_x,ccs_lvf,sigcmax,lvt_sspg0p675vm40c,lib',        # corner 带前缀
+        'stdlib_x,ccs_db,sigcmax,ffpg0p825v125c,lib',             # 中间字段包含 db
+        'stdlib_x,ccs_lvf,sigcmax,ffpg0p825v125c,db_ccs',         # file_type 带后缀
+        'stdlib_sspg0p675vm40c,ccs_lvf,sigcmax,other,db',         # pvt 在库名中
+        'stdlib_x,ccs_lvf,sigcmax,sspg0p675v1p62vm40c,dbx',       # GPIO 风格的 pvvt
+        'dblib,gds,gds',                                          # sub_key 在库名中
+        'stdlib_x,lef_tech,lef',
+        'stdlib_x,cdk12m3mx2,sigcmax,sspg0p675vm40c,db',          # extral_lib，需要 RC 匹配
+    ],
+    'MEM_LIBRARY': [
+        'memlib_x,ccs_lvf,sigcmax,sspg0p675vm40c_sigcmax,db',
+        'memlib_x,ccs_lvf,sigcmin,sspg0p675vm40c,db',
+        'memlib_sigcmax,ccs_lvf,x,ffpg0p825v125c,db',              # RC 在库名中
+    ],
+    'IP_LIBRARY': [
+        'gpio_x,func,sigcmax,sspg0p675vm40c,db',
+        'gpio_x,all,rcall,sspg0p675v1p62vm40c,db',
+        'gpio_x,all,rcall,ffpg0p825v125c,lib',
+        'gpio_1p8v_x,all,rcall,sspg0p675v1p08vm40c,db',           # 被 extral_baned_list 过滤
+        'ip_func_sigcmax_sspg0p675vm40c,db',                       # pvt,sub_key 跨越库名
+    ],
+}
+
+
+def test_irregular_keys_match_scan(tmp_path):
+    """测试部分 sub_key、组合 corner 名等情况下，索引查询与扫描返回相同的库"""
+    configs = [_generate(tmp_path, f'stdlib_{i}') for i in range(2)]
+    interp = _interp(*configs)
+    for array_name, keys in IRREGULAR_KEYS.items():
+        for key in keys:
+            lib_name = key.split(',')[0]
+            interp.call('set', f"{array_name}({key})", f"/path/{key.replace(',', '_')}")
+            interp.call('lappend', f"{array_name}_BY_LIB({lib_name})", key)
+    for array_name in IRREGULAR_KEYS:
+        assert interp.eval(f"lib_info::index_usable {array_name}") == "1"
+
+    queries = [f"lsort [lib_info::get_lib_info {sub_key} {{{VIEWS}}}]" for sub_key in ('db', 'lib', 'd', 'ccs', 'db_ccs')]
+    queries += [f"lsort [lib_info::get_physical_info {sub_key}]" for sub_key in ('lef', 'gds', 'db', 'lvf', 'le')]
+    indexed = [interp.eval(query) for query in queries]
+    # 确认这些查询确实命中了特殊 key
+    assert '/path/stdlib_x_ccs_lvf_sigcmax_sspg0p675vm40c_ccs_db' in indexed[0]
+    assert '/path/ip_func_sigcmax_sspg0p675vm40c_db' in indexed[0]
+    assert '/path/dblib_gds_gds' in indexed[7]
+
+    interp.eval("foreach a {LIBRARY MEM_LIBRARY IP_LIBRARY} {array unset ${a}_BY_LIB}")
+    assert [interp.eval(query) for query in queries] == indexed
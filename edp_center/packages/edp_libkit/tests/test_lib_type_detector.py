@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 LibraryTypeDetector：各类目录结构的分类结果、每个目录只读取一次
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.lib_type_detector import LibraryTypeDetector
+
+
+# 相对路径 -> 期望的库类型（子目录一并创建）
+CASES = {
+    'IP/ln08lpu_gpio_1p8v/v1.12': 'IP',                          # 父目录名包含 IP，版本目录
+    'vendor/pll_ip/FE-Common': None,                             # 普通目录
+    'vendor/pll_ip': 'IP',                                       # 有 FE-Common 子目录
+    'STD_Cell/0711_install/v-logic_sa08nvghlogl20hdf068f': 'STD',
+    'STD_Cell/0711_install/v-logic_sa08nvghlogl20hdf068f/2.00A': 'STD',  # 祖先目录包含 STD_Cell
+    'vendor/dw_lib': 'STD',                                      # 有 DesignWare_logic_libs 子目录
+    'vendor/dw_lib/DesignWare_logic_libs': None,
+    'vendor/v-logic_abc': 'STD',                                 # v-logic_ 前缀
+    'Mem_Compiler/sadrls0g4l2p/ver': 'MEM',                      # 祖先目录名包含 mem（不区分大小写）
+    'vendor/SRAM_lib': 'MEM',
+    'STD_Cell/memory_like': 'MEM',                               # MEM 优先于 STD
+    'IP/block/rtl': 'IP',                                        # 祖先目录名为 IP
+    'vendor/IPX/other': None,                                    # 只有祖先目录名正好是 IP 才推断
+    'vendor/plain': None,
+}
+
+
+def _make_tree(root: Path):
+    for rel in CASES:
+        (root / rel).mkdir(parents=True, exist_ok=True)
+    (root / 'vendor/dw_lib/DesignWare_logic_libs').mkdir(exist_ok=True)
+    (root / 'vendor/pll_ip/FE-Common').mkdir(exist_ok=True)
+    (root / 'vendor/not_a_dir').write_text('x')
+
+
+def test_detect_library_type_cases(tmp_path):
+    """测试各类目录结构的分类结果"""
+    _make_tree(tmp_path)
+    LibraryTypeDetector.clear_cache()
+    for rel, expected in CASES.items():
+        assert LibraryTypeDetector.detect_library_type(tmp_path / rel) == expected, rel
+    assert LibraryTypeDetector.detect_library_type(tmp_path / 'vendor/not_a_dir') is None
+    assert LibraryTypeDetector.detect_library_type(tmp_path / 'missing') is None
+
+    types = LibraryTypeDetector.detect_library_types([tmp_path / rel for rel in CASES], jobs=4)
+    assert list(types.values()) == list(CASES.values())
+
+    info = LibraryTypeDetector.detect_library_info(tmp_path / 'STD_Cell/0711_install/v-logic_sa08nvghlogl20hdf068f/2.00A', 'Samsung')
+    assert info == ('STD', '2.00A', None)
+    (tmp_path / 'IP/ln08lpu_gpio_1p8v/v1.10').mkdir()
+    info = LibraryTypeDetector.detect_library_info(tmp_path / 'IP/ln08lpu_gpio_1p8v', 'Samsung')
+    assert info == ('IP', 'ln08lpu_gpio_1p8v', 'v1.10')
+
+
+def test_single_scandir_and_cache(tmp_path, monkeypatch):
+    """测试每个目录只读取一次，不再逐个特征 stat，重复检测使用缓存"""
+    _make_tree(tmp_path)
+    LibraryTypeDetector.clear_cache()
+
+    scans = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        scans.append(str(path))
+        return real_scandir(path)
+
+    def no_stat(*args, **kwargs):
+        raise AssertionError('检测时不应调用 Path.exists/is_dir')
+
+    monkeypatch.setattr(os, 'scandir', counting_scandir)
+    monkeypatch.setattr(Path, 'exists', no_stat)
+    monkeypatch.setattr(Path, 'is_dir', no_stat)
+
+    paths = [tmp_path / rel for rel in CASES]
+    for _ in range(3):
+        for path in paths:
+            LibraryTypeDetector.detect_library_type(path)
+    assert sorted(scans) == sorted(str(p) for p in paths)
+
+    LibraryTypeDetector.clear_cache()
+    LibraryTypeDetector.detect_library_type(paths[0])
+    assert len(scans) == len(paths) + 1
+
+
+def test_cache_invalidated_by_mtime_and_bounded(tmp_path, monkeypatch):
+    """测试目录条目变化后缓存失效（不需要 clear_cache），缓存条目数有上限"""
+    from edp_center.packages.edp_libkit import lib_type_detector
+
+    LibraryTypeDetector.clear_cache()
+    lib = tmp_path / 'vendor/pll_ip'
+    lib.mkdir(parents=True)
+    assert LibraryTypeDetector.detect_library_type(lib) is None
+
+    (lib / 'FE-Common').mkdir()
+    os.utime(lib, ns=(0, os.stat(lib).st_mtime_ns + 10**9))  # 保证 mtime 变化（粗粒度文件系统）
+    assert LibraryTypeDetector.detect_library_type(lib) == 'IP'
+
+    (lib / 'FE-Common').rmdir()
+    os.utime(lib, ns=(0, os.stat(lib).st_mtime_ns + 10**9))
+    assert LibraryTypeDetector.detect_library_type(lib) is None
+
+    # 目录被删除后不再返回旧结果
+    lib.rmdir()
+    assert LibraryTypeDetector.detect_library_type(lib) is None
+
+    monkeypatch.setattr(lib_type_detector, 'CACHE_MAX_ENTRIES', 3)
+    LibraryTypeDetector.clear_cache()
+    paths = []
+    for i in range(5):
+        path = tmp_path / f'lib{i}'
+        path.mkdir()
+        paths.append(path)
+        LibraryTypeDetector.detect_library_type(path)
+    assert list(LibraryTypeDetector._cache) == [str(p) for p in paths[2:]]
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 Liberty 流式扫描器，以及扫描结果写入 LibraryIndex 后的查询
+"""
+
+import gzip
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.liberty_scanner import scan_liberty, is_liberty_file
+from edp_center.packages.edp_libkit.library_index import LibraryIndex
+from edp_center.packages.edp_libkit.lib_info import LibInfo
+
+LIBERTY = '''/* header comment with braces: library (fake) { */
+library (stdlib_ss0p675vn40c) {
+  delay_model : table_lookup ;
+  time_unit : "1ns" ;
+  voltage_unit : "1V" ;
+  leakage_power_unit : "1pW" ;
+  capacitive_load_unit (1, ff) ;
+  nom_process : 1 ;
+  nom_voltage : 0.675 ;
+  nom_temperature : -40 ;
+  operating_conditions ( "ss0p675vn40c" ) {
+    process : 1 ;
+    voltage : 0.675 ;
+    temperature : -40 ;
+    tree_type : "balanced_tree" ;
+    power_rail (VDD, 0.675) ;
+  }
+  default_operating_conditions : ss0p675vn40c ;
+  lu_table_template (delay_template_2x2) {
+    variable_1 : input_net_transition ;
+    index_1 ("0.01, 0.02") ;
+  }
+  cell (INV_X1) {
+    area : 1.0 ;
+    pin (Z) {
+      direction : output ;
+      timing () {
+        /* } unbalanced brace in a comment */
+        cell_rise (delay_template_2x2) {
+          values ("0.1, 0.2", \\
+                  "0.3, 0.4") ;
+        }
+      }
+    }
+  }
+  /* cell (COMMENTED_OUT) { } */
+  cell ( "NAND2_X1" ) {
+    pin (A) { direction : input ; }
+  }
+  cell (DFF_X1) { ff (IQ, IQN) { next_state : "D" ; } }
+}
+'''
+
+
+def _write(path: Path, content: str = LIBERTY) -> Path:
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'wt', encoding='latin-1') as f:
+        f.write(content)
+    return path
+
+
+def test_scan_header_and_cells(tmp_path):
+    """测试提取库名、单位、nom PVT、operating_conditions 和 cell 名称"""
+    header = scan_liberty(_write(tmp_path / 'stdlib.lib'))
+    assert header.library_name == 'stdlib_ss0p675vn40c'
+    assert header.units == {'time_unit': '1ns', 'voltage_unit': '1V', 'leakage_power_unit': '1pW',
+                            'capacitive_load_unit': '1ff'}
+    assert (header.nom_process, header.nom_voltage, header.nom_temperature) == (1.0, 0.675, -40.0)
+    assert header.default_operating_conditions == 'ss0p675vn40c'
+    assert header.operating_conditions == {'ss0p675vn40c': {
+        'process': '1', 'voltage': '0.675', 'temperature': '-40', 'tree_type': 'balanced_tree',
+        'power_rail': 'VDD0.675'}}
+    assert header.attributes == {'delay_model': 'table_lookup'}
+    assert header.cells == ['INV_X1', 'NAND2_X1', 'DFF_X1']
+    assert header.complete
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64])
+def test_chunk_boundaries(tmp_path, chunk_size):
+    """测试任意切分数据块时结果相同（包括切开注释起止符）"""
+    path = _write(tmp_path / 'stdlib.lib')
+    expected = scan_liberty(path)
+    header = scan_liberty(path, chunk_size=chunk_size)
+    # library 组结束后停止读取，读取的字节数与块大小有关
+    header.bytes_scanned = expected.bytes_scanned
+    assert header == expected
+
+
+def test_gzip_and_header_only(tmp_path):
+    """测试 .lib.gz 与 .lib 结果相同；只扫描头部时读到第一个 cell 就停止"""
+    plain = scan_liberty(_write(tmp_path / 'stdlib.lib'))
+    gz = scan_liberty(_write(tmp_path / 'stdlib.lib.gz'))
+    assert gz.cells == plain.cells and gz.units == plain.units and gz.nom_voltage == plain.nom_voltage
+
+    big = LIBERTY.replace('  cell (DFF_X1)', '  cell (BIG) { values ("' + '0.1, ' * 200000 + '") ; }\n  cell (DFF_X1)')
+    header = scan_liberty(_write(tmp_path / 'big.lib', big), with_cells=False, chunk_size=1024)
+    assert header.cells == ['INV_X1']
+    assert header.nom_voltage == 0.675
+    assert not header.complete
+    assert header.bytes_scanned < 4096
+
+
+def test_is_liberty_file():
+    """测试 Liberty 文件名识别"""
+    assert is_liberty_file('a_ss.lib')
+    assert is_liberty_file('a_ss.lib.gz')
+    assert is_liberty_file('a_ss.lib_ccs_tn_lvf_dths.gz')
+    assert not is_liberty_file('a_ss.db')
+    assert not is_liberty_file('a.library.v')
+
+
+def test_library_index_liberty(tmp_path):
+    """测试扫描结果写入 LibraryIndex 后按 cell 和 PVT 查询"""
+    index = LibraryIndex(tmp_path / 'index.db')
+    mem_info = LibInfo(lib_name='memlib', lib_path=tmp_path, lib_type='MEM', foundry='samsung', node='ln08lpu_gp')
+    memlib = mem_info.get_unique_id()
+    index.add_library(mem_info)
+    ss = _write(tmp_path / 'stdlib_ss.lib.gz')
+    ff = _write(tmp_path / 'stdlib_ff.lib', LIBERTY.replace('0.675', '0.825').replace('-40 ;', '125 ;')
+                .replace('DFF_X1', 'SDFF_X1'))
+    mem = _write(tmp_path / 'mem.lib', LIBERTY.replace('INV_X1', 'SRAM_1024X32'))
+
+    assert index.index_liberty_files('stdlib', [ss, ff]) == 2
+    assert index.index_liberty_files(memlib, [mem]) == 1
+    # 文件未变化时跳过
+    assert index.index_liberty_files('stdlib', [ss, ff]) == 0
+    assert index.index_liberty_file('stdlib', ss, force=True) is not None
+
+    assert index.find_libraries_by_cell('INV_X1') == {'stdlib': ['INV_X1']}
+    assert index.find_libraries_by_cell('*DFF*') == {memlib: ['DFF_X1'], 'stdlib': ['DFF_X1', 'SDFF_X1']}
+    assert index.get_liberty_cells(memlib) == ['DFF_X1', 'NAND2_X1', 'SRAM_1024X32']
+
+    corners = index.find_liberty_files(voltage=0.675, temperature=-40)
+    assert [c['file_path'] for c in corners] == [mem, ss]
+    assert corners[1]['units']['time_unit'] == '1ns'
+    assert corners[1]['cell_count'] == 3
+    assert [c['file_path'] for c in index.find_liberty_files(lib_id='stdlib', temperature=125)] == [ff]
+
+    # 重新打开索引后数据仍在；移除库后相关记录一起删除
+    index = LibraryIndex(tmp_path / 'index.db')
+    assert index.find_libraries_by_cell('SRAM*') == {memlib: ['SRAM_1024X32']}
+    assert index.remove_library(memlib)
+    assert index.find_libraries_by_cell('SRAM*') == {}
+    assert index.find_liberty_files(lib_id=memlib) == []
+
+
+def test_reindex_removes_stale_cells(tmp_path):
+    """测试文件改写后重新扫描，删除或改名的 cell 不再出现在查询结果中"""
+    index = LibraryIndex(tmp_path / 'index.db')
+    ss = _write(tmp_path / 'stdlib_ss.lib', LIBERTY)
+    ff = _write(tmp_path / 'stdlib_ff.lib', LIBERTY.replace('DFF_X1', 'SDFF_X1').replace('NAND2_X1', 'NOR2_X1'))
+    assert index.index_liberty_files('stdlib', [ss, ff]) == 2
+    assert index.get_liberty_cells('stdlib') == ['DFF_X1', 'INV_X1', 'NAND2_X1', 'NOR2_X1', 'SDFF_X1']
+    assert index.find_libraries_by_cell('INV_X1') == {'stdlib': ['INV_X1']}
+
+    # 去掉 DFF_X1，把 NAND2_X1 改名为 NAND2_X2
+    _write(ss, LIBERTY.replace('DFF_X1', 'INV_X1').replace('NAND2_X1', 'NAND2_X2'))
+    assert index.index_liberty_file('stdlib', ss, force=True) is not None
+    assert index.find_libraries_by_cell('DFF_X1') == {}
+    assert index.find_libraries_by_cell('NAND2*') == {'stdlib': ['NAND2_X2']}
+    assert index.search_names('NAND2', kind='cell') == [('stdlib', 'NAND2_X2')]
+    # 其他文件提供的 cell 保留
+    assert index.get_liberty_cells('stdlib') == ['INV_X1', 'NAND2_X2', 'NOR2_X1', 'SDFF_X1']
+
+
+def test_old_liberty_cells_table_rebuilt(tmp_path):
+    """测试旧版本没有 file_path 列的 liberty_cells 被重建，文件重新扫描"""
+    import sqlite3
+
+    index_path = tmp_path / 'index.db'
+    ss = _write(tmp_path / 'stdlib_ss.lib', LIBERTY)
+    LibraryIndex(index_path).index_liberty_file('stdlib', ss)
+    with sqlite3.connect(index_path) as conn:
+        conn.execute('DROP TABLE liberty_cells')
+        conn.execute('CREATE TABLE liberty_cells (lib_id TEXT, cell_name TEXT, PRIMARY KEY (lib_id, cell_name))')
+        conn.execute("INSERT INTO liberty_cells VALUES ('stdlib', 'OLD_CELL')")
+        conn.execute('PRAGMA user_version = 1')
+
+    index = LibraryIndex(index_path)
+    assert index.get_liberty_cells('stdlib') == []
+    assert index.index_liberty_files('stdlib', [ss]) == 1
+    assert index.get_liberty_cells('stdlib') == ['DFF_X1', 'INV_X1', 'NAND2_X1']
+    assert index.search_names('INV', kind='cell') == [('stdlib', 'INV_X1')]
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 LibraryIndex 的 SQL 查询：打开时不加载库、过滤结果与 fnmatch 一致、全文名称搜索和旧索引迁移
+"""
+
+import fnmatch
+import sqlite3
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.lib_info import LibInfo
+from edp_center.packages.edp_libkit.library_index import LibraryIndex
+
+FOUNDRIES = [('Samsung', 'ln08lpu_gp'), ('Samsung', 'ln04lpp'), ('TSMC', 'n5')]
+LIB_TYPES = ['STD', 'IP', 'MEM']
+
+
+def _make_libs(count: int):
+    libs = []
+    for i in range(count):
+        foundry, node = FOUNDRIES[i % len(FOUNDRIES)]
+        lib_type = LIB_TYPES[i % len(LIB_TYPES) if i % 7 else 0]
+        name = f"{'sram' if lib_type == 'MEM' else 'std'}_{['hvt', 'lvt', 'svt'][i % 3]}_{i:04d}"
+        libs.append(LibInfo(lib_name=name, lib_path=Path(f'/libs/{name}'), lib_type=lib_type,
+                            version='1.00A', foundry=foundry, node=node))
+    return libs
+
+
+def _linear_search(libs, foundry=None, node=None, lib_type=None, lib_name_pattern=None):
+    """原来的实现：遍历全部库逐个比较"""
+    return [lib.get_unique_id() for lib in libs
+            if (not foundry or lib.foundry == foundry) and (not node or lib.node == node)
+            and (not lib_type or lib.lib_type == lib_type)
+            and (not lib_name_pattern or fnmatch.fnmatchcase(lib.lib_name, lib_name_pattern))]
+
+
+def test_open_is_lazy_and_filters_match_fnmatch(tmp_path):
+    """测试重新打开索引时不加载库，过滤结果与逐个比较一致"""
+    libs = _make_libs(120)
+    assert LibraryIndex(tmp_path / 'index.db').add_libraries(libs) == len(libs)
+
+    index = LibraryIndex(tmp_path / 'index.db', cache_size=8)
+    assert len(index._cache) == 0
+
+    queries = [
+        {},
+        {'foundry': 'Samsung'},
+        {'foundry': 'Samsung', 'node': 'ln04lpp', 'lib_type': 'STD'},
+        {'lib_type': 'MEM', 'lib_name_pattern': 'sram_*'},
+        {'lib_name_pattern': '*_[hl]vt_00?[!0]'},
+        {'foundry': 'TSMC', 'lib_name_pattern': 'std_svt_*'},
+        {'foundry': 'NoSuchFoundry'},
+    ]
+    for query in queries:
+        expected = _linear_search(libs, **query)
+        assert [lib.get_unique_id() for lib in index.search_libraries(**query)] == expected
+        assert index.count_libraries(**query) == len(expected)
+    assert len(index._cache) == 8
+
+    assert len(index.search_libraries(foundry='Samsung', limit=5)) == 5
+    lib_id = libs[3].get_unique_id()
+    assert index.get_library(lib_id).lib_path == libs[3].lib_path
+    assert index.get_library(lib_id) is index.get_library(lib_id)
+    assert index.get_library('missing') is None
+
+    assert index.get_foundries() == ['Samsung', 'TSMC']
+    assert index.get_nodes() == ['ln04lpp', 'ln08lpu_gp', 'n5']
+    assert index.get_nodes('Samsung') == ['ln04lpp', 'ln08lpu_gp']
+    assert index.get_lib_types(foundry='TSMC', node='n5') == sorted({l.lib_type for l in libs if l.node == 'n5'})
+    assert index.get_statistics() == {'total_libraries': 120, 'foundries': 2, 'nodes': 3, 'lib_types': 3}
+
+    # 其他连接更新了这一行后不再返回缓存中的旧对象
+    with sqlite3.connect(tmp_path / 'index.db') as conn:
+        conn.execute("UPDATE libraries SET lib_path = '/moved' WHERE id = ?", (lib_id,))
+    assert index.get_library(lib_id).lib_path == Path('/moved')
+    assert index.search_libraries(lib_name_pattern=libs[3].lib_name)[0].lib_path == Path('/moved')
+    with sqlite3.connect(tmp_path / 'index.db') as conn:
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'idx_foundry_node' not in indexes and 'idx_foundry_node_type' in indexes
+
+    assert index.remove_library(lib_id)
+    assert not index.remove_library(lib_id)
+    assert index.get_library(lib_id) is None
+    assert index.count_libraries() == 119
+
+
+def test_name_search_follows_updates(tmp_path):
+    """测试库名/cell 名全文搜索，以及重命名和删除后的同步"""
+    index = LibraryIndex(tmp_path / 'index.db')
+    libs = _make_libs(30)
+    index.add_libraries(libs)
+
+    expected = sorted((l.get_unique_id(), l.lib_name) for l in libs if 'lvt_00' in l.lib_name)
+    assert index.search_names('lvt_00') == sorted(expected, key=lambda item: (item[1], item[0]))
+    assert [name for _, name in index.search_names('sram*1?')] == sorted(
+        l.lib_name for l in libs if fnmatch.fnmatchcase(l.lib_name, 'sram*1?'))
+    assert len(index.search_names('vt', limit=4)) == 4
+    # 短子串（扫描基础表）和长子串（trigram）都不区分大小写
+    srams = sorted((l.get_unique_id(), l.lib_name) for l in libs if 'sram' in l.lib_name)
+    for text in ('SR', 'Sra', 'SRAM_'):
+        assert sorted(index.search_names(text)) == srams
+    assert index.search_names('m_h_') == []
+
+    # 更新库名时全文索引同步更新
+    renamed = libs[0]
+    with index._connect() as conn:
+        conn.execute('UPDATE libraries SET lib_name = ? WHERE id = ?', ('renamed_macro', renamed.get_unique_id()))
+    assert index.search_names('d_mac') == [(renamed.get_unique_id(), 'renamed_macro')]
+    index.remove_library(renamed.get_unique_id())
+    assert index.search_names('d_mac') == []
+
+    with index._connect() as conn:
+        conn.executemany('INSERT INTO liberty_cells (lib_id, cell_name) VALUES (?, ?)',
+                         [('lib_a', 'DFFRX1'), ('lib_a', 'INVX1'), ('lib_b', 'SDFFRX2')])
+    assert index.search_names('DFFR', kind='cell') == [('lib_a', 'DFFRX1'), ('lib_b', 'SDFFRX2')]
+    assert index.find_libraries_by_cell('*DFF*') == {'lib_a': ['DFFRX1'], 'lib_b': ['SDFFRX2']}
+
+
+def test_old_index_gets_fulltext(tmp_path):
+    """测试旧版本索引文件（没有全文索引）第一次打开时重建全文索引"""
+    db_path = tmp_path / 'index.db'
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('''
+            CREATE TABLE libraries (
+                id TEXT PRIMARY KEY, lib_name TEXT NOT NULL, lib_path TEXT NOT NULL, lib_type TEXT NOT NULL,
+                version TEXT, foundry TEXT, node TEXT, adapter_type TEXT, created_at TEXT, updated_at TEXT,
+                metadata TEXT, statistics TEXT
+            )
+        ''')
+        conn.execute("INSERT INTO libraries (id, lib_name, lib_path, lib_type, foundry, node) "
+                     "VALUES ('old_id', 'legacy_sram_lib', '/libs/legacy', 'MEM', 'Samsung', 'ln08lpu_gp')")
+
+    index = LibraryIndex(db_path)
+    assert index.search_names('sram') == [('old_id', 'legacy_sram_lib')]
+    assert index.search_libraries(lib_type='MEM')[0].lib_name == 'legacy_sram_lib'
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == LibraryIndex.SCHEMA_VERSION
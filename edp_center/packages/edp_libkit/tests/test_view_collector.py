@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+测试 ViewFileCollector：结果与逐个模式 glob 一致，每个目录只读取一次
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from edp_center.packages.edp_libkit.view_collector import ViewFileCollector
+from edp_center.packages.edp_libkit.generator import LibConfigGenerator
+from edp_center.packages.edp_libkit.cli import _find_library_directories
+
+VIEW_PATTERNS = {
+    'ccs_lvf': ['*.db', '*.db_ccs_tn_lvf_dths', '*.lib_ccs_tn_lvf_dths.gz', '*.lib', '*.lib.gz', '*.db'],
+    'lef': '*.lef',
+    'model': ['*'],
+    'verilog': ['*.v', '*.sv'],
+}
+
+
+def _glob_collect(view_dirs, view_patterns):
+    """原来的实现：每个模式 glob 一次，去重排序"""
+    view_files = {}
+    for view_type, view_path in view_dirs.items():
+        patterns = view_patterns[view_type]
+        patterns = [patterns] if isinstance(patterns, str) else patterns
+        files = sorted(set(f for p in patterns for f in view_path.glob(p)))
+        if files:
+            view_files[view_type] = files
+    return view_files
+
+
+def test_collect_matches_glob(tmp_path):
+    """测试多模式单次扫描的结果与逐个模式 glob 相同"""
+    names = {
+        'ccs_lvf': ['a_ss.db', 'a_ff.db', 'a_ss.lib.gz', 'a.lib', 'a.db_ccs_tn_lvf_dths',
+                    'a.lib_ccs_tn_lvf_dths.gz', 'README', 'a.DB', '.hidden.db'],
+        'lef': ['a.lef', 'a.lef.bak', 'tech.lef'],
+        'model': ['x.scs', '.y'],
+        'verilog': ['a.v', 'a.vhd'],
+    }
+    view_dirs = {}
+    for view_type, files in names.items():
+        view_dirs[view_type] = tmp_path / view_type
+        view_dirs[view_type].mkdir()
+        for name in files:
+            (view_dirs[view_type] / name).touch()
+    # 与 glob 一致：匹配的子目录也返回
+    (view_dirs['ccs_lvf'] / 'sub.db').mkdir()
+    view_dirs['missing'] = tmp_path / 'missing'
+    patterns = dict(VIEW_PATTERNS, missing='*')
+
+    collector = ViewFileCollector()
+    result = collector.collect(view_dirs, patterns)
+    assert result == _glob_collect(view_dirs, patterns)
+    assert list(result) == ['ccs_lvf', 'lef', 'model', 'verilog']
+    assert collector.dir_reads == len(view_dirs)
+
+
+def test_shared_directory_read_once(tmp_path):
+    """测试多个视图共享同一个目录时只读取一次"""
+    for name in ['a.lib', 'a.db', 'a.v']:
+        (tmp_path / name).touch()
+    collector = ViewFileCollector()
+    result = collector.collect({'liberty': tmp_path, 'db': tmp_path, 'verilog': tmp_path},
+                               {'liberty': '*.lib', 'db': ['*.db'], 'verilog': ['*.v']})
+    assert {k: [p.name for p in v] for k, v in result.items()} == {
+        'liberty': ['a.lib'], 'db': ['a.db'], 'verilog': ['a.v']}
+    assert collector.dir_reads == 1
+
+
+def test_generator_reads_each_view_dir_once(tmp_path):
+    """测试 LibConfigGenerator 收集文件时每个视图目录只读取一次"""
+    view_dirs = {}
+    for view_type in ['gds', 'lef', 'ccs_lvf', 'ccs_power', 'logic_synth', 'cdl']:
+        view_dirs[view_type] = tmp_path / view_type
+        view_dirs[view_type].mkdir()
+        for ext in ['gds', 'lef', 'db', 'lib.gz', 'cdl', 'v']:
+            (view_dirs[view_type] / f'lib_{view_type}.{ext}').touch()
+
+    generator = LibConfigGenerator('Samsung', tmp_path, tmp_path / 'out', node='ln08lpu_gp')
+    view_files = generator._collect_files(view_dirs)
+    assert generator.file_collector.dir_reads == len(view_dirs)
+
+    view_patterns = {v: generator.adapter.get_view_file_pattern(v) for v in view_dirs}
+    assert view_files == _glob_collect(view_dirs, view_patterns)
+    assert [p.name for p in view_files['ccs_lvf']] == ['lib_ccs_lvf.db']
+
+
+def test_find_library_directories_reads_parent_once(tmp_path):
+    """测试查找库目录时父目录只读取一次"""
+    generator = LibConfigGenerator('Samsung', tmp_path, tmp_path / 'out', node='ln08lpu_gp')
+    for name in ['gds', 'lef', 'docs']:
+        (tmp_path / 'lib_a' / name).mkdir(parents=True)
+    (tmp_path / 'notes.txt').touch()
+
+    collector = ViewFileCollector()
+    assert _find_library_directories(tmp_path / 'lib_a', generator.adapter, 'STD', collector) == [tmp_path / 'lib_a']
+    assert collector.dir_reads == 1
+
+    (tmp_path / 'lib_b' / 'gds').mkdir(parents=True)
+    (tmp_path / 'lib_b' / 'lef').mkdir()
+    (tmp_path / 'empty').mkdir()
+    collector = ViewFileCollector()
+    assert _find_library_directories(tmp_path, generator.adapter, 'STD', collector) == [
+        tmp_path / 'lib_a', tmp_path / 'lib_b']
+    assert collector.dir_reads == 1
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ViewFileCollector - 单次扫描的视图文件收集器
+
+每个视图类型有多个文件模式（如 ccs_lvf 的 *.db、*.lib.gz ...）。逐个模式调用
+Path.glob() 时，同一个目录会被重复读取（模式数 × 视图数次）。这里每个目录只用
+os.scandir 读取一次，用预编译的正则同时匹配该目录下所有视图的所有模式。
+
+匹配规则与 Path.glob(pattern) 一致（非递归，匹配文件和目录，包含隐藏文件），
+返回结果与逐个模式 glob 后去重排序相同。
+"""
+
+import fnmatch
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Pattern, Sequence, Tuple, Union
+
+# 与 pathlib 一致：Windows 上大小写不敏感
+_RE_FLAGS = re.IGNORECASE if os.name == 'nt' else 0
+
+
+@lru_cache(maxsize=None)
+def compile_patterns(patterns: Tuple[str, ...]) -> Pattern:
+    """
+    把多个 glob 文件模式编译为一个正则（结果按模式元组缓存）
+
+    Args:
+        patterns: 文件模式元组，如 ('*.db', '*.lib.gz')
+
+    Returns:
+        匹配任意一个模式的正则
+    """
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns), _RE_FLAGS)
+
+
+class ViewFileCollector:
+    """按目录单次扫描收集视图文件，dir_reads 记录实际读取目录的次数"""
+
+    def __init__(self):
+        self.dir_reads = 0
+
+    def scan(self, directory: Path) -> Tuple[List[str], List[str]]:
+        """
+        读取一次目录
+
+        Args:
+            directory: 目录路径
+
+        Returns:
+            (子目录名列表, 其他条目名列表)，目录不存在或不可读时返回两个空列表
+        """
+        dirs, others = [], []
+        self.dir_reads += 1
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    (dirs if is_dir else others).append(entry.name)
+        except OSError:
+            pass
+        return dirs, others
+
+    def collect(self, view_dirs: Dict[str, Path],
+                view_patterns: Dict[str, Union[str, Sequence[str]]]) -> Dict[str, List[Path]]:
+        """
+        收集各个视图目录中匹配模式的文件
+
+        Args:
+            view_dirs: {view_type: view_path} 字典
+            view_patterns: {view_type: 模式字符串或模式列表} 字典
+
+        Returns:
+            {view_type: 排序后的文件路径列表}，没有匹配文件的视图不出现在结果中
+        """
+        # 按目录分组，多个视图共享同一个目录时也只读取一次
+        by_dir: Dict[Path, List[Tuple[str, Pattern]]] = {}
+        for view_type, view_path in view_dirs.items():
+            patterns = view_patterns.get(view_type, '*')
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            regex = compile_patterns(tuple(patterns))
+            by_dir.setdefault(Path(view_path), []).append((view_type, regex))
+
+        found: Dict[str, List[Path]] = {}
+        for view_path, matchers in by_dir.items():
+            dirs, others = self.scan(view_path)
+            names = dirs + others
+            for view_type, regex in matchers:
+                matched = sorted(view_path / name for name in names if regex.match(name))
+                if matched:
+                    found[view_type] = matched
+        # 保持 view_dirs 的顺序
+        return {view_type: found[view_type] for view_type in view_dirs if view_type in found}